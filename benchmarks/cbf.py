@@ -0,0 +1,65 @@
+"""Benchmark of the size and the loading time of meshes stored as JSON, pickle and CBF.
+
+Usage: ``python benchmarks/cbf.py``
+"""
+from __future__ import print_function
+from __future__ import absolute_import
+from __future__ import division
+
+import json
+import os
+import pickle
+import tempfile
+import time
+
+from compas.datastructures import Mesh
+from compas.files import CBF
+
+
+def benchmark(n):
+    vertices = [[i, j, 0.0] for i in range(n + 1) for j in range(n + 1)]
+    faces = [[i * (n + 1) + j, (i + 1) * (n + 1) + j, (i + 1) * (n + 1) + j + 1, i * (n + 1) + j + 1] for i in range(n) for j in range(n)]
+    mesh = Mesh.from_vertices_and_faces(vertices, faces)
+    for key, attr in mesh.vertices(True):
+        attr['is_fixed'] = key % 7 == 0
+    data = mesh.data
+
+    folder = tempfile.gettempdir()
+    paths = {'json': os.path.join(folder, 'benchmark.json'),
+             'pickle': os.path.join(folder, 'benchmark.pickle'),
+             'cbf': os.path.join(folder, 'benchmark.cbf')}
+
+    mesh.to_json(paths['json'])
+    mesh.to_pickle(paths['pickle'])
+    mesh.to_binary(paths['cbf'])
+
+    def load_json():
+        with open(paths['json'], 'r') as f:
+            return json.load(f)
+
+    def load_pickle():
+        with open(paths['pickle'], 'rb') as f:
+            return pickle.load(f)
+
+    def load_cbf(mmap=False):
+        return CBF(paths['cbf'], mmap=mmap).reader.data
+
+    print('{} faces'.format(mesh.number_of_faces()))
+    print('{:<12} {:>10} {:>12} {:>12}'.format('format', 'size (MB)', 'data (s)', 'mesh (s)'))
+    for name, load, construct in (('json', load_json, Mesh.from_json),
+                                  ('pickle', load_pickle, Mesh.from_pickle),
+                                  ('cbf', load_cbf, Mesh.from_binary),
+                                  ('cbf (mmap)', lambda: load_cbf(True), lambda path: Mesh.from_binary(path, mmap=True))):
+        path = paths[name.split()[0]]
+        t0 = time.time()
+        assert load() == data or name == 'json'
+        t1 = time.time()
+        construct(path)
+        t2 = time.time()
+        print('{:<12} {:>10.2f} {:>12.3f} {:>12.3f}'.format(name, os.path.getsize(path) / 1e6, t1 - t0, t2 - t1))
+
+
+if __name__ == '__main__':
+
+    benchmark(100)
+    benchmark(300)
@@ -0,0 +1,36 @@
+"""Benchmark of the convex hull of random points, with and without the NumPy prefilter, and with SciPy,
+and of the convex hull of random points in the XY plane.
+
+Usage: ``python benchmarks/convex_hull.py``
+"""
+from __future__ import print_function
+from __future__ import absolute_import
+from __future__ import division
+
+import time
+
+from compas.geometry import convex_hull
+from compas.geometry import convex_hull_numpy
+from compas.geometry import convex_hull_xy
+from compas.geometry import pointcloud
+from compas.geometry.hull.hull import _hull_tolerance
+from compas.geometry.hull.hull import _quickhull
+
+
+if __name__ == '__main__':
+
+    for n in (1000, 10000, 100000, 1000000):
+        points = pointcloud(n, (0, 1000))
+
+        t0 = time.time()
+        convex_hull(points)
+        t1 = time.time()
+        _quickhull(points, range(n), _hull_tolerance(points))
+        t2 = time.time()
+        convex_hull_numpy(points)
+        t3 = time.time()
+        convex_hull_xy(points)
+        t4 = time.time()
+
+        print('points: {:>7}  convex_hull {:>7.2f}s  pure python {:>7.2f}s  convex_hull_numpy {:>7.2f}s  convex_hull_xy {:>7.2f}s'.format(
+            n, t1 - t0, t2 - t1, t3 - t2, t4 - t3))
@@ -0,0 +1,27 @@
+"""Benchmark of the Delaunay triangulation of random points, in pure Python and with SciPy.
+
+Usage: ``python benchmarks/delaunay.py``
+"""
+from __future__ import print_function
+from __future__ import absolute_import
+from __future__ import division
+
+import time
+
+from compas.geometry import delaunay_from_points
+from compas.geometry import delaunay_from_points_numpy
+from compas.geometry import pointcloud_xy
+
+
+if __name__ == '__main__':
+
+    for n in (1000, 10000, 50000):
+        points = pointcloud_xy(n, (0, 1000))
+
+        t0 = time.time()
+        delaunay_from_points(points)
+        t1 = time.time()
+        delaunay_from_points_numpy(points)
+        t2 = time.time()
+
+        print('points: {:>6}  delaunay_from_points {:>7.2f}s  delaunay_from_points_numpy {:>7.2f}s'.format(n, t1 - t0, t2 - t1))
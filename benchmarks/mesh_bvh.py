@@ -0,0 +1,55 @@
+"""Benchmark of the construction, closest point and ray queries, and refitting of the bounding volume hierarchy of a mesh.
+
+Usage: ``python benchmarks/mesh_bvh.py [number of faces ...]``
+"""
+from __future__ import print_function
+from __future__ import absolute_import
+from __future__ import division
+
+import sys
+import time
+
+from math import pi
+from math import sin
+from numpy import sin as npsin
+from numpy.random import rand
+
+from compas.datastructures import Mesh
+
+
+def grid(n):
+    vertices = [[i / n, j / n, 0.1 * sin(2 * pi * i / n) * sin(2 * pi * j / n)] for i in range(n + 1) for j in range(n + 1)]
+    faces = []
+    for i in range(n):
+        for j in range(n):
+            a = i * (n + 1) + j
+            b = a + n + 1
+            faces.append([a, b, b + 1])
+            faces.append([a, b + 1, a + 1])
+    return vertices, faces
+
+
+if __name__ == '__main__':
+
+    sizes = [int(arg) for arg in sys.argv[1:]] or [10000, 100000, 500000]
+
+    for size in sizes:
+        mesh = Mesh.from_vertices_and_faces(*grid(int((size / 2) ** 0.5)))
+        # points close to the surface, to be projected onto it
+        points = rand(100000, 3) * [1.0, 1.0, 0.04] - [0.0, 0.0, 0.02]
+        points[:, 2] += 0.1 * npsin(2 * pi * points[:, 0]) * npsin(2 * pi * points[:, 1])
+        print('faces: {}  points: {}'.format(mesh.number_of_faces(), len(points)))
+
+        t0 = time.time()
+        bvh = mesh.bvh()
+        t1 = time.time()
+        bvh.closest_points(points)
+        t2 = time.time()
+        bvh.intersect_rays(points, [[0.0, 0.0, -1.0]] * len(points))
+        t3 = time.time()
+        mesh.vertex_attribute(0, 'z', 0.5)
+        bvh.update()
+        t4 = time.time()
+
+        print('    build {:>7.2f}s  closest points {:>7.2f}s  rays {:>7.2f}s  refit {:>7.2f}s'.format(
+            t1 - t0, t2 - t1, t3 - t2, t4 - t3))
@@ -0,0 +1,52 @@
+"""Benchmark of the bulk construction of meshes against adding the vertices and faces one by one.
+
+Usage: ``python benchmarks/mesh_from_vertices_and_faces.py [number of faces ...]``
+"""
+from __future__ import print_function
+from __future__ import absolute_import
+from __future__ import division
+
+import sys
+import time
+
+from compas.datastructures import Mesh
+
+
+def grid(n):
+    vertices = [[i, j, 0.0] for i in range(n + 1) for j in range(n + 1)]
+    faces = []
+    for i in range(n):
+        for j in range(n):
+            a, b, c, d = i * (n + 1) + j, (i + 1) * (n + 1) + j, (i + 1) * (n + 1) + j + 1, i * (n + 1) + j + 1
+            faces.append([a, b, c])
+            faces.append([a, c, d])
+    return vertices, faces
+
+
+if __name__ == '__main__':
+
+    sizes = [int(arg) for arg in sys.argv[1:]] or [10000, 100000, 1000000]
+
+    for size in sizes:
+        vertices, faces = grid(int((size / 2) ** 0.5))
+        print('faces: {}'.format(len(faces)))
+
+        for storage in ('dict', 'compact'):
+            t0 = time.time()
+            mesh = Mesh(storage=storage)
+            for x, y, z in vertices:
+                mesh.add_vertex(x=x, y=y, z=z)
+            for face in faces:
+                mesh.add_face(face)
+            t1 = time.time()
+            del mesh
+            t2 = time.time()
+            mesh = Mesh.from_vertices_and_faces(vertices, faces, storage=storage)
+            t3 = time.time()
+            del mesh
+            t4 = time.time()
+            Mesh.from_vertices_and_faces(vertices, faces, storage=storage, validate=True)
+            t5 = time.time()
+
+            print('    {:<8} per element {:>7.2f}s  bulk {:>7.2f}s ({:.1f}x)  bulk + validation {:>7.2f}s'.format(
+                storage, t1 - t0, t3 - t2, (t1 - t0) / (t3 - t2), t5 - t4))
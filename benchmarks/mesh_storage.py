@@ -0,0 +1,57 @@
+"""Benchmark of the memory use, construction, queries and copies of meshes with ``'dict'`` and ``'compact'`` storage.
+
+Usage: ``python benchmarks/mesh_storage.py [number of faces ...]``
+"""
+from __future__ import print_function
+from __future__ import absolute_import
+from __future__ import division
+
+import sys
+import time
+import tracemalloc
+
+from compas.datastructures import Mesh
+
+
+def grid(n):
+    vertices = [[i, j, 0.0] for i in range(n + 1) for j in range(n + 1)]
+    faces = [[i * (n + 1) + j, (i + 1) * (n + 1) + j, (i + 1) * (n + 1) + j + 1, i * (n + 1) + j + 1] for i in range(n) for j in range(n)]
+    return vertices, faces
+
+
+if __name__ == '__main__':
+
+    sizes = [int(arg) for arg in sys.argv[1:]] or [10000, 100000, 1000000, 5000000]
+
+    for size in sizes:
+        vertices, faces = grid(int(size ** 0.5))
+        print('faces: {}'.format(len(faces)))
+
+        for storage in ('dict', 'compact'):
+            tracemalloc.start()
+            t0 = time.time()
+            mesh = Mesh.from_vertices_and_faces(vertices, faces, storage=storage)
+            t1 = time.time()
+            memory = tracemalloc.get_traced_memory()[0]
+            tracemalloc.stop()
+
+            t2 = time.time()
+            for key in mesh.vertices():
+                mesh.vertex_neighbors(key)
+            for fkey in mesh.faces():
+                mesh.face_vertices(fkey)
+            for key in mesh.vertices():
+                mesh.vertex_coordinates(key)
+            t3 = time.time()
+
+            t4 = time.time()
+            other = mesh.copy()
+            t5 = time.time()
+            other.vertex_attribute(0, 'x', 1.0)
+            t6 = time.time()
+
+            print('    {:<8} {:>8.1f} bytes/vertex  build {:>7.2f}s  queries {:>7.2f}s  copy {:>7.3f}s  first write {:>7.3f}s'.format(
+                storage, memory / mesh.number_of_vertices(), t1 - t0, t3 - t2, t5 - t4, t6 - t5))
+
+            del other
+            del mesh
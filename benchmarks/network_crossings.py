@@ -0,0 +1,61 @@
+"""Benchmark of finding the crossing edges of a network against testing all pairs of edges.
+
+Usage: ``python benchmarks/network_crossings.py``
+"""
+from __future__ import print_function
+from __future__ import absolute_import
+from __future__ import division
+
+import random
+import time
+
+from compas.datastructures import Network
+from compas.datastructures import network_find_crossings
+from compas.geometry import is_intersection_segment_segment_xy
+
+
+def grid(m):
+    # a perturbed grid, with the diagonals of a few cells
+    network = Network()
+    for i in range(m):
+        for j in range(m):
+            network.add_node(i * m + j, x=i + 0.3 * random.random(), y=j + 0.3 * random.random(), z=0.0)
+    for i in range(m):
+        for j in range(m):
+            if i + 1 < m:
+                network.add_edge(i * m + j, (i + 1) * m + j)
+            if j + 1 < m:
+                network.add_edge(i * m + j, i * m + j + 1)
+    for i, j in set((random.randrange(m - 1), random.randrange(m - 1)) for _ in range(50)):
+        network.add_edge(i * m + j, (i + 1) * m + j + 1)
+        network.add_edge((i + 1) * m + j, i * m + j + 1)
+    return network
+
+
+def brute_force(network):
+    edges = list(network.edges())
+    xy = {key: network.node_attributes(key, 'xy') for key in network.nodes()}
+    crossings = []
+    for i, (u1, v1) in enumerate(edges):
+        for u2, v2 in edges[i + 1:]:
+            if u1 == u2 or v1 == v2 or u1 == v2 or u2 == v1:
+                continue
+            if is_intersection_segment_segment_xy((xy[u1], xy[v1]), (xy[u2], xy[v2])):
+                crossings.append(((u1, v1), (u2, v2)))
+    return crossings
+
+
+if __name__ == '__main__':
+
+    for m in (20, 40, 100, 200):
+        network = grid(m)
+
+        t0 = time.time()
+        crossings = network_find_crossings(network)
+        t1 = time.time()
+        if m <= 40:
+            assert brute_force(network) == crossings
+        t2 = time.time()
+
+        print('edges: {:>6}  crossings: {:>3}  network_find_crossings {:>7.3f}s  brute force {}'.format(
+            network.number_of_edges(), len(crossings), t1 - t0, '{:>7.3f}s'.format(t2 - t1) if m <= 40 else '-'))
@@ -0,0 +1,37 @@
+"""Benchmark of classifying points with a polygon index against testing them one by one.
+
+Usage: ``python benchmarks/polygonindex.py``
+"""
+from __future__ import print_function
+from __future__ import absolute_import
+from __future__ import division
+
+import math
+import random
+import time
+
+from compas.geometry import PolygonIndex
+from compas.geometry import is_point_in_polygon_xy
+
+
+if __name__ == '__main__':
+
+    for n in (100, 1000, 10000):
+        polygon = []
+        for i in range(n):
+            a = 2 * math.pi * i / n
+            r = 1.0 + 0.5 * math.sin(7 * a) + 0.2 * random.random()
+            polygon.append([r * math.cos(a), r * math.sin(a), 0.0])
+        points = [[random.uniform(-2.0, 2.0), random.uniform(-2.0, 2.0), 0.0] for _ in range(100000)]
+
+        t0 = time.time()
+        index = PolygonIndex(polygon)
+        t1 = time.time()
+        index.classify(points)
+        t2 = time.time()
+        for point in points[:1000]:
+            is_point_in_polygon_xy(point, polygon)
+        t3 = time.time()
+
+        print('edges: {:>6}  build {:>6.3f}s  classify {:>6.3f}s  is_point_in_polygon_xy {:>7.3f}s (extrapolated)'.format(
+            n, t1 - t0, t2 - t1, 100 * (t3 - t2)))
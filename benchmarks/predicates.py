@@ -0,0 +1,47 @@
+"""Benchmark of the exact orientation and incircle predicates against their naive floating point versions.
+
+Usage: ``python benchmarks/predicates.py``
+"""
+from __future__ import print_function
+from __future__ import absolute_import
+from __future__ import division
+
+import random
+import timeit
+
+from compas.geometry import incircle_xy
+from compas.geometry import orient_xy
+
+
+def naive_orient_xy(a, b, c):
+    return (a[0] - c[0]) * (b[1] - c[1]) - (a[1] - c[1]) * (b[0] - c[0])
+
+
+def naive_incircle_xy(a, b, c, d):
+    adx, ady = a[0] - d[0], a[1] - d[1]
+    bdx, bdy = b[0] - d[0], b[1] - d[1]
+    cdx, cdy = c[0] - d[0], c[1] - d[1]
+    return ((adx * adx + ady * ady) * (bdx * cdy - cdx * bdy) +
+            (bdx * bdx + bdy * bdy) * (cdx * ady - adx * cdy) +
+            (cdx * cdx + cdy * cdy) * (adx * bdy - bdx * ady))
+
+
+if __name__ == '__main__':
+
+    # random points, for which the floating point filter almost always succeeds,
+    # and points on a line and on a circle, for which it always fails
+    points = [[random.random(), random.random()] for _ in range(4000)]
+    random_orient = list(zip(points[0::4], points[1::4], points[2::4]))
+    random_incircle = list(zip(points[0::4], points[1::4], points[2::4], points[3::4]))
+    colinear = [([0.1 * i, 0.1 * i], [0.3 * i, 0.3 * i], [0.7 * i, 0.7 * i]) for i in range(1, 1001)]
+    cocircular = [([i, 0.0], [0.0, i], [-i, 0.0], [0.0, -i]) for i in range(1, 1001)]
+
+    for name, function, cases in (
+            ('naive_orient_xy', naive_orient_xy, random_orient),
+            ('orient_xy', orient_xy, random_orient),
+            ('orient_xy (colinear)', orient_xy, colinear),
+            ('naive_incircle_xy', naive_incircle_xy, random_incircle),
+            ('incircle_xy', incircle_xy, random_incircle),
+            ('incircle_xy (cocircular)', incircle_xy, cocircular)):
+        t = min(timeit.repeat(lambda: [function(*case) for case in cases], number=10, repeat=5))
+        print('{:<26} {:>6.3f} us per call'.format(name, 1e6 * t / (10 * len(cases))))
@@ -44,6 +44,7 @@ Algorithms
     mesh_connected_components
     mesh_contours_numpy
     mesh_cut_by_plane
+    mesh_decimate
     mesh_delete_duplicate_vertices
     mesh_dual
     mesh_explode
@@ -58,7 +59,11 @@ Algorithms
     mesh_planarize_faces
     mesh_quads_to_triangles
     mesh_smooth_centroid
+    mesh_smooth_centroid_numpy
+    mesh_smooth_centerofmass
+    mesh_smooth_centerofmass_numpy
     mesh_smooth_area
+    mesh_smooth_area_numpy
     mesh_subdivide
     mesh_subdivide_tri
     mesh_subdivide_corner
@@ -87,11 +92,42 @@ Matrices
     :nosignatures:
 
     mesh_adjacency_matrix
+    mesh_arrays_numpy
     mesh_connectivity_matrix
     mesh_degree_matrix
     mesh_face_matrix
     mesh_laplacian_matrix
 
+Spatial queries
+---------------
+
+.. autosummary::
+    :toctree: generated/
+    :nosignatures:
+
+    MeshBVH
+    mesh_bvh_numpy
+
+Geodesics
+---------
+
+.. autosummary::
+    :toctree: generated/
+    :nosignatures:
+
+    GeodesicSolver
+
+Subdivision
+-----------
+
+.. autosummary::
+    :toctree: generated/
+    :nosignatures:
+
+    SubdivisionMatrix
+    mesh_subdivision_matrix
+    subdivision_matrix_numpy
+
 Conway Operators
 ----------------
 
@@ -127,6 +163,8 @@ Algorithms
     trimesh_descent
     trimesh_face_circle
     trimesh_gaussian_curvature
+    trimesh_remesh
+    trimesh_remesh_queue
 
 
 Networks
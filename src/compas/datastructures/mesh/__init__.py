@@ -10,6 +10,7 @@ from ._mesh import *  # noqa: F401 F403
 from .bbox import *  # noqa: F401 F403
 if not IPY:
     from .bbox_numpy import *  # noqa: F401 F403
+    from .bvh_numpy import *  # noqa: F401 F403
 from .combinatorics import *  # noqa: F401 F403
 if not IPY:
     from .contours_numpy import *  # noqa: F401 F403
@@ -18,6 +19,7 @@ from .curvature import *  # noqa: F401 F403
 if not IPY:
     from .descent_numpy import *  # noqa: F401 F403
 from .cut import *  # noqa: F401 F403
+from .decimation import *  # noqa: F401 F403
 from .duality import *  # noqa: F401 F403
 from .explode import *  # noqa: F401 F403
 if not IPY:
@@ -35,6 +37,8 @@ if not IPY:
     from .smoothing_numpy import *  # noqa: F401 F403
 from .remesh import *  # noqa: F401 F403
 from .subdivision import *  # noqa: F401 F403
+if not IPY:
+    from .subdivision_numpy import *  # noqa: F401 F403
 from .transformations import *  # noqa: F401 F403
 if not IPY:
     from .transformations_numpy import *  # noqa: F401 F403
@@ -56,6 +56,54 @@ class Mesh(BaseMesh):
         from compas.datastructures.mesh.transformations_numpy import mesh_transform_numpy
         mesh_transform_numpy(self, M)
 
+    def to_arrays(self):
+        """Get NumPy arrays of the vertex coordinates and the connectivity of the mesh.
+
+        Returns
+        -------
+        :class:`compas.datastructures.mesh.core.MeshArrays`
+            The read-only arrays of the mesh.
+            The arrays are cached, and extracted again only after the mesh was modified.
+
+        Examples
+        --------
+        >>> mesh = Mesh.from_polyhedron(6)
+        >>> mesh.to_arrays().vertices.shape
+        (8, 3)
+        """
+        from compas.datastructures.mesh.core.arrays_numpy import mesh_arrays_numpy
+        return mesh_arrays_numpy(self)
+
+    @property
+    def arrays(self):
+        """:class:`compas.datastructures.mesh.core.MeshArrays` : The cached NumPy arrays of the mesh (see :meth:`to_arrays`)."""
+        return self.to_arrays()
+
+    def bvh(self, leafsize=8):
+        """Get a bounding volume hierarchy of the faces of the mesh, for closest point, ray, plane and box queries.
+
+        Parameters
+        ----------
+        leafsize : int, optional
+            The number of triangles per leaf.
+            Default is ``8``.
+
+        Returns
+        -------
+        :class:`compas.datastructures.MeshBVH`
+            The hierarchy of the mesh.
+            The hierarchy is cached, and rebuilt or refitted when the mesh is modified.
+
+        Examples
+        --------
+        >>> mesh = Mesh.from_polyhedron(6)
+        >>> points, faces, distances = mesh.bvh().closest_points([[0.0, 0.0, 3.0]])
+        >>> distances.round(3).tolist()
+        [1.845]
+        """
+        from compas.datastructures.mesh.bvh_numpy import mesh_bvh_numpy
+        return mesh_bvh_numpy(self, leafsize=leafsize)
+
     def to_trimesh(self):
         # convert to mesh with only triangle faces
         # provides options that define the rules for triangulation
@@ -0,0 +1,625 @@
+"""
+Bounding volume hierarchy over the faces of a mesh, for batched spatial queries.
+
+The faces of the mesh are triangulated (fans around the first vertex of every face),
+the triangles are sorted along a Morton (Z-order) curve through their centroids,
+and consecutive groups of ``leafsize`` triangles form the leaves of the hierarchy.
+The leaves are merged pairwise, level by level, up to a single root box.
+Since the structure of the tree only depends on the order of the triangles,
+the boxes can be recomputed (refitted) in a few vectorized passes when only the vertex coordinates change.
+
+All queries are answered for many query objects at once,
+by descending the levels of the tree with the pairs of queries and nodes that are not yet pruned.
+"""
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+from numpy import arange
+from numpy import argsort
+from numpy import array
+from numpy import asarray
+from numpy import bincount
+from numpy import concatenate
+from numpy import cross
+from numpy import cumsum
+from numpy import diff
+from numpy import einsum
+from numpy import errstate
+from numpy import float64
+from numpy import full
+from numpy import inf
+from numpy import int64
+from numpy import lexsort
+from numpy import maximum
+from numpy import minimum
+from numpy import searchsorted
+from numpy import unique
+from numpy import where
+from numpy import zeros
+
+from compas.datastructures.mesh.core import mesh_arrays_numpy
+
+
+__all__ = [
+    'MeshBVH',
+    'mesh_bvh_numpy'
+]
+
+
+def mesh_bvh_numpy(mesh, leafsize=8):
+    """Get the bounding volume hierarchy of the faces of a mesh.
+
+    Parameters
+    ----------
+    mesh : compas.datastructures.Mesh
+        A mesh object.
+    leafsize : int, optional
+        The number of triangles per leaf.
+        Default is ``8``.
+
+    Returns
+    -------
+    :class:`MeshBVH`
+        The hierarchy of the mesh.
+        The hierarchy is cached on the mesh, and updated when the mesh is modified.
+
+    Examples
+    --------
+    >>> from compas.datastructures import Mesh
+    >>> mesh = Mesh.from_polyhedron(6)
+    >>> bvh = mesh_bvh_numpy(mesh)
+    >>> mesh_bvh_numpy(mesh) is bvh
+    True
+
+    """
+    bvh = mesh._cache.get('bvh')
+    if bvh is None or bvh.leafsize != leafsize:
+        bvh = mesh._cache['bvh'] = MeshBVH(mesh, leafsize=leafsize)
+    return bvh
+
+
+class MeshBVH(object):
+    """Bounding volume hierarchy of the faces of a mesh.
+
+    Parameters
+    ----------
+    mesh : compas.datastructures.Mesh
+        A mesh object.
+    leafsize : int, optional
+        The number of triangles per leaf.
+        Default is ``8``.
+
+    Attributes
+    ----------
+    mesh : compas.datastructures.Mesh
+        The mesh.
+    leafsize : int
+        The number of triangles per leaf.
+    triangles : array
+        The vertex indices of the triangles, as a ``T x 3`` array, in the order of the leaves.
+        The indices refer to the vertex arrays of the mesh (see :func:`compas.datastructures.mesh_arrays_numpy`).
+    triangle_faces : array
+        The index of the face of every triangle.
+    levels : list
+        The minimum and maximum corners of the boxes of the nodes of every level of the tree,
+        from the leaves to the root.
+        The children of node ``i`` are nodes ``2 * i`` and ``2 * i + 1`` of the level below.
+    topology_version : int
+        The topology version of the mesh at the time of the last build.
+    geometry_version : int
+        The geometry version of the mesh at the time of the last refit.
+
+    Notes
+    -----
+    The hierarchy is updated lazily, at the start of every query.
+    It is rebuilt if the topology of the mesh has changed since the last build,
+    and refitted if only the vertex coordinates have changed.
+    Refitting keeps the order of the triangles, which may become less efficient
+    (but not less correct) after large deformations.
+    Use :meth:`build` to rebuild the hierarchy explicitly.
+
+    Faces with more than three vertices are triangulated as fans.
+    For non-convex or non-planar faces, the results therefore refer to this triangulation.
+
+    Examples
+    --------
+    >>> from compas.datastructures import Mesh
+    >>> mesh = Mesh.from_polyhedron(6)
+    >>> bvh = MeshBVH(mesh)
+    >>> points, faces, distances = bvh.closest_points([[0.0, 0.0, 3.0]])
+    >>> points.round(3).tolist()
+    [[0.0, 0.0, 1.155]]
+
+    """
+
+    chunksize = 2000
+
+    def __init__(self, mesh, leafsize=8):
+        self.mesh = mesh
+        self.leafsize = leafsize
+        self.triangles = None
+        self.triangle_faces = None
+        self.levels = None
+        self.topology_version = None
+        self.geometry_version = None
+        self._vertices = None
+        self._fkeys = None
+        self.build()
+
+    # --------------------------------------------------------------------------
+    # construction
+    # --------------------------------------------------------------------------
+
+    def build(self):
+        """Triangulate the faces of the mesh, sort the triangles and compute the boxes of all nodes."""
+        arrays = mesh_arrays_numpy(self.mesh)
+        triangles, faces = _fan_triangles(arrays.face_indptr, arrays.face_indices)
+        if len(triangles):
+            centroids = arrays.vertices[triangles].mean(axis=1)
+            order = argsort(_morton(centroids), kind='mergesort')
+            triangles = triangles[order]
+            faces = faces[order]
+        self.triangles = triangles
+        self.triangle_faces = faces
+        self._fkeys = arrays.fkeys
+        self.topology_version = arrays.topology_version
+        self.geometry_version = None
+        self.refit()
+
+    def refit(self):
+        """Recompute the boxes of all nodes for the current vertex coordinates of the mesh."""
+        arrays = mesh_arrays_numpy(self.mesh)
+        self._vertices = arrays.vertices
+        xyz = arrays.vertices[self.triangles]
+        lo = xyz.min(axis=1) if len(xyz) else zeros((0, 3))
+        hi = xyz.max(axis=1) if len(xyz) else zeros((0, 3))
+        starts = arange(0, len(lo), self.leafsize)
+        if not len(starts):
+            self.levels = [(full((1, 3), inf), full((1, 3), -inf))]
+        else:
+            levels = [(minimum.reduceat(lo, starts, axis=0), maximum.reduceat(hi, starts, axis=0))]
+            while len(levels[-1][0]) > 1:
+                levels.append(_merge(*levels[-1]))
+            self.levels = levels
+        self.geometry_version = arrays.geometry_version
+
+    def update(self):
+        """Rebuild or refit the hierarchy if the mesh has changed since the last update."""
+        mesh = self.mesh
+        if mesh.topology_version != self.topology_version:
+            self.build()
+        elif mesh.geometry_version != self.geometry_version:
+            self.refit()
+
+    # --------------------------------------------------------------------------
+    # traversal
+    # --------------------------------------------------------------------------
+
+    def _traverse(self, n, prune):
+        """Descend the tree with ``n`` queries, and return the pairs of queries and leaves that are not pruned.
+
+        The function ``prune`` receives the query indices and the minimum and maximum corners of the node boxes of a level,
+        and returns a boolean mask of the pairs that should be kept.
+        """
+        q = arange(n)
+        node = zeros(n, dtype=int64)
+        for level in range(len(self.levels) - 1, -1, -1):
+            lo, hi = self.levels[level]
+            keep = prune(q, lo[node], hi[node])
+            q = q[keep]
+            node = node[keep]
+            if level:
+                count = len(self.levels[level - 1][0])
+                q = q.repeat(2)
+                node = (node[:, None] * 2 + arange(2)).ravel()
+                valid = node < count
+                q = q[valid]
+                node = node[valid]
+        return q, node
+
+    def _leaf_triangles(self, q, node):
+        """Expand pairs of queries and leaves to pairs of queries and triangles."""
+        tri = (node[:, None] * self.leafsize + arange(self.leafsize)).ravel()
+        q = q.repeat(self.leafsize)
+        valid = tri < len(self.triangles)
+        return q[valid], tri[valid]
+
+    def _nearest_leaves(self, points):
+        """Descend the tree towards the nearest child box, for every point."""
+        node = zeros(len(points), dtype=int64)
+        for level in range(len(self.levels) - 2, -1, -1):
+            lo, hi = self.levels[level]
+            left = node * 2
+            right = minimum(left + 1, len(lo) - 1)
+            d_left = _squared_distance_boxes(points, lo[left], hi[left])
+            d_right = _squared_distance_boxes(points, lo[right], hi[right])
+            node = where(d_right < d_left, right, left)
+        return node
+
+    def _corners(self, tri):
+        xyz = self._vertices[self.triangles[tri]]
+        return xyz[:, 0], xyz[:, 1], xyz[:, 2]
+
+    # --------------------------------------------------------------------------
+    # queries
+    # --------------------------------------------------------------------------
+
+    def closest_points(self, points):
+        """Find the closest points on the mesh to a number of points.
+
+        Parameters
+        ----------
+        points : array-like
+            The XYZ coordinates of the query points, as a ``N x 3`` array.
+
+        Returns
+        -------
+        tuple
+            * The XYZ coordinates of the closest points on the mesh, as a ``N x 3`` array.
+            * The identifiers of the faces on which the closest points lie.
+            * The distances between the query points and the closest points.
+
+        Examples
+        --------
+        >>> from compas.datastructures import Mesh
+        >>> mesh = Mesh.from_polyhedron(6)
+        >>> points, faces, distances = mesh.bvh().closest_points([[3.0, 0.0, 0.0], [0.0, 0.0, 0.5]])
+        >>> distances.round(3).tolist()
+        [1.845, 0.655]
+
+        """
+        self.update()
+        points = asarray(points, dtype=float64).reshape((-1, 3))
+        closest = zeros(points.shape)
+        faces = full(len(points), -1, dtype=int64)
+        distances = full(len(points), inf)
+        if not len(self.triangles):
+            return closest, faces, distances
+        for start in range(0, len(points), self.chunksize):
+            chunk = points[start:start + self.chunksize]
+            n = len(chunk)
+            # the distance to the triangles of the greedily found nearest leaf
+            # and the distance to the farthest corner of any box are upper bounds for the distance to the mesh
+            q, tri = self._leaf_triangles(arange(n), self._nearest_leaves(chunk))
+            a, b, c = self._corners(tri)
+            bound = full(n, inf)
+            minimum.at(bound, q, _squared_norm(_closest_points_triangles(chunk[q], a, b, c) - chunk[q]))
+
+            def prune(q, lo, hi):
+                p = chunk[q]
+                minimum.at(bound, q, _squared_norm(maximum(abs(lo - p), abs(hi - p))))
+                return _squared_distance_boxes(p, lo, hi) <= bound[q]
+
+            q, leaf = self._traverse(n, prune)
+            # the leaves are visited in rounds, in the order of their distance to the query points,
+            # such that the bounds shrink before the farther leaves are visited
+            lo, hi = self.levels[0]
+            near = _squared_distance_boxes(chunk[q], lo[leaf], hi[leaf])
+            order = lexsort((near, q))
+            q, leaf, near = q[order], leaf[order], near[order]
+            rank = arange(len(q)) - searchsorted(q, q)
+            best = full(n, inf)
+            r = 0
+            while r <= rank.max(initial=-1):
+                select = (rank >= r) & (rank < 2 * r + 1) & (near <= bound[q])
+                r = 2 * r + 1
+                qq, tri = self._leaf_triangles(q[select], leaf[select])
+                a, b, c = self._corners(tri)
+                x = _closest_points_triangles(chunk[qq], a, b, c)
+                d = _squared_norm(x - chunk[qq])
+                first = _first(qq, d)
+                qq, tri, x, d = qq[first], tri[first], x[first], d[first]
+                closer = d < best[qq]
+                qq, tri, x, d = qq[closer], tri[closer], x[closer], d[closer]
+                best[qq] = d
+                bound[qq] = minimum(bound[qq], d)
+                closest[start + qq] = x
+                faces[start + qq] = self._fkeys[self.triangle_faces[tri]]
+            distances[start:start + n] = best ** 0.5
+        return closest, faces, distances
+
+    def intersect_rays(self, origins, directions, tmax=None):
+        """Find the first intersections of a number of rays with the mesh.
+
+        Parameters
+        ----------
+        origins : array-like
+            The XYZ coordinates of the origins of the rays, as a ``N x 3`` array.
+        directions : array-like
+            The direction vectors of the rays, as a ``N x 3`` array.
+        tmax : float, optional
+            The maximum ray parameter, in units of the direction vectors.
+            Default is no maximum.
+
+        Returns
+        -------
+        tuple
+            * The XYZ coordinates of the intersection points, as a ``N x 3`` array.
+              The rows of rays that do not hit the mesh are ``nan``.
+            * The identifiers of the intersected faces, or ``-1`` for rays that do not hit the mesh.
+            * The ray parameters of the intersection points, or ``inf`` for rays that do not hit the mesh.
+
+        Examples
+        --------
+        >>> from compas.datastructures import Mesh
+        >>> mesh = Mesh.from_polyhedron(6)
+        >>> points, faces, t = mesh.bvh().intersect_rays([[0.0, 0.0, 5.0]], [[0.0, 0.0, -1.0]])
+        >>> t.round(3).tolist()
+        [3.845]
+
+        """
+        self.update()
+        origins = asarray(origins, dtype=float64).reshape((-1, 3))
+        directions = asarray(directions, dtype=float64).reshape((-1, 3))
+        tmax = inf if tmax is None else tmax
+        points = full(origins.shape, float('nan'))
+        faces = full(len(origins), -1, dtype=int64)
+        params = full(len(origins), inf)
+        if not len(self.triangles):
+            return points, faces, params
+        for start in range(0, len(origins), self.chunksize):
+            o = origins[start:start + self.chunksize]
+            d = directions[start:start + self.chunksize]
+            inverse = 1.0 / where(d == 0.0, 1e-300, d)
+
+            def prune(q, lo, hi):
+                t1 = (lo - o[q]) * inverse[q]
+                t2 = (hi - o[q]) * inverse[q]
+                near = minimum(t1, t2).max(axis=1)
+                far = maximum(t1, t2).min(axis=1)
+                return (far >= maximum(near, 0.0)) & (near <= tmax)
+
+            q, tri = self._leaf_triangles(*self._traverse(len(o), prune))
+            a, b, c = self._corners(tri)
+            t = _intersect_rays_triangles(o[q], d[q], a, b, c)
+            hit = t <= tmax
+            q, tri, t = q[hit], tri[hit], t[hit]
+            best = _first(q, t)
+            index = start + q[best]
+            params[index] = t[best]
+            points[index] = origins[index] + directions[index] * t[best][:, None]
+            faces[index] = self._fkeys[self.triangle_faces[tri[best]]]
+        return points, faces, params
+
+    def intersect_segments(self, starts, ends):
+        """Find the intersections of a number of line segments with the mesh closest to their start points.
+
+        Parameters
+        ----------
+        starts : array-like
+            The XYZ coordinates of the start points of the segments, as a ``N x 3`` array.
+        ends : array-like
+            The XYZ coordinates of the end points of the segments, as a ``N x 3`` array.
+
+        Returns
+        -------
+        tuple
+            * The XYZ coordinates of the intersection points, as a ``N x 3`` array.
+              The rows of segments that do not intersect the mesh are ``nan``.
+            * The identifiers of the intersected faces, or ``-1`` for segments that do not intersect the mesh.
+            * The parameters of the intersection points along the segments, between ``0`` and ``1``,
+              or ``inf`` for segments that do not intersect the mesh.
+
+        """
+        starts = asarray(starts, dtype=float64).reshape((-1, 3))
+        ends = asarray(ends, dtype=float64).reshape((-1, 3))
+        return self.intersect_rays(starts, ends - starts, tmax=1.0)
+
+    def intersect_plane(self, plane):
+        """Find the faces of the mesh that intersect a plane.
+
+        Parameters
+        ----------
+        plane : tuple or :class:`compas.geometry.Plane`
+            The base point and normal of the plane.
+
+        Returns
+        -------
+        list
+            The identifiers of the faces with vertices on both sides of the plane, or on the plane.
+
+        Examples
+        --------
+        >>> from compas.datastructures import Mesh
+        >>> mesh = Mesh.from_polyhedron(6)
+        >>> len(mesh.bvh().intersect_plane(([0.0, 0.0, 0.0], [1.0, 0.0, 0.0])))
+        4
+
+        """
+        self.update()
+        point, normal = plane
+        point = asarray(point, dtype=float64)
+        normal = asarray(normal, dtype=float64)
+        if not len(self.triangles):
+            return []
+
+        def prune(q, lo, hi):
+            s = (0.5 * (lo + hi) - point).dot(normal)
+            r = (0.5 * (hi - lo)).dot(abs(normal))
+            return abs(s) <= r
+
+        _, tri = self._leaf_triangles(*self._traverse(1, prune))
+        a, b, c = self._corners(tri)
+        s = array([(x - point).dot(normal) for x in (a, b, c)])
+        cut = (s.min(axis=0) <= 0.0) & (s.max(axis=0) >= 0.0)
+        faces = unique(self.triangle_faces[tri[cut]])
+        return self._fkeys[faces].tolist()
+
+    def overlap_boxes(self, boxes):
+        """Find the faces of the mesh of which the bounding boxes overlap with a number of axis-aligned boxes.
+
+        Parameters
+        ----------
+        boxes : array-like
+            The minimum and maximum corners of the boxes, as a ``N x 2 x 3`` array.
+
+        Returns
+        -------
+        list
+            For every box, the identifiers of the overlapping faces.
+
+        Notes
+        -----
+        The overlap is tested against the bounding boxes of the triangles of the faces.
+        The result is therefore conservative: it contains all faces that intersect a box,
+        and possibly some faces that are close to a box.
+
+        Examples
+        --------
+        >>> from compas.datastructures import Mesh
+        >>> mesh = Mesh.from_polyhedron(6)
+        >>> [len(faces) for faces in mesh.bvh().overlap_boxes([[[0.5, 0.5, 0.5], [2.0, 2.0, 2.0]]])]
+        [3]
+
+        """
+        self.update()
+        boxes = asarray(boxes, dtype=float64).reshape((-1, 2, 3))
+        result = []
+        if not len(self.triangles):
+            return [[] for _ in boxes]
+        for start in range(0, len(boxes), self.chunksize):
+            chunk = boxes[start:start + self.chunksize]
+
+            def prune(q, lo, hi):
+                return ((lo <= chunk[q, 1]) & (hi >= chunk[q, 0])).all(axis=1)
+
+            q, tri = self._leaf_triangles(*self._traverse(len(chunk), prune))
+            xyz = self._vertices[self.triangles[tri]]
+            keep = prune(q, xyz.min(axis=1), xyz.max(axis=1))
+            q = q[keep]
+            f = self.triangle_faces[tri[keep]]
+            pairs = unique(q * len(self._fkeys) + f)
+            q, f = pairs // len(self._fkeys), pairs % len(self._fkeys)
+            indptr = concatenate(([0], cumsum(bincount(q, minlength=len(chunk)))))
+            fkeys = self._fkeys[f].tolist()
+            result += [fkeys[indptr[i]:indptr[i + 1]] for i in range(len(chunk))]
+        return result
+
+
+# ==============================================================================
+# Helpers
+# ==============================================================================
+
+
+def _fan_triangles(indptr, indices):
+    """Triangulate faces as fans around their first vertex."""
+    sizes = diff(indptr)
+    count = maximum(sizes - 2, 0)
+    n = count.sum()
+    faces = arange(len(sizes)).repeat(count)
+    first = indptr[:-1].repeat(count)
+    offset = arange(n) - (cumsum(count) - count).repeat(count)
+    triangles = array([indices[first], indices[first + offset + 1], indices[first + offset + 2]], dtype=int64).T
+    return triangles.reshape((-1, 3)), faces
+
+
+def _morton(points):
+    """Morton codes of points, with 10 bits per axis, in a cube around the points."""
+    lo = points.min(axis=0)
+    extent = (points.max(axis=0) - lo).max() or 1.0
+    cells = ((points - lo) / extent * 1023).astype(int64)
+    code = zeros(len(points), dtype=int64)
+    for axis in range(3):
+        v = cells[:, axis]
+        v = (v | (v << 16)) & 0x030000FF
+        v = (v | (v << 8)) & 0x0300F00F
+        v = (v | (v << 4)) & 0x030C30C3
+        v = (v | (v << 2)) & 0x09249249
+        code |= v << (2 - axis)
+    return code
+
+
+def _merge(lo, hi):
+    """The boxes of the parents of pairs of consecutive nodes."""
+    m = len(lo) // 2
+    plo = minimum(lo[0:2 * m:2], lo[1:2 * m:2])
+    phi = maximum(hi[0:2 * m:2], hi[1:2 * m:2])
+    if len(lo) % 2:
+        plo = concatenate((plo, lo[-1:]))
+        phi = concatenate((phi, hi[-1:]))
+    return plo, phi
+
+
+def _squared_norm(v):
+    return einsum('ij,ij->i', v, v)
+
+
+def _squared_distance_boxes(points, lo, hi):
+    """The squared distances between points and boxes, per pair."""
+    return _squared_norm(maximum(maximum(lo - points, points - hi), 0.0))
+
+
+def _first(q, values):
+    """The positions of the smallest value per query."""
+    if not len(q):
+        return q
+    best = full(q.max() + 1, inf)
+    minimum.at(best, q, values)
+    candidates = (values <= best[q]).nonzero()[0]
+    _, first = unique(q[candidates], return_index=True)
+    return candidates[first]
+
+
+def _closest_points_triangles(p, a, b, c):
+    """The closest points on triangles to points, per pair (see Ericson, Real-Time Collision Detection, 5.1.5)."""
+    ab = b - a
+    ac = c - a
+    bc = c - b
+    d1 = einsum('ij,ij->i', ab, p - a)
+    d2 = einsum('ij,ij->i', ac, p - a)
+    d3 = einsum('ij,ij->i', ab, p - b)
+    d4 = einsum('ij,ij->i', ac, p - b)
+    d5 = einsum('ij,ij->i', ab, p - c)
+    d6 = einsum('ij,ij->i', ac, p - c)
+    va = d3 * d6 - d5 * d4
+    vb = d5 * d2 - d1 * d6
+    vc = d1 * d4 - d3 * d2
+    with errstate(divide='ignore', invalid='ignore'):
+        denom = va + vb + vc
+        denom[denom == 0] = 1.0
+        x = a + ab * (vb / denom)[:, None] + ac * (vc / denom)[:, None]
+        # the regions are tested in reverse order, such that the first matching region wins
+        i = ((va <= 0) & (d4 - d3 >= 0) & (d5 - d6 >= 0)).nonzero()[0]
+        t = (d4[i] - d3[i]) / ((d4[i] - d3[i]) + (d5[i] - d6[i]))
+        x[i] = b[i] + bc[i] * t[:, None]
+        i = ((vb <= 0) & (d2 >= 0) & (d6 <= 0)).nonzero()[0]
+        t = d2[i] / (d2[i] - d6[i])
+        x[i] = a[i] + ac[i] * t[:, None]
+        i = ((d6 >= 0) & (d5 <= d6)).nonzero()[0]
+        x[i] = c[i]
+        i = ((vc <= 0) & (d1 >= 0) & (d3 <= 0)).nonzero()[0]
+        t = d1[i] / (d1[i] - d3[i])
+        x[i] = a[i] + ab[i] * t[:, None]
+        i = ((d3 >= 0) & (d4 <= d3)).nonzero()[0]
+        x[i] = b[i]
+        i = ((d1 <= 0) & (d2 <= 0)).nonzero()[0]
+        x[i] = a[i]
+    return x
+
+
+def _intersect_rays_triangles(o, d, a, b, c):
+    """The ray parameters of the intersections of rays and triangles, per pair, or ``inf`` (Moller-Trumbore)."""
+    e1 = b - a
+    e2 = c - a
+    pvec = cross(d, e2)
+    det = einsum('ij,ij->i', e1, pvec)
+    ok = det != 0
+    det[~ok] = 1.0
+    tvec = o - a
+    u = einsum('ij,ij->i', tvec, pvec) / det
+    qvec = cross(tvec, e1)
+    v = einsum('ij,ij->i', d, qvec) / det
+    t = einsum('ij,ij->i', e2, qvec) / det
+    ok &= (u >= 0) & (v >= 0) & (u + v <= 1) & (t >= 0)
+    return where(ok, t, inf)
+
+
+# ==============================================================================
+# Main
+# ==============================================================================
+
+if __name__ == '__main__':
+
+    import doctest
+    doctest.testmod(globs=globals())
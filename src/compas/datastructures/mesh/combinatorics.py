@@ -2,7 +2,7 @@ from __future__ import print_function
 from __future__ import absolute_import
 from __future__ import division
 
-from compas.topology import breadth_first_traverse
+from compas.topology import breadth_first_ordering
 from compas.topology import connected_components
 
 
@@ -41,12 +41,26 @@ def mesh_is_connected(mesh):
     """
     if not mesh.vertex:
         return False
-    nodes = breadth_first_traverse(mesh.adjacency, mesh.get_any_vertex())
-    return len(nodes) == mesh.number_of_vertices()
+    adjacency = mesh.adjacency_csr()
+    return len(breadth_first_ordering(adjacency, 0)) == len(adjacency)
 
 
 def mesh_connected_components(mesh):
-    return connected_components(mesh.adjacency)
+    """Identify the vertices of the connected components of a mesh.
+
+    Parameters
+    ----------
+    mesh : compas.datastructures.Mesh
+        A mesh data structure.
+
+    Returns
+    -------
+    list of list of hashable
+        A nested list of vertex identifiers.
+    """
+    adjacency = mesh.adjacency_csr()
+    keys = adjacency.keys
+    return [[keys[i] for i in component] for component in connected_components(adjacency)]
 
 
 # ==============================================================================
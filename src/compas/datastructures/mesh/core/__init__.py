@@ -5,11 +5,14 @@ from __future__ import print_function
 from compas import IPY
 
 from .attributes import *  # noqa: F401 F403
+from .registry import EdgeRegistry  # noqa: F401
 from .halfedge import HalfEdge  # noqa: F401
 from .mesh import BaseMesh  # noqa: F401
 from .operations import *  # noqa: F401 F403
 from .clean import *  # noqa: F401 F403
 if not IPY:
+    from .arrays_numpy import *  # noqa: F401 F403
+    from .geometry_numpy import *  # noqa: F401 F403
     from .matrices import *  # noqa: F401 F403
 
 __all__ = [name for name in dir() if not name.startswith('_')]
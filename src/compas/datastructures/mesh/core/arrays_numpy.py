@@ -0,0 +1,268 @@
+"""
+Cached NumPy arrays of the geometry and topology of a mesh.
+
+The arrays are extracted from the mesh once, and then shared by all array-based
+algorithms until the mesh is modified.
+Whether the arrays are still valid is determined by the version counters
+of the mesh (:attr:`compas.datastructures.HalfEdge.topology_version` and
+:attr:`compas.datastructures.HalfEdge.geometry_version`).
+When only the vertex coordinates have changed, the topological arrays are reused.
+
+All cached arrays are read-only.
+Use ``array.copy()`` to obtain an array that can be modified.
+"""
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+from numpy import arange
+from numpy import array
+from numpy import array_equal
+from numpy import cumsum
+from numpy import diff
+from numpy import float64
+from numpy import frombuffer
+from numpy import full
+from numpy import int64
+from numpy import maximum
+from numpy import minimum
+from numpy import searchsorted
+from numpy import unique
+from numpy import zeros
+
+from compas.datastructures.mesh.core.compact import VERTEX
+
+
+__all__ = [
+    'MeshArrays',
+    'mesh_arrays_numpy'
+]
+
+
+def mesh_arrays_numpy(mesh):
+    """Get NumPy arrays of the vertex coordinates and the connectivity of a mesh.
+
+    Parameters
+    ----------
+    mesh : compas.datastructures.Mesh
+        A mesh object.
+
+    Returns
+    -------
+    :class:`MeshArrays`
+        The arrays of the mesh.
+        The same object is returned for as long as the mesh is not modified.
+
+    Notes
+    -----
+    Modifications made through the methods of the mesh are detected automatically.
+    After modifying the dicts of a mesh with ``'dict'`` storage directly,
+    call :meth:`compas.datastructures.HalfEdge.invalidate`.
+
+    Examples
+    --------
+    >>> from compas.datastructures import Mesh
+    >>> mesh = Mesh.from_polyhedron(6)
+    >>> arrays = mesh_arrays_numpy(mesh)
+    >>> arrays.vertices.shape
+    (8, 3)
+    >>> arrays.faces.shape
+    (6, 4)
+    >>> mesh_arrays_numpy(mesh) is arrays
+    True
+
+    """
+    topology = mesh.topology_version
+    geometry = mesh.geometry_version
+    arrays = mesh._cache.get('arrays')
+    if arrays is not None:
+        if arrays.topology_version == topology:
+            if arrays.geometry_version == geometry:
+                return arrays
+            arrays = MeshArrays(mesh, topology=arrays)
+        else:
+            arrays = MeshArrays(mesh)
+    else:
+        arrays = MeshArrays(mesh)
+    mesh._cache['arrays'] = arrays
+    return arrays
+
+
+class MeshArrays(object):
+    """Read-only snapshot of the geometry and topology of a mesh as NumPy arrays.
+
+    Vertices and faces are indexed in the order of :meth:`compas.datastructures.HalfEdge.vertices`
+    and :meth:`compas.datastructures.HalfEdge.faces`, and halfedges in the order of the halfedge dict.
+    Every edge has the index and the orientation of the first of its halfedges in that order.
+    This is the order of :meth:`compas.datastructures.HalfEdge.edges` without an edge registry,
+    but not necessarily with one (see :meth:`compas.datastructures.HalfEdge.register_edges`).
+
+    Parameters
+    ----------
+    mesh : compas.datastructures.Mesh
+        A mesh object.
+    topology : :class:`MeshArrays`, optional
+        Arrays of the same mesh with the same topology, of which the topological arrays are reused.
+
+    Attributes
+    ----------
+    vertices : array
+        The vertex coordinates, as a ``V x 3`` array of floats.
+    keys : array
+        The vertex identifiers.
+    key_index : dict
+        A mapping of vertex identifiers to vertex indices.
+    fkeys : array
+        The face identifiers.
+    fkey_index : dict
+        A mapping of face identifiers to face indices.
+    faces : array
+        The vertex indices of the faces, as a ``F x m`` array, with ``m`` the maximum face degree.
+        The rows of faces with fewer vertices are padded with ``-1``.
+    face_indptr : array
+        Offsets of the faces in ``face_indices`` (CSR layout).
+        The vertices of face ``i`` are ``face_indices[face_indptr[i]:face_indptr[i + 1]]``.
+    face_indices : array
+        The vertex indices of all faces, one after the other.
+    edges : array
+        The vertex indices of the edges, as a ``E x 2`` array.
+    halfedges : array
+        The vertex indices of the halfedges, as a ``H x 2`` array.
+    halfedge_faces : array
+        The face index of every halfedge, or ``-1`` for halfedges on the boundary.
+    halfedge_twins : array
+        The index of the opposite halfedge of every halfedge.
+    topology_version : int
+        The topology version of the mesh at the time of extraction.
+    geometry_version : int
+        The geometry version of the mesh at the time of extraction.
+
+    """
+
+    def __init__(self, mesh, topology=None):
+        self.topology_version = mesh.topology_version
+        self.geometry_version = mesh.geometry_version
+        if topology is not None:
+            for name in ('keys', 'key_index', 'fkeys', 'fkey_index', 'faces', 'face_indptr',
+                         'face_indices', 'edges', 'halfedges', 'halfedge_faces', 'halfedge_twins'):
+                setattr(self, name, getattr(topology, name))
+        else:
+            self._extract_topology(mesh)
+        self.vertices = _readonly(_vertex_coordinates(mesh, self.keys))
+
+    def _extract_topology(self, mesh):
+        keys = list(mesh.vertex)
+        fkeys = list(mesh.face)
+        self.keys = _readonly(array(keys, dtype=int64))
+        self.fkeys = _readonly(array(fkeys, dtype=int64))
+        self.key_index = {key: index for index, key in enumerate(keys)}
+        self.fkey_index = {fkey: index for index, fkey in enumerate(fkeys)}
+        # faces
+        flat = []
+        sizes = []
+        for fkey in fkeys:
+            vertices = mesh.face[fkey]
+            sizes.append(len(vertices))
+            flat.extend(vertices)
+        indptr = zeros(len(sizes) + 1, dtype=int64)
+        cumsum(sizes, out=indptr[1:])
+        indices = _indices(self.keys, array(flat, dtype=int64))
+        self.face_indptr = _readonly(indptr)
+        self.face_indices = _readonly(indices)
+        self.faces = _readonly(_padded(indptr, indices))
+        # halfedges
+        u = []
+        v = []
+        f = []
+        for key in mesh.halfedge:
+            for nbr, fkey in mesh.halfedge[key].items():
+                u.append(key)
+                v.append(nbr)
+                f.append(-1 if fkey is None else self.fkey_index[fkey])
+        n = len(keys)
+        hu = _indices(self.keys, array(u, dtype=int64))
+        hv = _indices(self.keys, array(v, dtype=int64))
+        self.halfedges = _readonly(array([hu, hv], dtype=int64).T.reshape((-1, 2)))
+        self.halfedge_faces = _readonly(array(f, dtype=int64))
+        # twins
+        code = hu * n + hv
+        twincode = hv * n + hu
+        twins = full(len(code), -1, dtype=int64)
+        if len(code):
+            sorter = code.argsort()
+            position = searchsorted(code, twincode, sorter=sorter).clip(0, len(code) - 1)
+            found = code[sorter[position]] == twincode
+            twins[found] = sorter[position[found]]
+        self.halfedge_twins = _readonly(twins)
+        # edges, in the order and the orientation of their first halfedge
+        _, first = unique(minimum(hu, hv) * n + maximum(hu, hv), return_index=True)
+        first.sort()
+        self.edges = _readonly(self.halfedges[first])
+
+    @property
+    def index_key(self):
+        """dict : A mapping of vertex indices to vertex identifiers."""
+        return dict(enumerate(self.keys.tolist()))
+
+    @property
+    def face_sizes(self):
+        """array : The number of vertices of every face."""
+        return diff(self.face_indptr)
+
+    @property
+    def triangles(self):
+        """array : The coordinates of the vertices of the faces of a triangle mesh, as a ``F x 3 x 3`` array."""
+        return self.vertices[self.faces[:, :3]]
+
+
+# ==============================================================================
+# Helpers
+# ==============================================================================
+
+
+def _readonly(a):
+    a.flags.writeable = False
+    return a
+
+
+def _indices(keys, values):
+    """Convert vertex identifiers to vertex indices."""
+    if not len(values):
+        return values
+    if array_equal(keys, arange(len(keys))):
+        return values.copy()
+    sorter = keys.argsort()
+    return sorter[searchsorted(keys, values, sorter=sorter)]
+
+
+def _padded(indptr, indices):
+    sizes = diff(indptr)
+    m = sizes.max() if len(sizes) else 0
+    faces = full((len(sizes), m), -1, dtype=int64)
+    if len(sizes):
+        rows = arange(len(sizes)).repeat(sizes)
+        cols = arange(len(indices)) - indptr[:-1].repeat(sizes)
+        faces[rows, cols] = indices
+    return faces
+
+
+def _vertex_coordinates(mesh, keys):
+    """Extract the vertex coordinates, directly from the coordinate buffer if possible."""
+    n = len(keys)
+    if mesh.storage == 'compact':
+        table = mesh.vertex.table
+        if table.ordered and len(table.flags) == n and table.counts[VERTEX] == n and table.xyzset.count(7) == n:
+            return frombuffer(table.xyz, dtype=float64).reshape((-1, 3)).copy()
+    x, y, z = [mesh.default_vertex_attributes.get(name) for name in 'xyz']
+    xyz = [[attr.get('x', x), attr.get('y', y), attr.get('z', z)] for attr in (mesh.vertex[key] for key in keys.tolist())]
+    return array(xyz, dtype=float64).reshape((-1, 3))
+
+
+# ==============================================================================
+# Main
+# ==============================================================================
+
+if __name__ == '__main__':
+
+    import doctest
+    doctest.testmod(globs=globals())
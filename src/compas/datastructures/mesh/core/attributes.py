@@ -10,11 +10,12 @@ __all__ = ['VertexAttributeView', 'FaceAttributeView', 'EdgeAttributeView']
 class AttributeView(object):
     """Mixin for attribute dict views."""
 
-    def __init__(self, defaults, attr, custom_only=False):
+    def __init__(self, defaults, attr, custom_only=False, callback=None):
         super(AttributeView, self).__init__()
         self.defaults = defaults
         self.attr = attr
         self.custom_only = custom_only
+        self.callback = callback
 
     def __str__(self):
         s = []
@@ -33,9 +34,13 @@ class AttributeView(object):
 
     def __setitem__(self, name, value):
         self.attr[name] = value
+        if self.callback:
+            self.callback(name)
 
     def __delitem__(self, name):
         del self.attr[name]
+        if self.callback:
+            self.callback(name)
 
     def __iter__(self):
         if self.custom_only:
@@ -48,10 +53,12 @@ class AttributeView(object):
 
 class VertexAttributeView(AttributeView, MutableMapping):
     """Mutable Mapping that provides a read/write view of the custom attributes of a vertex
-    combined with the default attributes of all vertices."""
+    combined with the default attributes of all vertices.
 
-    def __init__(self, defaults, attr, custom_only=False):
-        super(VertexAttributeView, self).__init__(defaults, attr, custom_only)
+    The optional callback is called with the name of every attribute that is set or deleted through the view."""
+
+    def __init__(self, defaults, attr, custom_only=False, callback=None):
+        super(VertexAttributeView, self).__init__(defaults, attr, custom_only, callback)
 
 
 class EdgeAttributeView(AttributeView, MutableMapping):
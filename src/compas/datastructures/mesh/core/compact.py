@@ -0,0 +1,1045 @@
+"""
+Compact, array-backed storage for the half-edge data structure.
+
+The storage classes in this module replace the nested dictionaries of
+:class:`compas.datastructures.HalfEdge` (``vertex``, ``halfedge`` and ``face``)
+with mutable mappings that keep their payload in flat typed buffers.
+
+* Vertex coordinates are stored in one contiguous ``float64`` buffer (three values per vertex).
+  All other vertex attributes are stored sparsely, and only for the vertices that have them.
+* Face connectivity is stored CSR-style, as a start offset and vertex count per face
+  into one flat integer buffer of vertex identifiers.
+* Halfedges are stored in integer buffers of target vertices, faces, links to the
+  next outgoing halfedge of the same vertex, and links to the twin halfedge.
+
+The mappings behave like the dictionaries they replace,
+such that all algorithms operating on a mesh work unchanged.
+Coordinates are always stored as floating point numbers.
+
+Vertex and face identifiers are stored in the integer buffers as well,
+and should therefore be integers between 0 and 2**31 - 1.
+Other identifiers are rejected with a ``ValueError``.
+As long as identifiers are added in increasing order, without large gaps,
+they are used directly as indices into the buffers.
+Otherwise, they are mapped to indices with a dict.
+
+Copies of the stores are copy-on-write.
+A copy shares the buffers of the original until either of them is modified,
+and then only the modified block of buffers (topology, geometry or attributes) is duplicated.
+Vertex attributes with mutable values are duplicated when such a value is read,
+because it may be modified in place.
+"""
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+from array import array
+from copy import deepcopy
+from operator import index
+
+from compas.datastructures.mesh.core._mutablemapping import MutableMapping
+
+
+__all__ = [
+    'CompactVertexStore',
+    'CompactHalfedgeStore',
+    'CompactFaceStore',
+    'compact_storage'
+]
+
+
+VERTEX = 1
+ROW = 2
+INTMAX = 2 ** 31 - 1
+# identifiers are used as indices as long as they are smaller than twice the number of items plus this margin
+GAP = 1024
+AXES = {'x': 0, 'y': 1, 'z': 2}
+ATOMIC = (bool, int, float, str, type(None))
+BLOCKS = {
+    'topology': ('slot', 'flags', 'free', 'first', 'last', 'target', 'face', 'next', 'twin', 'hfree'),
+    'geometry': ('xyz', 'xyzset'),
+    'attributes': ('attr',)
+}
+
+
+def compact_storage():
+    """Construct the vertex, halfedge and face stores of a compact half-edge data structure.
+
+    Returns
+    -------
+    tuple
+        The vertex store, the halfedge store and the face store.
+
+    Examples
+    --------
+    >>> vertex, halfedge, face = compact_storage()
+    >>> vertex[0] = {'x': 1.0, 'y': 0.0, 'z': 0.0}
+    >>> vertex[0]['x']
+    1.0
+    """
+    table = VertexTable()
+    return CompactVertexStore(table), CompactHalfedgeStore(table), CompactFaceStore()
+
+
+def _check_key(key):
+    """Verify that an identifier can be stored in an integer buffer."""
+    try:
+        value = index(key)
+    except TypeError:
+        value = -1
+    if not 0 <= value <= INTMAX:
+        raise ValueError('Compact storage requires integer identifiers between 0 and {}: {!r}'.format(INTMAX, key))
+
+
+def _check_keys(keys):
+    """Verify that a list of identifiers can be stored in an integer buffer."""
+    try:
+        values = array('i', keys)
+    except (TypeError, OverflowError):
+        values = None
+    if values is None or (values and min(values) < 0):
+        for key in keys:
+            _check_key(key)
+
+
+def _is_direct(keys):
+    """Verify that a list of valid identifiers can be used directly as indices."""
+    return all(a < b for a, b in zip(keys, keys[1:])) and (not keys or keys[-1] < 2 * len(keys) + GAP)
+
+
+# ==============================================================================
+# Vertices and halfedges
+# ==============================================================================
+
+
+class VertexTable(object):
+    """Buffers shared by the vertex store and the halfedge store.
+
+    Every vertex identifier is mapped to a slot.
+    The slot indexes the coordinate buffer, the sparse attribute dict and the
+    heads of the linked lists of outgoing halfedges.
+    As long as the identifiers are added in increasing order, without large gaps,
+    the slot of a vertex is its identifier (``slot`` is ``None``),
+    and the slots of removed vertices are left unused.
+    Otherwise, the slots are looked up in the dict ``slot``,
+    and a slot is reused once the vertex and its halfedge row are both removed.
+    The counters ``topology`` and ``geometry`` are incremented on every change
+    of the connectivity and of the vertex coordinates, respectively.
+    As long as no slot is reused (``ordered``), slots follow the order of insertion.
+    The buffers are grouped in blocks (see ``BLOCKS``).
+    The blocks listed in ``shared`` may be shared with copies of the table,
+    and are duplicated with :meth:`own` before they are modified.
+    """
+
+    def __init__(self):
+        self.slot = None
+        self.flags = bytearray()
+        self.free = []
+        self.xyz = array('d')
+        self.xyzset = bytearray()
+        self.attr = {}
+        self.first = array('i')
+        self.last = array('i')
+        self.target = array('i')
+        self.face = array('i')
+        self.next = array('i')
+        self.twin = array('i')
+        self.hfree = []
+        self.counts = {VERTEX: 0, ROW: 0}
+        self.topology = 0
+        self.geometry = 0
+        self.ordered = True
+        self.shared = set()
+
+    def copy(self):
+        """Make a copy of the table that shares all buffers with this table, until either of them is modified."""
+        table = VertexTable.__new__(VertexTable)
+        table.__dict__.update(self.__dict__)
+        table.counts = dict(self.counts)
+        table.shared = set(BLOCKS)
+        self.shared = set(BLOCKS)
+        return table
+
+    def own(self, block):
+        """Duplicate the buffers of a block if they are shared with a copy."""
+        if block not in self.shared:
+            return
+        self.shared.discard(block)
+        if block == 'attributes':
+            self.attr = deepcopy(self.attr)
+        elif block == 'topology':
+            if self.slot is not None:
+                self.slot = dict(self.slot)
+            for name in BLOCKS[block][1:]:
+                setattr(self, name, getattr(self, name)[:])
+        else:
+            for name in BLOCKS[block]:
+                setattr(self, name, getattr(self, name)[:])
+
+    def slot_of(self, key):
+        """The slot of a vertex or halfedge row, or ``None`` if the identifier has neither."""
+        if self.slot is not None:
+            return self.slot.get(key)
+        try:
+            if 0 <= key < len(self.flags) and self.flags[key]:
+                return key
+        except TypeError:
+            pass
+        return None
+
+    def keys(self, flag):
+        """The identifiers of the vertices (``VERTEX``) or halfedge rows (``ROW``), in the order of insertion."""
+        flags = self.flags
+        if self.slot is not None:
+            return [key for key, slot in self.slot.items() if flags[slot] & flag]
+        if self.counts[flag] == len(flags):
+            return list(range(len(flags)))
+        return [slot for slot in range(len(flags)) if flags[slot] & flag]
+
+    def map_slots(self):
+        """Switch from identifiers as slots to a dict of slots, such that unused slots can be reused."""
+        flags = self.flags
+        self.slot = {slot: slot for slot in range(len(flags)) if flags[slot]}
+        self.free = [slot for slot in range(len(flags) - 1, -1, -1) if not flags[slot]]
+
+    def acquire(self, key, flag):
+        if self.shared:
+            self.own('topology')
+        slot = self.slot_of(key)
+        if slot is None:
+            _check_key(key)
+            if self.shared:
+                self.own('geometry')
+            if self.slot is None and not len(self.flags) <= key < 2 * max(self.counts.values()) + GAP:
+                self.map_slots()
+            if self.slot is None:
+                slot = key
+                n = key + 1 - len(self.flags)
+                self.flags.extend(bytearray(n))
+                self.xyz.extend(array('d', [0.0]) * (3 * n))
+                self.xyzset.extend(bytearray(n))
+                self.first.extend(array('i', [-1]) * n)
+                self.last.extend(array('i', [-1]) * n)
+            else:
+                if self.free:
+                    slot = self.free.pop()
+                    self.ordered = False
+                    self.xyz[3 * slot:3 * slot + 3] = array('d', [0.0, 0.0, 0.0])
+                    self.xyzset[slot] = 0
+                    self.first[slot] = -1
+                    self.last[slot] = -1
+                else:
+                    slot = len(self.flags)
+                    self.flags.append(0)
+                    self.xyz.extend((0.0, 0.0, 0.0))
+                    self.xyzset.append(0)
+                    self.first.append(-1)
+                    self.last.append(-1)
+                self.slot[key] = slot
+        if not self.flags[slot] & flag:
+            self.flags[slot] |= flag
+            self.counts[flag] += 1
+            self.topology += 1
+        return slot
+
+    def release(self, key, flag):
+        if self.shared:
+            self.own('topology')
+        slot = self.slot_of(key)
+        self.flags[slot] &= ~flag & 0xFF
+        self.counts[flag] -= 1
+        self.topology += 1
+        if not self.flags[slot] and self.slot is not None:
+            del self.slot[key]
+            self.free.append(slot)
+
+    def lookup(self, key, flag):
+        if self.slot is None:
+            # inlined version of slot_of, because every access to a vertex or halfedge row goes through here
+            try:
+                if 0 <= key < len(self.flags) and self.flags[key] & flag:
+                    return key
+            except TypeError:
+                pass
+            raise KeyError(key)
+        slot = self.slot.get(key)
+        if slot is None or not self.flags[slot] & flag:
+            raise KeyError(key)
+        return slot
+
+    def find(self, slot, v):
+        h = self.first[slot]
+        while h != -1:
+            if self.target[h] == v:
+                return h
+            h = self.next[h]
+        return -1
+
+    def add_halfedge(self, u, slot, v):
+        if self.shared:
+            self.own('topology')
+        if self.hfree:
+            h = self.hfree.pop()
+            self.target[h] = v
+            self.face[h] = -1
+            self.next[h] = -1
+            self.twin[h] = -1
+        else:
+            h = len(self.target)
+            self.target.append(v)
+            self.face.append(-1)
+            self.next.append(-1)
+            self.twin.append(-1)
+        if self.last[slot] == -1:
+            self.first[slot] = h
+        else:
+            self.next[self.last[slot]] = h
+        self.last[slot] = h
+        self.topology += 1
+        vslot = self.slot_of(v)
+        if vslot is not None and self.flags[vslot] & ROW:
+            t = self.find(vslot, u)
+            if t != -1:
+                self.twin[h] = t
+                self.twin[t] = h
+        return h
+
+    def remove_halfedge(self, slot, v):
+        if self.shared:
+            self.own('topology')
+        prev = -1
+        h = self.first[slot]
+        while h != -1:
+            if self.target[h] == v:
+                break
+            prev = h
+            h = self.next[h]
+        else:
+            raise KeyError(v)
+        if prev == -1:
+            self.first[slot] = self.next[h]
+        else:
+            self.next[prev] = self.next[h]
+        if self.last[slot] == h:
+            self.last[slot] = prev
+        t = self.twin[h]
+        if t != -1:
+            self.twin[t] = -1
+        self.hfree.append(h)
+        self.topology += 1
+
+    def clear_row(self, slot):
+        if self.shared:
+            self.own('topology')
+        h = self.first[slot]
+        while h != -1:
+            t = self.twin[h]
+            if t != -1:
+                self.twin[t] = -1
+            self.hfree.append(h)
+            h = self.next[h]
+        self.first[slot] = -1
+        self.last[slot] = -1
+        self.topology += 1
+
+    def clear_vertex(self, slot):
+        if self.shared:
+            self.own('geometry')
+            self.own('attributes')
+        self.xyzset[slot] = 0
+        self.geometry += 1
+        self.attr.pop(slot, None)
+
+
+class VertexRecord(MutableMapping):
+    """Read/write view of the attributes of one vertex in compact storage."""
+
+    __slots__ = ('_table', '_slot')
+
+    def __init__(self, table, slot):
+        self._table = table
+        self._slot = slot
+
+    def __repr__(self):
+        return repr(dict(self.items()))
+
+    def __getitem__(self, name):
+        i = AXES.get(name)
+        if i is not None and self._table.xyzset[self._slot] & (1 << i):
+            return self._table.xyz[3 * self._slot + i]
+        attr = self._table.attr.get(self._slot)
+        if attr is None or name not in attr:
+            raise KeyError(name)
+        value = attr[name]
+        if 'attributes' in self._table.shared and not isinstance(value, ATOMIC):
+            # a mutable value can be modified in place, and is therefore no longer shared once it is read
+            self._table.own('attributes')
+            value = self._table.attr[self._slot][name]
+        return value
+
+    def __setitem__(self, name, value):
+        i = AXES.get(name)
+        if self._table.shared:
+            self._table.own('attributes' if i is None else 'geometry')
+        if i is not None:
+            self._table.xyz[3 * self._slot + i] = value
+            self._table.xyzset[self._slot] |= 1 << i
+            self._table.geometry += 1
+            return
+        attr = self._table.attr.get(self._slot)
+        if attr is None:
+            attr = self._table.attr[self._slot] = {}
+        attr[name] = value
+
+    def __delitem__(self, name):
+        i = AXES.get(name)
+        if self._table.shared:
+            self._table.own('geometry')
+            self._table.own('attributes')
+        if i is not None and self._table.xyzset[self._slot] & (1 << i):
+            self._table.xyzset[self._slot] &= ~(1 << i) & 0xFF
+            self._table.geometry += 1
+            return
+        attr = self._table.attr.get(self._slot)
+        if attr is None or name not in attr:
+            raise KeyError(name)
+        del attr[name]
+        if not attr:
+            del self._table.attr[self._slot]
+
+    def __contains__(self, name):
+        i = AXES.get(name)
+        if i is not None and self._table.xyzset[self._slot] & (1 << i):
+            return True
+        attr = self._table.attr.get(self._slot)
+        return attr is not None and name in attr
+
+    def __iter__(self):
+        flags = self._table.xyzset[self._slot]
+        names = [name for name in 'xyz' if flags & (1 << AXES[name])]
+        attr = self._table.attr.get(self._slot)
+        if attr:
+            names += list(attr)
+        return iter(names)
+
+    def __len__(self):
+        flags = self._table.xyzset[self._slot]
+        attr = self._table.attr.get(self._slot)
+        return (flags & 1) + (flags >> 1 & 1) + (flags >> 2 & 1) + (len(attr) if attr else 0)
+
+    def copy(self):
+        return dict(self.items())
+
+
+class CompactVertexStore(MutableMapping):
+    """Mapping of vertex identifiers to vertex attributes, with coordinates stored in a contiguous buffer.
+
+    Vertex identifiers are stored in the integer buffers of the halfedges and faces,
+    and should therefore be integers between 0 and 2**31 - 1.
+    Adding a vertex with any other identifier raises a ``ValueError``.
+
+    Parameters
+    ----------
+    table : :class:`VertexTable`
+        The buffers shared with the corresponding halfedge store.
+    """
+
+    __slots__ = ('table',)
+
+    def __init__(self, table):
+        self.table = table
+
+    def __repr__(self):
+        return repr(dict((key, dict(attr)) for key, attr in self.items()))
+
+    def __getitem__(self, key):
+        return VertexRecord(self.table, self.table.lookup(key, VERTEX))
+
+    def __setitem__(self, key, attr):
+        slot = self.table.acquire(key, VERTEX)
+        self.table.clear_vertex(slot)
+        record = VertexRecord(self.table, slot)
+        for name in attr:
+            record[name] = attr[name]
+
+    def __delitem__(self, key):
+        self.table.clear_vertex(self.table.lookup(key, VERTEX))
+        self.table.release(key, VERTEX)
+
+    def __contains__(self, key):
+        slot = self.table.slot_of(key)
+        return slot is not None and bool(self.table.flags[slot] & VERTEX)
+
+    def __iter__(self):
+        return iter(self.table.keys(VERTEX))
+
+    def __len__(self):
+        return self.table.counts[VERTEX]
+
+    def to_dict(self):
+        """Convert the store to a plain dict of attribute dicts."""
+        return {key: dict(self[key].items()) for key in self}
+
+    def load(self, vertices):
+        """Fill an empty store with vertices, and the shared halfedge store with their empty rows.
+
+        Parameters
+        ----------
+        vertices : list
+            Pairs of unique vertex identifiers and attribute dicts.
+
+        Raises
+        ------
+        ValueError
+            If the store is not empty.
+        ValueError
+            If an identifier is not an integer between 0 and 2**31 - 1.
+        """
+        table = self.table
+        if table.counts[VERTEX] or table.counts[ROW]:
+            raise ValueError('The store is not empty.')
+        vertices = list(vertices)
+        keys = [key for key, _ in vertices]
+        _check_keys(keys)
+        for block in BLOCKS:
+            table.own(block)
+        if _is_direct(keys):
+            slots = keys
+            n = keys[-1] + 1 if keys else 0
+        else:
+            slots = range(len(keys))
+            n = len(keys)
+        flags = bytearray(n)
+        xyz = [0.0] * (3 * n)
+        xyzset = bytearray(n)
+        other = {}
+        for slot, (key, attr) in zip(slots, vertices):
+            flags[slot] = VERTEX | ROW
+            mask = 0
+            for name in attr:
+                i = AXES.get(name)
+                if i is None:
+                    other.setdefault(slot, {})[name] = attr[name]
+                else:
+                    xyz[3 * slot + i] = attr[name]
+                    mask |= 1 << i
+            xyzset[slot] = mask
+        table.slot = None if slots is keys else dict(zip(keys, slots))
+        table.flags = flags
+        table.free = []
+        table.xyz = array('d', xyz)
+        table.xyzset = xyzset
+        table.attr = other
+        table.first = array('i', [-1]) * n
+        table.last = array('i', [-1]) * n
+        table.counts = {VERTEX: len(keys), ROW: len(keys)}
+        table.ordered = True
+        table.topology += 1
+        table.geometry += 1
+
+
+class HalfedgeRow(MutableMapping):
+    """Mapping of the neighbors of one vertex to the faces of the corresponding halfedges."""
+
+    __slots__ = ('_table', '_slot', '_key')
+
+    def __init__(self, table, slot, key):
+        self._table = table
+        self._slot = slot
+        self._key = key
+
+    def __repr__(self):
+        return repr(dict(self.items()))
+
+    def __getitem__(self, v):
+        h = self._table.find(self._slot, v)
+        if h == -1:
+            raise KeyError(v)
+        fkey = self._table.face[h]
+        return None if fkey == -1 else fkey
+
+    def __setitem__(self, v, fkey):
+        if self._table.shared:
+            self._table.own('topology')
+        h = self._table.find(self._slot, v)
+        if h == -1:
+            h = self._table.add_halfedge(self._key, self._slot, v)
+        self._table.face[h] = -1 if fkey is None else fkey
+        self._table.topology += 1
+
+    def __delitem__(self, v):
+        self._table.remove_halfedge(self._slot, v)
+
+    def __contains__(self, v):
+        return self._table.find(self._slot, v) != -1
+
+    def __iter__(self):
+        return iter(self.keys())
+
+    def __len__(self):
+        n = 0
+        h = self._table.first[self._slot]
+        while h != -1:
+            n += 1
+            h = self._table.next[h]
+        return n
+
+    def keys(self):
+        table = self._table
+        keys = []
+        h = table.first[self._slot]
+        while h != -1:
+            keys.append(table.target[h])
+            h = table.next[h]
+        return keys
+
+    def values(self):
+        return [fkey for _, fkey in self.items()]
+
+    def items(self):
+        table = self._table
+        items = []
+        h = table.first[self._slot]
+        while h != -1:
+            fkey = table.face[h]
+            items.append((table.target[h], None if fkey == -1 else fkey))
+            h = table.next[h]
+        return items
+
+    def copy(self):
+        return dict(self.items())
+
+
+class CompactHalfedgeStore(MutableMapping):
+    """Mapping of vertex identifiers to their halfedge rows, with halfedges stored in integer buffers.
+
+    As in :class:`CompactVertexStore`, vertex identifiers should be integers between 0 and 2**31 - 1.
+
+    Parameters
+    ----------
+    table : :class:`VertexTable`
+        The buffers shared with the corresponding vertex store.
+    """
+
+    __slots__ = ('table',)
+
+    def __init__(self, table):
+        self.table = table
+
+    def __repr__(self):
+        return repr(dict((key, dict(row.items())) for key, row in self.items()))
+
+    def __getitem__(self, key):
+        return HalfedgeRow(self.table, self.table.lookup(key, ROW), key)
+
+    def __setitem__(self, key, nbrs):
+        slot = self.table.slot_of(key)
+        if slot is not None and self.table.flags[slot] & ROW:
+            self.table.clear_row(slot)
+        slot = self.table.acquire(key, ROW)
+        row = HalfedgeRow(self.table, slot, key)
+        for nbr in nbrs:
+            row[nbr] = nbrs[nbr]
+
+    def __delitem__(self, key):
+        self.table.clear_row(self.table.lookup(key, ROW))
+        self.table.release(key, ROW)
+
+    def __contains__(self, key):
+        slot = self.table.slot_of(key)
+        return slot is not None and bool(self.table.flags[slot] & ROW)
+
+    def __iter__(self):
+        return iter(self.table.keys(ROW))
+
+    def __len__(self):
+        return self.table.counts[ROW]
+
+    def to_dict(self):
+        """Convert the store to a plain dict of dicts."""
+        return {key: dict(self[key].items()) for key in self}
+
+    def load(self, rows):
+        """Fill the empty rows of the store with halfedges.
+
+        Parameters
+        ----------
+        rows : dict
+            A dict of dicts of halfedges, as in :attr:`compas.datastructures.HalfEdge.halfedge`.
+            Every vertex in the dict should already have an empty row in the store.
+
+        Raises
+        ------
+        ValueError
+            If the store already contains halfedges.
+        """
+        table = self.table
+        if len(table.target) > len(table.hfree):
+            raise ValueError('The store already contains halfedges.')
+        table.own('topology')
+        sources = []
+        target = []
+        face = []
+        links = []
+        index = {}
+        first = table.first
+        last = table.last
+        for u, nbrs in rows.items():
+            n = len(nbrs)
+            if not n:
+                continue
+            slot = table.lookup(u, ROW)
+            h = len(target)
+            first[slot] = h
+            last[slot] = h + n - 1
+            index[u] = dict(zip(nbrs, range(h, h + n)))
+            sources += [u] * n
+            target += nbrs
+            face += nbrs.values()
+            links += range(h + 1, h + n)
+            links.append(-1)
+        table.target = array('i', target)
+        table.face = array('i', [-1 if fkey is None else fkey for fkey in face])
+        table.next = array('i', links)
+        try:
+            # the rows of a mesh built from faces contain the twins of all halfedges
+            table.twin = array('i', [index[v][u] for u, v in zip(sources, target)])
+        except KeyError:
+            empty = {}
+            table.twin = array('i', [index.get(v, empty).get(u, -1) for u, v in zip(sources, target)])
+        table.hfree = []
+        table.topology += 1
+
+
+# ==============================================================================
+# Faces
+# ==============================================================================
+
+
+class AttributeRecord(MutableMapping):
+    """Read/write view of the attribute dict of one item in a sparse dict of attribute dicts.
+
+    The attribute dict of the item is only created when the first attribute is set.
+    """
+
+    __slots__ = ('_data', '_key')
+
+    def __init__(self, data, key):
+        self._data = data
+        self._key = key
+
+    def __repr__(self):
+        return repr(self._data.get(self._key, {}))
+
+    def __getitem__(self, name):
+        return self._data.get(self._key, {})[name]
+
+    def __setitem__(self, name, value):
+        self._data.setdefault(self._key, {})[name] = value
+
+    def __delitem__(self, name):
+        del self._data.get(self._key, {})[name]
+
+    def __iter__(self):
+        return iter(list(self._data.get(self._key, {})))
+
+    def __len__(self):
+        return len(self._data.get(self._key, {}))
+
+
+class FaceRecord(object):
+    """Read/write, list-like view of the vertices of one face in compact storage."""
+
+    __slots__ = ('_store', '_key')
+
+    def __init__(self, store, key):
+        self._store = store
+        self._key = key
+
+    def _list(self):
+        return self._store.vertices_of(self._key)
+
+    def __repr__(self):
+        return repr(self._list())
+
+    def __len__(self):
+        return self._store._count[self._store._lookup(self._key)]
+
+    def __iter__(self):
+        return iter(self._list())
+
+    def __reversed__(self):
+        return reversed(self._list())
+
+    def __contains__(self, value):
+        return value in self._list()
+
+    def __getitem__(self, index):
+        return self._list()[index]
+
+    def __setitem__(self, index, value):
+        vertices = self._list()
+        vertices[index] = value
+        self._store[self._key] = vertices
+
+    def __delitem__(self, index):
+        vertices = self._list()
+        del vertices[index]
+        self._store[self._key] = vertices
+
+    def __add__(self, other):
+        return self._list() + list(other)
+
+    def __radd__(self, other):
+        return list(other) + self._list()
+
+    def __eq__(self, other):
+        if isinstance(other, FaceRecord):
+            other = other._list()
+        return self._list() == other
+
+    def __ne__(self, other):
+        return not self == other
+
+    __hash__ = None
+
+    def index(self, value, *args):
+        return self._list().index(value, *args)
+
+    def count(self, value):
+        return self._list().count(value)
+
+    def insert(self, index, value):
+        vertices = self._list()
+        vertices.insert(index, value)
+        self._store[self._key] = vertices
+
+    def append(self, value):
+        self.insert(len(self), value)
+
+    def remove(self, value):
+        vertices = self._list()
+        vertices.remove(value)
+        self._store[self._key] = vertices
+
+    def reverse(self):
+        self._store[self._key] = self._list()[::-1]
+
+    def copy(self):
+        return self._list()
+
+
+class CompactFaceStore(MutableMapping):
+    """Mapping of face identifiers to face vertices, stored CSR-style in one flat integer buffer.
+
+    Face identifiers are stored in the integer buffer of the halfedges,
+    and should therefore be integers between 0 and 2**31 - 1.
+    Adding a face with any other identifier raises a ``ValueError``.
+    As long as the identifiers are added in increasing order, without large gaps,
+    they index the start offsets and vertex counts directly.
+    Otherwise, they are mapped to indices with a dict.
+
+    Faces whose number of vertices changes are moved to the end of the buffer.
+    The buffer is compacted when more than half of it is unused.
+    The counter ``version`` is incremented on every change.
+    Copies share the buffers of the original until either of them is modified.
+    """
+
+    __slots__ = ('_slot', '_free', '_start', '_count', '_vertices', '_size', '_garbage', '_shared', 'version')
+
+    def __init__(self):
+        self._slot = None
+        self._free = []
+        self._start = array('i')
+        self._count = array('i')
+        self._vertices = array('i')
+        self._size = 0
+        self._garbage = 0
+        self._shared = False
+        self.version = 0
+
+    def __repr__(self):
+        return repr(self.to_dict())
+
+    def __getitem__(self, key):
+        if self._slot_of(key) is None:
+            raise KeyError(key)
+        return FaceRecord(self, key)
+
+    def __setitem__(self, key, vertices):
+        if self._shared:
+            self._own()
+        vertices = array('i', vertices)
+        n = len(vertices)
+        self.version += 1
+        slot = self._slot_of(key)
+        if slot is not None and self._count[slot] == n:
+            start = self._start[slot]
+            self._vertices[start:start + n] = vertices
+            return
+        if slot is None:
+            _check_key(key)
+            if self._slot is None and not len(self._count) <= key < 2 * self._size + GAP:
+                self._map_slots()
+            if self._slot is None:
+                slot = key
+                self._start.extend(array('i', [0]) * (key + 1 - len(self._start)))
+                self._count.extend(array('i', [-1]) * (key + 1 - len(self._count)))
+            else:
+                if self._free:
+                    slot = self._free.pop()
+                else:
+                    slot = len(self._start)
+                    self._start.append(0)
+                    self._count.append(-1)
+                self._slot[key] = slot
+            self._size += 1
+        else:
+            self._garbage += self._count[slot]
+        self._start[slot] = len(self._vertices)
+        self._count[slot] = n
+        self._vertices.extend(vertices)
+        if self._garbage > len(self._vertices) // 2:
+            self.compact()
+
+    def __delitem__(self, key):
+        if self._shared:
+            self._own()
+        slot = self._lookup(key)
+        if self._slot is not None:
+            del self._slot[key]
+            self._free.append(slot)
+        self.version += 1
+        self._garbage += self._count[slot]
+        self._count[slot] = -1
+        self._size -= 1
+
+    def __contains__(self, key):
+        return self._slot_of(key) is not None
+
+    def __iter__(self):
+        return iter(self._keys())
+
+    def __len__(self):
+        return self._size
+
+    def _slot_of(self, key):
+        if self._slot is not None:
+            return self._slot.get(key)
+        try:
+            if 0 <= key < len(self._count) and self._count[key] != -1:
+                return key
+        except TypeError:
+            pass
+        return None
+
+    def _lookup(self, key):
+        slot = self._slot_of(key)
+        if slot is None:
+            raise KeyError(key)
+        return slot
+
+    def _keys(self):
+        if self._slot is not None:
+            return list(self._slot)
+        count = self._count
+        if self._size == len(count):
+            return list(range(self._size))
+        return [slot for slot in range(len(count)) if count[slot] != -1]
+
+    def _map_slots(self):
+        count = self._count
+        self._slot = {slot: slot for slot in range(len(count)) if count[slot] != -1}
+        self._free = [slot for slot in range(len(count) - 1, -1, -1) if count[slot] == -1]
+
+    def vertices_of(self, key):
+        """Return the vertices of a face as a list."""
+        slot = self._lookup(key)
+        start = self._start[slot]
+        return self._vertices[start:start + self._count[slot]].tolist()
+
+    def _own(self):
+        if self._slot is not None:
+            self._slot = dict(self._slot)
+        self._free = self._free[:]
+        self._start = self._start[:]
+        self._count = self._count[:]
+        self._vertices = self._vertices[:]
+        self._shared = False
+
+    def copy(self):
+        """Make a copy of the store that shares all buffers with this store, until either of them is modified."""
+        store = CompactFaceStore.__new__(CompactFaceStore)
+        for name in self.__slots__:
+            setattr(store, name, getattr(self, name))
+        store._shared = self._shared = True
+        return store
+
+    def compact(self):
+        """Remove the unused parts of the connectivity buffer."""
+        if self._shared:
+            self._own()
+        vertices = array('i')
+        for slot in (self._keys() if self._slot is None else self._slot.values()):
+            start = self._start[slot]
+            count = self._count[slot]
+            self._start[slot] = len(vertices)
+            vertices.extend(self._vertices[start:start + count])
+        self._vertices = vertices
+        self._garbage = 0
+
+    def to_dict(self):
+        """Convert the store to a plain dict of vertex lists."""
+        return {key: self.vertices_of(key) for key in self}
+
+    def load(self, faces):
+        """Fill an empty store with faces.
+
+        Parameters
+        ----------
+        faces : dict
+            A dict of face identifiers pointing to lists of vertices.
+
+        Raises
+        ------
+        ValueError
+            If the store is not empty.
+        ValueError
+            If an identifier is not an integer between 0 and 2**31 - 1.
+        """
+        if self._size:
+            raise ValueError('The store is not empty.')
+        keys = list(faces)
+        _check_keys(keys)
+        if _is_direct(keys):
+            slots = keys
+            n = keys[-1] + 1 if keys else 0
+        else:
+            slots = range(len(keys))
+            n = len(keys)
+        starts = [0] * n
+        counts = [-1] * n
+        start = 0
+        for slot, vertices in zip(slots, faces.values()):
+            starts[slot] = start
+            counts[slot] = len(vertices)
+            start += counts[slot]
+        self._shared = False
+        self._slot = None if slots is keys else dict(zip(keys, slots))
+        self._free = []
+        self._start = array('i', starts)
+        self._count = array('i', counts)
+        self._vertices = array('i', [key for vertices in faces.values() for key in vertices])
+        self._size = len(keys)
+        self._garbage = 0
+        self.version += 1
+
+
+# ==============================================================================
+# Main
+# ==============================================================================
+
+if __name__ == '__main__':
+
+    import doctest
+    doctest.testmod(globs=globals())
@@ -0,0 +1,343 @@
+"""
+Vectorized geometry queries for all or a selection of the vertices, edges and faces of a mesh.
+
+The functions in this module compute the same quantities as the corresponding
+per-element methods of :class:`compas.datastructures.Mesh`
+(for example, :func:`mesh_faces_normals_numpy` and ``Mesh.face_normal``),
+but for many elements in one pass over the cached arrays of the mesh
+(see :func:`compas.datastructures.mesh_arrays_numpy`).
+"""
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+from math import pi
+
+from numpy import arange
+from numpy import arccos
+from numpy import add
+from numpy import bincount
+from numpy import clip
+from numpy import cross
+from numpy import einsum
+from numpy import vstack
+from numpy import where
+
+from compas.numerical import normrow
+
+from compas.datastructures.mesh.core.arrays_numpy import mesh_arrays_numpy
+
+
+__all__ = [
+    'mesh_faces_centroids_numpy',
+    'mesh_faces_normals_numpy',
+    'mesh_faces_areas_numpy',
+    'mesh_vertices_normals_numpy',
+    'mesh_vertices_areas_numpy',
+    'mesh_vertices_curvatures_numpy',
+    'mesh_edges_lengths_numpy'
+]
+
+
+def _select(values, index, keys):
+    if keys is None:
+        return values
+    return values[[index[key] for key in keys]]
+
+
+def _corners(arrays):
+    """The face index and the index of the previous corner of every corner of every face."""
+    indptr = arrays.face_indptr
+    sizes = indptr[1:] - indptr[:-1]
+    face = arange(len(sizes)).repeat(sizes)
+    corner = arange(len(arrays.face_indices))
+    previous = corner - 1
+    previous[indptr[:-1]] = indptr[1:] - 1
+    return face, corner, previous
+
+
+def _face_centroids(arrays):
+    xyz = arrays.vertices[arrays.face_indices]
+    indptr = arrays.face_indptr
+    sizes = indptr[1:] - indptr[:-1]
+    return add.reduceat(xyz, indptr[:-1], axis=0) / sizes[:, None]
+
+
+def _face_normals(arrays):
+    """The non-unitized normals of all faces and the cross products at their corners."""
+    face, corner, previous = _corners(arrays)
+    centroids = _face_centroids(arrays)
+    xyz = arrays.vertices[arrays.face_indices] - centroids[face]
+    n = cross(xyz[previous], xyz[corner])
+    return add.reduceat(n, arrays.face_indptr[:-1], axis=0), n, face
+
+
+def mesh_faces_centroids_numpy(mesh, fkeys=None):
+    """Compute the centroids of multiple faces of a mesh.
+
+    Parameters
+    ----------
+    mesh : compas.datastructures.Mesh
+        A mesh object.
+    fkeys : list, optional
+        The identifiers of the faces.
+        Default is all faces.
+
+    Returns
+    -------
+    array
+        The centroid of every face, as a ``F x 3`` array,
+        in the order of ``fkeys`` or of ``mesh.faces()``.
+
+    Examples
+    --------
+    >>> from compas.datastructures import Mesh
+    >>> mesh = Mesh.from_polyhedron(6)
+    >>> mesh_faces_centroids_numpy(mesh).shape
+    (6, 3)
+    """
+    arrays = mesh_arrays_numpy(mesh)
+    return _select(_face_centroids(arrays), arrays.fkey_index, fkeys)
+
+
+def mesh_faces_normals_numpy(mesh, fkeys=None, unitized=True):
+    """Compute the normals of multiple faces of a mesh.
+
+    Parameters
+    ----------
+    mesh : compas.datastructures.Mesh
+        A mesh object.
+    fkeys : list, optional
+        The identifiers of the faces.
+        Default is all faces.
+    unitized : bool, optional
+        Unitize the normal vectors.
+        Default is ``True``.
+
+    Returns
+    -------
+    array
+        The normal vector of every face, as a ``F x 3`` array,
+        in the order of ``fkeys`` or of ``mesh.faces()``.
+
+    Notes
+    -----
+    The normals are computed as in :func:`compas.geometry.normal_polygon`.
+
+    Examples
+    --------
+    >>> from compas.datastructures import Mesh
+    >>> mesh = Mesh.from_polyhedron(6)
+    >>> mesh_faces_normals_numpy(mesh).shape
+    (6, 3)
+    """
+    arrays = mesh_arrays_numpy(mesh)
+    normals, _, _ = _face_normals(arrays)
+    if unitized:
+        normals /= normrow(normals)
+    return _select(normals, arrays.fkey_index, fkeys)
+
+
+def mesh_faces_areas_numpy(mesh, fkeys=None):
+    """Compute the areas of multiple faces of a mesh.
+
+    Parameters
+    ----------
+    mesh : compas.datastructures.Mesh
+        A mesh object.
+    fkeys : list, optional
+        The identifiers of the faces.
+        Default is all faces.
+
+    Returns
+    -------
+    array
+        The area of every face, in the order of ``fkeys`` or of ``mesh.faces()``.
+
+    Notes
+    -----
+    The areas are computed as in :func:`compas.geometry.area_polygon`.
+
+    Examples
+    --------
+    >>> from compas.datastructures import Mesh
+    >>> mesh = Mesh.from_polyhedron(6)
+    >>> mesh_faces_areas_numpy(mesh).round(3).tolist()
+    [5.333, 5.333, 5.333, 5.333, 5.333, 5.333]
+    """
+    arrays = mesh_arrays_numpy(mesh)
+    _, n, face = _face_normals(arrays)
+    n0 = n[arrays.face_indptr[:-1]]
+    sign = where(einsum('ij,ij->i', n, n0[face]) > 0, 0.5, -0.5)
+    areas = bincount(face, sign * normrow(n).ravel(), minlength=len(arrays.fkeys))
+    return _select(areas, arrays.fkey_index, fkeys)
+
+
+def mesh_vertices_normals_numpy(mesh, keys=None):
+    """Compute the normals of multiple vertices of a mesh.
+
+    Parameters
+    ----------
+    mesh : compas.datastructures.Mesh
+        A mesh object.
+    keys : list, optional
+        The identifiers of the vertices.
+        Default is all vertices.
+
+    Returns
+    -------
+    array
+        The normal vector of every vertex, as a ``V x 3`` array,
+        in the order of ``keys`` or of ``mesh.vertices()``.
+
+    Notes
+    -----
+    The normal of a vertex is the normalized sum of the non-unitized normals
+    of the faces around the vertex.
+
+    Examples
+    --------
+    >>> from compas.datastructures import Mesh
+    >>> mesh = Mesh.from_polyhedron(6)
+    >>> mesh_vertices_normals_numpy(mesh).shape
+    (8, 3)
+    """
+    arrays = mesh_arrays_numpy(mesh)
+    normals, _, face = _face_normals(arrays)
+    n = len(arrays.keys)
+    indices = arrays.face_indices
+    normals = normals[face]
+    normals = vstack([bincount(indices, normals[:, axis], minlength=n) for axis in range(3)]).T
+    normals /= normrow(normals)
+    return _select(normals, arrays.key_index, keys)
+
+
+def mesh_vertices_areas_numpy(mesh, keys=None):
+    """Compute the tributary areas of multiple vertices of a mesh.
+
+    Parameters
+    ----------
+    mesh : compas.datastructures.Mesh
+        A mesh object.
+    keys : list, optional
+        The identifiers of the vertices.
+        Default is all vertices.
+
+    Returns
+    -------
+    array
+        The tributary area of every vertex, in the order of ``keys`` or of ``mesh.vertices()``.
+
+    Examples
+    --------
+    >>> from compas.datastructures import Mesh
+    >>> mesh = Mesh.from_polyhedron(6)
+    >>> mesh_vertices_areas_numpy(mesh).round(3).tolist()
+    [4.0, 4.0, 4.0, 4.0, 4.0, 4.0, 4.0, 4.0]
+    """
+    arrays = mesh_arrays_numpy(mesh)
+    xyz = arrays.vertices
+    centroids = _face_centroids(arrays)
+    f = arrays.halfedge_faces
+    inside = f != -1
+    u, v = arrays.halfedges[inside].T
+    c = centroids[f[inside]]
+    # every halfedge contributes to the areas of both of its vertices
+    a = normrow(cross(xyz[v] - xyz[u], c - xyz[u])).ravel()
+    b = normrow(cross(xyz[u] - xyz[v], c - xyz[v])).ravel()
+    n = len(arrays.keys)
+    areas = 0.25 * (bincount(u, a, minlength=n) + bincount(v, b, minlength=n))
+    return _select(areas, arrays.key_index, keys)
+
+
+def mesh_vertices_curvatures_numpy(mesh, keys=None):
+    """Compute the dimensionless curvature of multiple vertices of a mesh.
+
+    Parameters
+    ----------
+    mesh : compas.datastructures.Mesh
+        A mesh object.
+    keys : list, optional
+        The identifiers of the vertices.
+        Default is all vertices.
+
+    Returns
+    -------
+    array
+        The curvature of every vertex, in the order of ``keys`` or of ``mesh.vertices()``.
+
+    Notes
+    -----
+    The curvature of a vertex is ``2 * pi`` minus the sum of the angles between consecutive neighbors,
+    as in ``Mesh.vertex_curvature``.
+    For interior vertices, these angles are the corner angles of the surrounding faces.
+    The curvature of vertices on the boundary is computed per vertex.
+
+    Examples
+    --------
+    >>> from compas.datastructures import Mesh
+    >>> mesh = Mesh.from_polyhedron(6)
+    >>> mesh_vertices_curvatures_numpy(mesh).round(3).tolist()
+    [1.571, 1.571, 1.571, 1.571, 1.571, 1.571, 1.571, 1.571]
+    """
+    arrays = mesh_arrays_numpy(mesh)
+    xyz = arrays.vertices
+    indices = arrays.face_indices
+    face, corner, previous = _corners(arrays)
+    following = corner + 1
+    following[arrays.face_indptr[1:] - 1] = arrays.face_indptr[:-1]
+    o = xyz[indices]
+    a = xyz[indices[previous]] - o
+    b = xyz[indices[following]] - o
+    cosine = einsum('ij,ij->i', a, b) / (normrow(a) * normrow(b)).ravel()
+    angles = arccos(clip(cosine, -1.0, 1.0))
+    n = len(arrays.keys)
+    curvatures = 2 * pi - bincount(indices, angles, minlength=n)
+    boundary = arrays.halfedges[arrays.halfedge_faces == -1, 0]
+    for index in set(boundary.tolist()):
+        curvatures[index] = mesh.vertex_curvature(arrays.keys[index].item())
+    return _select(curvatures, arrays.key_index, keys)
+
+
+def mesh_edges_lengths_numpy(mesh, edges=None):
+    """Compute the lengths of multiple edges of a mesh.
+
+    Parameters
+    ----------
+    mesh : compas.datastructures.Mesh
+        A mesh object.
+    edges : list, optional
+        The edges, as pairs of vertex identifiers.
+        Default is all edges.
+
+    Returns
+    -------
+    array
+        The length of every edge, in the order of ``edges`` or of ``mesh.edges()``.
+
+    Examples
+    --------
+    >>> from compas.datastructures import Mesh
+    >>> mesh = Mesh.from_polyhedron(6)
+    >>> mesh_edges_lengths_numpy(mesh).round(3).tolist()
+    [2.309, 2.309, 2.309, 2.309, 2.309, 2.309, 2.309, 2.309, 2.309, 2.309, 2.309, 2.309]
+    """
+    arrays = mesh_arrays_numpy(mesh)
+    xyz = arrays.vertices
+    if edges is None:
+        u, v = arrays.edges.T
+    else:
+        key_index = arrays.key_index
+        u = [key_index[u] for u, _ in edges]
+        v = [key_index[v] for _, v in edges]
+    return normrow(xyz[v] - xyz[u]).ravel()
+
+
+# ==============================================================================
+# Main
+# ==============================================================================
+
+if __name__ == '__main__':
+
+    import doctest
+    doctest.testmod(globs=globals())
@@ -15,8 +15,15 @@ from random import choice
 from compas.datastructures.mesh.core import VertexAttributeView
 from compas.datastructures.mesh.core import EdgeAttributeView
 from compas.datastructures.mesh.core import FaceAttributeView
+from compas.datastructures.mesh.core.compact import CompactHalfedgeStore
+from compas.datastructures.mesh.core.compact import CompactVertexStore
+from compas.datastructures.mesh.core.compact import ATOMIC
+from compas.datastructures.mesh.core.compact import AttributeRecord
+from compas.datastructures.mesh.core.compact import compact_storage
+from compas.datastructures.mesh.core.registry import EdgeRegistry
 
 from compas.datastructures import Datastructure
+from compas.files import CBF
 from compas.utilities import pairwise
 from compas.utilities import window
 
@@ -24,11 +31,34 @@ from compas.utilities import window
 __all__ = ['HalfEdge']
 
 
+def _copy_attributes(attr):
+    for value in attr.values():
+        if not isinstance(value, ATOMIC):
+            return deepcopy(attr)
+    return dict(attr)
+
+
 class HalfEdge(Datastructure):
     """Base half-edge data structure for representing meshes.
 
+    Parameters
+    ----------
+    storage : {'dict', 'compact'}, optional
+        The storage backend of the vertices, halfedges and faces.
+        With ``'dict'`` (default), everything is stored in nested dictionaries.
+        With ``'compact'``, vertex coordinates, face connectivity and halfedges
+        are stored in flat typed buffers (see :mod:`compas.datastructures.mesh.core.compact`),
+        and face attribute dicts are only created for faces that have attributes,
+        which reduces the memory footprint of large meshes considerably.
+        Vertex and face identifiers then have to be integers between 0 and 2**31 - 1,
+        and adding a vertex or face with any other identifier raises a ``ValueError``.
+
     Attributes
     ----------
+    storage
+    topology_version
+    geometry_version
+    edge_registry
     attributes
     default_vertex_attributes
     default_edge_attributes
@@ -88,15 +118,16 @@ class HalfEdge(Datastructure):
     #     "required": ["compas", "datatype", "data"]
     # }
 
-    def __init__(self):
+    def __init__(self, storage='dict'):
         super(HalfEdge, self).__init__()
+        self._storage = None
         self._max_int_key = -1
         self._max_int_fkey = -1
-        self.vertex = {}
-        self.halfedge = {}
-        self.face = {}
-        self.facedata = {}
-        self.edgedata = {}
+        self._topology_version = 0
+        self._geometry_version = 0
+        self._cache = {}
+        self._edge_registry = None
+        self._reset_storage(storage)
         self.attributes = {'name': 'Mesh'}
         self.default_vertex_attributes = {'x': 0.0, 'y': 0.0, 'z': 0.0}
         self.default_edge_attributes = {}
@@ -140,6 +171,46 @@ class HalfEdge(Datastructure):
     def name(self, value):
         self.attributes['name'] = value
 
+    @property
+    def storage(self):
+        """str : The storage backend of the data structure, ``'dict'`` or ``'compact'``."""
+        return self._storage
+
+    @property
+    def topology_version(self):
+        """int : A counter that increases whenever the connectivity of the mesh changes.
+
+        Changes made through the methods of the mesh are tracked automatically.
+        With ``'compact'`` storage, direct modifications of ``vertex``, ``halfedge`` and ``face`` are tracked as well.
+        With ``'dict'`` storage, direct modifications of the dicts have to be reported with :meth:`invalidate`.
+        """
+        version = self._topology_version
+        if self._storage == 'compact':
+            version += self.vertex.table.topology + self.face.version
+        return version
+
+    @property
+    def geometry_version(self):
+        """int : A counter that increases whenever the coordinates of the vertices of the mesh change.
+
+        Changes made through the methods of the mesh and through the attribute views
+        returned by :meth:`vertex_attributes` and :meth:`vertices` are tracked automatically.
+        With ``'compact'`` storage, direct modifications of ``vertex`` are tracked as well.
+        With ``'dict'`` storage, direct modifications of the dicts have to be reported with :meth:`invalidate`.
+        """
+        version = self._geometry_version
+        if self._storage == 'compact':
+            version += self.vertex.table.geometry
+        return version
+
+    @property
+    def edge_registry(self):
+        """:class:`compas.datastructures.mesh.core.EdgeRegistry` : The persistent edge index of the mesh, if any.
+
+        See :meth:`register_edges`.
+        """
+        return self._edge_registry
+
     @property
     def adjacency(self):
         return self.halfedge
@@ -185,13 +256,22 @@ class HalfEdge(Datastructure):
         for key in self.edgedata:
             edgedata[repr(key)] = self.edgedata[key]
 
+        if self._storage == 'compact':
+            vertex = self.vertex.to_dict()
+            face = self.face.to_dict()
+            facedata = {fkey: self.facedata.get(fkey, {}) for fkey in face}
+        else:
+            vertex = self.vertex
+            face = self.face
+            facedata = self.facedata
+
         data = {'attributes': self.attributes,
                 'dva': self.default_vertex_attributes,
                 'dea': self.default_edge_attributes,
                 'dfa': self.default_face_attributes,
-                'vertex': self.vertex,
-                'face': self.face,
-                'facedata': self.facedata,
+                'vertex': vertex,
+                'face': face,
+                'facedata': facedata,
                 'edgedata': edgedata,
                 'max_int_key': self._max_int_key,
                 'max_int_fkey': self._max_int_fkey}
@@ -216,19 +296,10 @@ class HalfEdge(Datastructure):
         self.default_face_attributes.update(dfa)
         self.default_edge_attributes.update(dea)
 
-        self.vertex = {}
-        self.face = {}
-        self.halfedge = {}
-        self.facedata = {}
-        self.edgedata = {}
+        self._reset_storage()
 
-        for key, attr in iter(vertex.items()):
-            self.add_vertex(int(key), attr_dict=attr)
-
-        for fkey, vertices in iter(face.items()):
-            attr = facedata.get(fkey) or {}
-            # vertices = [int(k) for k in vertices]
-            self.add_face(vertices, fkey=int(fkey), attr_dict=attr)
+        self._add_vertices(iter(vertex.items()))
+        self._add_faces((int(fkey), vertices, facedata.get(fkey) or {}) for fkey, vertices in iter(face.items()))
 
         for uv, attr in iter(edgedata.items()):
             self.edgedata[literal_eval(uv)] = attr or {}
@@ -354,10 +425,131 @@ class HalfEdge(Datastructure):
         with open(filepath, 'wb+') as f:
             pickle.dump(self.data, f, protocol=pickle.HIGHEST_PROTOCOL)
 
+    @classmethod
+    def from_binary(cls, filepath, mmap=False):
+        """Construct a mesh from serialised data contained in a binary CBF file.
+
+        Parameters
+        ----------
+        filepath : str
+            The path to the binary file.
+        mmap : bool, optional
+            Read the file through a memory map.
+            Default is ``False``.
+
+        Returns
+        -------
+        object
+            An object of type ``cls``.
+
+        Notes
+        -----
+        This constructor method is meant to be used in conjunction with the
+        corresponding *to_binary* method.
+        """
+        cbf = CBF(filepath, mmap=mmap)
+        o = cls()
+        o.data = cbf.reader.data
+        return o
+
+    def to_binary(self, filepath):
+        """Serialise the structured data representing the mesh to a binary CBF file.
+
+        Parameters
+        ----------
+        filepath : str
+            The path to the binary file.
+
+        Notes
+        -----
+        The vertices, faces and their attributes are stored as typed arrays.
+        See :class:`compas.files.CBF` for details.
+        """
+        cbf = CBF(filepath)
+        cbf.write(self.data, layout={'vertex': ('attributes', 1),
+                                     'face': ('lists', 1),
+                                     'facedata': ('attributes', 1),
+                                     'edgedata': ('attributes', 1)})
+
     # --------------------------------------------------------------------------
     # helpers
     # --------------------------------------------------------------------------
 
+    @classmethod
+    def _empty(cls, storage='dict'):
+        """An empty instance of the class with the given storage backend.
+
+        The class is instantiated without arguments,
+        such that subclasses of which the constructor has no ``storage`` parameter are supported as well.
+        """
+        mesh = cls()
+        if mesh._storage != storage:
+            mesh._reset_storage(storage)
+        return mesh
+
+    def _reset_storage(self, storage=None):
+        if storage is not None and storage not in ('dict', 'compact'):
+            raise ValueError("Storage should be one of 'dict', 'compact': {}".format(storage))
+        if self._storage == 'compact' and 'face' in self.__dict__:
+            # the counters of the replaced stores are absorbed to keep the versions increasing
+            self._topology_version = self.topology_version
+            self._geometry_version = self.geometry_version
+        if storage is not None:
+            self._storage = storage
+        if self._storage == 'compact':
+            self.vertex, self.halfedge, self.face = compact_storage()
+        else:
+            self.vertex = {}
+            self.halfedge = {}
+            self.face = {}
+        self.facedata = {}
+        self.edgedata = {}
+        self.invalidate()
+
+    def _vertex_attribute_changed(self, name):
+        if name in ('x', 'y', 'z'):
+            self._geometry_version += 1
+
+    def _topology_changed(self, vertices=None):
+        self._topology_version += 1
+        if self._edge_registry is not None:
+            self._edge_registry.update(vertices)
+
+    def invalidate(self, topology=True, geometry=True, vertices=None):
+        """Report a modification of the mesh that was not made through its methods.
+
+        Parameters
+        ----------
+        topology : bool, optional
+            The connectivity of the mesh was modified.
+            Default is ``True``.
+        geometry : bool, optional
+            The vertex coordinates of the mesh were modified.
+            Default is ``True``.
+        vertices : list, optional
+            The vertices of which the connectivity was modified.
+            Default is all vertices.
+            This is only used to update the edge registry (see :meth:`register_edges`).
+
+        Notes
+        -----
+        Data derived from the mesh and cached on it, such as the arrays of ``Mesh.to_arrays``,
+        is recomputed when the corresponding version counter has changed.
+        Call this method after modifying ``vertex``, ``halfedge`` or ``face`` directly.
+
+        Examples
+        --------
+        >>> mesh = HalfEdge()
+        >>> version = mesh.topology_version
+        >>> mesh.invalidate(geometry=False)
+        >>> mesh.topology_version > version
+        True
+        """
+        if topology:
+            self._topology_changed(vertices)
+        if geometry:
+            self._geometry_version += 1
+
     def copy(self, cls=None):
         """Make an independent copy of the mesh object.
 
@@ -371,26 +563,93 @@ class HalfEdge(Datastructure):
         -------
         Mesh
             A separate, but identical mesh object.
+            The copy uses the same storage backend as the original.
+
+        Notes
+        -----
+        The copy is made directly from the storage of the mesh, without going through :attr:`data`.
+        With ``'compact'`` storage, the copy shares the buffers of the vertices, halfedges and faces
+        with the original until either of them is modified (copy-on-write),
+        such that only the face and edge attribute dicts are copied up front.
+        With ``'dict'`` storage, the dicts are copied structurally,
+        and attribute values are only deep-copied if they are not numbers, strings or ``None``.
+
+        Examples
+        --------
+        >>> from compas.datastructures import Mesh
+        >>> mesh = Mesh.from_vertices_and_faces(*Mesh.from_polyhedron(6).to_vertices_and_faces(), storage='compact')
+        >>> other = mesh.copy()
+        >>> other.vertex_attribute(0, 'x', 10.0)
+        >>> mesh.vertex_attribute(0, 'x') == other.vertex_attribute(0, 'x')
+        False
         """
         if not cls:
             cls = type(self)
-        return cls.from_data(deepcopy(self.data))
+        mesh = cls._empty(self._storage)
+        if self._storage == 'compact':
+            table = self.vertex.table.copy()
+            mesh.vertex = CompactVertexStore(table)
+            mesh.halfedge = CompactHalfedgeStore(table)
+            mesh.face = self.face.copy()
+        else:
+            mesh.vertex = {key: _copy_attributes(attr) for key, attr in self.vertex.items()}
+            mesh.halfedge = {key: dict(nbrs) for key, nbrs in self.halfedge.items()}
+            mesh.face = {fkey: list(vertices) for fkey, vertices in self.face.items()}
+        if self._storage == 'compact':
+            mesh.facedata = {fkey: _copy_attributes(attr) for fkey, attr in self.facedata.items() if attr}
+        else:
+            mesh.facedata = {fkey: _copy_attributes(attr) if attr else {} for fkey, attr in self.facedata.items()}
+        mesh.edgedata = {uv: _copy_attributes(attr) if attr else {} for uv, attr in self.edgedata.items()}
+        mesh.attributes.update(deepcopy(self.attributes))
+        mesh.default_vertex_attributes.update(deepcopy(self.default_vertex_attributes))
+        mesh.default_edge_attributes.update(deepcopy(self.default_edge_attributes))
+        mesh.default_face_attributes.update(deepcopy(self.default_face_attributes))
+        mesh._max_int_key = self._max_int_key
+        mesh._max_int_fkey = self._max_int_fkey
+        return mesh
 
     def clear(self):
         """Clear all the mesh data."""
-        del self.vertex
-        del self.edgedata
-        del self.halfedge
-        del self.face
-        del self.facedata
-        self.vertex = {}
-        self.edgedata = {}
-        self.halfedge = {}
-        self.face = {}
-        self.facedata = {}
+        self._reset_storage()
         self._max_int_key = -1
         self._max_int_fkey = -1
 
+    def register_edges(self):
+        """Maintain a persistent index of the edges of the mesh.
+
+        Returns
+        -------
+        :class:`compas.datastructures.mesh.core.EdgeRegistry`
+            The edge registry.
+
+        Notes
+        -----
+        While the registry exists, :meth:`edges` iterates over the registered edges,
+        in the order of their identifiers, :meth:`number_of_edges` takes constant time,
+        and :meth:`edges_on_boundary` does not have to visit the interior edges.
+
+        The registry is updated by the methods of the mesh and by the mesh operations.
+        After modifying the ``halfedge`` dict directly, call :meth:`invalidate`
+        with the vertices of which the connectivity has changed.
+
+        The registry is not copied with the mesh.
+
+        Examples
+        --------
+        >>> from compas.datastructures import Mesh
+        >>> mesh = Mesh.from_polyhedron(6)
+        >>> registry = mesh.register_edges()
+        >>> mesh.number_of_edges()
+        12
+        """
+        if self._edge_registry is None:
+            self._edge_registry = EdgeRegistry(self)
+        return self._edge_registry
+
+    def unregister_edges(self):
+        """Remove the persistent index of the edges of the mesh."""
+        self._edge_registry = None
+
     def get_any_vertex(self):
         """Get the identifier of a random vertex.
 
@@ -476,6 +735,33 @@ class HalfEdge(Datastructure):
         """
         return dict(enumerate(self.vertices()))
 
+    def adjacency_csr(self):
+        """Get the vertex adjacency of the mesh in compressed sparse row format.
+
+        Returns
+        -------
+        :class:`compas.topology.CSRAdjacency`
+            The compact adjacency, with the vertex identifiers in ``keys``.
+            The adjacency is cached, and constructed again only after the topology of the mesh was modified.
+            It should therefore not be modified.
+
+        Examples
+        --------
+        >>> mesh = HalfEdge()
+        >>> mesh.add_face([mesh.add_vertex() for _ in range(4)])
+        0
+        >>> adjacency = mesh.adjacency_csr()
+        >>> sorted(adjacency.keys[i] for i in adjacency[adjacency.key_index[0]])
+        [1, 3]
+        """
+        from compas.topology import CSRAdjacency
+        version = self.topology_version
+        cached = self._cache.get('csr')
+        if cached is None or cached[0] != version:
+            cached = version, CSRAdjacency.from_adjacency(self.adjacency)
+            self._cache['csr'] = cached
+        return cached[1]
+
     # --------------------------------------------------------------------------
     # builders
     # --------------------------------------------------------------------------
@@ -530,6 +816,8 @@ class HalfEdge(Datastructure):
         attr = attr_dict or {}
         attr.update(kwattr)
         self.vertex[key].update(attr)
+        self._topology_version += 1
+        self._geometry_version += 1
         return key
 
     def add_face(self, vertices, fkey=None, attr_dict=None, **kwattr):
@@ -582,13 +870,135 @@ class HalfEdge(Datastructure):
         attr = attr_dict or {}
         attr.update(kwattr)
         self.face[fkey] = vertices
-        self.facedata.setdefault(fkey, attr)
+        if attr or self._storage == 'dict':
+            self.facedata.setdefault(fkey, attr)
         for u, v in pairwise(vertices + vertices[:1]):
             self.halfedge[u][v] = fkey
             if u not in self.halfedge[v]:
                 self.halfedge[v][u] = None
+        self._topology_changed(vertices)
         return fkey
 
+    def _add_vertices(self, vertices):
+        """Add many vertices at once.
+
+        Parameters
+        ----------
+        vertices : iterable
+            Pairs of vertex identifiers and attribute dicts.
+
+        Notes
+        -----
+        This is equivalent to calling :meth:`add_vertex` for every vertex,
+        but the version counters are updated only once.
+        """
+        vertices = [(int(key), attr) for key, attr in vertices]
+        keys = [key for key, _ in vertices]
+        if keys:
+            self._max_int_key = max(self._max_int_key, max(keys))
+        if self._storage == 'compact' and not self.vertex and not self.halfedge and len(set(keys)) == len(keys):
+            self.vertex.load(vertices)
+        else:
+            vertex = self.vertex
+            halfedge = self.halfedge
+            for key, attr in vertices:
+                if key not in vertex:
+                    vertex[key] = dict(attr)
+                    halfedge[key] = {}
+                else:
+                    vertex[key].update(attr)
+        self._topology_version += 1
+        self._geometry_version += 1
+
+    def _add_faces(self, faces, validate=False):
+        """Add many faces at once, in a single pass over their halfedges.
+
+        Parameters
+        ----------
+        faces : iterable
+            Triples of face identifiers, lists of vertex keys, and attribute dicts.
+            If a face identifier is ``None``, one is generated.
+        validate : bool, optional
+            Verify that the faces form a manifold mesh.
+            Default is ``False``.
+
+        Returns
+        -------
+        list
+            The identifiers of the faces that were added.
+            Faces with less than three distinct vertices are skipped, as in :meth:`add_face`.
+
+        Raises
+        ------
+        ValueError
+            If ``validate`` is ``True`` and a halfedge is used by more than one face,
+            or a vertex has more than one outgoing halfedge on the boundary.
+            The mesh contains all faces nevertheless.
+
+        Notes
+        -----
+        This is equivalent to calling :meth:`add_face` for every face,
+        but the version counters and the edge registry are updated only once.
+        With ``'compact'`` storage, the halfedges and faces of an empty mesh are collected
+        in plain dicts first, and then copied into the buffers in one go.
+        """
+        if self._storage == 'compact':
+            table = self.halfedge.table
+            bulk = not self.face and len(table.target) == len(table.hfree)
+        else:
+            bulk = False
+        if bulk:
+            face = {}
+            halfedge = {key: {} for key in self.halfedge}
+        else:
+            face = self.face
+            halfedge = self.halfedge
+        facedata = self.facedata
+        sparse = self._storage == 'compact'
+        max_int_fkey = self._max_int_fkey
+        fkeys = []
+        conflicts = []
+        for fkey, vertices, attr in faces:
+            vertices = [int(key) for key in vertices]
+            n = len(vertices)
+            if n < 3 or len(set(vertices)) < n:
+                # remove the closing vertex and consecutive duplicates, as in add_face
+                if vertices and vertices[-1] == vertices[0]:
+                    del vertices[-1]
+                vertices = [u for u, v in pairwise(vertices + vertices[:1]) if u != v]
+                if len(vertices) < 3:
+                    continue
+            if fkey is None:
+                fkey = max_int_fkey = max_int_fkey + 1
+            elif fkey > max_int_fkey:
+                max_int_fkey = fkey
+            face[fkey] = vertices
+            if attr or not sparse:
+                facedata.setdefault(fkey, attr)
+            following = vertices[1:]
+            following.append(vertices[0])
+            for u, v in zip(vertices, following):
+                nbrs = halfedge[u]
+                if v in nbrs and nbrs[v] is not None:
+                    conflicts.append((u, v))
+                nbrs[v] = fkey
+                nbrs = halfedge[v]
+                if u not in nbrs:
+                    nbrs[u] = None
+            fkeys.append(fkey)
+        if bulk:
+            # the faces are loaded first, because their identifiers are validated before anything is stored
+            self.face.load(face)
+            self.halfedge.load(halfedge)
+        self._max_int_fkey = max_int_fkey
+        self._topology_changed()
+        if validate:
+            singular = [key for key in halfedge if list(halfedge[key].values()).count(None) > 1]
+            if conflicts or singular:
+                raise ValueError('The faces do not form a manifold mesh: '
+                                 '{} halfedges are shared by more than one face, {} vertices are singular.'.format(len(conflicts), len(singular)))
+        return fkeys
+
     # --------------------------------------------------------------------------
     # modifiers
     # --------------------------------------------------------------------------
@@ -612,10 +1022,12 @@ class HalfEdge(Datastructure):
         >>>
         """
         nbrs = self.vertex_neighbors(key)
+        touched = set(nbrs)
         for nbr in nbrs:
             fkey = self.halfedge[key][nbr]
             if fkey is None:
                 continue
+            touched.update(self.face[fkey])
             for u, v in self.face_halfedges(fkey):
                 self.halfedge[u][v] = None
             del self.face[fkey]
@@ -638,6 +1050,8 @@ class HalfEdge(Datastructure):
                         del self.edgedata[n, nbr]
         del self.halfedge[key]
         del self.vertex[key]
+        touched.add(key)
+        self._topology_changed(touched)
 
     def delete_face(self, fkey):
         """Delete a face from the mesh object.
@@ -657,6 +1071,7 @@ class HalfEdge(Datastructure):
         --------
         >>>
         """
+        vertices = list(self.face[fkey])
         for u, v in self.face_halfedges(fkey):
             self.halfedge[u][v] = None
             if self.halfedge[v][u] is None:
@@ -669,10 +1084,12 @@ class HalfEdge(Datastructure):
         del self.face[fkey]
         if fkey in self.facedata:
             del self.facedata[fkey]
+        self._topology_changed(vertices)
 
     def cull_vertices(self):
         """Remove all unused vertices from the mesh object.
         """
+        self._topology_changed(())
         for u in list(self.vertices()):
             if u not in self.halfedge:
                 del self.vertex[u]
@@ -750,11 +1167,20 @@ class HalfEdge(Datastructure):
         Unless edges were added explicitly using :meth:`add_edge` the order of
         edges is *as they come out*. However, as long as the toplogy remains
         unchanged, the order is consistent.
+        If the edges are registered (see :meth:`register_edges`),
+        they are yielded in the order of their identifiers.
 
         Examples
         --------
         >>>
         """
+        if self._edge_registry is not None:
+            for key in self._edge_registry:
+                if not data:
+                    yield key
+                else:
+                    yield key, self.edge_attributes(key)
+            return
         seen = set()
         for u in self.halfedge:
             for v in self.halfedge[u]:
@@ -1067,6 +1493,7 @@ class HalfEdge(Datastructure):
             attr_dict = {}
         attr_dict.update(kwattr)
         self.default_vertex_attributes.update(attr_dict)
+        self._geometry_version += 1
 
     def vertex_attribute(self, key, name, value=None):
         """Get or set an attribute of a vertex.
@@ -1096,6 +1523,7 @@ class HalfEdge(Datastructure):
             raise KeyError(key)
         if value is not None:
             self.vertex[key][name] = value
+            self._vertex_attribute_changed(name)
             return None
         if name in self.vertex[key]:
             return self.vertex[key][name]
@@ -1125,6 +1553,7 @@ class HalfEdge(Datastructure):
         """
         if name in self.vertex[key]:
             del self.vertex[key][name]
+            self._vertex_attribute_changed(name)
 
     def vertex_attributes(self, key, names=None, values=None):
         """Get or set multiple attributes of a vertex.
@@ -1158,11 +1587,12 @@ class HalfEdge(Datastructure):
             # use it as a setter
             for name, value in zip(names, values):
                 self.vertex[key][name] = value
+                self._vertex_attribute_changed(name)
             return
         # use it as a getter
         if not names:
             # return all vertex attributes as a dict
-            return VertexAttributeView(self.default_vertex_attributes, self.vertex[key])
+            return VertexAttributeView(self.default_vertex_attributes, self.vertex[key], callback=self._vertex_attribute_changed)
         values = []
         for name in names:
             if name in self.vertex[key]:
@@ -1359,7 +1789,10 @@ class HalfEdge(Datastructure):
             return
         # use it as a getter
         if not names:
-            return FaceAttributeView(self.default_face_attributes, self.facedata.setdefault(key, {}))
+            attr = self.facedata.get(key)
+            if attr is None:
+                attr = AttributeRecord(self.facedata, key)
+            return FaceAttributeView(self.default_face_attributes, attr)
         values = []
         for name in names:
             value = self.face_attribute(key, name)
@@ -1650,6 +2083,8 @@ class HalfEdge(Datastructure):
 
     def number_of_edges(self):
         """Count the number of edges in the mesh."""
+        if self._edge_registry is not None:
+            return len(self._edge_registry)
         return len(list(self.edges()))
 
     def number_of_faces(self):
@@ -2536,7 +2971,10 @@ class HalfEdge(Datastructure):
             The boundary edges.
 
         """
-        boundary_edges = [(u, v) for u, v in self.edges() if self.is_edge_on_boundary(u, v)]
+        if self._edge_registry is not None:
+            boundary_edges = self._edge_registry.edges_on_boundary()
+        else:
+            boundary_edges = [(u, v) for u, v in self.edges() if self.is_edge_on_boundary(u, v)]
         if not chained:
             return boundary_edges
         # this is not "chained"
@@ -2,10 +2,12 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 
-from numpy import asarray
+from numpy import arange
 from numpy import zeros
 from numpy import cross
+from numpy import full
 from numpy import bincount
+from numpy import concatenate
 
 from scipy.sparse import coo_matrix
 from scipy.sparse import spdiags
@@ -20,6 +22,8 @@ from compas.numerical import degree_matrix
 from compas.numerical import connectivity_matrix
 from compas.numerical import face_matrix
 
+from compas.datastructures.mesh.core.arrays_numpy import mesh_arrays_numpy
+
 
 __all__ = [
     'mesh_adjacency_matrix',
@@ -388,33 +392,36 @@ def trimesh_cotangent_laplacian_matrix(mesh, rtype='csr'):
         `Laplacian Mesh Optimization <https://igl.ethz.ch/projects/Laplacian-mesh-processing/Laplacian-mesh-optimization/lmo.pdf>`_.
 
     """
-    key_index = mesh.key_index()
-    n = mesh.number_of_vertices()
+    arrays = mesh_arrays_numpy(mesh)
+    xyz = arrays.vertices
+    tris = arrays.faces
+    n = xyz.shape[0]
     data = []
     rows = []
     cols = []
 
-    for key in mesh.vertices():
-        nbrs = mesh.vertex_neighbors(key)
-        i = key_index[key]
-        data.append(-1.0)
-        rows.append(i)
-        cols.append(i)
-
-        W = 0
-        for nbr in nbrs:
-            a, b = trimesh_edge_cotangents(mesh, key, nbr)
-            w = a + b
-            W += w
-
-        for nbr in nbrs:
-            j = key_index[nbr]
-            a, b = trimesh_edge_cotangents(mesh, key, nbr)
-            w = a + b
-            data.append(w / W)
-            rows.append(i)
-            cols.append(j)
-
+    # the cotangent of the angle at corner k contributes to the weight of the opposite edge (i, j)
+    for i, j, k in ((0, 1, 2), (1, 2, 0), (2, 0, 1)):
+        a = xyz[tris[:, i]] - xyz[tris[:, k]]
+        b = xyz[tris[:, j]] - xyz[tris[:, k]]
+        length = normrow(cross(a, b)).ravel()
+        cotangent = zeros(length.shape[0])
+        nonzero = length > 0
+        cotangent[nonzero] = (a[nonzero] * b[nonzero]).sum(axis=1) / length[nonzero]
+        data += [cotangent, cotangent]
+        rows += [tris[:, i], tris[:, j]]
+        cols += [tris[:, j], tris[:, i]]
+
+    # sum the contributions per edge, but keep the entries of edges with zero weight
+    W = coo_matrix((concatenate(data), (concatenate(rows), concatenate(cols))), shape=(n, n)).tocsr().tocoo()
+    w = bincount(W.row, W.data, minlength=n)
+    scale = zeros(n)
+    scale[w != 0] = 1.0 / w[w != 0]
+
+    diagonal = arange(n)
+    data = concatenate((full(n, -1.0), W.data * scale[W.row]))
+    rows = concatenate((diagonal, W.row))
+    cols = concatenate((diagonal, W.col))
     L = coo_matrix((data, (rows, cols)), shape=(n, n))
 
     if rtype == 'csr':
@@ -475,9 +482,9 @@ def trimesh_vertexarea_matrix(mesh):
         plotter.show()
 
     """
-    key_index = mesh.key_index()
-    xyz = asarray(mesh.vertices_attributes('xyz'), dtype=float)
-    tris = asarray([[key_index[key] for key in mesh.face_vertices(fkey)] for fkey in mesh.faces()], dtype=int)
+    arrays = mesh_arrays_numpy(mesh)
+    xyz = arrays.vertices
+    tris = arrays.faces
     e1 = xyz[tris[:, 1]] - xyz[tris[:, 0]]
     e2 = xyz[tris[:, 2]] - xyz[tris[:, 0]]
     n = cross(e1, e2)
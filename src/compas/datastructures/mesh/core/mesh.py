@@ -6,6 +6,8 @@ import collections
 import sys
 from math import pi
 
+import compas
+
 from compas.datastructures.mesh.core.halfedge import HalfEdge
 
 from compas.files import OBJ
@@ -44,6 +46,12 @@ __all__ = ['BaseMesh']
 class BaseMesh(HalfEdge):
     """Geometric implementation of a half edge data structure for polygon meshses.
 
+    Parameters
+    ----------
+    storage : {'dict', 'compact'}, optional
+        The storage backend of the vertices, halfedges and faces.
+        Default is ``'dict'``.
+
     Attributes
     ----------
     attributes : dict
@@ -94,8 +102,8 @@ class BaseMesh(HalfEdge):
 
     """
 
-    def __init__(self):
-        super(BaseMesh, self).__init__()
+    def __init__(self, storage='dict'):
+        super(BaseMesh, self).__init__(storage=storage)
         self.attributes.update({'name': 'Mesh'})
         self.default_vertex_attributes.update({'x': 0.0, 'y': 0.0, 'z': 0.0})
 
@@ -385,47 +393,73 @@ class BaseMesh(HalfEdge):
         raise NotImplementedError
 
     @classmethod
-    def from_vertices_and_faces(cls, vertices, faces):
+    def from_vertices_and_faces(cls, vertices, faces, storage='dict', validate=False):
         """Construct a mesh object from a list of vertices and faces.
 
         Parameters
         ----------
-        vertices : list, dict
+        vertices : list, dict, array
             A list of vertices, represented by their XYZ coordinates,
-            or a dictionary of vertex keys pointing to their XYZ coordinates.
-        faces : list, dict
+            or a dictionary of vertex keys pointing to their XYZ coordinates,
+            or a ``V x 3`` NumPy array of coordinates.
+        faces : list, dict, array
             A list of faces, represented by a list of indices referencing the list of vertex coordinates,
-            or a dictionary of face keys pointing to a list of indices referencing the list of vertex coordinates.
+            or a dictionary of face keys pointing to a list of indices referencing the list of vertex coordinates,
+            or a ``F x m`` NumPy array of indices.
+        storage : {'dict', 'compact'}, optional
+            The storage backend of the mesh.
+            Default is ``'dict'``.
+        validate : bool, optional
+            Verify that the faces form a manifold mesh.
+            Default is ``False``.
 
         Returns
         -------
         Mesh
             A mesh object.
 
+        Raises
+        ------
+        ValueError
+            If ``validate`` is ``True`` and two faces traverse an edge in the same direction,
+            that is, a halfedge is used by more than one face,
+            which is always the case if an edge is shared by more than two faces.
+            Also if a vertex is shared by otherwise disconnected parts of the mesh.
+
+        Notes
+        -----
+        The halfedge data structure is built in a single pass over all faces.
+        This is much faster than adding the vertices and faces one by one
+        with :meth:`add_vertex` and :meth:`add_face`.
+
         Examples
         --------
-        >>>
+        >>> from compas.datastructures import Mesh
+        >>> mesh = Mesh.from_vertices_and_faces([[0, 0, 0], [1, 0, 0], [1, 1, 0], [0, 1, 0]], [[0, 1, 2, 3]])
+        >>> mesh.number_of_vertices(), mesh.number_of_faces(), mesh.number_of_edges()
+        (4, 1, 4)
         """
-        mesh = cls()
+        mesh = cls._empty(storage)
 
         if sys.version_info[0] < 3:
             mapping = collections.Mapping
         else:
             mapping = collections.abc.Mapping
 
+        if hasattr(vertices, 'tolist'):
+            vertices = vertices.tolist()
+        if hasattr(faces, 'tolist'):
+            faces = faces.tolist()
+
         if isinstance(vertices, mapping):
-            for key, xyz in vertices.items():
-                mesh.add_vertex(key=key, attr_dict={i: j for i, j in zip(['x', 'y', 'z'], xyz)})
+            mesh._add_vertices((key, dict(zip('xyz', xyz))) for key, xyz in vertices.items())
         else:
-            for x, y, z in iter(vertices):
-                mesh.add_vertex(x=x, y=y, z=z)
+            mesh._add_vertices((key, {'x': x, 'y': y, 'z': z}) for key, (x, y, z) in enumerate(vertices))
 
         if isinstance(faces, mapping):
-            for fkey, vertices in faces.items():
-                mesh.add_face(vertices, fkey)
+            mesh._add_faces(((fkey, vertices, {}) for fkey, vertices in faces.items()), validate=validate)
         else:
-            for face in iter(faces):
-                mesh.add_face(face)
+            mesh._add_faces(((None, vertices, {}) for vertices in faces), validate=validate)
 
         return mesh
 
@@ -921,6 +955,78 @@ class BaseMesh(HalfEdge):
             C += angle_points(self.vertex_coordinates(vkey), self.vertex_coordinates(u), self.vertex_coordinates(v))
         return 2 * pi - C
 
+    def vertices_areas(self, keys=None):
+        """Compute the tributary areas of multiple vertices.
+
+        Parameters
+        ----------
+        keys : list, optional
+            The identifiers of the vertices.
+            Default is all vertices.
+
+        Returns
+        -------
+        list
+            The tributary area of every vertex, in the order of ``keys`` or of :meth:`vertices`.
+
+        Notes
+        -----
+        The areas are computed in one vectorized pass if NumPy is available,
+        and vertex by vertex otherwise (for example, in IronPython).
+        """
+        if compas.IPY:
+            return [self.vertex_area(key) for key in (keys if keys is not None else self.vertices())]
+        from compas.datastructures.mesh.core.geometry_numpy import mesh_vertices_areas_numpy
+        return mesh_vertices_areas_numpy(self, keys).tolist()
+
+    def vertices_normals(self, keys=None):
+        """Compute the normals of multiple vertices.
+
+        Parameters
+        ----------
+        keys : list, optional
+            The identifiers of the vertices.
+            Default is all vertices.
+
+        Returns
+        -------
+        list
+            The normal vector of every vertex, in the order of ``keys`` or of :meth:`vertices`.
+
+        Notes
+        -----
+        The normals are computed in one vectorized pass if NumPy is available,
+        and vertex by vertex otherwise (for example, in IronPython).
+        """
+        if compas.IPY:
+            return [self.vertex_normal(key) for key in (keys if keys is not None else self.vertices())]
+        from compas.datastructures.mesh.core.geometry_numpy import mesh_vertices_normals_numpy
+        return mesh_vertices_normals_numpy(self, keys).tolist()
+
+    def vertices_curvatures(self, keys=None):
+        """Compute the dimensionless curvature of multiple vertices.
+
+        Parameters
+        ----------
+        keys : list, optional
+            The identifiers of the vertices.
+            Default is all vertices.
+
+        Returns
+        -------
+        list
+            The curvature of every vertex, in the order of ``keys`` or of :meth:`vertices`.
+
+        Notes
+        -----
+        The curvatures are computed in one vectorized pass if NumPy is available,
+        and vertex by vertex otherwise (for example, in IronPython).
+        """
+        if compas.IPY:
+            return [self.vertex_curvature(key) for key in (keys if keys is not None else self.vertices())]
+        from compas.datastructures.mesh.core.geometry_numpy import mesh_vertices_curvatures_numpy
+        return mesh_vertices_curvatures_numpy(self, keys).tolist()
+
     # --------------------------------------------------------------------------
     # edge geometry
     # --------------------------------------------------------------------------
@@ -1045,6 +1151,30 @@ class BaseMesh(HalfEdge):
         """
         return normalize_vector(self.edge_vector(u, v))
 
+    def edges_lengths(self, edges=None):
+        """Compute the lengths of multiple edges.
+
+        Parameters
+        ----------
+        edges : list, optional
+            The edges, as pairs of vertex identifiers.
+            Default is all edges.
+
+        Returns
+        -------
+        list
+            The length of every edge, in the order of ``edges`` or of :meth:`edges`.
+
+        Notes
+        -----
+        The lengths are computed in one vectorized pass if NumPy is available,
+        and edge by edge otherwise (for example, in IronPython).
+        """
+        if compas.IPY:
+            return [self.edge_length(u, v) for u, v in (edges if edges is not None else self.edges())]
+        from compas.datastructures.mesh.core.geometry_numpy import mesh_edges_lengths_numpy
+        return mesh_edges_lengths_numpy(self, edges).tolist()
+
     # --------------------------------------------------------------------------
     # face geometry
     # --------------------------------------------------------------------------
@@ -1238,6 +1368,81 @@ class BaseMesh(HalfEdge):
         average_distances = average([distance_point_point(point, centroid) for point in points])
         return max_deviation / average_distances
 
+    def faces_normals(self, fkeys=None, unitized=True):
+        """Compute the normals of multiple faces.
+
+        Parameters
+        ----------
+        fkeys : list, optional
+            The identifiers of the faces.
+            Default is all faces.
+        unitized : bool, optional
+            Unitize the normal vectors.
+            Default is ``True``.
+
+        Returns
+        -------
+        list
+            The normal vector of every face, in the order of ``fkeys`` or of :meth:`faces`.
+
+        Notes
+        -----
+        The normals are computed in one vectorized pass if NumPy is available,
+        and face by face otherwise (for example, in IronPython).
+        """
+        if compas.IPY:
+            return [self.face_normal(fkey, unitized) for fkey in (fkeys if fkeys is not None else self.faces())]
+        from compas.datastructures.mesh.core.geometry_numpy import mesh_faces_normals_numpy
+        return mesh_faces_normals_numpy(self, fkeys, unitized).tolist()
+
+    def faces_areas(self, fkeys=None):
+        """Compute the areas of multiple faces.
+
+        Parameters
+        ----------
+        fkeys : list, optional
+            The identifiers of the faces.
+            Default is all faces.
+
+        Returns
+        -------
+        list
+            The area of every face, in the order of ``fkeys`` or of :meth:`faces`.
+
+        Notes
+        -----
+        The areas are computed in one vectorized pass if NumPy is available,
+        and face by face otherwise (for example, in IronPython).
+        """
+        if compas.IPY:
+            return [self.face_area(fkey) for fkey in (fkeys if fkeys is not None else self.faces())]
+        from compas.datastructures.mesh.core.geometry_numpy import mesh_faces_areas_numpy
+        return mesh_faces_areas_numpy(self, fkeys).tolist()
+
+    def faces_centroids(self, fkeys=None):
+        """Compute the centroids of multiple faces.
+
+        Parameters
+        ----------
+        fkeys : list, optional
+            The identifiers of the faces.
+            Default is all faces.
+
+        Returns
+        -------
+        list
+            The centroid of every face, in the order of ``fkeys`` or of :meth:`faces`.
+
+        Notes
+        -----
+        The centroids are computed in one vectorized pass if NumPy is available,
+        and face by face otherwise (for example, in IronPython).
+        """
+        if compas.IPY:
+            return [self.face_centroid(fkey) for fkey in (fkeys if fkeys is not None else self.faces())]
+        from compas.datastructures.mesh.core.geometry_numpy import mesh_faces_centroids_numpy
+        return mesh_faces_centroids_numpy(self, fkeys).tolist()
+
     # --------------------------------------------------------------------------
     # boundary
     # --------------------------------------------------------------------------
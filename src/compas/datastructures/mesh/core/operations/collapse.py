@@ -120,6 +120,9 @@ def mesh_collapse_edge(mesh, u, v, t=0.5, allow_boundary=False, fixed=None):
     if v in fixed or u in fixed:
         return False
 
+    # the vertices of which the connectivity changes
+    touched = set(mesh.halfedge[u]) | set(mesh.halfedge[v]) | set([u, v])
+
     # move U
     x, y, z = mesh.edge_point(u, v, t)
     mesh.vertex[u]['x'] = x
@@ -214,6 +217,8 @@ def mesh_collapse_edge(mesh, u, v, t=0.5, allow_boundary=False, fixed=None):
     del mesh.halfedge[v]
     del mesh.vertex[v]
 
+    mesh.invalidate(vertices=touched)
+
 
 # split this up into more efficient cases
 # - both not on boundary
@@ -286,6 +291,9 @@ def trimesh_collapse_edge(mesh, u, v, t=0.5, allow_boundary=False, fixed=None):
     if v in fixed or u in fixed:
         return False
 
+    # the vertices of which the connectivity changes
+    touched = set(mesh.halfedge[u]) | set(mesh.halfedge[v]) | set([u, v])
+
     # move U
     x, y, z = mesh.edge_point(u, v, t)
 
@@ -364,11 +372,13 @@ def trimesh_collapse_edge(mesh, u, v, t=0.5, allow_boundary=False, fixed=None):
 
     # clean up
     for nu in mesh.halfedge[u]:
-        for nbr in mesh.halfedge[nu]:
+        for nbr in list(mesh.halfedge[nu]):
             if nbr == v:
                 mesh.halfedge[nu][u] = mesh.halfedge[nu][v]
                 del mesh.halfedge[nu][v]
 
+    mesh.invalidate(vertices=touched)
+
     return True
 
 
@@ -78,6 +78,8 @@ def mesh_split_edge(mesh, u, v, t=0.5, allow_boundary=False):
         i = mesh.face[fkey_vu].index(u)
         mesh.face[fkey_vu].insert(i, w)
 
+    mesh.invalidate(geometry=False, vertices=[u, v, w])
+
     return w
 
 
@@ -153,6 +155,8 @@ def trimesh_split_edge(mesh, u, v, t=0.5, allow_boundary=False):
         del mesh.halfedge[v][u]
         del mesh.face[fkey_vu]
 
+    mesh.invalidate(geometry=False, vertices=[u, v, w])
+
     # return the key of the split vertex
     return w
 
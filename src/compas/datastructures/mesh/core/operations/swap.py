@@ -63,6 +63,8 @@ def trimesh_swap_edge(mesh, u, v, allow_boundary=True):
     a = mesh.add_face([o_uv, o_vu, v])
     b = mesh.add_face([o_vu, o_uv, u])
 
+    mesh.invalidate(geometry=False, vertices=[u, v, o_uv, o_vu])
+
     return a, b
 
 
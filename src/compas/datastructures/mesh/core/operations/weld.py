@@ -2,8 +2,7 @@ from __future__ import print_function
 from __future__ import absolute_import
 from __future__ import division
 
-from compas.topology import adjacency_from_edges
-from compas.topology import connected_components
+from compas.topology import connected_components_from_edges
 
 from compas.datastructures.mesh.core.operations.substitute import mesh_substitute_vertex_in_faces
 
@@ -34,7 +33,7 @@ def mesh_unweld_vertices(mesh, fkey, where=None):
 
     """
     face = []
-    vertices = mesh.face_vertices(fkey)
+    vertices = mesh.face_vertices(fkey)[:]
 
     if not where:
         where = vertices
@@ -48,6 +47,7 @@ def mesh_unweld_vertices(mesh, fkey, where=None):
         face.append(u)
 
     mesh.add_face(face, fkey=fkey)
+    mesh.invalidate(geometry=False, vertices=vertices + face)
 
     return face
 
@@ -83,17 +83,9 @@ def mesh_unweld_edges(mesh, edges):
             if not mesh.is_edge_on_boundary(vkey, nbr) and (vkey, nbr) not in edges and (nbr, vkey) not in edges:
                 network_edges.append((old_to_new[mesh.halfedge[vkey][nbr]], old_to_new[mesh.halfedge[nbr][vkey]]))
 
-        adjacency = adjacency_from_edges(network_edges)
-        for key, values in adjacency.items():
-            adjacency[key] = {value: None for value in values}
-        # include non connected vertices
-        edge_vertices = list(set([i for edge in network_edges for i in edge]))
-        for i in range(len(mesh.vertex_faces(vkey))):
-            if i not in edge_vertices:
-                adjacency[i] = {}
-
         # collect the disconnected parts around the vertex due to unwelding
-        vertex_changes[vkey] = [[new_to_old[key] for key in part] for part in connected_components(adjacency)]
+        parts = connected_components_from_edges(network_edges, len(new_to_old))
+        vertex_changes[vkey] = [[new_to_old[key] for key in part] for part in parts]
 
     for vkey, changes in vertex_changes.items():
         # for each disconnected part replace the vertex by a new vertex in the
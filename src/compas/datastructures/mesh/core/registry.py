@@ -0,0 +1,173 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+
+__all__ = ['EdgeRegistry']
+
+
+class EdgeRegistry(object):
+    """Persistent index of the edges of a half-edge data structure.
+
+    The registry is maintained incrementally by the methods of the mesh that change its connectivity,
+    and by the mesh operations (split, collapse, swap, weld, ...).
+    It is created with :meth:`compas.datastructures.HalfEdge.register_edges`.
+
+    Parameters
+    ----------
+    mesh : compas.datastructures.HalfEdge
+        The mesh of which the edges are registered.
+
+    Attributes
+    ----------
+    edges : dict
+        A mapping of edge identifiers to edges, in the order in which the edges were registered.
+        The orientation of an edge is the orientation in which it was first encountered.
+    boundary : set
+        The identifiers of the edges on the boundary.
+
+    Notes
+    -----
+    Edge identifiers are integers that are never reused.
+    An edge keeps its identifier for as long as it exists.
+
+    Examples
+    --------
+    >>> from compas.datastructures import Mesh
+    >>> mesh = Mesh.from_polyhedron(6)
+    >>> registry = mesh.register_edges()
+    >>> len(registry)
+    12
+    >>> key = registry.edge_key(*registry.edge(0))
+    >>> key
+    0
+    """
+
+    def __init__(self, mesh):
+        self.mesh = mesh
+        self.edges = {}
+        self.boundary = set()
+        self._index = {}
+        self._incident = {}
+        self._max_int_key = -1
+        self.update()
+
+    def __len__(self):
+        return len(self.edges)
+
+    def __iter__(self):
+        return iter(list(self.edges.values()))
+
+    def __contains__(self, edge):
+        return edge in self._index
+
+    def edge(self, key):
+        """Get the vertices of a registered edge.
+
+        Parameters
+        ----------
+        key : int
+            The identifier of the edge.
+
+        Returns
+        -------
+        tuple
+            The vertices of the edge.
+        """
+        return self.edges[key]
+
+    def edge_key(self, u, v):
+        """Get the identifier of an edge.
+
+        Parameters
+        ----------
+        u : int
+            The first vertex of the edge.
+        v : int
+            The second vertex of the edge.
+
+        Returns
+        -------
+        int
+            The identifier of the edge, irrespective of its orientation.
+
+        Raises
+        ------
+        KeyError
+            If the edge is not registered.
+        """
+        return self._index[u, v]
+
+    def edges_on_boundary(self):
+        """Get the edges on the boundary, in the order of their identifiers.
+
+        Returns
+        -------
+        list
+            The edges on the boundary.
+        """
+        return [self.edges[key] for key in sorted(self.boundary)]
+
+    def update(self, vertices=None):
+        """Update the edges incident to a number of vertices.
+
+        Parameters
+        ----------
+        vertices : list, optional
+            The vertices with changed connectivity.
+            Default is to update all edges.
+        """
+        halfedge = self.mesh.halfedge
+        if vertices is None:
+            vertices = set(halfedge)
+            vertices.update(self._incident)
+        for u in vertices:
+            for key in list(self._incident.get(u, ())):
+                a, b = self.edges[key]
+                if not (a in halfedge and b in halfedge[a]) and not (b in halfedge and a in halfedge[b]):
+                    self._remove(key)
+            if u not in halfedge:
+                continue
+            for v in halfedge[u]:
+                if (u, v) not in self._index:
+                    self._add(u, v)
+            for key in self._incident.get(u, ()):
+                self._classify(key)
+
+    def _add(self, u, v):
+        key = self._max_int_key = self._max_int_key + 1
+        self.edges[key] = u, v
+        self._index[u, v] = key
+        self._index[v, u] = key
+        self._incident.setdefault(u, set()).add(key)
+        self._incident.setdefault(v, set()).add(key)
+        return key
+
+    def _remove(self, key):
+        u, v = self.edges.pop(key)
+        del self._index[u, v]
+        del self._index[v, u]
+        for w in (u, v):
+            incident = self._incident[w]
+            incident.discard(key)
+            if not incident:
+                del self._incident[w]
+        self.boundary.discard(key)
+
+    def _classify(self, key):
+        u, v = self.edges[key]
+        halfedge = self.mesh.halfedge
+        if u not in halfedge or v not in halfedge or halfedge[u].get(v) is None or halfedge[v].get(u) is None:
+            self.boundary.add(key)
+        else:
+            self.boundary.discard(key)
+
+
+# ==============================================================================
+# Main
+# ==============================================================================
+
+if __name__ == '__main__':
+
+    import doctest
+    doctest.testmod(globs=globals())
@@ -0,0 +1,344 @@
+from __future__ import print_function
+from __future__ import absolute_import
+from __future__ import division
+
+from heapq import heapify
+from heapq import heappop
+from heapq import heappush
+from time import time
+
+from compas.datastructures.mesh.core import trimesh_collapse_edge
+
+
+__all__ = [
+    'mesh_decimate',
+]
+
+
+# the weight of the planes through the feature edges, relative to the planes of the faces
+FEATURE_WEIGHT = 1000.0
+
+
+def mesh_decimate(mesh, target_faces, preserve_boundary=True, seams=None, fixed=None, max_error=None, verbose=False):
+    """Reduce the number of faces of a triangle mesh by collapsing edges in order of the quadric error metric.
+
+    Parameters
+    ----------
+    mesh : Mesh
+        A triangle mesh.
+    target_faces : int
+        The number of faces at which the decimation stops.
+    preserve_boundary : bool, optional [True]
+        Keep the vertices of the boundary on the boundary.
+    seams : list, optional [None]
+        Edges of the mesh that should be preserved in the same way as the boundary,
+        for example the seams of a texture or of another vertex attribute.
+    fixed : list, optional [None]
+        A list of vertices that should not be removed or moved.
+    max_error : float, optional [None]
+        Stop before a collapse with a larger error.
+    verbose : bool, optional [False]
+        Print the number of collapses and the throughput.
+
+    Returns
+    -------
+    dict
+        The number of collapses (``'collapses'``), the number of faces after decimation (``'faces'``),
+        the largest error of a collapse (``'error'``), the time spent in seconds (``'timing'``,
+        a dict with keys ``'setup'`` and ``'collapse'``), and the number of collapses per second (``'rate'``).
+
+    Raises
+    ------
+    ValueError
+        If the mesh has faces that are not triangles.
+
+    Notes
+    -----
+    Every vertex has a quadric, the sum of the squared distances to the planes of its faces, weighted by their area [1]_.
+    The cost of collapsing an edge is the value of the sum of the quadrics of its vertices at the position of the remaining vertex.
+    This position minimises the sum of the quadrics, or, if the minimum is not unique,
+    is the best of the two vertices and the midpoint of the edge.
+
+    The edges are collapsed from a priority queue, cheapest first.
+    Entries of the queue are not removed when the mesh changes.
+    Instead, every vertex has a counter that is incremented when its quadric changes,
+    and entries with outdated counters are discarded when they are taken from the queue.
+    After every collapse, only the edges of the remaining vertex are added to the queue again.
+
+    A collapse is rejected if the vertices have other neighbors in common than the opposite vertices of the faces of the edge,
+    if it would reduce the number of neighbors of these opposite vertices to less than three,
+    if it would flip the normal of a face, or if it would pinch the boundary.
+
+    The edges of the boundary and the seams are feature edges.
+    A vertex on a feature can only be removed by collapsing one of its two feature edges, and remains in place otherwise.
+    Vertices where more or less than two feature edges meet are never removed.
+    The quadrics of the vertices of feature edges include planes through the edges, perpendicular to their faces,
+    which make collapses along curved features expensive.
+
+    References
+    ----------
+    .. [1] Garland, M. and Heckbert, P. *Surface Simplification Using Quadric Error Metrics*.
+           Proceedings of SIGGRAPH 97, pp. 209-216, 1997.
+
+    Examples
+    --------
+    >>> from compas.datastructures import Mesh
+    >>> from compas.datastructures import trimesh_subdivide_loop
+    >>> mesh = trimesh_subdivide_loop(Mesh.from_polyhedron(20), k=2)
+    >>> mesh.number_of_faces()
+    320
+    >>> stats = mesh_decimate(mesh, 100)
+    >>> mesh.number_of_faces()
+    100
+    >>> stats['collapses']
+    110
+    >>> mesh.is_valid()
+    True
+
+    """
+    for fkey in mesh.faces():
+        if len(mesh.face[fkey]) != 3:
+            raise ValueError('Decimation is only defined for triangle meshes.')
+
+    t0 = time()
+    fixed = set(fixed or [])
+    boundary = set(mesh.vertices_on_boundary())
+    features = {key: set() for key in mesh.vertices()}
+    edges = list(seams or [])
+    if preserve_boundary:
+        edges += mesh.edges_on_boundary()
+    for u, v in edges:
+        features[u].add(v)
+        features[v].add(u)
+    quadrics = _vertex_quadrics(mesh, features)
+    stamp = {key: 0 for key in quadrics}
+
+    heap = []
+    for u, v in mesh.edges():
+        entry = _queue_entry(mesh, u, v, quadrics, stamp, fixed, boundary, features)
+        if entry:
+            heap.append(entry)
+    heapify(heap)
+
+    t1 = time()
+    halfedge = mesh.halfedge
+    faces = mesh.number_of_faces()
+    count = 0
+    error = 0.0
+    while heap and faces > target_faces:
+        cost, keep, remove, skeep, sremove, xyz = heappop(heap)
+        if max_error is not None and cost > max_error:
+            break
+        if keep not in halfedge or remove not in halfedge[keep]:
+            continue
+        if stamp[keep] != skeep or stamp[remove] != sremove:
+            continue
+        if not _is_collapse_valid(mesh, keep, remove, xyz, boundary):
+            continue
+        n = (halfedge[keep][remove] is not None) + (halfedge[remove][keep] is not None)
+        nbrs = set(halfedge[keep]) | set(halfedge[remove])
+        if not trimesh_collapse_edge(mesh, keep, remove, t=0.0, allow_boundary=True):
+            continue
+        attr = mesh.vertex[keep]
+        attr['x'], attr['y'], attr['z'] = xyz
+        faces -= n
+        count += 1
+        error = max(error, cost)
+
+        quadrics[keep] = [a + b for a, b in zip(quadrics[keep], quadrics[remove])]
+        stamp[keep] += 1
+        for nbr in features[remove]:
+            features[nbr].discard(remove)
+            if nbr != keep:
+                features[nbr].add(keep)
+                features[keep].add(nbr)
+        for key in nbrs | set([remove]):
+            if key != keep and key not in halfedge:
+                del quadrics[key]
+                del stamp[key]
+                del features[key]
+                boundary.discard(key)
+
+        for nbr in halfedge[keep]:
+            entry = _queue_entry(mesh, keep, nbr, quadrics, stamp, fixed, boundary, features)
+            if entry:
+                heappush(heap, entry)
+
+    if count:
+        # the coordinates of the remaining vertices were set directly
+        mesh.invalidate(topology=False)
+    t2 = time()
+
+    timing = {'setup': t1 - t0, 'collapse': t2 - t1}
+    rate = count / timing['collapse'] if timing['collapse'] > 0 else 0.0
+    if verbose:
+        print('collapses: {0} faces: {1} setup: {2:.3f}s collapse: {3:.3f}s ({4:.0f} collapses per second)'.format(
+            count, faces, timing['setup'], timing['collapse'], rate))
+    return {'collapses': count, 'faces': faces, 'error': error, 'timing': timing, 'rate': rate}
+
+
+# ==============================================================================
+# Helpers
+# ==============================================================================
+
+
+def _plane_quadric(normal, point, weight):
+    """The quadric of the squared distance to a plane, as the upper triangle of a symmetric 4x4 matrix."""
+    a, b, c = normal
+    d = -(a * point[0] + b * point[1] + c * point[2])
+    return [weight * a * a, weight * a * b, weight * a * c, weight * a * d,
+            weight * b * b, weight * b * c, weight * b * d,
+            weight * c * c, weight * c * d,
+            weight * d * d]
+
+
+def _vertex_quadrics(mesh, features):
+    """The sums of the quadrics of the planes of the faces of the vertices, and of the planes through their feature edges."""
+    quadrics = {key: [0.0] * 10 for key in mesh.vertices()}
+    normals = {}
+    for fkey in mesh.faces():
+        face = mesh.face[fkey]
+        a, b, c = [_coordinates(mesh, key) for key in face]
+        n = _normal(a, b, c)
+        length = _length(n)
+        if not length:
+            continue
+        n = [n[0] / length, n[1] / length, n[2] / length]
+        normals[fkey] = n
+        q = _plane_quadric(n, a, 0.5 * length)
+        for key in face:
+            quadrics[key] = [x + y for x, y in zip(quadrics[key], q)]
+    for u in features:
+        for v in features[u]:
+            if u > v:
+                continue
+            a = _coordinates(mesh, u)
+            b = _coordinates(mesh, v)
+            e = [b[0] - a[0], b[1] - a[1], b[2] - a[2]]
+            weight = FEATURE_WEIGHT * (e[0] ** 2 + e[1] ** 2 + e[2] ** 2)
+            for fkey in (mesh.halfedge[u].get(v), mesh.halfedge[v].get(u)):
+                if fkey not in normals:
+                    continue
+                n = normals[fkey]
+                p = [e[1] * n[2] - e[2] * n[1], e[2] * n[0] - e[0] * n[2], e[0] * n[1] - e[1] * n[0]]
+                length = _length(p)
+                if not length:
+                    continue
+                q = _plane_quadric([p[0] / length, p[1] / length, p[2] / length], a, weight)
+                quadrics[u] = [x + y for x, y in zip(quadrics[u], q)]
+                quadrics[v] = [x + y for x, y in zip(quadrics[v], q)]
+    return quadrics
+
+
+def _quadric_error(q, point):
+    x, y, z = point
+    error = (q[0] * x * x + 2 * q[1] * x * y + 2 * q[2] * x * z + 2 * q[3] * x +
+             q[4] * y * y + 2 * q[5] * y * z + 2 * q[6] * y +
+             q[7] * z * z + 2 * q[8] * z +
+             q[9])
+    return max(error, 0.0)
+
+
+def _quadric_minimum(q):
+    """The point where the quadric is minimal, or None if the minimum is not unique."""
+    a = q[0], q[1], q[2]
+    b = q[1], q[4], q[5]
+    c = q[2], q[5], q[7]
+    det = a[0] * (b[1] * c[2] - b[2] * c[1]) - a[1] * (b[0] * c[2] - b[2] * c[0]) + a[2] * (b[0] * c[1] - b[1] * c[0])
+    scale = q[0] + q[4] + q[7]
+    if abs(det) <= 1e-9 * scale ** 3:
+        return None
+    r = -q[3], -q[6], -q[8]
+    x = (r[0] * (b[1] * c[2] - b[2] * c[1]) - a[1] * (r[1] * c[2] - b[2] * r[2]) + a[2] * (r[1] * c[1] - b[1] * r[2])) / det
+    y = (a[0] * (r[1] * c[2] - b[2] * r[2]) - r[0] * (b[0] * c[2] - b[2] * c[0]) + a[2] * (b[0] * r[2] - r[1] * c[0])) / det
+    z = (a[0] * (b[1] * r[2] - r[1] * c[1]) - a[1] * (b[0] * r[2] - r[1] * c[0]) + r[0] * (b[0] * c[1] - b[1] * c[0])) / det
+    return [x, y, z]
+
+
+def _queue_entry(mesh, u, v, quadrics, stamp, fixed, boundary, features):
+    """The cheapest allowed collapse of an edge, as an entry of the queue, or None."""
+    q = [a + b for a, b in zip(quadrics[u], quadrics[v])]
+    positions = None
+    best = None
+    for keep, remove in ((u, v), (v, u)):
+        if remove in fixed:
+            continue
+        if features[remove] and (len(features[remove]) != 2 or keep not in features[remove]):
+            continue
+        if remove in boundary:
+            if keep not in boundary:
+                continue
+            if mesh.halfedge[keep][remove] is not None and mesh.halfedge[remove][keep] is not None:
+                continue
+        if keep in fixed or features[keep] or features[remove]:
+            options = [_coordinates(mesh, keep)]
+        else:
+            if positions is None:
+                point = _quadric_minimum(q)
+                if point:
+                    positions = [point]
+                else:
+                    a = _coordinates(mesh, u)
+                    b = _coordinates(mesh, v)
+                    positions = [a, b, [0.5 * (a[0] + b[0]), 0.5 * (a[1] + b[1]), 0.5 * (a[2] + b[2])]]
+            options = positions
+        for xyz in options:
+            cost = _quadric_error(q, xyz)
+            if best is None or cost < best[0]:
+                best = cost, keep, remove, xyz
+    if best is None:
+        return None
+    cost, keep, remove, xyz = best
+    return cost, keep, remove, stamp[keep], stamp[remove], xyz
+
+
+def _is_collapse_valid(mesh, keep, remove, xyz, boundary):
+    """Verify that collapsing an edge does not change the topology of the mesh or flip faces."""
+    halfedge = mesh.halfedge
+    faces = (halfedge[keep][remove] is not None) + (halfedge[remove][keep] is not None)
+    common = set(halfedge[keep]) & set(halfedge[remove])
+    if len(common) != faces:
+        return False
+    if faces == 2 and keep in boundary and remove in boundary:
+        return False
+    if any(len(halfedge[key]) <= 3 for key in common):
+        return False
+    for key, other in ((keep, remove), (remove, keep)):
+        for fkey in halfedge[key].values():
+            if fkey is None:
+                continue
+            face = mesh.face[fkey]
+            if other in face:
+                continue
+            points = [_coordinates(mesh, vertex) for vertex in face]
+            before = _normal(*points)
+            points[face.index(key)] = xyz
+            after = _normal(*points)
+            if before[0] * after[0] + before[1] * after[1] + before[2] * after[2] <= 0:
+                return False
+    return True
+
+
+def _coordinates(mesh, key):
+    attr = mesh.vertex[key]
+    return [attr['x'], attr['y'], attr['z']]
+
+
+def _normal(a, b, c):
+    u = b[0] - a[0], b[1] - a[1], b[2] - a[2]
+    v = c[0] - a[0], c[1] - a[1], c[2] - a[2]
+    return [u[1] * v[2] - u[2] * v[1], u[2] * v[0] - u[0] * v[2], u[0] * v[1] - u[1] * v[0]]
+
+
+def _length(vector):
+    return (vector[0] ** 2 + vector[1] ** 2 + vector[2] ** 2) ** 0.5
+
+
+# ==============================================================================
+# Main
+# ==============================================================================
+
+if __name__ == "__main__":
+
+    import doctest
+    doctest.testmod(globs=globals())
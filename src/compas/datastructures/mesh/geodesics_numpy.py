@@ -2,25 +2,35 @@ from __future__ import print_function
 from __future__ import absolute_import
 from __future__ import division
 
-from numpy import array
+from numpy import arange
+from numpy import asarray
+from numpy import concatenate
 from numpy import cross
 from numpy import bincount
-from numpy import zeros
+from numpy import einsum
+from numpy import int64
 from numpy import mean
-from numpy import tan
-from numpy import arccos
-from numpy import sum
+from numpy import sqrt
+from numpy import where
+from numpy import zeros
 
+from scipy.sparse import coo_matrix
 from scipy.sparse import spdiags
 from scipy.sparse.linalg import splu
 
 from compas.numerical import normrow
-from compas.numerical import normalizerow
 
-from compas.datastructures.mesh.core import trimesh_cotangent_laplacian_matrix
+from compas.datastructures.mesh.core import mesh_arrays_numpy
+
+
+__all__ = [
+    'mesh_geodesic_distances_numpy',
+    'GeodesicSolver',
+]
 
 
-__all__ = ['mesh_geodesic_distances_numpy']
+# the number of pairs of faces and source sets processed at once
+CHUNKSIZE = 2 ** 18
 
 
 def mesh_geodesic_distances_numpy(mesh, sources, m=1.0):
@@ -33,86 +43,229 @@ def mesh_geodesic_distances_numpy(mesh, sources, m=1.0):
     sources : list
         A list of vertex identifiers from which the distances should be calculated.
     m : float (1.0)
-        ?
+        The time step of the heat flow, as a multiple of the square of the mean edge length.
 
     Returns
     -------
     array
         Distance values.
 
-    """
-    Lc = trimesh_cotangent_laplacian_matrix(mesh)
-
-    key_index = mesh.key_index()
-    vertices = mesh.vertices_attributes('xyz')
-    faces = [[key_index[key] for key in mesh.face_vertices(fkey)] for fkey in mesh.faces()]
-
-    V = array(vertices)
-    F = array(faces, dtype=int)
-
-    e01 = V[F[:, 1]] - V[F[:, 0]]
-    e12 = V[F[:, 2]] - V[F[:, 1]]
-    e20 = V[F[:, 0]] - V[F[:, 2]]
-
-    normal = cross(e01, e12)
-    A2 = normrow(normal)
-    A3 = A2.ravel() / 6
-
-    VA = zeros(V.shape[0])
-    for i in (0, 1, 2):
-        b = bincount(F[:, i], A3)
-        VA[:len(b)] += b
-    VA = spdiags(VA, 0, V.shape[0], V.shape[0])
-
-    h = mean([normrow(e01), normrow(e12), normrow(e20)])
-    t = m * h ** 2
-
-    u0 = zeros(V.shape[0])
-    u0[sources] = 1.0
-
-    # A = VA - t * Lc
-    # print(A.sum(axis=1))
+    Notes
+    -----
+    The distances are computed with a :class:`GeodesicSolver`,
+    which is cached on the mesh for as long as the mesh is not modified.
+    Repeated calls with other sources only solve the prefactored systems.
+
+    Examples
+    --------
+    >>> from compas.datastructures import Mesh
+    >>> mesh = Mesh.from_vertices_and_faces([[0, 0, 0], [1, 0, 0], [1, 1, 0], [0, 1, 0]], [[0, 1, 2], [0, 2, 3]])
+    >>> d = mesh_geodesic_distances_numpy(mesh, [0])
+    >>> d.shape
+    (4,)
+    >>> d.argmin(), d.argmax()
+    (0, 2)
 
-    u = splu((VA - t * Lc).tocsc()).solve(u0)
-
-    unit = normal / A2
-
-    unit_e01 = cross(unit, e01)
-    unit_e12 = cross(unit, e12)
-    unit_e20 = cross(unit, e20)
-
-    grad_u = (
-        unit_e01 * u[F[:, 2], None] +
-        unit_e12 * u[F[:, 0], None] +
-        unit_e20 * u[F[:, 1], None]) / A2
-
-    X = - grad_u / normrow(grad_u)
-
-    div_X = zeros(V.shape[0])
-
-    for i1, i2, i3 in [(0, 1, 2), (1, 2, 0), (2, 0, 1)]:
-        v1 = F[:, i1]
-        v2 = F[:, i2]
-        v3 = F[:, i3]
+    """
+    version = mesh.topology_version, mesh.geometry_version
+    cached = mesh._cache.get('geodesics')
+    if cached is None or cached[0] != version:
+        cached = version, {}
+        mesh._cache['geodesics'] = cached
+    solver = cached[1].get(m)
+    if solver is None:
+        solver = cached[1][m] = GeodesicSolver(mesh, m=m)
+    return solver.distances(sources)
 
-        e1 = V[v2] - V[v1]
-        e2 = V[v3] - V[v1]
-        e0 = V[v3] - V[v2]
 
-        a = 1 / tan(arccos(sum(normalizerow(-e2) * normalizerow(-e0), axis=1)))
-        b = 1 / tan(arccos(sum(normalizerow(-e1) * normalizerow(+e0), axis=1)))
+class GeodesicSolver(object):
+    """Prefactored heat method for the geodesic distances on a triangle mesh, from many sets of sources.
 
-        div_X += bincount(
-            v1,
-            0.5 * (a * sum(e1 * X, axis=1) + b * sum(e2 * X, axis=1)),
-            minlength=V.shape[0])
+    Parameters
+    ----------
+    mesh : compas.datastructures.Mesh
+        A triangle mesh.
+    m : float, optional
+        The time step of the heat flow, as a multiple of the square of the mean edge length.
+        Default is ``1.0``.
 
-    # print(Lc.sum(axis=1))
+    Attributes
+    ----------
+    keys : array
+        The vertex identifiers, in the order of the rows of the distance fields.
+    t : float
+        The time step of the heat flow.
+
+    Raises
+    ------
+    ValueError
+        If the mesh has faces that are not triangles.
+
+    Notes
+    -----
+    The heat method [1]_ computes the distances from a set of sources in three steps:
+
+    * the heat flow ``(M - t L) u = u0`` from the sources is integrated over a single time step,
+    * the gradient of the heat is normalized in every face, ``X = -grad(u) / |grad(u)|``,
+    * the distances are the solution of the Poisson equation ``L phi = div(X)``, shifted to be zero at the sources.
+
+    ``L`` is the cotangent Laplacian and ``M`` the lumped mass matrix of the mesh.
+    The two systems are factorized with a sparse LU decomposition when the solver is created,
+    and the gradient and divergence operators are assembled once.
+    Every query then only requires two back-substitutions and a few vectorized operations,
+    and many sets of sources are solved at once with :meth:`distance_matrix`.
+    The Poisson system is singular, and is regularized with a negligible multiple of the mass matrix.
+
+    The solver is a snapshot of the mesh, and has to be created again if the mesh is modified.
+
+    References
+    ----------
+    .. [1] Crane K., Weischedel C. and Wardetzky M.
+           *Geodesics in Heat: A New Approach to Computing Distance Based on Heat Flow*.
+           ACM Transactions on Graphics 32(5), 2013.
+
+    Examples
+    --------
+    >>> from compas.datastructures import Mesh
+    >>> mesh = Mesh.from_vertices_and_faces([[0, 0, 0], [1, 0, 0], [1, 1, 0], [0, 1, 0]], [[0, 1, 2], [0, 2, 3]])
+    >>> solver = GeodesicSolver(mesh)
+    >>> solver.distance_matrix([[0], [2], [0, 2]]).shape
+    (3, 4)
 
-    phi = splu(Lc.tocsc()).solve(div_X)
-    phi -= phi.min()
+    """
 
-    return phi
+    def __init__(self, mesh, m=1.0):
+        arrays = mesh_arrays_numpy(mesh)
+        V = arrays.vertices
+        F = arrays.faces
+        if F.shape[1] != 3 or (F < 0).any():
+            raise ValueError('The heat method is only defined for triangle meshes.')
+        n = V.shape[0]
+        self.keys = arrays.keys
+        self._key_index = arrays.key_index
+        self._faces = F
+
+        # the edges opposite to the corners of the faces
+        edges = [V[F[:, 2]] - V[F[:, 1]], V[F[:, 0]] - V[F[:, 2]], V[F[:, 1]] - V[F[:, 0]]]
+        normal = cross(edges[2], -edges[1])
+        A2 = normrow(normal).ravel()
+        nonzero = A2 > 0
+        unit = normal / where(nonzero, A2, 1.0)[:, None]
+
+        # the gradient of a linear function in a face, as the coefficients of the values at the corners
+        self._gradient = [cross(unit, e) / where(nonzero, A2, 1.0)[:, None] for e in edges]
+
+        # the cotangents of the corner angles
+        cotangents = []
+        for i in range(3):
+            a = edges[(i + 2) % 3]
+            b = -edges[(i + 1) % 3]
+            cotangents.append(where(nonzero, einsum('ij,ij->i', a, b) / where(nonzero, A2, 1.0), 0.0))
+
+        # the cotangent Laplacian, the divergence and the mass matrix
+        rows = []
+        cols = []
+        data = []
+        columns = 3 * arange(F.shape[0])
+        drows = []
+        dcols = []
+        ddata = []
+        for i in range(3):
+            j = (i + 1) % 3
+            k = (i + 2) % 3
+            w = 0.5 * cotangents[k]
+            rows += [F[:, i], F[:, j], F[:, i], F[:, j]]
+            cols += [F[:, j], F[:, i], F[:, i], F[:, j]]
+            data += [w, w, -w, -w]
+            # the edges from corner i to the two other corners, opposite to the angles at these corners
+            e1 = edges[k]
+            e2 = -edges[j]
+            weights = 0.5 * (cotangents[k][:, None] * e1 + cotangents[j][:, None] * e2)
+            for axis in range(3):
+                drows.append(F[:, i])
+                dcols.append(columns + axis)
+                ddata.append(weights[:, axis])
+        L = coo_matrix((concatenate(data), (concatenate(rows), concatenate(cols))), shape=(n, n)).tocsc()
+        self._divergence = coo_matrix((concatenate(ddata), (concatenate(drows), concatenate(dcols))), shape=(n, 3 * F.shape[0])).tocsr()
+        mass = zeros(n)
+        for i in range(3):
+            mass += bincount(F[:, i], A2 / 6.0, minlength=n)
+        M = spdiags(mass, 0, n, n).tocsc()
+
+        h = mean([normrow(e) for e in edges])
+        self.t = m * h ** 2
+        epsilon = 1e-8 * abs(L.diagonal()).mean() / max(mass.mean(), 1e-300)
+        self._heat = splu((M - self.t * L).tocsc())
+        self._poisson = splu((L - epsilon * M).tocsc())
+
+    def distances(self, sources):
+        """Compute the geodesic distances of all vertices to a set of sources.
+
+        Parameters
+        ----------
+        sources : list
+            The identifiers of the source vertices.
+
+        Returns
+        -------
+        array
+            The distances of the vertices, in the order of :attr:`keys`.
+
+        Examples
+        --------
+        >>> from compas.datastructures import Mesh
+        >>> mesh = Mesh.from_vertices_and_faces([[0, 0, 0], [1, 0, 0], [1, 1, 0], [0, 1, 0]], [[0, 1, 2], [0, 2, 3]])
+        >>> solver = GeodesicSolver(mesh)
+        >>> d = solver.distances([0])
+        >>> d[0]
+        0.0
+        >>> d[2] > d[1]
+        True
+
+        """
+        return self.distance_matrix([sources])[0]
+
+    def distance_matrix(self, sources):
+        """Compute the geodesic distances of all vertices to many sets of sources.
+
+        Parameters
+        ----------
+        sources : list
+            A list of sets of source vertices, as lists of vertex identifiers.
+
+        Returns
+        -------
+        array
+            A matrix with a row per set of sources and a column per vertex, in the order of :attr:`keys`.
+
+        Notes
+        -----
+        The distance fields are computed together, in chunks of at most :data:`CHUNKSIZE` pairs of faces and source sets.
+
+        """
+        key_index = self._key_index
+        n = len(self.keys)
+        result = zeros((len(sources), n))
+        size = max(1, CHUNKSIZE // max(1, self._faces.shape[0]))
+        for start in range(0, len(sources), size):
+            chunk = sources[start:start + size]
+            index = [key_index[key] for keys in chunk for key in keys]
+            column = [i for i, keys in enumerate(chunk) for key in keys]
+            u0 = zeros((n, len(chunk)))
+            u0[asarray(index, dtype=int64), asarray(column, dtype=int64)] = 1.0
+            result[start:start + len(chunk)] = self._solve(u0).T
+        return result
+
+    def _solve(self, u0):
+        F = self._faces
+        u = self._heat.solve(u0)
+        g0, g1, g2 = self._gradient
+        grad = g0[:, :, None] * u[F[:, 0]][:, None, :] + g1[:, :, None] * u[F[:, 1]][:, None, :] + g2[:, :, None] * u[F[:, 2]][:, None, :]
+        length = sqrt(einsum('ijk,ijk->ik', grad, grad))
+        X = -grad / where(length > 0, length, 1.0)[:, None, :]
+        div = self._divergence.dot(X.reshape((-1, u0.shape[1])))
+        phi = self._poisson.solve(div)
+        return phi - phi.min(axis=0)
 
 
 # ==============================================================================
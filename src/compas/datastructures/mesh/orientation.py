@@ -2,7 +2,8 @@ from __future__ import print_function
 from __future__ import absolute_import
 from __future__ import division
 
-from compas.topology import breadth_first_traverse
+from compas.topology import face_adjacency
+from compas.topology import unify_cycles
 
 
 __all__ = [
@@ -12,83 +13,6 @@ __all__ = [
 ]
 
 
-def _mesh_face_adjacency(mesh, nmax=10, radius=10.0):
-    fkey_index = {fkey: index for index, fkey in enumerate(mesh.faces())}
-    index_fkey = {index: fkey for index, fkey in enumerate(mesh.faces())}
-    points = [mesh.face_centroid(fkey) for fkey in mesh.faces()]
-
-    k = min(mesh.number_of_faces(), nmax)
-
-    try:
-        from scipy.spatial import cKDTree
-
-        tree = cKDTree(points)
-        _, closest = tree.query(points, k=k, n_jobs=-1)
-
-    except Exception:
-        # try:
-        #     from Rhino.Geometry import RTree
-        #     from Rhino.Geometry import Sphere
-        #     from Rhino.Geometry import Point3d
-
-        # except Exception:
-        from compas.geometry import KDTree
-
-        tree = KDTree(points)
-        closest = [tree.nearest_neighbors(point, k) for point in points]
-        closest = [[index for xyz, index, d in nnbrs] for nnbrs in closest]
-
-        # else:
-        #     tree = RTree()
-        #     for i, point in enumerate(points):
-        #         tree.Insert(Point3d(* point), i)
-
-        #     def callback(sender, e):
-        #         data = e.Tag
-        #         data.append(e.Id)
-
-        #     closest = []
-        #     for i, point in enumerate(points):
-        #         sphere = Sphere(Point3d(* point), radius)
-        #         data = []
-        #         tree.Search(sphere, callback, data)
-        #         closest.append(data)
-
-    adjacency = {}
-
-    for fkey in mesh.faces():
-        nbrs = []
-        index = fkey_index[fkey]
-        found = set()
-
-        nnbrs = set(closest[index])
-
-        for u, v in mesh.face_halfedges(fkey):
-            for index in nnbrs:
-                nbr = index_fkey[index]
-
-                if nbr == fkey:
-                    continue
-                if nbr in found:
-                    continue
-
-                for a, b in mesh.face_halfedges(nbr):
-                    if v == a and u == b:
-                        nbrs.append(nbr)
-                        found.add(nbr)
-                        break
-
-                for a, b in mesh.face_halfedges(nbr):
-                    if u == a and v == b:
-                        nbrs.append(nbr)
-                        found.add(nbr)
-                        break
-
-        adjacency[fkey] = nbrs
-
-    return adjacency
-
-
 def mesh_face_adjacency(mesh):
     """Build a face adjacency dict.
 
@@ -107,50 +31,20 @@ def mesh_face_adjacency(mesh):
     This algorithm is used primarily to unify the cycle directions of a given mesh.
     Therefore, the premise is that the topological information of the mesh is corrupt
     and cannot be used to construct the adjacency structure. The algorithm is thus
-    purely geometrical, but uses a spatial indexing tree to speed up the search.
-
-    """
-    f = mesh.number_of_faces()
+    based only on the vertices of the faces, and finds the faces that share an edge
+    by hashing the sorted vertices of the edges (see :func:`compas.topology.face_adjacency`).
 
-    if f > 100:
-        return _mesh_face_adjacency(mesh)
+    Examples
+    --------
+    >>> from compas.datastructures import Mesh
+    >>> mesh = Mesh.from_vertices_and_faces([[0, 0, 0], [1, 0, 0], [1, 1, 0], [0, 1, 0]], [[0, 1, 2], [0, 3, 2]])
+    >>> mesh_face_adjacency(mesh)
+    {0: [1], 1: [0]}
 
-    adjacency = {}
-    faces = list(mesh.faces())
-
-    for fkey in mesh.faces():
-        # faces = []
-        # for key in mesh.face_vertices(fkey):
-        #     for nbr in mesh.halfedge[key]:
-        #         fnbr = mesh.halfedge[key][nbr]
-        #         if fnbr is not None:
-        #             faces.append(fnbr)
-
-        nbrs = []
-        found = set()
-
-        for u, v in mesh.face_halfedges(fkey):
-            for nbr in faces:
-                if nbr == fkey:
-                    continue
-                if nbr in found:
-                    continue
-
-                for a, b in mesh.face_halfedges(nbr):
-                    if v == a and u == b:
-                        nbrs.append(nbr)
-                        found.add(nbr)
-                        break
-
-                for a, b in mesh.face_halfedges(nbr):
-                    if u == a and v == b:
-                        nbrs.append(nbr)
-                        found.add(nbr)
-                        break
-
-        adjacency[fkey] = nbrs
-
-    return adjacency
+    """
+    fkeys = list(mesh.faces())
+    adjacency = face_adjacency(None, (mesh.face[fkey] for fkey in fkeys))
+    return {fkeys[index]: [fkeys[nbr] for nbr in nbrs] for index, nbrs in adjacency.items()}
 
 
 def mesh_unify_cycles(mesh, root=None):
@@ -166,36 +60,24 @@ def mesh_unify_cycles(mesh, root=None):
     root : str, optional [None]
         The key of the root face.
 
-    """
-    def unify(node, nbr):
-        # find the common edge
-        for u, v in mesh.face_halfedges(nbr):
-            if u in mesh.face[node] and v in mesh.face[node]:
-                # node and nbr have edge u-v in common
-                i = mesh.face[node].index(u)
-                j = mesh.face[node].index(v)
-                if i == j - 1 or (j == 0 and u == mesh.face[node][-1]):
-                    # if the traversal of a neighboring halfedge
-                    # is in the same direction
-                    # flip the neighbor
-                    mesh.face[nbr][:] = mesh.face[nbr][::-1]
-                    return
+    Examples
+    --------
+    >>> from compas.datastructures import Mesh
+    >>> mesh = Mesh.from_vertices_and_faces([[0, 0, 0], [1, 0, 0], [1, 1, 0], [0, 1, 0]], [[0, 1, 2], [0, 3, 2]])
+    >>> mesh_unify_cycles(mesh, root=0)
+    >>> mesh.face_vertices(1)
+    [2, 3, 0]
 
+    """
+    fkeys = list(mesh.faces())
     if root is None:
         root = mesh.get_any_face()
-
-    adj = mesh_face_adjacency(mesh)
-
-    visited = breadth_first_traverse(adj, root, unify)
-
-    assert len(list(visited)) == mesh.number_of_faces(), 'Not all faces were visited'
-
-    mesh.halfedge = {key: {} for key in mesh.vertices()}
-    for fkey in mesh.faces():
-        for u, v in mesh.face_halfedges(fkey):
-            mesh.halfedge[u][v] = fkey
-            if u not in mesh.halfedge[v]:
-                mesh.halfedge[v][u] = None
+    faces = [list(mesh.face[fkey]) for fkey in fkeys]
+    unified = unify_cycles(None, [face[:] for face in faces], root=fkeys.index(root))
+    for fkey, face, cycle in zip(fkeys, faces, unified):
+        if cycle != face:
+            mesh.face[fkey][:] = cycle
+    _mesh_rebuild_halfedges(mesh)
 
 
 def mesh_flip_cycles(mesh):
@@ -212,13 +94,21 @@ def mesh_flip_cycles(mesh):
     just reverses whatever direction it finds.
 
     """
-    mesh.halfedge = {key: {} for key in mesh.vertices()}
     for fkey in mesh.faces():
         mesh.face[fkey][:] = mesh.face[fkey][::-1]
+    _mesh_rebuild_halfedges(mesh)
+
+
+def _mesh_rebuild_halfedges(mesh):
+    """Reconstruct the halfedges of a mesh from the vertices of its faces."""
+    for key in mesh.vertices():
+        mesh.halfedge[key] = {}
+    for fkey in mesh.faces():
         for u, v in mesh.face_halfedges(fkey):
             mesh.halfedge[u][v] = fkey
             if u not in mesh.halfedge[v]:
                 mesh.halfedge[v][u] = None
+    mesh.invalidate(geometry=False)
 
 
 # ==============================================================================
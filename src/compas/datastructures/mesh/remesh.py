@@ -2,6 +2,13 @@ from __future__ import print_function
 from __future__ import absolute_import
 from __future__ import division
 
+from heapq import heapify
+from heapq import heappop
+from heapq import heappush
+from time import time
+
+import compas
+
 from compas.datastructures.mesh.smoothing import mesh_smooth_area
 from compas.datastructures.mesh.core import trimesh_collapse_edge
 from compas.datastructures.mesh.core import trimesh_swap_edge
@@ -10,6 +17,7 @@ from compas.datastructures.mesh.core import trimesh_split_edge
 
 __all__ = [
     'trimesh_remesh',
+    'trimesh_remesh_queue',
 ]
 
 
@@ -241,6 +249,370 @@ def trimesh_remesh(mesh,
             callback(mesh, k, callback_args)
 
 
+def trimesh_remesh_queue(mesh,
+                         target,
+                         kmax=10,
+                         tol=0.1,
+                         verbose=False,
+                         allow_boundary_split=False,
+                         allow_boundary_swap=False,
+                         allow_boundary_collapse=False,
+                         smooth=True,
+                         fixed=None,
+                         callback=None,
+                         callback_args=None):
+    """Remesh until all edges have a specified target length,
+    processing the edges to split and collapse in order of their length.
+
+    Parameters
+    ----------
+    mesh : Mesh
+        A triangle mesh.
+    target : float
+        The target length for the mesh edges.
+    kmax : int, optional [10]
+        The maximum number of iterations.
+    tol : float, optional [0.1]
+        Length deviation tolerance.
+    verbose : bool, optional [False]
+        Print the number of operations and the timing of every iteration.
+    allow_boundary_split : bool, optional [False]
+        Allow boundary edges to be split.
+    allow_boundary_swap : bool, optional [False]
+        Allow boundary edges or edges connected to the boundary to be swapped.
+    allow_boundary_collapse : bool, optional [False]
+        Allow boundary edges or edges connected to the boundary to be collapsed.
+    smooth : bool, optional [True]
+        Apply smoothing at every iteration.
+    fixed : list, optional [None]
+        A list of vertices that have to stay fixed.
+    callback : callable, optional [None]
+        A user-defined function that is called after every iteration.
+    callback_args : list, optional [None]
+        A list of additional parameters to be passed to the callback function.
+
+    Returns
+    -------
+    dict
+        The number of iterations (``'iterations'``),
+        the number of splits, collapses and swaps (``'split'``, ``'collapse'``, ``'swap'``),
+        the number of edges that are still shorter than the minimum length or longer than the maximum length
+        after the last iteration (``'short'``, ``'long'``),
+        and the time spent in every phase in seconds (``'timing'``, a dict with keys
+        ``'split'``, ``'collapse'``, ``'swap'`` and ``'smooth'``).
+
+    Notes
+    -----
+    Every iteration consists of the same operations as in :func:`trimesh_remesh`,
+    but without sweeping over all edges after every operation.
+
+    * The edges longer than the maximum length are split longest first, from a priority queue.
+      After every split, the new edges are added to the queue if they are still too long,
+      but shorter than the split edge.
+    * The edges shorter than the minimum length are collapsed shortest first, from a priority queue.
+      An edge is not collapsed if this would create an edge longer than the maximum length,
+      or, if it is shorter than half the minimum length, longer than the existing edges of the neighbors as well,
+      if its vertices have other neighbors in common than the opposite vertices of its faces,
+      or if it is an interior edge between two vertices on the boundary.
+      After every collapse, only the edges of the remaining vertex are added to the queue.
+    * Edges are swapped if this reduces the deviation of the valencies of the vertices from their optimal value.
+      The valencies are updated after every operation, and after every swap only the edges of the two faces are checked again.
+      After the first iteration, only the edges around the vertices of which the valency has changed are considered.
+    * The vertices are smoothed with :func:`mesh_smooth_area`.
+
+    The lengths of all edges are computed once per iteration, with NumPy if it is available.
+    The entries of the queues are not removed when the mesh changes.
+    Instead, the edges are verified when they are taken from the queue.
+
+    The iterations stop when no more edges are split, collapsed or swapped,
+    or when the number of splits and collapses has not decreased by at least 10% in three iterations.
+    This happens if some edges cannot reach the target length,
+    for example next to boundary edges that are not allowed to be split,
+    and the same parts of the mesh are split and collapsed again in every iteration.
+    The remaining edges are reported in the returned statistics.
+
+    Examples
+    --------
+    >>> from compas.datastructures import Mesh
+    >>> mesh = Mesh.from_polyhedron(20)
+    >>> stats = trimesh_remesh_queue(mesh, 0.2)
+    >>> stats['split'] > 0
+    True
+    >>> sorted(stats['timing'])
+    ['collapse', 'smooth', 'split', 'swap']
+
+    """
+    lmin = (1 - tol) * (4.0 / 5.0) * target
+    lmax = (1 + tol) * (4.0 / 3.0) * target
+
+    fixed = set(fixed or [])
+    boundary = set(mesh.vertices_on_boundary())
+    valence = {key: len(mesh.halfedge[key]) for key in mesh.vertices()}
+
+    stats = {'iterations': 0, 'split': 0, 'collapse': 0, 'swap': 0}
+    timing = stats['timing'] = {'split': 0.0, 'collapse': 0.0, 'swap': 0.0, 'smooth': 0.0}
+
+    # the vertices of which the valency has changed
+    # all edges are considered for swapping in the first iteration
+    changed = None
+
+    # the lowest number of splits and collapses so far
+    best = None
+    stalled = 0
+
+    for k in range(kmax):
+        t0 = time()
+        long_edges, short_edges = _edges_outside(mesh, lmin, lmax)
+        touched = set()
+        splits = _split_edges(mesh, long_edges, short_edges, lmin, lmax, fixed, boundary, valence, touched, allow_boundary_split)
+        t1 = time()
+        collapses = _collapse_edges(mesh, short_edges, lmin, lmax, fixed, boundary, valence, touched, allow_boundary_collapse)
+        t2 = time()
+        if changed is None:
+            edges = list(mesh.edges())
+        else:
+            edges = _vertices_edges(mesh, changed | touched)
+        changed = set()
+        swaps = _swap_edges(mesh, edges, fixed, boundary, valence, changed, allow_boundary_swap)
+        t3 = time()
+        if smooth:
+            mesh_smooth_area(mesh, fixed=fixed.union(boundary), kmax=1)
+        t4 = time()
+
+        stats['iterations'] += 1
+        stats['split'] += splits
+        stats['collapse'] += collapses
+        stats['swap'] += swaps
+        timing['split'] += t1 - t0
+        timing['collapse'] += t2 - t1
+        timing['swap'] += t3 - t2
+        timing['smooth'] += t4 - t3
+
+        if verbose:
+            print('{0}: split {1} ({2:.3f}s) collapse {3} ({4:.3f}s) swap {5} ({6:.3f}s) smooth ({7:.3f}s)'.format(
+                k, splits, t1 - t0, collapses, t2 - t1, swaps, t3 - t2, t4 - t3))
+
+        if callback:
+            callback(mesh, k, callback_args)
+
+        if not splits and not collapses and not swaps:
+            break
+
+        count = splits + collapses
+        if best is None or count < 0.9 * best or not count:
+            best = count
+            stalled = 0
+        else:
+            stalled += 1
+            if stalled == 3:
+                break
+
+    long_edges, short_edges = _edges_outside(mesh, lmin, lmax)
+    stats['short'] = len(short_edges)
+    stats['long'] = len(long_edges)
+    return stats
+
+
+# ==============================================================================
+# Helpers
+# ==============================================================================
+
+
+def _edge_length(mesh, u, v):
+    a = mesh.vertex[u]
+    b = mesh.vertex[v]
+    return ((a['x'] - b['x']) ** 2 + (a['y'] - b['y']) ** 2 + (a['z'] - b['z']) ** 2) ** 0.5
+
+
+def _distance(attr, x, y, z):
+    return ((attr['x'] - x) ** 2 + (attr['y'] - y) ** 2 + (attr['z'] - z) ** 2) ** 0.5
+
+
+def _nbr_length(mesh, nbr, u, v):
+    """The length of the longest edge between a neighbor and the vertices of an edge."""
+    return max(_edge_length(mesh, nbr, key) for key in (u, v) if key in mesh.halfedge[nbr])
+
+
+def _is_edge(mesh, u, v):
+    return u in mesh.halfedge and v in mesh.halfedge[u]
+
+
+def _edges_outside(mesh, lmin, lmax):
+    """The edges longer than the maximum length, as a max-heap,
+    and the edges shorter than the minimum length, as a min-heap."""
+    if compas.IPY:
+        lengths = [(_edge_length(mesh, u, v), u, v) for u, v in mesh.edges()]
+        long_edges = [(-length, u, v) for length, u, v in lengths if length > lmax]
+        short_edges = [(length, u, v) for length, u, v in lengths if length < lmin]
+    else:
+        from compas.datastructures.mesh.core.arrays_numpy import mesh_arrays_numpy
+        from compas.datastructures.mesh.core.geometry_numpy import mesh_edges_lengths_numpy
+        arrays = mesh_arrays_numpy(mesh)
+        lengths = mesh_edges_lengths_numpy(mesh)
+        keys = arrays.keys
+        edges = arrays.edges
+        selected = lengths > lmax
+        long_edges = list(zip((-lengths[selected]).tolist(), keys[edges[selected, 0]].tolist(), keys[edges[selected, 1]].tolist()))
+        selected = lengths < lmin
+        short_edges = list(zip(lengths[selected].tolist(), keys[edges[selected, 0]].tolist(), keys[edges[selected, 1]].tolist()))
+    heapify(long_edges)
+    heapify(short_edges)
+    return long_edges, short_edges
+
+
+def _vertices_edges(mesh, vertices):
+    """The edges of the vertices and the edges opposite to the vertices in their faces."""
+    edges = []
+    for key in vertices:
+        if key not in mesh.halfedge:
+            continue
+        for nbr, fkey in mesh.halfedge[key].items():
+            edges.append((key, nbr))
+            if fkey is not None:
+                face = mesh.face[fkey]
+                i = face.index(key)
+                edges.append((face[i - 2], face[i - 1]))
+    return edges
+
+
+def _split_edges(mesh, heap, short_edges, lmin, lmax, fixed, boundary, valence, touched, allow_boundary):
+    """Split the edges longer than the maximum length, longest first."""
+    count = 0
+    while heap:
+        _, u, v = heappop(heap)
+        if not _is_edge(mesh, u, v):
+            continue
+        if u in fixed and v in fixed:
+            continue
+        split = _edge_length(mesh, u, v)
+        w = trimesh_split_edge(mesh, u, v, allow_boundary=allow_boundary)
+        if w is None:
+            continue
+        count += 1
+        if u in boundary and v in boundary and (mesh.halfedge[u].get(w) is None or mesh.halfedge[w].get(u) is None):
+            boundary.add(w)
+        valence[w] = len(mesh.halfedge[w])
+        touched.add(w)
+        for nbr in mesh.halfedge[w]:
+            valence[nbr] = len(mesh.halfedge[nbr])
+            touched.add(nbr)
+            length = _edge_length(mesh, w, nbr)
+            if length < lmin:
+                heappush(short_edges, (length, w, nbr))
+            # only edges shorter than the split edge are split again in this iteration,
+            # which excludes edges of triangles of which the longest edge cannot be split
+            elif lmax < length < split:
+                heappush(heap, (-length, w, nbr))
+    return count
+
+
+def _collapse_edges(mesh, heap, lmin, lmax, fixed, boundary, valence, touched, allow_boundary):
+    """Collapse the edges shorter than the minimum length, shortest first."""
+    count = 0
+    while heap:
+        length, u, v = heappop(heap)
+        if not _is_edge(mesh, u, v):
+            continue
+        if u in fixed or v in fixed:
+            continue
+        current = _edge_length(mesh, u, v)
+        if current >= lmin:
+            continue
+        if current != length:
+            # one of the vertices has moved since the edge was queued
+            heappush(heap, (current, u, v))
+            continue
+        if v in boundary and u not in boundary:
+            u, v = v, u
+        # the remaining vertex is moved to the boundary vertex, or otherwise to the midpoint
+        a = mesh.vertex[u]
+        b = mesh.vertex[v]
+        t = 0.0 if u in boundary else 0.5
+        x = a['x'] + t * (b['x'] - a['x'])
+        y = a['y'] + t * (b['y'] - a['y'])
+        z = a['z'] + t * (b['z'] - a['z'])
+        # the end points should only have the opposite vertices of the faces of the edge in common
+        faces = (mesh.halfedge[u][v] is not None) + (mesh.halfedge[v][u] is not None)
+        if len(set(mesh.halfedge[u]) & set(mesh.halfedge[v])) != faces:
+            continue
+        # an interior edge between two boundary vertices would pinch the mesh
+        if faces == 2 and u in boundary and v in boundary:
+            continue
+        nbrs = set(mesh.halfedge[u]) | set(mesh.halfedge[v])
+        nbrs.discard(u)
+        nbrs.discard(v)
+        if current < 0.5 * lmin:
+            # an edge far below the minimum length is collapsed unless this creates an edge longer than the maximum length,
+            # and also longer than the existing edges of the neighbor, which cannot be shortened by keeping the edge
+            if any(_distance(mesh.vertex[nbr], x, y, z) > max(lmax, _nbr_length(mesh, nbr, u, v)) for nbr in nbrs):
+                continue
+        elif any(_distance(mesh.vertex[nbr], x, y, z) > lmax for nbr in nbrs):
+            continue
+        if not trimesh_collapse_edge(mesh, u, v, allow_boundary=allow_boundary, fixed=fixed):
+            continue
+        count += 1
+        boundary.discard(v)
+        valence.pop(v, None)
+        touched.discard(v)
+        for nbr in nbrs:
+            if nbr in mesh.halfedge:
+                valence[nbr] = len(mesh.halfedge[nbr])
+                touched.add(nbr)
+            else:
+                valence.pop(nbr, None)
+                boundary.discard(nbr)
+                touched.discard(nbr)
+        valence[u] = len(mesh.halfedge[u])
+        touched.add(u)
+        for nbr in mesh.halfedge[u]:
+            length = _edge_length(mesh, u, nbr)
+            if length < lmin:
+                heappush(heap, (length, u, nbr))
+    return count
+
+
+def _swap_edges(mesh, edges, fixed, boundary, valence, changed, allow_boundary):
+    """Swap the edges of which the swap reduces the deviation of the valencies from six, or four on the boundary."""
+
+    def optimal(key):
+        return 4 if key in boundary else 6
+
+    stack = edges
+    count = 0
+    while stack:
+        u, v = stack.pop()
+        if not _is_edge(mesh, u, v):
+            continue
+        if u in fixed and v in fixed:
+            continue
+        f1 = mesh.halfedge[u][v]
+        f2 = mesh.halfedge[v][u]
+        if f1 is None or f2 is None:
+            continue
+        face1 = mesh.face[f1]
+        face2 = mesh.face[f2]
+        a = face1[face1.index(u) - 1]
+        b = face2[face2.index(v) - 1]
+        du = valence[u] - optimal(u)
+        dv = valence[v] - optimal(v)
+        da = valence[a] - optimal(a)
+        db = valence[b] - optimal(b)
+        current_error = abs(du) + abs(dv) + abs(da) + abs(db)
+        swapped_error = abs(du - 1) + abs(dv - 1) + abs(da + 1) + abs(db + 1)
+        if current_error <= swapped_error:
+            continue
+        if not trimesh_swap_edge(mesh, u, v, allow_boundary=allow_boundary):
+            continue
+        count += 1
+        valence[u] -= 1
+        valence[v] -= 1
+        valence[a] += 1
+        valence[b] += 1
+        changed.update((u, v, a, b))
+        stack += [(u, a), (a, v), (v, b), (b, u)]
+    return count
+
+
 # ==============================================================================
 # Main
 # ==============================================================================
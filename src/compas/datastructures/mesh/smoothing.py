@@ -2,6 +2,9 @@ from __future__ import print_function
 from __future__ import absolute_import
 from __future__ import division
 
+import compas
+
+from compas.geometry import area_polygon
 from compas.geometry import centroid_points
 from compas.geometry import centroid_polygon
 
@@ -36,35 +39,41 @@ def mesh_smooth_centroid(mesh, fixed=None, kmax=100, damping=0.5, callback=None,
     Exception
         If a callback is provided, but it is not callable.
 
+    Notes
+    -----
+    The neighbors of the vertices are looked up once, in the compact adjacency of the mesh
+    (see :meth:`compas.datastructures.HalfEdge.adjacency_csr`),
+    and the iterations update flat lists of coordinates.
+    The vertices of the mesh are updated before every call to the callback, or otherwise after the last iteration.
+    Modifications of the vertices by the callback are taken into account in the next iteration.
+    With NumPy and SciPy, meshes with many vertices are smoothed with :func:`mesh_smooth_centroid_numpy`.
+
     Examples
     --------
-    >>>
+    >>> from compas.datastructures import Mesh
+    >>> mesh = Mesh.from_vertices_and_faces([[0, 0, 0], [2, 0, 0], [2, 2, 0], [0, 2, 0], [0.5, 0.5, 1.0]],
+    ...                                     [[0, 1, 4], [1, 2, 4], [2, 3, 4], [3, 0, 4]])
+    >>> mesh_smooth_centroid(mesh, fixed=[0, 1, 2, 3], kmax=20)
+    >>> [round(x, 3) for x in mesh.vertex_coordinates(4)]
+    [1.0, 1.0, 0.0]
 
     """
-    if callback:
-        if not callable(callback):
-            raise Exception('Callback is not callable.')
-
-    fixed = fixed or []
-    fixed = set(fixed)
+    _check_callback(callback)
+    if _use_numpy(mesh):
+        from compas.datastructures.mesh.smoothing_numpy import mesh_smooth_centroid_numpy
+        return mesh_smooth_centroid_numpy(mesh, fixed, kmax, damping, callback, callback_args)
 
-    for k in range(kmax):
-        key_xyz = {key: mesh.vertex_coordinates(key) for key in mesh.vertices()}
+    adjacency = mesh.adjacency_csr()
+    indptr = adjacency.indptr
+    indices = adjacency.indices
 
-        for key, attr in mesh.vertices(True):
-            if key in fixed:
-                continue
+    def targets(xyz, free):
+        for index in free:
+            nbrs = indices[indptr[index]:indptr[index + 1]]
+            if nbrs:
+                yield index, centroid_points([xyz[nbr] for nbr in nbrs])
 
-            x, y, z = key_xyz[key]
-
-            cx, cy, cz = centroid_points([key_xyz[nbr] for nbr in mesh.vertex_neighbors(key)])
-
-            attr['x'] += damping * (cx - x)
-            attr['y'] += damping * (cy - y)
-            attr['z'] += damping * (cz - z)
-
-        if callback:
-            callback(k, callback_args)
+    _smooth(mesh, adjacency.keys, fixed, kmax, damping, targets, callback, callback_args)
 
 
 def mesh_smooth_centerofmass(mesh, fixed=None, kmax=100, damping=0.5, callback=None, callback_args=None):
@@ -90,35 +99,41 @@ def mesh_smooth_centerofmass(mesh, fixed=None, kmax=100, damping=0.5, callback=N
     Exception
         If a callback is provided, but it is not callable.
 
+    Notes
+    -----
+    The ordered neighbors of the vertices are looked up once.
+    Vertices with fewer than three neighbors are moved to the centroid of their neighbors.
+    The vertices of the mesh are updated as in :func:`mesh_smooth_centroid`.
+    With NumPy and SciPy, meshes with many vertices are smoothed with :func:`mesh_smooth_centerofmass_numpy`.
+
     Examples
     --------
-    >>>
+    >>> from compas.datastructures import Mesh
+    >>> mesh = Mesh.from_vertices_and_faces([[0, 0, 0], [2, 0, 0], [2, 2, 0], [0, 2, 0], [0.5, 0.5, 1.0]],
+    ...                                     [[0, 1, 4], [1, 2, 4], [2, 3, 4], [3, 0, 4]])
+    >>> mesh_smooth_centerofmass(mesh, fixed=[0, 1, 2, 3], kmax=20)
+    >>> [round(x, 3) for x in mesh.vertex_coordinates(4)]
+    [1.0, 1.0, 0.0]
 
     """
-    if callback:
-        if not callable(callback):
-            raise Exception('Callback is not callable.')
-
-    fixed = fixed or []
-    fixed = set(fixed)
-
-    for k in range(kmax):
-        key_xyz = {key: mesh.vertex_coordinates(key) for key in mesh.vertices()}
+    _check_callback(callback)
+    if _use_numpy(mesh):
+        from compas.datastructures.mesh.smoothing_numpy import mesh_smooth_centerofmass_numpy
+        return mesh_smooth_centerofmass_numpy(mesh, fixed, kmax, damping, callback, callback_args)
 
-        for key, attr in mesh.vertices(True):
-            if key in fixed:
-                continue
+    keys = list(mesh.vertices())
+    key_index = {key: index for index, key in enumerate(keys)}
+    rings = [[key_index[nbr] for nbr in mesh.vertex_neighbors(key, ordered=True)] for key in keys]
 
-            x, y, z = key_xyz[key]
+    def targets(xyz, free):
+        for index in free:
+            ring = rings[index]
+            if len(ring) > 2:
+                yield index, centroid_polygon([xyz[nbr] for nbr in ring])
+            elif ring:
+                yield index, centroid_points([xyz[nbr] for nbr in ring])
 
-            cx, cy, cz = centroid_polygon([key_xyz[nbr] for nbr in mesh.vertex_neighbors(key, ordered=True)])
-
-            attr['x'] += damping * (cx - x)
-            attr['y'] += damping * (cy - y)
-            attr['z'] += damping * (cz - z)
-
-        if callback:
-            callback(k, callback_args)
+    _smooth(mesh, keys, fixed, kmax, damping, targets, callback, callback_args)
 
 
 def mesh_smooth_area(mesh, fixed=None, kmax=100, damping=0.5, callback=None, callback_args=None):
@@ -144,54 +159,106 @@ def mesh_smooth_area(mesh, fixed=None, kmax=100, damping=0.5, callback=None, cal
     Exception
         If a callback is provided, but it is not callable.
 
+    Notes
+    -----
+    The faces of the mesh and around the vertices are looked up once,
+    and the centroids and areas of all faces are computed once per iteration.
+    Vertices of which the surrounding faces have no area are not moved.
+    The vertices of the mesh are updated as in :func:`mesh_smooth_centroid`.
+    With NumPy and SciPy, meshes with many vertices are smoothed with :func:`mesh_smooth_area_numpy`.
+
     Examples
     --------
-    >>>
+    >>> from compas.datastructures import Mesh
+    >>> mesh = Mesh.from_vertices_and_faces([[0, 0, 0], [2, 0, 0], [2, 2, 0], [0, 2, 0], [0.5, 0.5, 0.0]],
+    ...                                     [[0, 1, 4], [1, 2, 4], [2, 3, 4], [3, 0, 4]])
+    >>> mesh_smooth_area(mesh, fixed=[0, 1, 2, 3], kmax=50)
+    >>> [round(x, 3) for x in mesh.vertex_coordinates(4)]
+    [1.0, 1.0, 0.0]
 
     """
-    if callback:
-        if not callable(callback):
-            raise Exception('Callback is not callable.')
-
-    fixed = fixed or []
-    fixed = set(fixed)
-
-    for k in range(kmax):
-        key_xyz = {key: mesh.vertex_coordinates(key)[:] for key in mesh.vertices()}
-        fkey_centroid = {fkey: mesh.face_centroid(fkey) for fkey in mesh.faces()}
-        fkey_area = {fkey: mesh.face_area(fkey) for fkey in mesh.faces()}
-
-        for key, attr in mesh.vertices(True):
-            if key in fixed:
-                continue
-
-            x, y, z = key_xyz[key]
-
+    _check_callback(callback)
+    if _use_numpy(mesh):
+        from compas.datastructures.mesh.smoothing_numpy import mesh_smooth_area_numpy
+        return mesh_smooth_area_numpy(mesh, fixed, kmax, damping, callback, callback_args)
+
+    keys = list(mesh.vertices())
+    key_index = {key: index for index, key in enumerate(keys)}
+    fkeys = list(mesh.faces())
+    fkey_index = {fkey: index for index, fkey in enumerate(fkeys)}
+    faces = [[key_index[key] for key in mesh.face_vertices(fkey)] for fkey in fkeys]
+    vertex_faces = [[fkey_index[fkey] for fkey in mesh.vertex_faces(key)] for key in keys]
+
+    def targets(xyz, free):
+        centroids = []
+        areas = []
+        for face in faces:
+            points = [xyz[index] for index in face]
+            centroids.append(centroid_points(points))
+            areas.append(area_polygon(points))
+        for index in free:
             A = 0
             ax, ay, az = 0, 0, 0
-
-            for fkey in mesh.vertex_faces(key, ordered=True):
-                if fkey is None:
-                    continue
-
-                a = fkey_area[fkey]
-                c = fkey_centroid[fkey]
+            for face in vertex_faces[index]:
+                a = areas[face]
+                c = centroids[face]
                 ax += a * c[0]
                 ay += a * c[1]
                 az += a * c[2]
                 A += a
-
             if A:
-                ax = ax / A
-                ay = ay / A
-                az = az / A
+                yield index, [ax / A, ay / A, az / A]
+
+    _smooth(mesh, keys, fixed, kmax, damping, targets, callback, callback_args)
 
-            attr['x'] += damping * (ax - x)
-            attr['y'] += damping * (ay - y)
-            attr['z'] += damping * (az - z)
 
+# ==============================================================================
+# Helpers
+# ==============================================================================
+
+
+def _use_numpy(mesh, threshold=1000):
+    if compas.IPY or mesh.number_of_vertices() < threshold:
+        return False
+    try:
+        import numpy  # noqa: F401
+        import scipy  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def _check_callback(callback):
+    if callback:
+        if not callable(callback):
+            raise Exception('Callback is not callable.')
+
+
+def _smooth(mesh, keys, fixed, kmax, damping, targets, callback, callback_args):
+    """Move the free vertices towards their targets, computed from the coordinates of the previous iteration."""
+    fixed = set(fixed or [])
+    free = [index for index, key in enumerate(keys) if key not in fixed]
+    xyz = [mesh.vertex_coordinates(key) for key in keys]
+    for k in range(kmax):
+        for index, (tx, ty, tz) in list(targets(xyz, free)):
+            x, y, z = xyz[index]
+            xyz[index] = [x + damping * (tx - x), y + damping * (ty - y), z + damping * (tz - z)]
         if callback:
+            _update_vertices(mesh, keys, xyz, free)
             callback(k, callback_args)
+            # the callback may modify the vertices, for example to project them onto a target
+            xyz = [mesh.vertex_coordinates(key) for key in keys]
+    if kmax and not callback:
+        _update_vertices(mesh, keys, xyz, free)
+
+
+def _update_vertices(mesh, keys, xyz, indices):
+    """Set the coordinates of the vertices with the given indices, and report the modification once."""
+    vertex = mesh.vertex
+    for index in indices:
+        attr = vertex[keys[index]]
+        attr['x'], attr['y'], attr['z'] = xyz[index]
+    mesh.invalidate(topology=False)
 
 
 # ==============================================================================
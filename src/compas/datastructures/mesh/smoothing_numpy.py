@@ -1,9 +1,247 @@
+from __future__ import print_function
+from __future__ import absolute_import
+from __future__ import division
+
+from numpy import add
+from numpy import arange
 from numpy import array
+from numpy import bincount
+from numpy import concatenate
+from numpy import cross
+from numpy import einsum
+from numpy import flatnonzero
+from numpy import float64
+from numpy import int64
+from numpy import ones
+from numpy import sqrt
+from numpy import where
+from numpy import zeros
+from scipy.sparse import coo_matrix
 
+from compas.datastructures.mesh.core import mesh_arrays_numpy
 from compas.datastructures.mesh.core import trimesh_cotangent_laplacian_matrix
+from compas.datastructures.mesh.smoothing import _check_callback
+from compas.datastructures.mesh.smoothing import _update_vertices
+
+
+__all__ = [
+    'mesh_smooth_centroid_numpy',
+    'mesh_smooth_centerofmass_numpy',
+    'mesh_smooth_area_numpy',
+    'trimesh_smooth_laplacian_cotangent',
+]
+
+
+def mesh_smooth_centroid_numpy(mesh, fixed=None, kmax=100, damping=0.5, callback=None, callback_args=None):
+    """Smooth a mesh by moving every free vertex to the centroid of its neighbors, using NumPy and SciPy.
+
+    Parameters
+    ----------
+    mesh : Mesh
+        A mesh object.
+    fixed : list, optional
+        The fixed vertices of the mesh.
+    kmax : int, optional
+        The maximum number of iterations.
+    damping : float, optional
+        The damping factor.
+    callback : callable, optional
+        A user-defined callback function to be executed after every iteration.
+    callback_args : list, optional
+        A list of arguments to be passed to the callback.
+
+    Raises
+    ------
+    Exception
+        If a callback is provided, but it is not callable.
+
+    Notes
+    -----
+    The centroids of the neighbors of the free vertices are the product of a sparse matrix and the vertex coordinates.
+    The matrix is constructed once, from the edges of the mesh, and applied in every iteration.
+    The vertices of the mesh are updated before every call to the callback, or otherwise after the last iteration.
+    Modifications of the vertices by the callback are taken into account in the next iteration.
+
+    See Also
+    --------
+    :func:`compas.datastructures.mesh_smooth_centroid`
+
+    Examples
+    --------
+    >>> from compas.datastructures import Mesh
+    >>> mesh = Mesh.from_vertices_and_faces([[0, 0, 0], [2, 0, 0], [2, 2, 0], [0, 2, 0], [0.5, 0.5, 1.0]],
+    ...                                     [[0, 1, 4], [1, 2, 4], [2, 3, 4], [3, 0, 4]])
+    >>> mesh_smooth_centroid_numpy(mesh, fixed=[0, 1, 2, 3], kmax=20)
+    >>> [round(x, 3) for x in mesh.vertex_coordinates(4)]
+    [1.0, 1.0, 0.0]
+
+    """
+    _check_callback(callback)
+    arrays = mesh_arrays_numpy(mesh)
+    n = len(arrays.keys)
+    u, v = arrays.edges.T
+    rows = concatenate((u, v))
+    cols = concatenate((v, u))
+    degree = bincount(rows, minlength=n)
+    index = _free(arrays, fixed, degree > 0)
+    weights = coo_matrix((1.0 / degree[rows], (rows, cols)), shape=(n, n)).tocsr()[index]
+
+    def targets(xyz):
+        return weights.dot(xyz)
+
+    _smooth_numpy(mesh, arrays, index, kmax, damping, targets, callback, callback_args)
+
 
+def mesh_smooth_centerofmass_numpy(mesh, fixed=None, kmax=100, damping=0.5, callback=None, callback_args=None):
+    """Smooth a mesh by moving every free vertex to the center of mass of the polygon formed by the neighboring vertices,
+    using NumPy and SciPy.
+
+    Parameters
+    ----------
+    mesh : Mesh
+        A mesh object.
+    fixed : list, optional
+        The fixed vertices of the mesh.
+    kmax : int, optional
+        The maximum number of iterations.
+    damping : float, optional
+        The damping factor.
+    callback : callable, optional
+        A user-defined callback function to be executed after every iteration.
+    callback_args : list, optional
+        A list of arguments to be passed to the callback.
+
+    Raises
+    ------
+    Exception
+        If a callback is provided, but it is not callable.
+
+    Notes
+    -----
+    The ordered neighbors of the free vertices are looked up once.
+    In every iteration, the centers of mass of all polygons of neighbors are computed at once,
+    as in :func:`compas.geometry.centroid_polygon`.
+    Vertices with fewer than three neighbors are moved to the centroid of their neighbors.
+
+    See Also
+    --------
+    :func:`compas.datastructures.mesh_smooth_centerofmass`
+
+    Examples
+    --------
+    >>> from compas.datastructures import Mesh
+    >>> mesh = Mesh.from_vertices_and_faces([[0, 0, 0], [2, 0, 0], [2, 2, 0], [0, 2, 0], [0.5, 0.5, 1.0]],
+    ...                                     [[0, 1, 4], [1, 2, 4], [2, 3, 4], [3, 0, 4]])
+    >>> mesh_smooth_centerofmass_numpy(mesh, fixed=[0, 1, 2, 3], kmax=20)
+    >>> [round(x, 3) for x in mesh.vertex_coordinates(4)]
+    [1.0, 1.0, 0.0]
+
+    """
+    _check_callback(callback)
+    arrays = mesh_arrays_numpy(mesh)
+    key_index = arrays.key_index
+    keys = arrays.keys.tolist()
+    rings = [[key_index[nbr] for nbr in mesh.vertex_neighbors(key, ordered=True)] for key in keys]
+    index = _free(arrays, fixed, array([len(ring) > 0 for ring in rings], dtype=bool))
+    rings = [rings[i] for i in index.tolist()]
+    sizes = array([len(ring) for ring in rings], dtype=int64)
+    indices = array([nbr for ring in rings for nbr in ring], dtype=int64)
+    indptr = zeros(len(rings) + 1, dtype=int64)
+    indptr[1:] = sizes.cumsum()
+    owner, previous = _cycles(indptr)
+    first = indptr[:-1]
 
-__all__ = ['trimesh_smooth_laplacian_cotangent']
+    def targets(xyz):
+        points = xyz[indices]
+        o = add.reduceat(points, first, axis=0) / sizes[:, None]
+        oa = points[previous] - o[owner]
+        ob = points - o[owner]
+        n = cross(oa, ob)
+        length = sqrt(einsum('ij,ij->i', n, n))
+        a2 = where(einsum('ij,ij->i', n, n[first][owner]) > 0, length, -length)
+        c = (o[owner] + points[previous] + points) / 3.0
+        A2 = bincount(owner, a2, minlength=len(sizes))
+        centers = zeros((len(sizes), 3))
+        for axis in range(3):
+            centers[:, axis] = bincount(owner, a2 * c[:, axis], minlength=len(sizes))
+        centers /= where(A2 != 0, A2, 1.0)[:, None]
+        centers = where((A2 == 0)[:, None], points[first], centers)
+        return where((sizes <= 3)[:, None], o, centers)
+
+    _smooth_numpy(mesh, arrays, index, kmax, damping, targets, callback, callback_args)
+
+
+def mesh_smooth_area_numpy(mesh, fixed=None, kmax=100, damping=0.5, callback=None, callback_args=None):
+    """Smooth a mesh by moving each vertex to the barycenter of the centroids of the surrounding faces, weighted by area,
+    using NumPy and SciPy.
+
+    Parameters
+    ----------
+    mesh : Mesh
+        A mesh object.
+    fixed : list, optional
+        The fixed vertices of the mesh.
+    kmax : int, optional
+        The maximum number of iterations.
+    damping : float, optional
+        The damping factor.
+    callback : callable, optional
+        A user-defined callback function to be executed after every iteration.
+    callback_args : list, optional
+        A list of arguments to be passed to the callback.
+
+    Raises
+    ------
+    Exception
+        If a callback is provided, but it is not callable.
+
+    Notes
+    -----
+    The sparse incidence matrix of the free vertices and the faces is constructed once.
+    In every iteration, the centroids and areas of all faces are computed at once,
+    as in :func:`compas.geometry.centroid_points` and :func:`compas.geometry.area_polygon`,
+    and accumulated at the vertices with the incidence matrix.
+    Vertices of which the surrounding faces have no area are not moved.
+
+    See Also
+    --------
+    :func:`compas.datastructures.mesh_smooth_area`
+
+    Examples
+    --------
+    >>> from compas.datastructures import Mesh
+    >>> mesh = Mesh.from_vertices_and_faces([[0, 0, 0], [2, 0, 0], [2, 2, 0], [0, 2, 0], [0.5, 0.5, 0.0]],
+    ...                                     [[0, 1, 4], [1, 2, 4], [2, 3, 4], [3, 0, 4]])
+    >>> mesh_smooth_area_numpy(mesh, fixed=[0, 1, 2, 3], kmax=50)
+    >>> [round(x, 3) for x in mesh.vertex_coordinates(4)]
+    [1.0, 1.0, 0.0]
+
+    """
+    _check_callback(callback)
+    arrays = mesh_arrays_numpy(mesh)
+    n = len(arrays.keys)
+    indptr = arrays.face_indptr
+    indices = arrays.face_indices
+    sizes = indptr[1:] - indptr[:-1]
+    face, previous = _cycles(indptr)
+    first = indptr[:-1]
+    incidence = coo_matrix((ones(len(indices)), (indices, face)), shape=(n, len(sizes))).tocsr()
+    incidence.data[:] = 1.0
+    index = _free(arrays, fixed, incidence.getnnz(axis=1) > 0)
+    incidence = incidence[index]
+
+    def targets(xyz):
+        points = xyz[indices]
+        centroids = add.reduceat(points, first, axis=0) / sizes[:, None]
+        relative = points - centroids[face]
+        n = cross(relative[previous], relative)
+        sign = where(einsum('ij,ij->i', n, n[first][face]) > 0, 0.5, -0.5)
+        areas = bincount(face, sign * sqrt(einsum('ij,ij->i', n, n)), minlength=len(sizes))
+        A = incidence.dot(areas)
+        barycenters = incidence.dot(areas[:, None] * centroids) / where(A != 0, A, 1.0)[:, None]
+        return where((A != 0)[:, None], barycenters, xyz[index])
+
+    _smooth_numpy(mesh, arrays, index, kmax, damping, targets, callback, callback_args)
 
 
 def trimesh_smooth_laplacian_cotangent(trimesh, fixed, kmax=10):
@@ -32,6 +270,44 @@ def trimesh_smooth_laplacian_cotangent(trimesh, fixed, kmax=10):
             attr['z'] = V[key][2]
 
 
+# =============================================================================
+# Helpers
+# =============================================================================
+
+
+def _free(arrays, fixed, movable):
+    """The indices of the vertices that are not fixed and can be moved."""
+    movable = movable.copy()
+    key_index = arrays.key_index
+    movable[[key_index[key] for key in fixed or [] if key in key_index]] = False
+    return flatnonzero(movable)
+
+
+def _cycles(indptr):
+    """The cycle and the previous position in the cycle of every position in a list of concatenated cycles."""
+    sizes = indptr[1:] - indptr[:-1]
+    owner = arange(len(sizes)).repeat(sizes)
+    previous = arange(indptr[-1]) - 1
+    previous[indptr[:-1][sizes > 0]] = indptr[1:][sizes > 0] - 1
+    return owner, previous
+
+
+def _smooth_numpy(mesh, arrays, index, kmax, damping, targets, callback, callback_args):
+    """Move the vertices with the given indices towards their targets, computed from the coordinates of the previous iteration."""
+    keys = arrays.keys.tolist()
+    xyz = array(arrays.vertices, dtype=float64)
+    for k in range(kmax):
+        points = targets(xyz)
+        xyz[index] += damping * (points - xyz[index])
+        if callback:
+            _update_vertices(mesh, keys, xyz.tolist(), index.tolist())
+            callback(k, callback_args)
+            # the callback may modify the vertices, for example to project them onto a target
+            xyz = array(mesh.vertices_attributes('xyz', keys=keys), dtype=float64)
+    if kmax and not callback:
+        _update_vertices(mesh, keys, xyz.tolist(), index.tolist())
+
+
 # =============================================================================
 # Main
 # =============================================================================
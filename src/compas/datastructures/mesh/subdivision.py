@@ -4,9 +4,9 @@ from __future__ import division
 
 from math import cos
 from math import pi
-from copy import deepcopy
 
-from compas.geometry import centroid_points
+import compas
+
 from compas.geometry import offset_polygon
 
 from compas.utilities import iterable_like
@@ -25,23 +25,13 @@ __all__ = [
     'mesh_subdivide_doosabin',
     'mesh_subdivide_frames',
     'trimesh_subdivide_loop',
+    'mesh_subdivision_matrix',
+    'SubdivisionMatrix',
 ]
 
 
 def mesh_fast_copy(other):
-    subd = SubdMesh()
-    # subd.attributes = deepcopy(other.attributes)
-    # subd.default_vertex_attributes = deepcopy(other.default_vertex_attributes)
-    # subd.default_face_attributes = deepcopy(other.default_face_attributes)
-    # subd.default_edge_attributes = deepcopy(other.default_edge_attributes)
-    subd.vertex = deepcopy(other.vertex)
-    subd.face = deepcopy(other.face)
-    # subd.edgedata = deepcopy(other.edgedata)
-    subd.facedata = deepcopy(other.facedata)
-    subd.halfedge = deepcopy(other.halfedge)
-    subd._max_int_key = other._max_int_key
-    subd._max_int_fkey = other._max_int_fkey
-    return subd
+    return other.copy(cls=SubdMesh)
 
 
 class SubdMesh(Mesh):
@@ -202,7 +192,7 @@ def mesh_subdivide_quad(mesh, k=1):
     cls = type(mesh)
     subd = mesh_fast_copy(mesh)
     for face in subd.faces():
-        subd.facedata[face]['path'] = [face]
+        subd.face_attribute(face, 'path', [face])
     for _ in range(k):
         faces = {face: subd.face_vertices(face)[:] for face in subd.faces()}
         face_centroid = {face: subd.face_centroid(face) for face in subd.faces()}
@@ -217,7 +207,7 @@ def mesh_subdivide_quad(mesh, k=1):
                 a = ancestor[vertex]
                 d = descendant[vertex]
                 newface = subd.add_face([a, vertex, d, c])
-                subd.facedata[newface]['path'] = subd.facedata[face]['path'] + [i]
+                subd.face_attribute(newface, 'path', subd.face_attribute(face, 'path') + [i])
             del subd.face[face]
             del subd.facedata[face]
     subd2 = cls()
@@ -293,6 +283,10 @@ def mesh_subdivide_catmullclark(mesh, k=1, fixed=None):
     smoothing after every level of further subdivision. Smoothing is done
     according to the scheme prescribed by the Catmull-Clark algorithm.
 
+    The subdivision is computed with a :class:`SubdivisionMatrix`,
+    which is cached on the mesh for as long as its topology does not change.
+    Subdividing the mesh again after moving its vertices only recomputes the coordinates of the subdivided mesh.
+
     Examples
     --------
     >>> box = Box.from_corner_corner_height([0.0, 0.0, 0.0], [1.0, 1.0, 0.0], 1.0)
@@ -307,118 +301,7 @@ def mesh_subdivide_catmullclark(mesh, k=1, fixed=None):
     True
 
     """
-    cls = type(mesh)
-    if not fixed:
-        fixed = []
-    fixed = set(fixed)
-
-    for _ in range(k):
-        subd = mesh_fast_copy(mesh)
-
-        # keep track of original connectivity and vertex locations
-
-        bkeys = set(subd.vertices_on_boundary())
-        bkey_edgepoints = {key: [] for key in bkeys}
-
-        # apply quad meshivision scheme
-        # keep track of the created edge points that are not on the boundary
-        # keep track track of the new edge points on the boundary
-        # and their relation to the previous boundary points
-
-        # quad subdivision
-        # ======================================================================
-
-        edgepoints = []
-
-        for u, v in mesh.edges():
-
-            w = mesh_split_edge(subd, u, v, allow_boundary=True)
-
-            # document why this is necessary
-            # everything else in this loop is just quad subdivision
-            if u in bkeys and v in bkeys:
-
-                bkey_edgepoints[u].append(w)
-                bkey_edgepoints[v].append(w)
-
-                continue
-
-            edgepoints.append(w)
-
-        fkey_xyz = {fkey: mesh.face_centroid(fkey) for fkey in mesh.faces()}
-
-        for fkey in mesh.faces():
-
-            descendant = {i: j for i, j in subd.face_halfedges(fkey)}
-            ancestor = {j: i for i, j in subd.face_halfedges(fkey)}
-
-            x, y, z = fkey_xyz[fkey]
-            c = subd.add_vertex(x=x, y=y, z=z)
-
-            for key in mesh.face_vertices(fkey):
-                a = ancestor[key]
-                d = descendant[key]
-
-                subd.add_face([a, key, d, c])
-
-            del subd.face[fkey]
-
-        # update coordinates
-        # ======================================================================
-
-        # these are the coordinates before updating
-
-        key_xyz = {key: subd.vertex_coordinates(key) for key in subd.vertex}
-
-        # move each edge point to the average of the neighboring centroids and
-        # the original end points
-
-        for w in edgepoints:
-            x, y, z = centroid_points([key_xyz[nbr] for nbr in subd.halfedge[w]])
-
-            subd.vertex[w]['x'] = x
-            subd.vertex[w]['y'] = y
-            subd.vertex[w]['z'] = z
-
-        # move each vertex to the weighted average of itself, the neighboring
-        # centroids and the neighboring mipoints
-
-        for key in mesh.vertices():
-            if key in fixed:
-                continue
-
-            if key in bkeys:
-                nbrs = set(bkey_edgepoints[key])
-                nbrs = [key_xyz[nbr] for nbr in nbrs]
-                e = 0.5
-                v = 0.5
-                E = [coord * e for coord in centroid_points(nbrs)]
-                V = [coord * v for coord in key_xyz[key]]
-                x, y, z = [E[_] + V[_] for _ in range(3)]
-
-            else:
-                fnbrs = [mesh.face_centroid(fkey) for fkey in mesh.vertex_faces(key) if fkey is not None]
-                nbrs = [key_xyz[nbr] for nbr in subd.halfedge[key]]
-                n = float(len(nbrs))
-                f = 1.0 / n
-                e = 2.0 / n
-                v = (n - 3.0) / n
-                F = centroid_points(fnbrs)
-                E = centroid_points(nbrs)
-                V = key_xyz[key]
-                x = f * F[0] + e * E[0] + v * V[0]
-                y = f * F[1] + e * E[1] + v * V[1]
-                z = f * F[2] + e * E[2] + v * V[2]
-
-            subd.vertex[key]['x'] = x
-            subd.vertex[key]['y'] = y
-            subd.vertex[key]['z'] = z
-
-        mesh = subd
-
-    subd2 = cls()
-    subd2.data = mesh.data
-    return subd2
+    return mesh_subdivision_matrix(mesh, 'catmullclark', k=k, fixed=fixed).subdivide(mesh)
 
 
 def mesh_subdivide_doosabin(mesh, k=1, fixed=None):
@@ -431,13 +314,19 @@ def mesh_subdivide_doosabin(mesh, k=1, fixed=None):
     k : int
         Optional. The number of levels of subdivision. Default is ``1``.
     fixed : list
-        Optional. A list of fixed vertices. Default is ``None``.
+        Optional. Not used, since none of the vertices of the mesh are retained by this scheme.
+        Default is ``None``.
 
     Returns
     -------
     Mesh
         A new subdivided mesh.
 
+    Notes
+    -----
+    The subdivision is computed with a :class:`SubdivisionMatrix`,
+    which is cached on the mesh for as long as its topology does not change.
+
     Examples
     --------
     >>> box = Box.from_corner_corner_height([0.0, 0.0, 0.0], [1.0, 1.0, 0.0], 1.0)
@@ -450,88 +339,7 @@ def mesh_subdivide_doosabin(mesh, k=1, fixed=None):
     True
 
     """
-    if not fixed:
-        fixed = []
-
-    fixed = set(fixed)
-
-    cls = type(mesh)
-
-    for _ in range(k):
-        old_xyz = {key: mesh.vertex_coordinates(key) for key in mesh.vertices()}
-        fkey_old_new = {fkey: {} for fkey in mesh.faces()}
-
-        subd = SubdMesh()
-
-        for fkey in mesh.faces():
-            vertices = mesh.face_vertices(fkey)
-            n = len(vertices)
-
-            face = []
-
-            for i in range(n):
-                old = vertices[i]
-
-                cx, cy, cz = 0, 0, 0
-
-                for j in range(n):
-                    x, y, z = old_xyz[vertices[j]]
-
-                    if i == j:
-                        alpha = (n + 5.) / (4. * n)
-                    else:
-                        alpha = (3. + 2. * cos(2. * pi * (i - j) / n)) / (4. * n)
-
-                    cx += alpha * x
-                    cy += alpha * y
-                    cz += alpha * z
-
-                new = subd.add_vertex(cx, cy, cz)
-                fkey_old_new[fkey][old] = new
-
-                face.append(new)
-
-            subd.add_face(face)
-
-        boundary = set(mesh.vertices_on_boundary())
-
-        for key in mesh.vertices():
-            if key in boundary:
-                continue
-
-            face = [fkey_old_new[fkey][key] for fkey in mesh.vertex_faces(key, ordered=True) if fkey is not None]
-
-            subd.add_face(face[::-1])
-
-        edges = set()
-
-        for u in mesh.halfedge:
-            for v in mesh.halfedge[u]:
-                if (u, v) in edges:
-                    continue
-
-                edges.add((u, v))
-                edges.add((v, u))
-
-                uv_fkey = mesh.halfedge[u][v]
-                vu_fkey = mesh.halfedge[v][u]
-
-                if uv_fkey is None or vu_fkey is None:
-                    continue
-
-                face = [
-                    fkey_old_new[uv_fkey][u],
-                    fkey_old_new[vu_fkey][u],
-                    fkey_old_new[vu_fkey][v],
-                    fkey_old_new[uv_fkey][v]
-                ]
-                subd.add_face(face)
-
-        mesh = subd
-
-    subd2 = cls()
-    subd2.data = mesh.data
-    return subd2
+    return mesh_subdivision_matrix(mesh, 'doosabin', k=k).subdivide(mesh)
 
 
 def mesh_subdivide_frames(mesh, offset, add_windows=False):
@@ -620,6 +428,16 @@ def trimesh_subdivide_loop(mesh, k=1, fixed=None):
     Mesh
         A new subdivided mesh.
 
+    Raises
+    ------
+    ValueError
+        If the mesh has faces that are not triangles.
+
+    Notes
+    -----
+    The subdivision is computed with a :class:`SubdivisionMatrix`,
+    which is cached on the mesh for as long as its topology does not change.
+
     Examples
     --------
     Make a low poly mesh from a box shape.
@@ -641,103 +459,402 @@ def trimesh_subdivide_loop(mesh, k=1, fixed=None):
     True
 
     """
-    cls = type(mesh)
+    return mesh_subdivision_matrix(mesh, 'loop', k=k, fixed=fixed).subdivide(mesh)
 
-    if not fixed:
-        fixed = []
 
-    fixed = set(fixed)
+# ==============================================================================
+# Subdivision matrices
+# ==============================================================================
 
-    subd = mesh_fast_copy(mesh)
 
-    for _ in range(k):
-        key_xyz = {key: subd.vertex_coordinates(key) for key in subd.vertices()}
-        fkey_vertices = {fkey: subd.face_vertices(fkey)[:] for fkey in subd.faces()}
-        uv_w = {(u, v): subd.face_vertex_ancestor(fkey, u) for fkey in subd.faces() for u, v in subd.face_halfedges(fkey)}
-        boundary = set(subd.vertices_on_boundary())
+def mesh_subdivision_matrix(mesh, scheme='catmullclark', k=1, fixed=None):
+    """Get the subdivision matrix of a mesh.
 
-        for key in subd.vertices():
-            nbrs = subd.vertex_neighbors(key)
+    Parameters
+    ----------
+    mesh : Mesh
+        The control mesh.
+    scheme : {'catmullclark', 'doosabin', 'loop'}, optional
+        The subdivision scheme.
+        Default is ``'catmullclark'``.
+    k : int, optional
+        The number of levels of subdivision.
+        Default is ``1``.
+    fixed : list, optional
+        A list of fixed vertices.
+        Default is ``None``.
 
-            if key in boundary:
-                xyz = key_xyz[key]
+    Returns
+    -------
+    :class:`SubdivisionMatrix`
+        The subdivision matrix.
+        The same object is returned for as long as the topology of the mesh does not change.
 
-                x = 0.75 * xyz[0]
-                y = 0.75 * xyz[1]
-                z = 0.75 * xyz[2]
+    Examples
+    --------
+    >>> mesh = Mesh.from_polyhedron(6)
+    >>> matrix = mesh_subdivision_matrix(mesh, 'catmullclark', k=2)
+    >>> len(matrix.faces)
+    96
+    >>> mesh_subdivision_matrix(mesh, 'catmullclark', k=2) is matrix
+    True
 
-                for n in nbrs:
-                    if subd.halfedge[key][n] is None or subd.halfedge[n][key] is None:
-                        xyz = key_xyz[n]
+    """
+    version = mesh.topology_version
+    cached = mesh._cache.get('subdivision')
+    if cached is None or cached[0] != version:
+        cached = version, {}
+        mesh._cache['subdivision'] = cached
+    options = scheme, k, frozenset(fixed or [])
+    matrix = cached[1].get(options)
+    if matrix is None:
+        matrix = cached[1][options] = SubdivisionMatrix(mesh, scheme=scheme, k=k, fixed=fixed)
+    return matrix
 
-                        x += 0.125 * xyz[0]
-                        y += 0.125 * xyz[1]
-                        z += 0.125 * xyz[2]
 
-            else:
-                n = len(nbrs)
+class SubdivisionMatrix(object):
+    """The vertex rules and the connectivity of the subdivision of a control mesh.
 
-                if n == 3:
-                    a = 3. / 16.
-                else:
-                    a = 3. / (8 * n)
-
-                xyz = key_xyz[key]
+    Parameters
+    ----------
+    mesh : Mesh
+        The control mesh.
+    scheme : {'catmullclark', 'doosabin', 'loop'}, optional
+        The subdivision scheme.
+        Default is ``'catmullclark'``.
+    k : int, optional
+        The number of levels of subdivision.
+        Default is ``1``.
+    fixed : list, optional
+        A list of fixed vertices.
+        Default is ``None``.
+
+    Attributes
+    ----------
+    keys : list
+        The vertices of the control mesh, in the order of the columns of the matrix.
+    levels : list
+        For every level of subdivision, the stencils of the vertices of that level.
+        A stencil is a dict mapping the indices of the vertices of the previous level to their weights.
+    faces : list
+        The faces of the subdivided mesh, as lists of indices of the vertices of the last level.
+    retained : int
+        The number of vertices of the control mesh that are also vertices of the subdivided mesh.
+        These are the first vertices of every level.
 
-                nbrs = [key_xyz[nbr] for nbr in nbrs]
-                nbrs = [sum(axis) for axis in zip(*nbrs)]
+    Raises
+    ------
+    ValueError
+        If the scheme is not supported, or if the Loop scheme is applied to faces that are not triangles.
 
-                x = (1. - n * a) * xyz[0] + a * nbrs[0]
-                y = (1. - n * a) * xyz[1] + a * nbrs[1]
-                z = (1. - n * a) * xyz[2] + a * nbrs[2]
+    Notes
+    -----
+    The connectivity of every level is computed directly from the faces of the previous level,
+    without constructing the intermediate meshes.
+    The coordinates of the subdivided mesh are the product of the matrices of all levels and the coordinates of the control mesh.
+    With NumPy and SciPy, the levels are multiplied once into a single sparse matrix
+    if the subdivided mesh has at least :attr:`numpy_threshold` vertices.
 
-            subd.vertex[key]['x'] = x
-            subd.vertex[key]['y'] = y
-            subd.vertex[key]['z'] = z
+    Examples
+    --------
+    >>> mesh = Mesh.from_vertices_and_faces([[0, 0, 0], [1, 0, 0], [1, 1, 0], [0, 1, 0]], [[0, 1, 2, 3]])
+    >>> matrix = SubdivisionMatrix(mesh, 'catmullclark')
+    >>> matrix.faces[0]
+    [4, 0, 5, 8]
+    >>> matrix.apply(mesh.vertices_attributes('xyz'))[8]
+    [0.5, 0.5, 0.0]
 
-        edgepoints = {}
+    """
 
-        # odd vertices
-        for u, v in list(subd.edges()):
+    numpy_threshold = 10000
+
+    def __init__(self, mesh, scheme='catmullclark', k=1, fixed=None):
+        if scheme not in _SCHEMES:
+            raise ValueError('Scheme not supported: {}'.format(scheme))
+        kernel, retained = _SCHEMES[scheme]
+        self.scheme = scheme
+        self.keys = list(mesh.vertices())
+        key_index = {key: index for index, key in enumerate(self.keys)}
+        fixed = set(key_index[key] for key in fixed or [] if key in key_index)
+        faces = [[key_index[key] for key in mesh.face_vertices(fkey)] for fkey in mesh.faces()]
+        n = len(self.keys)
+        self.levels = []
+        for _ in range(k):
+            stencils, faces = kernel(n, faces, fixed)
+            self.levels.append(stencils)
+            n = len(stencils)
+        self.faces = faces
+        self.retained = len(self.keys) if retained else 0
+        self._matrix = None
+
+    def __len__(self):
+        return len(self.levels[-1]) if self.levels else len(self.keys)
+
+    def _use_numpy(self):
+        if compas.IPY or len(self) < self.numpy_threshold:
+            return False
+        try:
+            import numpy  # noqa: F401
+            import scipy  # noqa: F401
+        except ImportError:
+            return False
+        return True
+
+    def apply(self, points):
+        """Compute the vertex coordinates of the subdivided mesh.
+
+        Parameters
+        ----------
+        points : list
+            The coordinates of the vertices of the control mesh, in the order of :attr:`keys`.
+
+        Returns
+        -------
+        list
+            The coordinates of the vertices of the subdivided mesh.
+
+        """
+        if self._use_numpy():
+            from compas.datastructures.mesh.subdivision_numpy import subdivision_matrix_numpy
+            return subdivision_matrix_numpy(self).dot(points).tolist()
+        points = [list(point) for point in points]
+        for stencils in self.levels:
+            points = [_weighted_sum(stencil, points) for stencil in stencils]
+        return points
+
+    def subdivide(self, mesh, cls=None):
+        """Construct the subdivided mesh from the current vertex coordinates of the control mesh.
+
+        Parameters
+        ----------
+        mesh : Mesh
+            The control mesh.
+        cls : Mesh, optional
+            The type of the subdivided mesh.
+            Default is the type of the control mesh.
+
+        Returns
+        -------
+        Mesh
+            The subdivided mesh.
+            The retained vertices keep their identifiers and attributes,
+            and the new vertices are numbered after the vertices of the control mesh.
+
+        """
+        cls = cls or type(mesh)
+        points = self.apply(mesh.vertices_attributes('xyz', keys=self.keys))
+        keys = self.keys[:self.retained]
+        start = mesh._max_int_key + 1 if keys else 0
+        keys += list(range(start, start + len(points) - len(keys)))
+        vertices = []
+        for index, (key, (x, y, z)) in enumerate(zip(keys, points)):
+            attr = dict(mesh.vertex[key]) if index < self.retained else {}
+            attr.update(x=x, y=y, z=z)
+            vertices.append((key, attr))
+        subd = cls._empty(mesh.storage)
+        subd.attributes.update(mesh.attributes)
+        subd.default_vertex_attributes.update(mesh.default_vertex_attributes)
+        subd.default_edge_attributes.update(mesh.default_edge_attributes)
+        subd.default_face_attributes.update(mesh.default_face_attributes)
+        subd._add_vertices(vertices)
+        subd._add_faces((None, [keys[index] for index in face], {}) for face in self.faces)
+        return subd
 
-            w = mesh_split_edge(subd, u, v, allow_boundary=True)
 
-            edgepoints[(u, v)] = w
-            edgepoints[(v, u)] = w
+# ==============================================================================
+# Helpers
+# ==============================================================================
 
-            a = key_xyz[u]
-            b = key_xyz[v]
 
-            if (u, v) in uv_w and (v, u) in uv_w:
-                c = key_xyz[uv_w[(u, v)]]
-                d = key_xyz[uv_w[(v, u)]]
-                xyz = [(3.0 / 8.0) * (a[i] + b[i]) + (1.0 / 8.0) * (c[i] + d[i]) for i in range(3)]
+def _weighted_sum(stencil, points):
+    x, y, z = 0.0, 0.0, 0.0
+    for index, weight in stencil.items():
+        point = points[index]
+        x += weight * point[0]
+        y += weight * point[1]
+        z += weight * point[2]
+    return [x, y, z]
 
-            else:
-                xyz = [0.5 * (a[i] + b[i]) for i in range(3)]
 
-            subd.vertex[w]['x'] = xyz[0]
-            subd.vertex[w]['y'] = xyz[1]
-            subd.vertex[w]['z'] = xyz[2]
+def _accumulate(stencil, vertices, weight):
+    for vertex in vertices:
+        stencil[vertex] = stencil.get(vertex, 0.0) + weight
 
-        # new faces
-        for fkey, vertices in fkey_vertices.items():
-            u, v, w = vertices
 
-            uv = edgepoints[(u, v)]
-            vw = edgepoints[(v, w)]
-            wu = edgepoints[(w, u)]
+def _topology(faces):
+    """The face and the previous vertex in the face of every halfedge, and the edges in order of appearance."""
+    halfedge_face = {}
+    halfedge_previous = {}
+    edges = []
+    edge_index = {}
+    for f, face in enumerate(faces):
+        for p, u, v in zip(face[-2:] + face[:-2], face[-1:] + face[:-1], face):
+            halfedge_face[u, v] = f
+            halfedge_previous[u, v] = p
+            if (u, v) not in edge_index:
+                edge_index[u, v] = edge_index[v, u] = len(edges)
+                edges.append((u, v))
+    return halfedge_face, halfedge_previous, edges, edge_index
 
-            subd.add_face([wu, u, uv])
-            subd.add_face([uv, v, vw])
-            subd.add_face([vw, w, wu])
-            subd.add_face([uv, vw, wu])
 
-            del subd.face[fkey]
+def _catmullclark(n, faces, fixed):
+    """Stencils and faces of one level of Catmull-Clark subdivision.
 
-    subd2 = cls()
-    subd2.data = subd.data
-    return subd2
+    The vertices of the new level are the vertices of the previous level,
+    followed by the edge points in order of appearance of the edges, and the face points.
+    """
+    halfedge_face, _, edges, edge_index = _topology(faces)
+    m = len(edges)
+    nbrs = [[] for _ in range(n)]
+    boundary = [[] for _ in range(n)]
+    vertex_faces = [[] for _ in range(n)]
+    for f, face in enumerate(faces):
+        for vertex in face:
+            vertex_faces[vertex].append(f)
+    facepoints = []
+    for face in faces:
+        facepoints.append(dict.fromkeys(face, 1.0 / len(face)))
+    edgepoints = []
+    for u, v in edges:
+        nbrs[u].append(v)
+        nbrs[v].append(u)
+        f1 = halfedge_face.get((u, v))
+        f2 = halfedge_face.get((v, u))
+        if f1 is None or f2 is None:
+            boundary[u].append(v)
+            boundary[v].append(u)
+            edgepoints.append({u: 0.5, v: 0.5})
+            continue
+        # the average of the end points and the neighboring face points
+        stencil = {u: 0.25, v: 0.25}
+        _accumulate(stencil, faces[f1], 0.25 / len(faces[f1]))
+        _accumulate(stencil, faces[f2], 0.25 / len(faces[f2]))
+        edgepoints.append(stencil)
+    vertexpoints = []
+    for i in range(n):
+        if i in fixed or not nbrs[i]:
+            vertexpoints.append({i: 1.0})
+        elif boundary[i]:
+            # the average of the vertex and the midpoints of the boundary edges
+            stencil = {i: 0.75}
+            _accumulate(stencil, boundary[i], 0.25 / len(boundary[i]))
+            vertexpoints.append(stencil)
+        else:
+            # (F + 2 * E + (n - 3) * V) / n,
+            # with F the average of the neighboring face points and E the average of the neighboring edge midpoints
+            valence = float(len(nbrs[i]))
+            stencil = {i: (valence - 2.0) / valence}
+            _accumulate(stencil, nbrs[i], 1.0 / (valence * valence))
+            for f in vertex_faces[i]:
+                _accumulate(stencil, faces[f], 1.0 / (valence * len(vertex_faces[i]) * len(faces[f])))
+            vertexpoints.append(stencil)
+    subfaces = []
+    for f, face in enumerate(faces):
+        c = n + m + f
+        for a, b, d in zip(face[-1:] + face[:-1], face, face[1:] + face[:1]):
+            subfaces.append([n + edge_index[a, b], b, n + edge_index[b, d], c])
+    return vertexpoints + edgepoints + facepoints, subfaces
+
+
+def _loop(n, faces, fixed):
+    """Stencils and faces of one level of Loop subdivision.
+
+    The vertices of the new level are the vertices of the previous level,
+    followed by the edge points in order of appearance of the edges.
+    """
+    if any(len(face) != 3 for face in faces):
+        raise ValueError('Loop subdivision is only defined for triangle meshes.')
+    halfedge_face, halfedge_previous, edges, edge_index = _topology(faces)
+    nbrs = [[] for _ in range(n)]
+    boundary = [[] for _ in range(n)]
+    edgepoints = []
+    for u, v in edges:
+        nbrs[u].append(v)
+        nbrs[v].append(u)
+        if (u, v) in halfedge_face and (v, u) in halfedge_face:
+            stencil = {u: 3.0 / 8.0, v: 3.0 / 8.0}
+            _accumulate(stencil, (halfedge_previous[u, v], halfedge_previous[v, u]), 1.0 / 8.0)
+            edgepoints.append(stencil)
+        else:
+            boundary[u].append(v)
+            boundary[v].append(u)
+            edgepoints.append({u: 0.5, v: 0.5})
+    vertexpoints = []
+    for i in range(n):
+        if i in fixed or not nbrs[i]:
+            vertexpoints.append({i: 1.0})
+        elif boundary[i]:
+            stencil = {i: 0.75}
+            _accumulate(stencil, boundary[i], 0.125)
+            vertexpoints.append(stencil)
+        else:
+            valence = len(nbrs[i])
+            a = 3.0 / 16.0 if valence == 3 else 3.0 / (8.0 * valence)
+            stencil = {i: 1.0 - valence * a}
+            _accumulate(stencil, nbrs[i], a)
+            vertexpoints.append(stencil)
+    subfaces = []
+    for u, v, w in faces:
+        uv = n + edge_index[u, v]
+        vw = n + edge_index[v, w]
+        wu = n + edge_index[w, u]
+        subfaces += [[wu, u, uv], [uv, v, vw], [vw, w, wu], [uv, vw, wu]]
+    return vertexpoints + edgepoints, subfaces
+
+
+def _doosabin(n, faces, fixed):
+    """Stencils and faces of one level of Doo-Sabin subdivision.
+
+    Every corner of every face is a vertex of the new level, in the order of the faces.
+    """
+    halfedge_face, halfedge_previous, edges, _ = _topology(faces)
+    stencils = []
+    corner = {}
+    subfaces = []
+    outgoing = {}
+    for f, face in enumerate(faces):
+        m = len(face)
+        for i, u in enumerate(face):
+            corner[f, u] = len(stencils)
+            stencil = {}
+            for j, v in enumerate(face):
+                if i == j:
+                    stencil[v] = (m + 5.0) / (4.0 * m)
+                else:
+                    stencil[v] = (3.0 + 2.0 * cos(2.0 * pi * (i - j) / m)) / (4.0 * m)
+            stencils.append(stencil)
+            outgoing.setdefault(u, (u, face[(i + 1) % m]))
+        subfaces.append([corner[f, u] for u in face])
+    boundary = set()
+    for u, v in edges:
+        f1 = halfedge_face.get((u, v))
+        f2 = halfedge_face.get((v, u))
+        if f1 is None or f2 is None:
+            boundary.update((u, v))
+            continue
+        subfaces.append([corner[f1, u], corner[f2, u], corner[f2, v], corner[f1, v]])
+    for u in range(n):
+        if u in boundary or u not in outgoing:
+            continue
+        # the corners of the faces around the vertex,
+        # in the opposite direction of the cycles of the faces
+        face = []
+        start = uv = outgoing[u]
+        while True:
+            f = halfedge_face[uv]
+            face.append(corner[f, u])
+            uv = u, halfedge_previous[uv]
+            if uv == start:
+                break
+        subfaces.append(face)
+    return stencils, subfaces
+
+
+_SCHEMES = {
+    'catmullclark': (_catmullclark, True),
+    'doosabin': (_doosabin, False),
+    'loop': (_loop, True),
+}
 
 
 # ==============================================================================
@@ -747,28 +864,7 @@ def trimesh_subdivide_loop(mesh, k=1, fixed=None):
 if __name__ == "__main__":
 
     import doctest
-    import compas  # noqa: F401
     from compas.datastructures import mesh_quads_to_triangles  # noqa: F401
     from compas.datastructures import Mesh
     from compas.geometry import Box  # noqa: F401
     doctest.testmod(globs=globals())
-
-    # from compas.datastructures import Mesh
-    # from compas.geometry import Box
-    # from compas.utilities import print_profile
-    # from compas_viewers.multimeshviewer import MultiMeshViewer
-
-    # subdivide = print_profile(mesh_subdivide_quad)
-
-    # box = Box.from_width_height_depth(10.0, 10.0, 10.0)
-    # mesh = Mesh.from_shape(box)
-    # mesh.default_face_attributes.update(path=[])
-    # subd = subdivide(mesh, k=3)
-
-    # print(subd.face_attribute(subd.get_any_face(), 'path'))
-
-    # # print(mesh.number_of_faces())
-
-    # viewer = MultiMeshViewer()
-    # viewer.meshes = [subd]
-    # viewer.show()
@@ -0,0 +1,74 @@
+from __future__ import print_function
+from __future__ import absolute_import
+from __future__ import division
+
+from numpy import array
+from numpy import float64
+from numpy import int64
+from scipy.sparse import csr_matrix
+from scipy.sparse import identity
+
+
+__all__ = [
+    'subdivision_matrix_numpy',
+]
+
+
+def subdivision_matrix_numpy(matrix):
+    """Get the subdivision matrix of all levels of subdivision as a single sparse matrix.
+
+    Parameters
+    ----------
+    matrix : :class:`compas.datastructures.SubdivisionMatrix`
+        The subdivision matrix.
+
+    Returns
+    -------
+    scipy.sparse.csr_matrix
+        A sparse matrix with a row per vertex of the subdivided mesh and a column per vertex of the control mesh.
+        The matrix is computed once, and cached on the subdivision matrix.
+
+    Examples
+    --------
+    >>> from compas.datastructures import Mesh
+    >>> from compas.datastructures import mesh_subdivision_matrix
+    >>> mesh = Mesh.from_polyhedron(6)
+    >>> S = subdivision_matrix_numpy(mesh_subdivision_matrix(mesh, 'catmullclark', k=2))
+    >>> S.shape
+    (98, 8)
+    >>> xyz = S.dot(mesh.vertices_attributes('xyz'))
+
+    """
+    if matrix._matrix is None:
+        S = identity(len(matrix.keys), format='csr')
+        for stencils in matrix.levels:
+            S = _stencil_matrix(stencils, S.shape[0]).dot(S)
+        matrix._matrix = S
+    return matrix._matrix
+
+
+# ==============================================================================
+# Helpers
+# ==============================================================================
+
+
+def _stencil_matrix(stencils, n):
+    """The sparse matrix of the stencils of one level, with ``n`` columns."""
+    indptr = [0]
+    indices = []
+    data = []
+    for stencil in stencils:
+        indices.extend(stencil.keys())
+        data.extend(stencil.values())
+        indptr.append(len(indices))
+    return csr_matrix((array(data, dtype=float64), array(indices, dtype=int64), array(indptr, dtype=int64)), shape=(len(stencils), n))
+
+
+# ==============================================================================
+# Main
+# ==============================================================================
+
+if __name__ == '__main__':
+
+    import doctest
+    doctest.testmod(globs=globals())
@@ -4,6 +4,8 @@ from __future__ import division
 
 from compas.geometry import transform_points_numpy
 
+from compas.datastructures.mesh.core import mesh_arrays_numpy
+
 
 __all__ = [
     'mesh_transform_numpy',
@@ -33,10 +35,9 @@ def mesh_transform_numpy(mesh, transformation):
     >>> mesh_transform(tmesh, T)
 
     """
-    vertices = list(mesh.vertices())
-    xyz = [mesh.vertex_coordinates(vertex) for vertex in vertices]
-    xyz[:] = transform_points_numpy(xyz, transformation)
-    for index, vertex in enumerate(vertices):
+    arrays = mesh_arrays_numpy(mesh)
+    xyz = transform_points_numpy(arrays.vertices, transformation)
+    for index, vertex in enumerate(arrays.keys.tolist()):
         mesh.vertex_attributes(vertex, 'xyz', xyz[index])
 
 
@@ -2,7 +2,7 @@ from __future__ import print_function
 from __future__ import absolute_import
 from __future__ import division
 
-from compas.topology import breadth_first_traverse
+from compas.topology import breadth_first_ordering
 
 
 __all__ = [
@@ -34,8 +34,8 @@ def network_is_connected(network):
     """
     if network.number_of_nodes() == 0:
         return False
-    nodes = breadth_first_traverse(network.adjacency, network.get_any_node())
-    return len(nodes) == network.number_of_nodes()
+    adjacency = network.adjacency_csr()
+    return len(breadth_first_ordering(adjacency, 0)) == len(adjacency)
 
 
 # ==============================================================================
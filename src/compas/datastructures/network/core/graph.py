@@ -14,6 +14,7 @@ from ast import literal_eval
 
 from compas.utilities import geometric_key
 from compas.datastructures import Datastructure
+from compas.files import CBF
 
 
 __all__ = ['Graph']
@@ -311,6 +312,51 @@ class Graph(Datastructure):
             else:
                 json.dump(self.data, f)
 
+    @classmethod
+    def from_binary(cls, filepath, mmap=False):
+        """Construct a graph from serialised data contained in a binary CBF file.
+
+        Parameters
+        ----------
+        filepath : str
+            The path to the binary file.
+        mmap : bool, optional
+            Read the file through a memory map.
+            Default is ``False``.
+
+        Returns
+        -------
+        object
+            An object of the type of ``cls``.
+
+        Notes
+        -----
+        This constructor method is meant to be used in conjuction with the
+        corresponding *to_binary* method.
+        """
+        cbf = CBF(filepath, mmap=mmap)
+        graph = cls()
+        graph.data = cbf.reader.data
+        return graph
+
+    def to_binary(self, filepath):
+        """Serialise the structured data representing the graph to a binary CBF file.
+
+        Parameters
+        ----------
+        filepath : str
+            The path to the binary file.
+
+        Notes
+        -----
+        The nodes, edges and their attributes are stored as typed arrays.
+        See :class:`compas.files.CBF` for details.
+        """
+        cbf = CBF(filepath)
+        cbf.write(self.data, layout={'node': ('attributes', 1),
+                                     'edge': ('attributes', 2),
+                                     'adjacency': ('values', 2)})
+
     @classmethod
     def from_edges(cls, edges):
         graph = cls()
@@ -498,6 +544,25 @@ class Graph(Datastructure):
         """
         return dict(enumerate(self.edges()))
 
+    def adjacency_csr(self):
+        """Get the node adjacency of the graph in compressed sparse row format.
+
+        Returns
+        -------
+        :class:`compas.topology.CSRAdjacency`
+            The compact adjacency, with the node identifiers in ``keys``.
+
+        Examples
+        --------
+        >>> graph = Graph()
+        >>> graph.add_edge(graph.add_node(0), graph.add_node(1))
+        (0, 1)
+        >>> graph.adjacency_csr().indices
+        [1, 0]
+        """
+        from compas.topology import CSRAdjacency
+        return CSRAdjacency.from_adjacency(self.adjacency)
+
     # --------------------------------------------------------------------------
     # builders
     # --------------------------------------------------------------------------
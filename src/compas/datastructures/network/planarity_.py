@@ -6,8 +6,6 @@ from math import cos
 from math import sin
 from math import pi
 
-from itertools import product
-
 import compas
 
 from compas.geometry import angle_vectors_xy
@@ -56,30 +54,20 @@ def network_is_crossed(network):
     Notes
     -----
     This algorithm assumes that the network lies in the XY plane.
+    The pairs of edges are found as in :func:`network_find_crossings`,
+    and the search stops at the first crossing.
 
     """
-    for (u1, v1), (u2, v2) in product(network.edges(), network.edges()):
-        if u1 == u2 or v1 == v2 or u1 == v2 or u2 == v1:
-            continue
-        a = network.node_attributes(u1, 'xy')
-        b = network.node_attributes(v1, 'xy')
-        c = network.node_attributes(u2, 'xy')
-        d = network.node_attributes(v2, 'xy')
-        if is_intersection_segment_segment_xy((a, b), (c, d)):
-            return True
+    edges = list(network.edges())
+    xy = {key: network.node_attributes(key, 'xy') for key in network.nodes()}
+    for _ in _find_crossings(edges, xy):
+        return True
     return False
 
 
 def _are_edges_crossed(edges, vertices):
-    for (u1, v1), (u2, v2) in product(edges, edges):
-        if u1 == u2 or v1 == v2 or u1 == v2 or u2 == v1:
-            continue
-        a = vertices[u1]
-        b = vertices[v1]
-        c = vertices[u2]
-        d = vertices[v2]
-        if is_intersection_segment_segment_xy((a, b), (c, d)):
-            return True
+    for _ in _find_crossings(edges, vertices):
+        return True
     return False
 
 
@@ -116,27 +104,112 @@ def network_find_crossings(network):
     -------
     list
         A list of edge pairs, with each edge represented by two vertex keys.
+        The first edge of every pair comes before the second in the order of ``network.edges()``,
+        and the pairs are sorted in that order.
 
     Notes
     -----
     This algorithm assumes that the network lies in the XY plane.
 
+    Two edges cross if they do not share a node,
+    and :func:`compas.geometry.is_intersection_segment_segment_xy` is ``True`` for their segments.
+    Only the pairs of edges with overlapping bounding boxes are tested.
+    To find them, the edges are hashed in the cells of a uniform grid covered by their bounding boxes,
+    with cells of the average size of the edges,
+    and every pair is only tested in the cell that contains the lower corner of the intersection of their boxes.
+    Edges that cover many cells are tested against all other edges instead.
+    For networks of which the edges have similar lengths, the time complexity is
+    linear in the number of edges and crossings, instead of quadratic in the number of edges.
+
+    Examples
+    --------
+    >>> from compas.datastructures import Network
+    >>> network = Network.from_lines([([0, 0, 0], [2, 2, 0]), ([0, 2, 0], [2, 0, 0]), ([2, 2, 0], [3, 2, 0])])
+    >>> network_find_crossings(network)
+    [((0, 1), (2, 3))]
+
     """
-    crossings = set()
-    for (u1, v1), (u2, v2) in product(network.edges(), network.edges()):
+    edges = list(network.edges())
+    xy = {key: network.node_attributes(key, 'xy') for key in network.nodes()}
+    return [(edges[i], edges[j]) for i, j in sorted(_find_crossings(edges, xy))]
+
+
+def _find_crossings(edges, xy, gridsize=1024, largebox=64):
+    """Generate the pairs of indices of crossing edges, with the first index smaller than the second.
+
+    Parameters
+    ----------
+    edges : list
+        The edges, as pairs of node keys.
+    xy : dict
+        The XY coordinates of the nodes.
+    gridsize : int, optional
+        The maximum number of cells of the grid along each axis.
+    largebox : int, optional
+        The number of cells above which an edge is tested against all other edges instead.
+
+    """
+    if len(edges) < 2:
+        return
+    segments = [(xy[u], xy[v]) for u, v in edges]
+    boxes = []
+    size = 0.0
+    for a, b in segments:
+        xmin, xmax = (a[0], b[0]) if a[0] <= b[0] else (b[0], a[0])
+        ymin, ymax = (a[1], b[1]) if a[1] <= b[1] else (b[1], a[1])
+        boxes.append((xmin, ymin, xmax, ymax))
+        size += max(xmax - xmin, ymax - ymin)
+    x0 = min(box[0] for box in boxes)
+    y0 = min(box[1] for box in boxes)
+    extent = max(max(box[2] for box in boxes) - x0, max(box[3] for box in boxes) - y0)
+    cell = max(size / len(boxes), extent / gridsize) or 1.0
+
+    def test(i, j):
+        u1, v1 = edges[i]
+        u2, v2 = edges[j]
         if u1 == u2 or v1 == v2 or u1 == v2 or u2 == v1:
+            return False
+        return is_intersection_segment_segment_xy(segments[i], segments[j])
+
+    grid = {}
+    large = []
+    for index, (xmin, ymin, xmax, ymax) in enumerate(boxes):
+        imin = int((xmin - x0) / cell)
+        jmin = int((ymin - y0) / cell)
+        imax = int((xmax - x0) / cell)
+        jmax = int((ymax - y0) / cell)
+        if (imax - imin + 1) * (jmax - jmin + 1) > largebox:
+            large.append(index)
             continue
-        if ((u1, v1), (u2, v2)) in crossings:
-            continue
-        if ((u2, v2), (u1, v1)) in crossings:
-            continue
-        a = network.node_attributes(u1, 'xy')
-        b = network.node_attributes(v1, 'xy')
-        c = network.node_attributes(u2, 'xy')
-        d = network.node_attributes(v2, 'xy')
-        if is_intersection_segment_segment_xy((a, b), (c, d)):
-            crossings.add(((u1, v1), (u2, v2)))
-    return list(crossings)
+        for i in range(imin, imax + 1):
+            for j in range(jmin, jmax + 1):
+                if (i, j) in grid:
+                    grid[i, j].append(index)
+                else:
+                    grid[i, j] = [index]
+
+    for (i, j), bucket in grid.items():
+        for position, e1 in enumerate(bucket):
+            xmin1, ymin1, xmax1, ymax1 = boxes[e1]
+            for e2 in bucket[position + 1:]:
+                xmin2, ymin2, xmax2, ymax2 = boxes[e2]
+                if xmin2 > xmax1 or xmin1 > xmax2 or ymin2 > ymax1 or ymin1 > ymax2:
+                    continue
+                if int((max(xmin1, xmin2) - x0) / cell) != i or int((max(ymin1, ymin2) - y0) / cell) != j:
+                    continue
+                if test(e1, e2):
+                    yield e1, e2
+
+    is_large = set(large)
+    for e1 in large:
+        xmin1, ymin1, xmax1, ymax1 = boxes[e1]
+        for e2, (xmin2, ymin2, xmax2, ymax2) in enumerate(boxes):
+            if e2 == e1 or (e2 in is_large and e2 < e1):
+                continue
+            if xmin2 > xmax1 or xmin1 > xmax2 or ymin2 > ymax1 or ymin1 > ymax2:
+                continue
+            if test(e1, e2):
+                yield (e1, e2) if e1 < e2 else (e2, e1)
 
 
 def network_is_xy(network):
@@ -13,6 +13,7 @@ from ast import literal_eval
 from random import sample
 from random import choice
 
+from compas.files import CBF
 from compas.files import OBJ
 
 from compas.utilities import geometric_key
@@ -301,11 +302,7 @@ class VolMesh(Datastructure):
 
         for f in self.halfface:
             _f = repr(f)
-            data['halfface'][_f] = {}
-            for u, v in self.halfface[f].iteritems():
-                _u = repr(u)  # use the map?
-                _v = repr(v)  # use the map?
-                data['halfface'][_f][_u] = _v
+            data['halfface'][_f] = self.halfface[f][:]
 
         for c in self.cell:
             _c = repr(c)
@@ -314,7 +311,7 @@ class VolMesh(Datastructure):
                 _u = repr(u)
                 if _u not in data['cell'][_c]:
                     data['cell'][_c][_u] = {}
-                for v, f in self.cell[c][u].iteritems():
+                for v, f in self.cell[c][u].items():
                     _v = repr(v)
                     _f = repr(f)
                     data['cell'][_c][_u][_v] = _f
@@ -325,7 +322,7 @@ class VolMesh(Datastructure):
                 _v = repr(v)
                 if _v not in data['plane'][_u]:
                     data['plane'][_u][_v] = {}
-                for w, c in self.plane[u][v].iteritems():
+                for w, c in self.plane[u][v].items():
                     _w = repr(w)
                     _c = repr(c)
                     data['plane'][_u][_v][_w] = _c
@@ -370,7 +367,7 @@ class VolMesh(Datastructure):
         self.default_face_attributes.update(dfa)
         self.default_cell_attributes.update(dca)
 
-        for _k, attr in vertex.iteritems():
+        for _k, attr in vertex.items():
             k = literal_eval(_k)
             self.vertex[k] = self.default_vertex_attributes.copy()
             if attr:
@@ -379,11 +376,7 @@ class VolMesh(Datastructure):
 
         for _f in halfface:
             f = literal_eval(_f)
-            self.halfface[f] = {}
-            for _u, _v in halfface[_f].iteritems():
-                u = literal_eval(_u)
-                v = literal_eval(_v)
-                self.halfface[f][u] = v
+            self.halfface[f] = halfface[_f][:]
 
         for _c in cell:
             c = literal_eval(_c)
@@ -392,7 +385,7 @@ class VolMesh(Datastructure):
                 u = literal_eval(_u)
                 if u not in self.cell[c]:
                     self.cell[c][u] = {}
-                for _v, _f in cell[_c][_u].iteritems():
+                for _v, _f in cell[_c][_u].items():
                     v = literal_eval(_v)
                     f = literal_eval(_f)
                     self.cell[c][u][v] = f
@@ -403,7 +396,7 @@ class VolMesh(Datastructure):
                 v = literal_eval(_v)
                 if v not in self.plane[u]:
                     self.plane[u][v] = {}
-                for _w, _c in plane[_u][_v].iteritems():
+                for _w, _c in plane[_u][_v].items():
                     w = literal_eval(_w)
                     c = literal_eval(_c)
                     self.plane[u][v][w] = c
@@ -543,6 +536,55 @@ class VolMesh(Datastructure):
         with open(filepath, 'wb+') as f:
             pickle.dump(self.data, f, protocol=pickle.HIGHEST_PROTOCOL)
 
+    @classmethod
+    def from_binary(cls, filepath, mmap=False):
+        """Construct a volmesh from serialised data contained in a binary CBF file.
+
+        Parameters
+        ----------
+        filepath : str
+            The path to the binary file.
+        mmap : bool, optional
+            Read the file through a memory map.
+            Default is ``False``.
+
+        Returns
+        -------
+        object
+            An object of type ``cls``.
+
+        Notes
+        -----
+        This constructor method is meant to be used in conjuction with the
+        corresponding *to_binary* method.
+        """
+        cbf = CBF(filepath, mmap=mmap)
+        o = cls()
+        o.data = cbf.reader.data
+        return o
+
+    def to_binary(self, filepath):
+        """Serialise the structured data representing the volmesh to a binary CBF file.
+
+        Parameters
+        ----------
+        filepath : str
+            The path to the binary file.
+
+        Notes
+        -----
+        The vertices, halffaces, cells, planes and their attributes are stored as typed arrays.
+        See :class:`compas.files.CBF` for details.
+        """
+        cbf = CBF(filepath)
+        cbf.write(self.data, layout={'vertex': ('attributes', 1),
+                                     'halfface': ('lists', 1),
+                                     'cell': ('values', 3),
+                                     'plane': ('values', 3),
+                                     'edgedata': ('attributes', 1),
+                                     'facedata': ('attributes', 1),
+                                     'celldata': ('attributes', 1)})
+
     @classmethod
     def from_obj(cls, filepath, precision=None):
         """Construct a volmesh object from the data described in an OBJ file.
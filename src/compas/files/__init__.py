@@ -26,6 +26,22 @@ Unlike its predecessor STL format, AMF has native support for color, materials,
 lattices, and constellations. [Wikipedia_AMF]_
 
 
+CBF
+===
+
+The COMPAS Binary Format (CBF) is the native binary format of the COMPAS data structures.
+It stores the data dict of a mesh, network or volmesh, with the vertices, faces,
+edges and their attributes as typed, column-wise arrays that can be memory-mapped.
+
+.. autosummary::
+    :toctree: generated/
+    :nosignatures:
+
+    CBF
+    CBFReader
+    CBFWriter
+
+
 OBJ
 ===
 
@@ -120,6 +136,7 @@ from __future__ import division
 from __future__ import print_function
 
 from .amf import *  # noqa: F401 F403
+from .cbf import *  # noqa: F401 F403
 from .dxf import *  # noqa: F401 F403
 from .gltf import *  # noqa: F401 F403
 from .las import *  # noqa: F401 F403
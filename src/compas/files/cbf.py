@@ -0,0 +1,520 @@
+from __future__ import print_function
+from __future__ import absolute_import
+from __future__ import division
+
+import json
+import struct
+import sys
+
+from array import array
+
+try:
+    from mmap import mmap as memorymap
+    from mmap import ACCESS_READ
+except ImportError:
+    memorymap = None
+
+try:
+    basestring
+except NameError:
+    basestring = str
+
+try:
+    long
+except NameError:
+    long = int
+
+
+__all__ = [
+    'CBF',
+    'CBFReader',
+    'CBFWriter',
+]
+
+
+MAGIC = b'CBF\x00'
+VERSION = 1
+
+INT32 = 'i'
+try:
+    array('q')
+except ValueError:
+    INT64 = None
+else:
+    INT64 = 'q'
+
+
+class CBF(object):
+    """Read and write files in CBF format, the native binary format of the COMPAS data structures.
+
+    A CBF file stores the data dict of a data structure (for example, :attr:`compas.datastructures.Mesh.data`).
+    The large parts of the data dict, such as the vertices, faces and their attributes,
+    are stored as typed arrays, one array per attribute (columnar).
+    All other parts are stored as JSON in the header of the file.
+
+    Parameters
+    ----------
+    filepath : str
+        Path to the file.
+    mmap : bool, optional
+        Read the file through a memory map instead of loading it into memory first.
+        Default is ``False``.
+
+    Notes
+    -----
+    The file consists of a fixed-size preamble, a JSON header describing the layout of the data,
+    and a sequence of 8-byte aligned blocks of binary data.
+
+    Examples
+    --------
+    >>> import os
+    >>> import tempfile
+    >>> from compas.datastructures import Mesh
+    >>> mesh = Mesh.from_polyhedron(6)
+    >>> filepath = os.path.join(tempfile.gettempdir(), 'cube.cbf')
+    >>> mesh.to_binary(filepath)
+    >>> cbf = CBF(filepath)
+    >>> cbf.reader.data == mesh.data
+    True
+
+    """
+
+    def __init__(self, filepath, mmap=False):
+        self.filepath = filepath
+        self.mmap = mmap
+        self._reader = None
+        self._is_read = False
+        self._writer = None
+
+    def read(self):
+        self._reader = CBFReader(self.filepath, mmap=self.mmap)
+        self._reader.open()
+        try:
+            self._reader.pre()
+            self._reader.read()
+        finally:
+            self._reader.post()
+        self._is_read = True
+
+    def write(self, data, layout=None):
+        self._writer = CBFWriter(self.filepath, data, layout=layout)
+        self._writer.write()
+
+    @property
+    def reader(self):
+        if not self._is_read:
+            self.read()
+        return self._reader
+
+
+class CBFReader(object):
+    """Read the contents of a *cbf* file.
+
+    Parameters
+    ----------
+    filepath : str
+        Path to the file.
+    mmap : bool, optional
+        Read the file through a memory map.
+        Default is ``False``.
+
+    Attributes
+    ----------
+    header : dict
+        The layout of the data in the file.
+    data : dict
+        The data dict stored in the file.
+
+    """
+
+    def __init__(self, filepath, mmap=False):
+        self.filepath = filepath
+        self.mmap = mmap
+        self.buffer = None
+        self.header = None
+        self.data = None
+        self.start = 0
+        self.swap = False
+
+    def open(self):
+        with open(self.filepath, 'rb') as f:
+            if self.mmap and memorymap:
+                self.buffer = memorymap(f.fileno(), 0, access=ACCESS_READ)
+            else:
+                self.buffer = f.read()
+
+    def pre(self):
+        if self.buffer[:4] != MAGIC:
+            raise ValueError('The file is not a CBF file: {}'.format(self.filepath))
+        version, size = struct.unpack('<IQ', self.buffer[4:16])
+        if version > VERSION:
+            raise ValueError('Unsupported CBF version: {}'.format(version))
+        self.header = json.loads(self.buffer[16:16 + size].decode('utf-8'))
+        self.start = _aligned(16 + size)
+        self.swap = self.header['byteorder'] != sys.byteorder
+
+    def read(self):
+        data = self.header['data'].copy()
+        for name, table in self.header['tables'].items():
+            data[name] = self.read_table(table)
+        self.data = data
+
+    def post(self):
+        self.close()
+
+    def close(self):
+        """Release the contents of the file.
+
+        Notes
+        -----
+        With a memory-mapped file, the map is closed,
+        and the views returned by :meth:`array` and :meth:`column` should be released before.
+        """
+        if self.buffer is not None and hasattr(self.buffer, 'close'):
+            self.buffer.close()
+        self.buffer = None
+
+    def read_table(self, table):
+        depth = table['depth']
+        keys = [self.read_column(column) for column in table['keys']]
+        counts = [self.read_column(column) for column in table['counts']]
+        kind = table['kind']
+        if kind == 'attributes':
+            leaves = self.read_attributes(table, len(keys[-1]))
+        elif kind == 'lists':
+            sizes = self.read_column(table['sizes'])
+            items = self.read_column(table['items'])
+            leaves = _split(items, sizes)
+        else:
+            leaves = self.read_column(table['values'])
+        return _nest(keys, counts, leaves, depth)
+
+    def read_attributes(self, table, n):
+        rows = [{} for _ in range(n)]
+        for name, column in table['columns']:
+            values = self.read_column(column)
+            if 'mask' in column:
+                mask = self.read_column(column['mask'])
+                targets = (row for row, present in zip(rows, mask) if present)
+            else:
+                targets = rows
+            for row, value in zip(targets, values):
+                row[name] = value
+        if 'nulls' in table:
+            for index, null in enumerate(self.read_column(table['nulls'])):
+                if null:
+                    rows[index] = None
+        return rows
+
+    def read_column(self, column):
+        """Decode a column of values into a list.
+
+        Parameters
+        ----------
+        column : dict
+            The description of the column in the header.
+
+        Returns
+        -------
+        list
+            The values.
+        """
+        typecode = column['type']
+        if typecode == 'none':
+            return [None] * column['length']
+        if typecode == 'json':
+            start = self.start + column['offset']
+            return json.loads(self.buffer[start:start + column['nbytes']].decode('utf-8'))
+        values = self.array(column).tolist()
+        if typecode == 'b':
+            return [value != 0 for value in values]
+        if column.get('repr'):
+            return [repr(value) for value in values]
+        return values
+
+    def array(self, column):
+        """Get the typed values of a column without converting them to Python objects.
+
+        Parameters
+        ----------
+        column : dict
+            The description of the column in the header.
+
+        Returns
+        -------
+        memoryview or array
+            The values.
+            With a memory-mapped file and native byte order, this is a view on the file buffer.
+        """
+        typecode = column['type']
+        itemsize = array(typecode).itemsize
+        start = self.start + column['offset']
+        stop = start + column['length'] * itemsize
+        if not self.swap:
+            try:
+                return memoryview(self.buffer)[start:stop].cast(typecode)
+            except (AttributeError, TypeError):
+                pass
+        values = array(typecode)
+        _frombytes(values, self.buffer[start:stop])
+        if self.swap:
+            values.byteswap()
+        return values
+
+    def column(self, name, attribute=None):
+        """Get the typed values of an attribute of a table, without decoding the entire file.
+
+        Parameters
+        ----------
+        name : str
+            The name of the table in the data dict (for example, ``'vertex'``).
+        attribute : str, optional
+            The name of the attribute (for example, ``'x'``).
+            If omitted, the items of a table of lists, or the values of a table of values, are returned.
+
+        Returns
+        -------
+        memoryview or array or list
+            The values of the elements that have the attribute, in the order of the table.
+
+        Examples
+        --------
+        >>> import os
+        >>> import tempfile
+        >>> from compas.datastructures import Mesh
+        >>> mesh = Mesh.from_polyhedron(6)
+        >>> filepath = os.path.join(tempfile.gettempdir(), 'cube.cbf')
+        >>> mesh.to_binary(filepath)
+        >>> reader = CBFReader(filepath, mmap=True)
+        >>> reader.open()
+        >>> reader.pre()
+        >>> len(reader.column('vertex', 'x'))
+        8
+        >>> reader.close()
+        """
+        table = self.header['tables'][name]
+        if attribute is not None:
+            column = dict(table['columns'])[attribute]
+        elif table['kind'] == 'lists':
+            column = table['items']
+        else:
+            column = table['values']
+        if column['type'] in ('none', 'json') or column.get('repr'):
+            return self.read_column(column)
+        return self.array(column)
+
+
+class CBFWriter(object):
+    """Write a data dict to a *cbf* file.
+
+    Parameters
+    ----------
+    filepath : str
+        Path to the file.
+    data : dict
+        The data dict of a data structure.
+    layout : dict, optional
+        The parts of the data dict that are stored as tables of typed arrays.
+        Every item maps the name of a part to a pair ``(kind, depth)``,
+        with ``kind`` one of ``'attributes'`` (attribute dicts), ``'lists'`` (lists of values),
+        or ``'values'`` (single values), and ``depth`` the number of nested dicts around the items.
+        All other parts are stored as JSON.
+
+    Examples
+    --------
+    >>> layout = {'vertex': ('attributes', 1), 'face': ('lists', 1)}
+
+    """
+
+    def __init__(self, filepath, data, layout=None):
+        self.filepath = filepath
+        self.data = data
+        self.layout = layout or {}
+        self.blocks = []
+        self.size = 0
+
+    def write(self):
+        header = json.dumps(self.encode()).encode('utf-8')
+        with open(self.filepath, 'wb') as f:
+            f.write(MAGIC)
+            f.write(struct.pack('<IQ', VERSION, len(header)))
+            f.write(header)
+            f.write(b'\x00' * (_aligned(16 + len(header)) - 16 - len(header)))
+            for block in self.blocks:
+                f.write(block)
+
+    def encode(self):
+        header = {'byteorder': sys.byteorder, 'data': {}, 'tables': {}}
+        for name, value in self.data.items():
+            if name in self.layout:
+                kind, depth = self.layout[name]
+                header['tables'][name] = self.encode_table(value, kind, depth)
+            else:
+                header['data'][name] = value
+        return header
+
+    def encode_table(self, table, kind, depth):
+        keys, counts, leaves = _flatten(table, depth)
+        header = {'kind': kind,
+                  'depth': depth,
+                  'keys': [self.encode_column(column) for column in keys],
+                  'counts': [self.encode_column(column) for column in counts]}
+        if kind == 'attributes':
+            self.encode_attributes(header, leaves)
+        elif kind == 'lists':
+            header['sizes'] = self.encode_column([len(items) for items in leaves])
+            header['items'] = self.encode_column([item for items in leaves for item in items])
+        elif kind == 'values':
+            header['values'] = self.encode_column(leaves)
+        else:
+            raise ValueError('Unknown kind of table: {}'.format(kind))
+        return header
+
+    def encode_attributes(self, header, leaves):
+        if any(attr is None for attr in leaves):
+            header['nulls'] = self.encode_column([attr is None for attr in leaves])
+            leaves = [attr or {} for attr in leaves]
+        names = []
+        seen = set()
+        for attr in leaves:
+            for name in attr:
+                if name not in seen:
+                    seen.add(name)
+                    names.append(name)
+        columns = []
+        for name in names:
+            values = [attr[name] for attr in leaves if name in attr]
+            column = self.encode_column(values)
+            if len(values) < len(leaves):
+                column['mask'] = self.encode_column([name in attr for attr in leaves])
+            columns.append((name, column))
+        header['columns'] = columns
+
+    def encode_column(self, values):
+        typecode = _typecode(values)
+        column = {'type': typecode, 'length': len(values)}
+        if typecode == 'none':
+            return column
+        if typecode == 'json':
+            block = json.dumps(values).encode('utf-8')
+            column['nbytes'] = len(block)
+        elif typecode == 'repr':
+            integers = [int(value) for value in values]
+            typecode = _typecode(integers)
+            if typecode == 'json':
+                # the integers are too large for an array, the strings are stored as they are
+                column['type'] = typecode
+                block = json.dumps(values).encode('utf-8')
+                column['nbytes'] = len(block)
+            else:
+                column['type'] = typecode
+                column['repr'] = True
+                block = _tobytes(array(typecode, integers))
+        else:
+            block = _tobytes(array(typecode, values))
+        column['offset'] = self.size
+        self.blocks.append(block + b'\x00' * (_aligned(len(block)) - len(block)))
+        self.size += _aligned(len(block))
+        return column
+
+
+# ==============================================================================
+# Helpers
+# ==============================================================================
+
+
+def _aligned(n):
+    return (n + 7) // 8 * 8
+
+
+def _tobytes(values):
+    try:
+        return values.tobytes()
+    except AttributeError:
+        return values.tostring()
+
+
+def _frombytes(values, buffer):
+    try:
+        values.frombytes(buffer)
+    except AttributeError:
+        values.fromstring(buffer)
+
+
+def _typecode(values):
+    """Find the most compact array type that represents all values exactly."""
+    types = set(type(value) for value in values)
+    if not types or types == set([type(None)]):
+        return 'none'
+    if all(issubclass(t, bool) for t in types):
+        return 'b'
+    if all(issubclass(t, float) for t in types):
+        return 'd'
+    if all(issubclass(t, (int, long)) and not issubclass(t, bool) for t in types):
+        low = min(values)
+        high = max(values)
+        if -2 ** 31 <= low and high < 2 ** 31:
+            return INT32
+        if INT64 and -2 ** 63 <= low and high < 2 ** 63:
+            return INT64
+        return 'json'
+    if all(issubclass(t, basestring) for t in types):
+        try:
+            if all(value == repr(int(value)) for value in values):
+                return 'repr'
+        except ValueError:
+            pass
+    return 'json'
+
+
+def _flatten(table, depth):
+    """Flatten nested dicts into columns of keys, counts per level, and leaf values."""
+    keys = []
+    counts = []
+    nodes = [table]
+    for level in range(depth):
+        level_keys = []
+        level_counts = []
+        children = []
+        for node in nodes:
+            node = node or {}
+            level_counts.append(len(node))
+            for key, value in node.items():
+                level_keys.append(key)
+                children.append(value)
+        keys.append(level_keys)
+        counts.append(level_counts)
+        nodes = children
+    return keys, counts[1:], nodes
+
+
+def _nest(keys, counts, leaves, depth):
+    """Rebuild nested dicts from flattened columns."""
+    items = leaves
+    for level in range(depth - 1, 0, -1):
+        parents = []
+        i = 0
+        for n in counts[level - 1]:
+            parents.append(dict(zip(keys[level][i:i + n], items[i:i + n])))
+            i += n
+        items = parents
+    return dict(zip(keys[0], items))
+
+
+def _split(items, sizes):
+    lists = []
+    i = 0
+    for n in sizes:
+        lists.append(items[i:i + n])
+        i += n
+    return lists
+
+
+# ==============================================================================
+# Main
+# ==============================================================================
+
+if __name__ == '__main__':
+
+    import doctest
+    doctest.testmod(globs=globals())
@@ -213,10 +213,14 @@ Points, Vectors, Lines, Planes
     centroid_points_xy
     distance_line_line
     distance_point_line
+    distance_point_line_numpy
     distance_point_line_xy
     distance_point_line_sqrd
     distance_point_line_sqrd_xy
     distance_point_plane
+    distance_point_plane_numpy
+    distance_point_plane_signed
+    distance_point_plane_signed_numpy
     distance_point_point
     distance_point_point_xy
     distance_point_point_sqrd
@@ -283,6 +287,8 @@ Queries
     :toctree: generated/
     :nosignatures:
 
+    orient_xy
+    incircle_xy
     is_ccw_xy
     is_colinear
     is_colinear_xy
@@ -310,6 +316,8 @@ Queries
     is_point_on_segment_xy
     is_point_in_triangle
     is_point_in_triangle_xy
+    PolygonIndex
+    polygonindex_classify_numpy
 
 
 Proximity
@@ -319,15 +327,24 @@ Proximity
     :toctree: generated/
     :nosignatures:
 
+    closest_line_to_point
+    closest_line_to_point_numpy
     closest_point_in_cloud
     closest_point_in_cloud_xy
     closest_point_on_line
+    closest_point_on_line_numpy
     closest_point_on_line_xy
     closest_point_on_plane
+    closest_point_on_plane_numpy
     closest_point_on_polyline
+    closest_point_on_polyline_numpy
     closest_point_on_polyline_xy
     closest_point_on_segment
+    closest_point_on_segment_numpy
     closest_point_on_segment_xy
+    KDTree
+    kdtree_query_numpy
+    kdtree_query_radius_numpy
 
 
 Intersections
@@ -342,11 +359,18 @@ Intersections
     intersection_line_line_xy
     intersection_line_plane
     intersection_line_triangle
+    intersection_line_triangle_numpy
     intersection_plane_plane
     intersection_plane_plane_plane
+    intersection_ray_triangle_numpy
     intersection_segment_segment
     intersection_segment_segment_xy
+    intersection_segment_segment_xy_numpy
     intersection_segment_plane
+    intersection_segment_plane_numpy
+    intersection_segment_triangle_numpy
+    intersection_segments_triangles_numpy
+    overlapping_boxes_numpy
 
 
 Offsets
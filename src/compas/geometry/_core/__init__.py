@@ -2,6 +2,8 @@ from __future__ import print_function
 from __future__ import absolute_import
 from __future__ import division
 
+import compas
+
 from .basic import *  # noqa: F401 F403
 from .analytical import *  # noqa: F401 F403
 from .distance import *  # noqa: F401 F403
@@ -12,5 +14,8 @@ from .size import *  # noqa: F401 F403
 from .quaternions import *  # noqa: F401 F403
 from .tangent import *  # noqa: F401 F403
 from .kdtree import *  # noqa: F401 F403
+if not compas.IPY:
+    from .distance_numpy import *  # noqa: F401 F403
+    from .kdtree_numpy import *  # noqa: F401 F403
 
 __all__ = [name for name in dir() if not name.startswith('_')]
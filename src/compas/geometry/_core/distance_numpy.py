@@ -0,0 +1,376 @@
+from __future__ import print_function
+from __future__ import absolute_import
+from __future__ import division
+
+from numpy import absolute
+from numpy import arange
+from numpy import argmin
+from numpy import asarray
+from numpy import clip
+from numpy import einsum
+from numpy import empty
+from numpy import float64
+from numpy import int64
+from numpy import sqrt
+from numpy import where
+
+
+__all__ = [
+    'distance_point_line_numpy',
+    'distance_point_plane_numpy',
+    'distance_point_plane_signed_numpy',
+    'closest_point_on_line_numpy',
+    'closest_point_on_segment_numpy',
+    'closest_point_on_plane_numpy',
+    'closest_point_on_polyline_numpy',
+    'closest_line_to_point_numpy',
+]
+
+
+# the number of combinations of points and segments processed at once
+CHUNKSIZE = 2 ** 20
+
+
+def distance_point_line_numpy(points, lines):
+    """Compute the distances between points and lines, using NumPy.
+
+    Parameters
+    ----------
+    points : array-like
+        The coordinates of the points, as an array of shape ``(..., dim)``.
+    lines : array-like
+        The lines, defined by two points, as an array of shape ``(..., 2, dim)``.
+
+    Returns
+    -------
+    array
+        The distances, with the broadcast shape of the points and the lines.
+
+    Notes
+    -----
+    The points and lines are broadcast against each other, following the rules of NumPy.
+    For example, one point and ``m`` lines result in ``m`` distances,
+    ``n`` points and ``n`` lines in the ``n`` distances of the corresponding points and lines,
+    and ``n`` points with shape ``(n, 1, 3)`` and ``m`` lines with shape ``(m, 2, 3)``
+    in a matrix with the distances of all points to all lines.
+
+    The distance to a line of zero length is the distance to its start point.
+
+    See Also
+    --------
+    :func:`compas.geometry.distance_point_line`
+
+    Examples
+    --------
+    >>> lines = [[[0.0, 0.0, 0.0], [1.0, 0.0, 0.0]], [[0.0, 0.0, 0.0], [0.0, 1.0, 0.0]]]
+    >>> distance_point_line_numpy([[2.0, 3.0, 0.0]], lines).tolist()
+    [3.0, 2.0]
+    >>> distance_point_line_numpy([[2.0, 3.0, 0.0], [1.0, 1.0, 1.0]], lines).tolist()
+    [3.0, 1.4142135623730951]
+
+    """
+    points = asarray(points, dtype=float64)
+    a, ab, t = _line_parameters(points, lines)
+    return _norm(points - a - t[..., None] * ab)
+
+
+def distance_point_plane_numpy(points, planes):
+    """Compute the distances between points and planes, using NumPy.
+
+    Parameters
+    ----------
+    points : array-like
+        The coordinates of the points, as an array of shape ``(..., 3)``.
+    planes : array-like
+        The planes, defined by a base point and a normal, as an array of shape ``(..., 2, 3)``.
+
+    Returns
+    -------
+    array
+        The distances, with the broadcast shape of the points and the planes.
+
+    Notes
+    -----
+    The points and planes are broadcast against each other, as in :func:`distance_point_line_numpy`.
+    The normals of the planes do not have to be unit vectors.
+
+    See Also
+    --------
+    :func:`compas.geometry.distance_point_plane`
+
+    Examples
+    --------
+    >>> planes = [[[0.0, 0.0, 0.0], [0.0, 0.0, 2.0]], [[0.0, 0.0, 1.0], [0.0, 0.0, 1.0]]]
+    >>> distance_point_plane_numpy([0.0, 0.0, -1.0], planes).tolist()
+    [1.0, 2.0]
+
+    """
+    return absolute(distance_point_plane_signed_numpy(points, planes))
+
+
+def distance_point_plane_signed_numpy(points, planes):
+    """Compute the signed distances between points and planes, using NumPy.
+
+    Parameters
+    ----------
+    points : array-like
+        The coordinates of the points, as an array of shape ``(..., 3)``.
+    planes : array-like
+        The planes, defined by a base point and a normal, as an array of shape ``(..., 2, 3)``.
+
+    Returns
+    -------
+    array
+        The signed distances, with the broadcast shape of the points and the planes.
+        The distances are positive on the side of the planes the normals point to.
+
+    See Also
+    --------
+    :func:`compas.geometry.distance_point_plane_signed`
+
+    Examples
+    --------
+    >>> planes = [[[0.0, 0.0, 0.0], [0.0, 0.0, 2.0]], [[0.0, 0.0, 1.0], [0.0, 0.0, 1.0]]]
+    >>> distance_point_plane_signed_numpy([[0.0, 0.0, -1.0], [0.0, 0.0, 3.0]], planes).tolist()
+    [-1.0, 2.0]
+
+    """
+    points = asarray(points, dtype=float64)
+    base, normal = _plane_normals(planes)
+    return _dot(points - base, normal)
+
+
+def closest_point_on_line_numpy(points, lines):
+    """Compute the closest points on lines to points, using NumPy.
+
+    Parameters
+    ----------
+    points : array-like
+        The coordinates of the points, as an array of shape ``(..., dim)``.
+    lines : array-like
+        The lines, defined by two points, as an array of shape ``(..., 2, dim)``.
+
+    Returns
+    -------
+    array
+        The coordinates of the closest points, with the broadcast shape of the points and the lines.
+
+    Notes
+    -----
+    The points and lines are broadcast against each other, as in :func:`distance_point_line_numpy`.
+
+    See Also
+    --------
+    :func:`compas.geometry.closest_point_on_line`
+
+    Examples
+    --------
+    >>> closest_point_on_line_numpy([[2.0, 3.0, 0.0], [-1.0, 1.0, 0.0]], [[0.0, 0.0, 0.0], [1.0, 0.0, 0.0]]).tolist()
+    [[2.0, 0.0, 0.0], [-1.0, 0.0, 0.0]]
+
+    """
+    a, ab, t = _line_parameters(points, lines)
+    return a + t[..., None] * ab
+
+
+def closest_point_on_segment_numpy(points, segments):
+    """Compute the closest points on line segments to points, using NumPy.
+
+    Parameters
+    ----------
+    points : array-like
+        The coordinates of the points, as an array of shape ``(..., dim)``.
+    segments : array-like
+        The segments, defined by two points, as an array of shape ``(..., 2, dim)``.
+
+    Returns
+    -------
+    array
+        The coordinates of the closest points, with the broadcast shape of the points and the segments.
+
+    Notes
+    -----
+    The points and segments are broadcast against each other, as in :func:`distance_point_line_numpy`.
+
+    See Also
+    --------
+    :func:`compas.geometry.closest_point_on_segment`
+
+    Examples
+    --------
+    >>> closest_point_on_segment_numpy([[2.0, 3.0, 0.0], [0.5, 1.0, 0.0]], [[0.0, 0.0, 0.0], [1.0, 0.0, 0.0]]).tolist()
+    [[1.0, 0.0, 0.0], [0.5, 0.0, 0.0]]
+
+    """
+    a, ab, t = _line_parameters(points, segments)
+    return a + clip(t, 0.0, 1.0)[..., None] * ab
+
+
+def closest_point_on_plane_numpy(points, planes):
+    """Compute the closest points on planes to points, using NumPy.
+
+    Parameters
+    ----------
+    points : array-like
+        The coordinates of the points, as an array of shape ``(..., 3)``.
+    planes : array-like
+        The planes, defined by a base point and a normal, as an array of shape ``(..., 2, 3)``.
+
+    Returns
+    -------
+    array
+        The coordinates of the closest points, with the broadcast shape of the points and the planes.
+
+    See Also
+    --------
+    :func:`compas.geometry.closest_point_on_plane`
+
+    Examples
+    --------
+    >>> closest_point_on_plane_numpy([[1.0, 2.0, 3.0]], [[0.0, 0.0, 1.0], [0.0, 0.0, 2.0]]).tolist()
+    [[1.0, 2.0, 1.0]]
+
+    """
+    points = asarray(points, dtype=float64)
+    base, normal = _plane_normals(planes)
+    return points - _dot(points - base, normal)[..., None] * normal
+
+
+def closest_point_on_polyline_numpy(points, polyline):
+    """Compute the closest points on a polyline to points, using NumPy.
+
+    Parameters
+    ----------
+    points : array-like
+        The coordinates of the points, as an array of shape ``(n, dim)``.
+    polyline : array-like
+        The coordinates of the vertices of the polyline, as an array of shape ``(m, dim)``.
+
+    Returns
+    -------
+    array
+        The coordinates of the closest points, as an array of shape ``(n, dim)``.
+
+    Notes
+    -----
+    The points are processed in chunks, such that no more than :data:`CHUNKSIZE`
+    combinations of points and segments of the polyline are in memory at once.
+    If a point is equally close to several segments, the closest point on the first of these segments is returned.
+
+    See Also
+    --------
+    :func:`compas.geometry.closest_point_on_polyline`
+
+    Examples
+    --------
+    >>> polyline = [[0.0, 0.0, 0.0], [1.0, 0.0, 0.0], [1.0, 1.0, 0.0]]
+    >>> closest_point_on_polyline_numpy([[0.5, -1.0, 0.0], [2.0, 0.5, 0.0]], polyline).tolist()
+    [[0.5, 0.0, 0.0], [1.0, 0.5, 0.0]]
+
+    """
+    polyline = asarray(polyline, dtype=float64)
+    a = polyline[:-1]
+    ab = polyline[1:] - a
+    index, t = _closest_segments(points, a, ab)
+    return a[index] + t[:, None] * ab[index]
+
+
+def closest_line_to_point_numpy(points, lines):
+    """Find the closest lines to points, using NumPy.
+
+    Parameters
+    ----------
+    points : array-like
+        The coordinates of the points, as an array of shape ``(n, dim)``.
+    lines : array-like
+        The lines, defined by two points, as an array of shape ``(m, 2, dim)``.
+
+    Returns
+    -------
+    array
+        The index of the closest line to every point.
+
+    Notes
+    -----
+    As in :func:`compas.geometry.closest_line_to_point`, the distance to a line is the distance to its closest point
+    between the two points defining the line.
+    The points are processed in chunks, as in :func:`closest_point_on_polyline_numpy`.
+
+    See Also
+    --------
+    :func:`compas.geometry.closest_line_to_point`
+
+    Examples
+    --------
+    >>> lines = [[[0.0, 0.0, 0.0], [1.0, 0.0, 0.0]], [[0.0, 1.0, 0.0], [1.0, 1.0, 0.0]]]
+    >>> closest_line_to_point_numpy([[0.5, -1.0, 0.0], [2.0, 0.9, 0.0]], lines).tolist()
+    [0, 1]
+
+    """
+    lines = asarray(lines, dtype=float64)
+    a = lines[:, 0]
+    index, _ = _closest_segments(points, a, lines[:, 1] - a)
+    return index
+
+
+# ==============================================================================
+# Helpers
+# ==============================================================================
+
+
+def _dot(u, v):
+    return einsum('...i,...i', u, v)
+
+
+def _norm(u):
+    return sqrt(_dot(u, u))
+
+
+def _line_parameters(points, lines):
+    """The start points and direction vectors of the lines,
+    and the parameters of the projections of the points on the lines."""
+    points = asarray(points, dtype=float64)
+    lines = asarray(lines, dtype=float64)
+    a = lines[..., 0, :]
+    ab = lines[..., 1, :] - a
+    length = _dot(ab, ab)
+    t = _dot(points - a, ab) / where(length > 0, length, 1.0)
+    return a, ab, t
+
+
+def _plane_normals(planes):
+    """The base points and unit normals of the planes."""
+    planes = asarray(planes, dtype=float64)
+    base = planes[..., 0, :]
+    normal = planes[..., 1, :]
+    length = _norm(normal)
+    return base, normal / where(length > 0, length, 1.0)[..., None]
+
+
+def _closest_segments(points, a, ab):
+    """The index of the closest segment to every point,
+    and the parameter of the closest point on that segment."""
+    points = asarray(points, dtype=float64).reshape((-1, a.shape[1]))
+    length = _dot(ab, ab)
+    length = where(length > 0, length, 1.0)
+    index = empty(len(points), dtype=int64)
+    parameters = empty(len(points))
+    size = max(1, CHUNKSIZE // max(1, len(a)))
+    for start in range(0, len(points), size):
+        ap = points[start:start + size, None, :] - a
+        t = clip(_dot(ap, ab) / length, 0.0, 1.0)
+        d = ap - t[..., None] * ab
+        closest = argmin(_dot(d, d), axis=1)
+        index[start:start + size] = closest
+        parameters[start:start + size] = t[arange(len(t)), closest]
+    return index, parameters
+
+
+# ==============================================================================
+# Main
+# ==============================================================================
+
+if __name__ == '__main__':
+
+    import doctest
+    doctest.testmod(globs=globals())
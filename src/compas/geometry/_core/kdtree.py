@@ -2,9 +2,10 @@ from __future__ import print_function
 from __future__ import absolute_import
 from __future__ import division
 
-import collections
+from heapq import heappush
+from heapq import heapreplace
 
-from compas.geometry._core import distance_point_point_sqrd
+import compas
 
 
 __all__ = [
@@ -12,9 +13,6 @@ __all__ = [
 ]
 
 
-Node = collections.namedtuple("Node", 'point axis label left right')
-
-
 class KDTree(object):
     """A tree for nearest neighbor search in a k-dimensional space.
 
@@ -27,12 +25,29 @@ class KDTree(object):
 
     Attributes
     ----------
-    root : Node
-        The root node of the built tree.
-        This is the median with respect to the different dimensions of the tree.
+    points : list
+        The coordinates of the nodes of the tree.
+    labels : list
+        The labels of the nodes of the tree, i.e. the indices of the points in the list of objects.
+    axes : list
+        The split axes of the nodes of the tree.
 
     Notes
     -----
+    The nodes are stored in flat lists, in an implicit layout.
+    The node of a range ``[lo, hi)`` of the lists is the median of the range, at position ``(lo + hi) // 2``.
+    The nodes before the median form its left subtree, the nodes after the median its right subtree.
+    Every range is split along the axis with the largest extent of its points.
+
+    The tree is built by sorting the points once along every axis,
+    and splitting the sorted lists at every level, in ``O(n log n)`` time.
+    The searches are iterative, and therefore not limited by the recursion depth.
+
+    The batch queries :meth:`query` and :meth:`query_radius` are vectorized with NumPy if it is available,
+    and the number of query points is at least :attr:`numpy_threshold`.
+
+    The tree can be pickled, to cache it between runs.
+
     For more info, see [1]_ and [2]_.
 
     References
@@ -44,46 +59,124 @@ class KDTree(object):
 
     Examples
     --------
-    >>>
+    >>> tree = KDTree([[0.0, 0.0, 0.0], [1.0, 0.0, 0.0], [2.0, 0.0, 0.0], [3.0, 0.0, 0.0]])
+    >>> xyz, label, distance = tree.nearest_neighbor([1.2, 0.0, 0.0])
+    >>> label
+    1
+    >>> distances, labels = tree.query([[1.2, 0.0, 0.0], [3.5, 0.0, 0.0]], k=2)
+    >>> labels
+    [[1, 2], [3, 2]]
 
     """
 
+    numpy_threshold = 100
+
     def __init__(self, objects=None):
         """Initialise a KDTree object."""
-        self.root = None
+        self.points = []
+        self.labels = []
+        self.axes = []
+        self._arrays = None
         if objects:
-            self.root = self.build(list([(objects[i], i) for i in range(len(objects))]))
+            self.build(objects)
+
+    def __getstate__(self):
+        return {'points': self.points, 'labels': self.labels, 'axes': self.axes}
+
+    def __setstate__(self, state):
+        self.points = state['points']
+        self.labels = state['labels']
+        self.axes = state['axes']
+        self._arrays = None
 
-    def build(self, objects, axis=0):
-        """Populate a kd-tree with given objects.
+    def __len__(self):
+        return len(self.points)
+
+    def build(self, objects):
+        """Populate the tree with given objects.
 
         Parameters
         ----------
         objects : list
-            The tree objects.
-        axis : int, optional
-            The axis along which to build.
-
-        Returns
-        -------
-        Node
-            The root node.
+            The coordinates of the points.
+            The label of every point is its index in the list.
 
         """
-        if not objects:
-            return None
-
-        objects.sort(key=lambda o: o[0][axis])
-        median_idx = len(objects) // 2
-        median_point, median_label = objects[median_idx]
-        next_axis = (axis + 1) % 3
-
-        return Node(
-            median_point,
-            axis,
-            median_label,
-            self.build(objects[:median_idx], next_axis),
-            self.build(objects[median_idx + 1:], next_axis))
+        points = [list(point) for point in objects]
+        n = len(points)
+        self.points = [None] * n
+        self.labels = [None] * n
+        self.axes = [0] * n
+        self._arrays = None
+        if not n:
+            return
+        dim = len(points[0])
+        side = [0] * n
+        stack = [(0, [sorted(range(n), key=lambda i: points[i][axis]) for axis in range(dim)])]
+        while stack:
+            lo, lists = stack.pop()
+            if not lists[0]:
+                continue
+            axis = max(range(dim), key=lambda a: points[lists[a][-1]][a] - points[lists[a][0]][a])
+            ordered = lists[axis]
+            m = len(ordered) // 2
+            median = ordered[m]
+            self.points[lo + m] = points[median]
+            self.labels[lo + m] = median
+            self.axes[lo + m] = axis
+            for i in ordered[:m]:
+                side[i] = 1
+            for i in ordered[m + 1:]:
+                side[i] = 2
+            side[median] = 0
+            stack.append((lo, [[i for i in indices if side[i] == 1] for indices in lists]))
+            stack.append((lo + m + 1, [[i for i in indices if side[i] == 2] for indices in lists]))
+
+    # --------------------------------------------------------------------------
+    # single point queries
+    # --------------------------------------------------------------------------
+
+    def _search(self, point, k, radius=None, exclude=None):
+        """Find the ``k`` nearest nodes to a point, or all nodes within a radius if ``k`` is ``None``.
+
+        Returns a list of pairs of squared distances and node positions, in no particular order.
+        """
+        points = self.points
+        axes = self.axes
+        dim = len(point)
+        limit = float('inf') if radius is None else radius ** 2
+        found = []
+        stack = [(0, len(points), 0.0)]
+        while stack:
+            lo, hi, bound = stack.pop()
+            if lo >= hi or bound > limit:
+                continue
+            mid = (lo + hi) // 2
+            node = points[mid]
+            d2 = 0.0
+            for i in range(dim):
+                d2 += (point[i] - node[i]) ** 2
+            if d2 <= limit and (not exclude or self.labels[mid] not in exclude):
+                if k is None:
+                    found.append((d2, mid))
+                elif len(found) < k:
+                    heappush(found, (-d2, mid))
+                    if len(found) == k:
+                        limit = -found[0][0]
+                elif d2 < limit:
+                    heapreplace(found, (-d2, mid))
+                    limit = -found[0][0]
+            axis = axes[mid]
+            d = point[axis] - node[axis]
+            if d <= 0:
+                stack.append((mid + 1, hi, max(bound, d * d)))
+                stack.append((lo, mid, bound))
+            else:
+                stack.append((lo, mid, max(bound, d * d)))
+                stack.append((mid + 1, hi, bound))
+        if k is None:
+            return found
+        return [(-d2, mid) for d2, mid in found]
 
     def nearest_neighbor(self, point, exclude=None):
         """Find the nearest neighbor to a given point,
@@ -94,7 +187,7 @@ class KDTree(object):
         point : list
             XYZ coordinates of the base point.
         exclude : set, optional
-            A set of points to exclude from the search.
+            A set of labels of points to exclude from the search.
             Defaults to an empty set.
 
         Returns
@@ -105,30 +198,11 @@ class KDTree(object):
             Distance to the base point.
 
         """
-        def search(node):
-            if node is None:
-                return
-
-            d2 = distance_point_point_sqrd(point, node.point)
-            if d2 < best[2]:
-                if node.label not in exclude:
-                    best[:] = node.point, node.label, d2
-
-            d = point[node.axis] - node.point[node.axis]
-            if d <= 0:
-                close, far = node.left, node.right
-            else:
-                close, far = node.right, node.left
-
-            search(close)
-            if d ** 2 < best[2]:
-                search(far)
-
-        exclude = exclude or set()
-        best = [None, None, float('inf')]
-        search(self.root)
-        best[2] **= 0.5
-        return best
+        found = self._search(point, 1, exclude=exclude)
+        if not found:
+            return [None, None, float('inf')]
+        d2, mid = found[0]
+        return [self.points[mid], self.labels[mid], d2 ** 0.5]
 
     def nearest_neighbors(self, point, number, distance_sort=False):
         """Find the N nearest neighbors to a given point.
@@ -142,23 +216,108 @@ class KDTree(object):
         distance_sort : bool, optional
             Sort the nearest neighbors by distance to the base point.
             Default is ``False``.
+            The neighbors are always found in order of increasing distance,
+            and this parameter has no effect.
 
         Returns
         -------
         list
-            A list of N nearest neighbors.
+            A list of N nearest neighbors, in order of increasing distance.
+            If the tree has fewer than N points,
+            the list is padded with ``[None, None, inf]``, as returned by :meth:`nearest_neighbor`.
 
         """
-        nnbrs = []
-        exclude = set()
-        for i in range(number):
-            nnbr = self.nearest_neighbor(point, exclude)
-            nnbrs.append(nnbr)
-            exclude.add(nnbr[1])
-        if distance_sort:
-            return sorted(nnbrs, key=lambda nnbr: nnbr[2])
+        found = sorted(self._search(point, number))
+        nnbrs = [[self.points[mid], self.labels[mid], d2 ** 0.5] for d2, mid in found]
+        for _ in range(number - len(nnbrs)):
+            nnbrs.append([None, None, float('inf')])
         return nnbrs
 
+    # --------------------------------------------------------------------------
+    # batch queries
+    # --------------------------------------------------------------------------
+
+    def _use_numpy(self, points):
+        if compas.IPY or len(points) < self.numpy_threshold:
+            return False
+        try:
+            import numpy  # noqa: F401
+        except ImportError:
+            return False
+        return True
+
+    def query(self, points, k=1):
+        """Find the k nearest neighbors of a number of points.
+
+        Parameters
+        ----------
+        points : list
+            The coordinates of the query points.
+        k : int, optional
+            The number of nearest neighbors per point.
+            Default is ``1``.
+            If the tree has fewer than ``k`` points, all points are returned.
+
+        Returns
+        -------
+        tuple
+            * The distances to the nearest neighbors of every query point, in increasing order.
+            * The labels of the nearest neighbors of every query point.
+
+        Examples
+        --------
+        >>> tree = KDTree([[0.0, 0.0, 0.0], [1.0, 0.0, 0.0], [0.0, 2.0, 0.0]])
+        >>> distances, labels = tree.query([[0.5, 0.0, 0.0]], k=2)
+        >>> labels
+        [[0, 1]]
+
+        """
+        if self._use_numpy(points):
+            from compas.geometry._core.kdtree_numpy import kdtree_query_numpy
+            distances, labels = kdtree_query_numpy(self, points, k)
+            return distances.tolist(), labels.tolist()
+        distances = []
+        labels = []
+        for point in points:
+            found = sorted(self._search(point, k))
+            distances.append([d2 ** 0.5 for d2, _ in found])
+            labels.append([self.labels[mid] for _, mid in found])
+        return distances, labels
+
+    def query_radius(self, points, radius):
+        """Find the neighbors within a radius of a number of points.
+
+        Parameters
+        ----------
+        points : list
+            The coordinates of the query points.
+        radius : float
+            The search radius.
+
+        Returns
+        -------
+        tuple
+            * The distances to the neighbors of every query point, in increasing order.
+            * The labels of the neighbors of every query point.
+
+        Examples
+        --------
+        >>> tree = KDTree([[0.0, 0.0, 0.0], [1.0, 0.0, 0.0], [0.0, 2.0, 0.0]])
+        >>> tree.query_radius([[0.0, 0.0, 0.0]], 1.5)
+        ([[0.0, 1.0]], [[0, 1]])
+
+        """
+        if self._use_numpy(points):
+            from compas.geometry._core.kdtree_numpy import kdtree_query_radius_numpy
+            return kdtree_query_radius_numpy(self, points, radius)
+        distances = []
+        labels = []
+        for point in points:
+            found = sorted(self._search(point, None, radius=radius))
+            distances.append([d2 ** 0.5 for d2, _ in found])
+            labels.append([self.labels[mid] for _, mid in found])
+        return distances, labels
+
 
 # ==============================================================================
 # Main
@@ -177,13 +336,7 @@ if __name__ == '__main__':
     tree = KDTree(cloud)
 
     n = 50
-    nnbrs = []
-    exclude = set()
-
-    for i in range(n):
-        nnbr = tree.nearest_neighbor(point, exclude)
-        nnbrs.append(nnbr)
-        exclude.add(nnbr[1])
+    nnbrs = tree.nearest_neighbors(point, n, distance_sort=True)
 
     for nnbr in nnbrs:
         print(nnbr)
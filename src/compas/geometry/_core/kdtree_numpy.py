@@ -0,0 +1,258 @@
+from __future__ import print_function
+from __future__ import absolute_import
+from __future__ import division
+
+from numpy import arange
+from numpy import array
+from numpy import asarray
+from numpy import bincount
+from numpy import concatenate
+from numpy import cumsum
+from numpy import einsum
+from numpy import float64
+from numpy import full
+from numpy import inf
+from numpy import int64
+from numpy import lexsort
+from numpy import maximum
+from numpy import searchsorted
+from numpy import sqrt
+from numpy import unique
+from numpy import where
+from numpy import zeros
+
+
+__all__ = [
+    'kdtree_query_numpy',
+    'kdtree_query_radius_numpy',
+]
+
+
+CHUNKSIZE = 10000
+LEAFSIZE = 16
+
+
+def kdtree_query_numpy(tree, points, k=1):
+    """Find the k nearest neighbors of a number of points in a kd-tree, using NumPy.
+
+    Parameters
+    ----------
+    tree : :class:`compas.geometry.KDTree`
+        The tree.
+    points : array-like
+        The coordinates of the query points.
+    k : int, optional
+        The number of nearest neighbors per point.
+        Default is ``1``.
+        If the tree has fewer than ``k`` points, all points are returned.
+
+    Returns
+    -------
+    tuple
+        * The distances to the nearest neighbors, as a ``N x k`` array, in increasing order per row.
+        * The labels of the nearest neighbors, as a ``N x k`` array.
+
+    Notes
+    -----
+    The tree is descended by all query points at once, level by level.
+    A first descent along the nearest sides of the splitting planes ends in a small subtree
+    of which the points provide an upper bound for the distance to the ``k``-th nearest neighbor.
+    The second descent collects the points of all subtrees within that bound.
+
+    Examples
+    --------
+    >>> from compas.geometry import KDTree
+    >>> tree = KDTree([[0.0, 0.0, 0.0], [1.0, 0.0, 0.0], [0.0, 2.0, 0.0]])
+    >>> distances, labels = kdtree_query_numpy(tree, [[0.9, 0.0, 0.0]], k=2)
+    >>> labels.tolist()
+    [[1, 0]]
+
+    """
+    coords, labels, axes = _tree_arrays(tree)
+    points = asarray(points, dtype=float64).reshape((-1, coords.shape[1]))
+    n = len(coords)
+    k = min(k, n)
+    distances = full((len(points), k), inf)
+    positions = zeros((len(points), k), dtype=int64)
+    if not k:
+        return distances, positions
+    size = max(LEAFSIZE, k)
+    for start in range(0, len(points), CHUNKSIZE):
+        chunk = points[start:start + CHUNKSIZE]
+        m = len(chunk)
+        # descend along the nearest sides of the splitting planes, to a subtree with at least k points
+        q = arange(m)
+        lo = zeros(m, dtype=int64)
+        hi = full(m, n, dtype=int64)
+        active = q
+        while len(active):
+            l, h = lo[active], hi[active]
+            mid = (l + h) // 2
+            d = chunk[active, axes[mid]] - coords[mid, axes[mid]]
+            l, h = where(d <= 0, l, mid + 1), where(d <= 0, mid, h)
+            descend = h - l >= size
+            active = active[descend]
+            lo[active], hi[active] = l[descend], h[descend]
+        first_lo, first_hi = lo, hi
+        cq, cpos = _expand(q, lo, hi)
+        best = full((m, k), inf)
+        index = full((m, k), -1, dtype=int64)
+        _merge(best, index, cq, _squared_norm(chunk[cq] - coords[cpos]), cpos)
+        # collect the points of the subtrees that are not pruned by the k-th distance of the first subtree
+        lo = zeros(m, dtype=int64)
+        hi = full(m, n, dtype=int64)
+        bound = zeros(m)
+        limit = best[:, -1].copy()
+        found_q = []
+        found_pos = []
+        while len(q):
+            keep = (lo < hi) & (bound <= limit[q])
+            q, lo, hi, bound = q[keep], lo[keep], hi[keep], bound[keep]
+            leaf = hi - lo <= LEAFSIZE
+            cq, cpos = _expand(q[leaf], lo[leaf], hi[leaf])
+            q, lo, hi, bound = q[~leaf], lo[~leaf], hi[~leaf], bound[~leaf]
+            mid = (lo + hi) // 2
+            found_q += [cq, q]
+            found_pos += [cpos, mid]
+            d = chunk[q, axes[mid]] - coords[mid, axes[mid]]
+            far = maximum(bound, d ** 2)
+            q = concatenate((q, q))
+            lo, hi = concatenate((lo, mid + 1)), concatenate((mid, hi))
+            bound = concatenate((where(d <= 0, bound, far), where(d <= 0, far, bound)))
+        cq = concatenate(found_q)
+        cpos = concatenate(found_pos)
+        new = (cpos < first_lo[cq]) | (cpos >= first_hi[cq])
+        cq, cpos = cq[new], cpos[new]
+        d2 = _squared_norm(chunk[cq] - coords[cpos])
+        near = d2 < limit[cq]
+        _merge(best, index, cq[near], d2[near], cpos[near])
+        distances[start:start + m] = sqrt(best)
+        positions[start:start + m] = index
+    return distances, labels[positions]
+
+
+def kdtree_query_radius_numpy(tree, points, radius):
+    """Find the neighbors within a radius of a number of points in a kd-tree, using NumPy.
+
+    Parameters
+    ----------
+    tree : :class:`compas.geometry.KDTree`
+        The tree.
+    points : array-like
+        The coordinates of the query points.
+    radius : float
+        The search radius.
+
+    Returns
+    -------
+    tuple
+        * The distances to the neighbors of every query point, in increasing order.
+        * The labels of the neighbors of every query point.
+
+    Examples
+    --------
+    >>> from compas.geometry import KDTree
+    >>> tree = KDTree([[0.0, 0.0, 0.0], [1.0, 0.0, 0.0], [0.0, 2.0, 0.0]])
+    >>> kdtree_query_radius_numpy(tree, [[0.0, 0.0, 0.0]], 1.5)
+    ([[0.0, 1.0]], [[0, 1]])
+
+    """
+    coords, labels, axes = _tree_arrays(tree)
+    points = asarray(points, dtype=float64).reshape((-1, coords.shape[1]))
+    limit = radius ** 2
+    distances = []
+    neighbors = []
+    for start in range(0, len(points), CHUNKSIZE):
+        chunk = points[start:start + CHUNKSIZE]
+        m = len(chunk)
+        hits_q = []
+        hits_d = []
+        hits_i = []
+        q = arange(m)
+        lo = zeros(m, dtype=int64)
+        hi = full(m, len(coords), dtype=int64)
+        bound = zeros(m)
+        while len(q):
+            keep = (lo < hi) & (bound <= limit)
+            q, lo, hi, bound = q[keep], lo[keep], hi[keep], bound[keep]
+            leaf = hi - lo <= LEAFSIZE
+            cq, cpos = _expand(q[leaf], lo[leaf], hi[leaf])
+            q, lo, hi, bound = q[~leaf], lo[~leaf], hi[~leaf], bound[~leaf]
+            mid = (lo + hi) // 2
+            cq = concatenate((cq, q))
+            cpos = concatenate((cpos, mid))
+            d2 = _squared_norm(chunk[cq] - coords[cpos])
+            hit = d2 <= limit
+            hits_q.append(cq[hit])
+            hits_d.append(d2[hit])
+            hits_i.append(cpos[hit])
+            d = chunk[q, axes[mid]] - coords[mid, axes[mid]]
+            far = maximum(bound, d ** 2)
+            q = concatenate((q, q))
+            lo, hi = concatenate((lo, mid + 1)), concatenate((mid, hi))
+            bound = concatenate((where(d <= 0, bound, far), where(d <= 0, far, bound)))
+        q = concatenate(hits_q)
+        d2 = concatenate(hits_d)
+        index = concatenate(hits_i)
+        order = lexsort((d2, q))
+        indptr = concatenate(([0], cumsum(bincount(q, minlength=m))))
+        d = sqrt(d2[order]).tolist()
+        i = labels[index[order]].tolist()
+        distances += [d[indptr[j]:indptr[j + 1]] for j in range(m)]
+        neighbors += [i[indptr[j]:indptr[j + 1]] for j in range(m)]
+    return distances, neighbors
+
+
+# ==============================================================================
+# Helpers
+# ==============================================================================
+
+
+def _tree_arrays(tree):
+    """The coordinates, labels and split axes of the nodes of a tree, cached on the tree."""
+    if tree._arrays is None or len(tree._arrays[0]) != len(tree.points):
+        if tree.points:
+            coords = array(tree.points, dtype=float64)
+        else:
+            coords = zeros((0, 3))
+        tree._arrays = coords, array(tree.labels, dtype=int64), array(tree.axes, dtype=int64)
+    return tree._arrays
+
+
+def _squared_norm(v):
+    return einsum('ij,ij->i', v, v)
+
+
+def _expand(q, lo, hi):
+    """Expand pairs of queries and ranges of nodes to pairs of queries and nodes."""
+    count = hi - lo
+    total = count.sum()
+    positions = arange(total) - (cumsum(count) - count).repeat(count) + lo.repeat(count)
+    return q.repeat(count), positions
+
+
+def _merge(best, index, q, d2, positions):
+    """Merge candidate neighbors into the sorted rows of the k best distances and positions of the queries."""
+    if not len(q):
+        return
+    k = best.shape[1]
+    rows = unique(q)
+    q = concatenate((rows.repeat(k), q))
+    d2 = concatenate((best[rows].ravel(), d2))
+    positions = concatenate((index[rows].ravel(), positions))
+    order = lexsort((d2, q))
+    q, d2, positions = q[order], d2[order], positions[order]
+    rank = arange(len(q)) - searchsorted(q, q)
+    keep = rank < k
+    best[q[keep], rank[keep]] = d2[keep]
+    index[q[keep], rank[keep]] = positions[keep]
+
+
+# ==============================================================================
+# Main
+# ==============================================================================
+
+if __name__ == '__main__':
+
+    import doctest
+    doctest.testmod(globs=globals())
@@ -0,0 +1,553 @@
+from __future__ import print_function
+from __future__ import absolute_import
+from __future__ import division
+
+from numpy import absolute
+from numpy import arange
+from numpy import argsort
+from numpy import asarray
+from numpy import concatenate
+from numpy import cross
+from numpy import cumsum
+from numpy import einsum
+from numpy import empty
+from numpy import errstate
+from numpy import float64
+from numpy import int64
+from numpy import lexsort
+from numpy import maximum
+from numpy import minimum
+from numpy import nan
+from numpy import searchsorted
+from numpy import where
+from numpy import zeros
+
+
+__all__ = [
+    'intersection_line_triangle_numpy',
+    'intersection_ray_triangle_numpy',
+    'intersection_segment_triangle_numpy',
+    'intersection_segment_plane_numpy',
+    'intersection_segment_segment_xy_numpy',
+    'intersection_segments_triangles_numpy',
+    'overlapping_boxes_numpy',
+]
+
+
+# the number of candidate pairs processed at once
+CHUNKSIZE = 2 ** 20
+# the maximum number of cells per axis of the grid of the broad phase
+GRIDSIZE = 1024
+# the number of cells above which a box is swept instead of hashed
+LARGEBOX = 64
+
+
+def intersection_line_triangle_numpy(lines, triangles, tol=1e-6):
+    """Compute the intersections of lines and triangles, using NumPy.
+
+    Parameters
+    ----------
+    lines : array-like
+        The lines, defined by two points, as an array of shape ``(..., 2, 3)``.
+    triangles : array-like
+        The XYZ coordinates of the corners of the triangles, as an array of shape ``(..., 3, 3)``.
+    tol : float, optional
+        Lines and triangles are considered parallel if the absolute value of the dot product
+        of the line vector and the (non-normalized) normal of the triangle is smaller than this value.
+        Default is ``1e-6``.
+
+    Returns
+    -------
+    tuple
+        * A boolean mask of the intersecting pairs of lines and triangles.
+        * The parameters of the intersection points along the lines,
+          such that a point is ``a + t * (b - a)``, or ``nan`` for pairs that do not intersect.
+
+    Notes
+    -----
+    The lines and triangles are broadcast against each other, following the rules of NumPy.
+    For example, ``n`` lines and ``n`` triangles result in ``n`` tests of the corresponding lines and triangles,
+    and ``n`` lines with shape ``(n, 1, 2, 3)`` and ``m`` triangles with shape ``(m, 3, 3)``
+    in ``n x m`` tests of all lines against all triangles.
+
+    The intersections are computed with the algorithm of Moller and Trumbore [1]_.
+    Points on the edges of the triangles are inside.
+
+    References
+    ----------
+    .. [1] Moller, T. and Trumbore, B. *Fast, minimum storage ray-triangle intersection*.
+           Journal of Graphics Tools 2(1), 1997.
+
+    See Also
+    --------
+    :func:`compas.geometry.intersection_line_triangle`
+
+    Examples
+    --------
+    >>> triangle = [[0.0, 0.0, 0.0], [1.0, 0.0, 0.0], [0.0, 1.0, 0.0]]
+    >>> lines = [[[0.2, 0.2, 1.0], [0.2, 0.2, 2.0]], [[1.0, 1.0, 1.0], [1.0, 1.0, 2.0]]]
+    >>> hits, t = intersection_line_triangle_numpy(lines, triangle)
+    >>> hits.tolist()
+    [True, False]
+    >>> t[hits].tolist()
+    [-1.0]
+
+    """
+    lines = asarray(lines, dtype=float64)
+    a = lines[..., 0, :]
+    hits, t = _moller_trumbore(a, lines[..., 1, :] - a, triangles, tol)
+    return _masked(hits, t)
+
+
+def intersection_ray_triangle_numpy(origins, directions, triangles, tol=1e-6):
+    """Compute the intersections of rays and triangles, using NumPy.
+
+    Parameters
+    ----------
+    origins : array-like
+        The XYZ coordinates of the origins of the rays, as an array of shape ``(..., 3)``.
+    directions : array-like
+        The direction vectors of the rays, as an array of shape ``(..., 3)``.
+    triangles : array-like
+        The XYZ coordinates of the corners of the triangles, as an array of shape ``(..., 3, 3)``.
+    tol : float, optional
+        The tolerance for parallel rays and triangles (see :func:`intersection_line_triangle_numpy`).
+        Default is ``1e-6``.
+
+    Returns
+    -------
+    tuple
+        * A boolean mask of the intersecting pairs of rays and triangles.
+        * The ray parameters of the intersection points, in units of the direction vectors,
+          or ``nan`` for pairs that do not intersect.
+
+    Notes
+    -----
+    The rays and triangles are broadcast against each other, as in :func:`intersection_line_triangle_numpy`.
+
+    Examples
+    --------
+    >>> triangle = [[0.0, 0.0, 0.0], [1.0, 0.0, 0.0], [0.0, 1.0, 0.0]]
+    >>> hits, t = intersection_ray_triangle_numpy([[0.2, 0.2, 1.0], [0.2, 0.2, -1.0]], [0.0, 0.0, -2.0], triangle)
+    >>> hits.tolist()
+    [True, False]
+    >>> t[hits].tolist()
+    [0.5]
+
+    """
+    hits, t = _moller_trumbore(origins, directions, triangles, tol)
+    return _masked(hits & (t >= 0.0), t)
+
+
+def intersection_segment_triangle_numpy(segments, triangles, tol=1e-6):
+    """Compute the intersections of line segments and triangles, using NumPy.
+
+    Parameters
+    ----------
+    segments : array-like
+        The segments, defined by two points, as an array of shape ``(..., 2, 3)``.
+    triangles : array-like
+        The XYZ coordinates of the corners of the triangles, as an array of shape ``(..., 3, 3)``.
+    tol : float, optional
+        The tolerance for parallel segments and triangles (see :func:`intersection_line_triangle_numpy`).
+        Default is ``1e-6``.
+
+    Returns
+    -------
+    tuple
+        * A boolean mask of the intersecting pairs of segments and triangles.
+        * The parameters of the intersection points along the segments, between ``0`` and ``1``,
+          or ``nan`` for pairs that do not intersect.
+
+    Notes
+    -----
+    The segments and triangles are broadcast against each other, as in :func:`intersection_line_triangle_numpy`.
+    To test large numbers of segments against large numbers of triangles,
+    use :func:`intersection_segments_triangles_numpy`, which only tests the pairs with overlapping bounding boxes.
+
+    Examples
+    --------
+    >>> triangle = [[0.0, 0.0, 0.0], [1.0, 0.0, 0.0], [0.0, 1.0, 0.0]]
+    >>> segments = [[[0.2, 0.2, 1.0], [0.2, 0.2, -1.0]], [[0.2, 0.2, 1.0], [0.2, 0.2, 2.0]]]
+    >>> hits, t = intersection_segment_triangle_numpy(segments, triangle)
+    >>> hits.tolist()
+    [True, False]
+    >>> t[hits].tolist()
+    [0.5]
+
+    """
+    segments = asarray(segments, dtype=float64)
+    a = segments[..., 0, :]
+    hits, t = _moller_trumbore(a, segments[..., 1, :] - a, triangles, tol)
+    return _masked(hits & (t >= 0.0) & (t <= 1.0), t)
+
+
+def intersection_segment_plane_numpy(segments, planes, tol=1e-6):
+    """Compute the intersections of line segments and planes, using NumPy.
+
+    Parameters
+    ----------
+    segments : array-like
+        The segments, defined by two points, as an array of shape ``(..., 2, 3)``.
+    planes : array-like
+        The planes, defined by a base point and a normal, as an array of shape ``(..., 2, 3)``.
+    tol : float, optional
+        Segments and planes are considered parallel if the absolute value of the dot product
+        of the segment vector and the normal of the plane is smaller than this value.
+        Default is ``1e-6``.
+
+    Returns
+    -------
+    tuple
+        * A boolean mask of the intersecting pairs of segments and planes.
+        * The parameters of the intersection points along the segments, between ``0`` and ``1``,
+          or ``nan`` for pairs that do not intersect.
+
+    Notes
+    -----
+    The segments and planes are broadcast against each other, as in :func:`intersection_line_triangle_numpy`.
+
+    See Also
+    --------
+    :func:`compas.geometry.intersection_segment_plane`
+
+    Examples
+    --------
+    >>> plane = [[0.0, 0.0, 0.0], [0.0, 0.0, 1.0]]
+    >>> segments = [[[0.0, 0.0, 1.0], [0.0, 0.0, -3.0]], [[0.0, 0.0, 1.0], [0.0, 0.0, 2.0]]]
+    >>> hits, t = intersection_segment_plane_numpy(segments, plane)
+    >>> hits.tolist()
+    [True, False]
+    >>> t[hits].tolist()
+    [0.25]
+
+    """
+    segments = asarray(segments, dtype=float64)
+    planes = asarray(planes, dtype=float64)
+    a = segments[..., 0, :]
+    ab = segments[..., 1, :] - a
+    base = planes[..., 0, :]
+    normal = planes[..., 1, :]
+    cosa = _dot(normal, ab)
+    parallel = absolute(cosa) <= tol
+    t = -_dot(normal, a - base) / where(parallel, 1.0, cosa)
+    return _masked(~parallel & (t >= 0.0) & (t <= 1.0), t)
+
+
+def intersection_segment_segment_xy_numpy(segments1, segments2, tol=1e-6):
+    """Compute the intersections of pairs of line segments in the XY plane, using NumPy.
+
+    Parameters
+    ----------
+    segments1 : array-like
+        The first segments of the pairs, defined by two points, as an array of shape ``(..., 2, 2)`` or ``(..., 2, 3)``.
+    segments2 : array-like
+        The second segments of the pairs.
+    tol : float, optional
+        Segments are considered parallel if the absolute value of the cross product of their vectors
+        is smaller than this value, and the intersection points may lie this distance beyond the ends of the segments.
+        Default is ``1e-6``.
+
+    Returns
+    -------
+    tuple
+        * A boolean mask of the intersecting pairs of segments.
+        * The parameters of the intersection points along the first segments,
+          or ``nan`` for pairs that do not intersect.
+        * The parameters of the intersection points along the second segments,
+          or ``nan`` for pairs that do not intersect.
+
+    Notes
+    -----
+    The segments are broadcast against each other, as in :func:`intersection_line_triangle_numpy`.
+    The Z coordinates are ignored.
+
+    See Also
+    --------
+    :func:`compas.geometry.intersection_segment_segment_xy`
+
+    Examples
+    --------
+    >>> segment = [[0.0, 0.0, 0.0], [2.0, 0.0, 0.0]]
+    >>> segments = [[[1.0, -1.0, 0.0], [1.0, 3.0, 0.0]], [[3.0, -1.0, 0.0], [3.0, 1.0, 0.0]]]
+    >>> hits, t, s = intersection_segment_segment_xy_numpy(segment, segments)
+    >>> hits.tolist()
+    [True, False]
+    >>> t[hits].tolist(), s[hits].tolist()
+    ([0.5], [0.25])
+
+    """
+    segments1 = asarray(segments1, dtype=float64)[..., :2]
+    segments2 = asarray(segments2, dtype=float64)[..., :2]
+    a = segments1[..., 0, :]
+    ab = segments1[..., 1, :] - a
+    c = segments2[..., 0, :]
+    cd = segments2[..., 1, :] - c
+    ac = c - a
+    denom = _cross_xy(ab, cd)
+    parallel = absolute(denom) <= tol
+    denom = where(parallel, 1.0, denom)
+    t = _cross_xy(ac, cd) / denom
+    s = _cross_xy(ac, ab) / denom
+    with errstate(divide='ignore'):
+        # the tolerance as a distance along the segments
+        dt = tol / _dot(ab, ab) ** 0.5
+        ds = tol / _dot(cd, cd) ** 0.5
+    hits = ~parallel & (t >= -dt) & (t <= 1.0 + dt) & (s >= -ds) & (s <= 1.0 + ds)
+    return hits, where(hits, t, nan), where(hits, s, nan)
+
+
+def overlapping_boxes_numpy(boxes1, boxes2):
+    """Find the pairs of overlapping axis-aligned boxes in two sets of boxes, using NumPy.
+
+    Parameters
+    ----------
+    boxes1 : array-like
+        The minimum and maximum corners of the boxes of the first set, as an array of shape ``(n, 2, dim)``.
+    boxes2 : array-like
+        The minimum and maximum corners of the boxes of the second set, as an array of shape ``(m, 2, dim)``.
+
+    Returns
+    -------
+    tuple
+        * The indices of the boxes of the first set.
+        * The indices of the overlapping boxes of the second set.
+
+        The pairs are sorted by the first and then by the second index.
+
+    Notes
+    -----
+    The boxes are hashed in the cells of a uniform grid they overlap, with cells of the average size of the boxes.
+    The candidate pairs are the pairs of boxes in the same cell,
+    and every pair is only reported in the cell that contains the lower corner of the intersection of the two boxes.
+    Boxes that overlap more than :data:`LARGEBOX` cells are instead swept against all boxes of the other set
+    along the first axis.
+    Boxes that touch overlap.
+
+    The candidates are processed in chunks of about :data:`CHUNKSIZE` pairs.
+
+    Examples
+    --------
+    >>> boxes1 = [[[0.0, 0.0, 0.0], [1.0, 1.0, 1.0]], [[5.0, 5.0, 5.0], [6.0, 6.0, 6.0]]]
+    >>> boxes2 = [[[0.5, 0.5, 0.5], [2.0, 2.0, 2.0]], [[1.0, 0.0, 0.0], [5.0, 1.0, 5.0]]]
+    >>> i, j = overlapping_boxes_numpy(boxes1, boxes2)
+    >>> i.tolist(), j.tolist()
+    ([0, 0], [0, 1])
+
+    """
+    chunks = list(_overlapping_boxes(boxes1, boxes2))
+    i = concatenate([i for i, _ in chunks])
+    j = concatenate([j for _, j in chunks])
+    order = lexsort((j, i))
+    return i[order], j[order]
+
+
+def intersection_segments_triangles_numpy(segments, triangles, tol=1e-6):
+    """Find all intersections of a number of line segments with a number of triangles, using NumPy.
+
+    Parameters
+    ----------
+    segments : array-like
+        The segments, defined by two points, as an array of shape ``(n, 2, 3)``.
+    triangles : array-like
+        The XYZ coordinates of the corners of the triangles, as an array of shape ``(m, 3, 3)``.
+    tol : float, optional
+        The tolerance for parallel segments and triangles (see :func:`intersection_line_triangle_numpy`).
+        Default is ``1e-6``.
+
+    Returns
+    -------
+    tuple
+        * The indices of the intersecting segments.
+        * The indices of the intersected triangles.
+        * The parameters of the intersection points along the segments, between ``0`` and ``1``.
+
+        The intersections are sorted by segment and then by triangle.
+
+    Notes
+    -----
+    Only the pairs of segments and triangles with overlapping bounding boxes (see :func:`overlapping_boxes_numpy`)
+    are tested with :func:`intersection_segment_triangle_numpy`.
+
+    Examples
+    --------
+    >>> triangles = [[[0.0, 0.0, 0.0], [1.0, 0.0, 0.0], [0.0, 1.0, 0.0]], [[0.0, 0.0, 1.0], [1.0, 0.0, 1.0], [0.0, 1.0, 1.0]]]
+    >>> segments = [[[0.2, 0.2, -1.0], [0.2, 0.2, 3.0]], [[0.9, 0.9, -1.0], [0.9, 0.9, 3.0]]]
+    >>> i, j, t = intersection_segments_triangles_numpy(segments, triangles)
+    >>> i.tolist(), j.tolist(), t.tolist()
+    ([0, 0], [0, 1], [0.25, 0.5])
+
+    """
+    segments = asarray(segments, dtype=float64).reshape((-1, 2, 3))
+    triangles = asarray(triangles, dtype=float64).reshape((-1, 3, 3))
+    boxes1 = _boxes(segments)
+    boxes2 = _boxes(triangles)
+    found = []
+    for i, j in _overlapping_boxes(boxes1, boxes2):
+        hits, t = intersection_segment_triangle_numpy(segments[i], triangles[j], tol=tol)
+        found.append((i[hits], j[hits], t[hits]))
+    i = concatenate([i for i, _, _ in found])
+    j = concatenate([j for _, j, _ in found])
+    t = concatenate([t for _, _, t in found])
+    order = lexsort((j, i))
+    return i[order], j[order], t[order]
+
+
+# ==============================================================================
+# Helpers
+# ==============================================================================
+
+
+def _dot(u, v):
+    return einsum('...i,...i', u, v)
+
+
+def _cross_xy(u, v):
+    return u[..., 0] * v[..., 1] - u[..., 1] * v[..., 0]
+
+
+def _masked(hits, t):
+    return hits, where(hits, t, nan)
+
+
+def _moller_trumbore(origins, directions, triangles, tol):
+    """A mask of the pairs of lines and triangles that are not parallel and of which the intersection is inside the triangle,
+    and the line parameters of the intersections."""
+    o = asarray(origins, dtype=float64)
+    d = asarray(directions, dtype=float64)
+    triangles = asarray(triangles, dtype=float64)
+    a = triangles[..., 0, :]
+    e1 = triangles[..., 1, :] - a
+    e2 = triangles[..., 2, :] - a
+    pvec = cross(d, e2)
+    # the determinant is the dot product of the direction and the normal of the triangle, up to the sign
+    det = _dot(e1, pvec)
+    ok = absolute(det) > tol
+    det = where(ok, det, 1.0)
+    tvec = o - a
+    u = _dot(tvec, pvec) / det
+    qvec = cross(tvec, e1)
+    v = _dot(d, qvec) / det
+    t = _dot(e2, qvec) / det
+    return ok & (u >= 0.0) & (v >= 0.0) & (u + v <= 1.0), t
+
+
+def _boxes(polytopes):
+    """The bounding boxes of a number of segments or triangles."""
+    boxes = empty((len(polytopes), 2, polytopes.shape[2]))
+    boxes[:, 0] = polytopes.min(axis=1)
+    boxes[:, 1] = polytopes.max(axis=1)
+    return boxes
+
+
+def _overlapping_boxes(boxes1, boxes2):
+    """Generate the pairs of overlapping boxes, in chunks."""
+    boxes1 = asarray(boxes1, dtype=float64)
+    boxes2 = asarray(boxes2, dtype=float64)
+    yield empty(0, dtype=int64), empty(0, dtype=int64)
+    if not len(boxes1) or not len(boxes2):
+        return
+    lo1, hi1 = boxes1[:, 0], boxes1[:, 1]
+    lo2, hi2 = boxes2[:, 0], boxes2[:, 1]
+    origin = minimum(lo1.min(axis=0), lo2.min(axis=0))
+    extent = maximum(hi1.max(axis=0), hi2.max(axis=0)) - origin
+    width = concatenate((hi1 - lo1, hi2 - lo2)).mean(axis=0)
+    cell = maximum(width, extent / GRIDSIZE)
+    cell[cell == 0] = 1.0
+    shape = (extent / cell).astype(int64) + 1
+
+    def cells(points):
+        return minimum(((points - origin) / cell).astype(int64), shape - 1)
+
+    first1, last1 = cells(lo1), cells(hi1)
+    first2, last2 = cells(lo2), cells(hi2)
+    large1 = (last1 - first1 + 1).prod(axis=1) > LARGEBOX
+    large2 = (last2 - first2 + 1).prod(axis=1) > LARGEBOX
+    small1 = (~large1).nonzero()[0]
+    small2 = (~large2).nonzero()[0]
+    # the boxes that span many cells are swept against all boxes of the other set
+    i = large1.nonzero()[0]
+    for ii, j in _sweep(lo1[i], hi1[i], lo2, hi2):
+        yield i[ii], j
+    j = large2.nonzero()[0]
+    for i, jj in _sweep(lo1[small1], hi1[small1], lo2[j], hi2[j]):
+        yield small1[i], j[jj]
+    # the other boxes are hashed in the cells they overlap,
+    # and a pair is reported in the cell of the lower corner of the intersection of the boxes only
+    box1, key1 = _box_cells(small1, first1[small1], last1[small1], shape)
+    box2, key2 = _box_cells(small2, first2[small2], last2[small2], shape)
+    order = argsort(key2, kind='mergesort')
+    key2 = key2[order]
+    box2 = box2[order]
+    start = searchsorted(key2, key1, side='left')
+    stop = searchsorted(key2, key1, side='right')
+    for q, positions in _ranges(start, stop - start):
+        i = box1[q]
+        j = box2[positions]
+        corner = _cell_keys(cells(maximum(lo1[i], lo2[j])), shape)
+        keep = (corner == key1[q]) & ((lo1[i] <= hi2[j]) & (lo2[j] <= hi1[i])).all(axis=1)
+        yield i[keep], j[keep]
+
+
+def _sweep(lo1, hi1, lo2, hi2):
+    """Generate the pairs of overlapping boxes by sweeping along the first axis, in chunks.
+
+    Two intervals overlap if the start of the second interval lies in the first interval,
+    or if the start of the first interval lies in the second, but not at its start.
+    """
+    if not len(lo1) or not len(lo2):
+        return
+    for query_lo, query_hi, lo, side in ((lo1, hi1, lo2, 'left'), (lo2, hi2, lo1, 'right')):
+        order = argsort(lo[:, 0], kind='mergesort')
+        start = lo[order, 0]
+        first = searchsorted(start, query_lo[:, 0], side=side)
+        last = searchsorted(start, query_hi[:, 0], side='right')
+        for q, positions in _ranges(first, last - first):
+            i, j = (q, order[positions]) if side == 'left' else (order[positions], q)
+            keep = ((lo1[i] <= hi2[j]) & (lo2[j] <= hi1[i])).all(axis=1)
+            yield i[keep], j[keep]
+
+
+def _cell_keys(cells, shape):
+    key = zeros(len(cells), dtype=int64)
+    for axis in range(cells.shape[1]):
+        key = key * shape[axis] + cells[:, axis]
+    return key
+
+
+def _box_cells(boxes, first, last, shape):
+    """The pairs of boxes and the keys of the cells they overlap."""
+    size = last - first + 1
+    count = size.prod(axis=1)
+    offset = arange(count.sum()) - (cumsum(count) - count).repeat(count)
+    cells = empty((len(offset), first.shape[1]), dtype=int64)
+    for axis in range(first.shape[1] - 1, -1, -1):
+        n = size[:, axis].repeat(count)
+        cells[:, axis] = first[:, axis].repeat(count) + offset % n
+        offset = offset // n
+    return boxes.repeat(count), _cell_keys(cells, shape)
+
+
+def _ranges(first, count):
+    """Expand ranges of positions per query to pairs of queries and positions, in chunks of about :data:`CHUNKSIZE` pairs."""
+    total = cumsum(count)
+    queries = 0
+    while queries < len(count):
+        done = total[queries - 1] if queries else 0
+        stop = max(int(searchsorted(total, done + CHUNKSIZE, side='right')), queries + 1)
+        q = arange(queries, stop)
+        n = count[q]
+        offset = arange(n.sum()) - (cumsum(n) - n).repeat(n)
+        q = q.repeat(n)
+        yield q, first[q] + offset
+        queries = stop
+
+
+# ==============================================================================
+# Main
+# ==============================================================================
+
+if __name__ == '__main__':
+
+    import doctest
+    doctest.testmod(globs=globals())
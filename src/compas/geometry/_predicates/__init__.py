@@ -2,7 +2,12 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 
+import compas
+
 from .predicates_2 import *  # noqa: F401 F403
 from .predicates_3 import *  # noqa: F401 F403
+from .polygonindex import *  # noqa: F401 F403
+if not compas.IPY:
+    from .polygonindex_numpy import *  # noqa: F401 F403
 
 __all__ = [name for name in dir() if not name.startswith('_')]
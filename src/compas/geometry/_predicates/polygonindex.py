@@ -0,0 +1,211 @@
+from __future__ import print_function
+from __future__ import absolute_import
+from __future__ import division
+
+import compas
+
+from compas.geometry._predicates.predicates_2 import orient_xy
+
+
+__all__ = [
+    'PolygonIndex'
+]
+
+
+class PolygonIndex(object):
+    """An index of the edges of a polygon in the XY plane, for point in polygon queries of many points.
+
+    Parameters
+    ----------
+    polygon : sequence
+        A sequence of XY(Z) coordinates of 2D or 3D points (Z will be ignored)
+        representing the locations of the corners of a polygon.
+        The vertices are assumed to be in order.
+        The polygon is assumed to be closed.
+        The first and last vertex in the sequence should not be the same.
+    holes : list, optional
+        A list of polygons describing holes in the polygon.
+    tol : float, optional
+        Points closer than this distance to an edge of the polygon or the holes are on the boundary.
+        Default is ``1e-6``.
+
+    Attributes
+    ----------
+    edges : list
+        The edges of the polygon and the holes, as tuples ``(x1, y1, x2, y2)``.
+    bbox : tuple
+        The bounding box of the edges, extended by the tolerance, as a tuple ``(xmin, ymin, xmax, ymax)``.
+    slabs : list
+        For every horizontal slab of the bounding box, the indices of the edges overlapping it.
+
+    Notes
+    -----
+    The bounding box is divided in as many horizontal slabs of equal height as there are edges,
+    and every edge is listed in the slabs it overlaps, extended by the tolerance.
+    The index is built once, in time proportional to the number of edges and the slabs they overlap.
+    A point is then classified by testing only the edges of its slab.
+    It is inside if a ray from the point in the positive X direction crosses these edges an odd number of times.
+    The crossings are counted with exact orientation tests (see :func:`compas.geometry.orient_xy`).
+
+    The batch query :meth:`classify` is vectorized with NumPy if it is available,
+    and the number of query points is at least :attr:`numpy_threshold`.
+
+    Examples
+    --------
+    >>> index = PolygonIndex([[0.0, 0.0, 0.0], [4.0, 0.0, 0.0], [4.0, 4.0, 0.0], [0.0, 4.0, 0.0]],
+    ...                      holes=[[[1.0, 1.0, 0.0], [2.0, 1.0, 0.0], [2.0, 2.0, 0.0], [1.0, 2.0, 0.0]]])
+    >>> index.classify([[3.0, 3.0, 0.0], [1.5, 1.5, 0.0], [4.0, 2.0, 0.0], [5.0, 2.0, 0.0]])
+    [1, -1, 0, -1]
+
+    """
+
+    INSIDE = 1
+    BOUNDARY = 0
+    OUTSIDE = -1
+
+    numpy_threshold = 100
+
+    def __init__(self, polygon, holes=None, tol=1e-6):
+        self.tol = tol
+        self.edges = []
+        for points in [polygon] + list(holes or []):
+            points = [(point[0], point[1]) for point in points]
+            for (x1, y1), (x2, y2) in zip(points[-1:] + points[:-1], points):
+                self.edges.append((x1, y1, x2, y2))
+        self.bbox = None
+        self.slabs = []
+        self._height = 1.0
+        self._arrays = None
+        self.build()
+
+    def build(self):
+        """Divide the bounding box of the edges in slabs, and list the edges overlapping every slab."""
+        edges = self.edges
+        tol = self.tol
+        self._arrays = None
+        if not edges:
+            self.bbox = None
+            self.slabs = []
+            return
+        xmin = min(min(x1, x2) for x1, _, x2, _ in edges) - tol
+        xmax = max(max(x1, x2) for x1, _, x2, _ in edges) + tol
+        ymin = min(min(y1, y2) for _, y1, _, y2 in edges) - tol
+        ymax = max(max(y1, y2) for _, y1, _, y2 in edges) + tol
+        self.bbox = xmin, ymin, xmax, ymax
+        n = len(edges)
+        self._height = (ymax - ymin) / n or 1.0
+        self.slabs = [[] for _ in range(n)]
+        for index, (_, y1, _, y2) in enumerate(edges):
+            lo = self._slab(min(y1, y2) - tol)
+            hi = self._slab(max(y1, y2) + tol)
+            for slab in range(lo, hi + 1):
+                self.slabs[slab].append(index)
+
+    def _slab(self, y):
+        return max(0, min(len(self.slabs) - 1, int((y - self.bbox[1]) / self._height)))
+
+    # --------------------------------------------------------------------------
+    # single point queries
+    # --------------------------------------------------------------------------
+
+    def classify_point(self, point):
+        """Determine if a point lies inside the polygon, on its boundary, or outside it.
+
+        Parameters
+        ----------
+        point : sequence of float
+            XY(Z) coordinates of a 2D or 3D point (Z will be ignored).
+
+        Returns
+        -------
+        int
+            :attr:`INSIDE` (``1``), :attr:`BOUNDARY` (``0``) or :attr:`OUTSIDE` (``-1``).
+
+        Examples
+        --------
+        >>> index = PolygonIndex([[0.0, 0.0], [1.0, 0.0], [0.0, 1.0]])
+        >>> index.classify_point([0.2, 0.2])
+        1
+
+        """
+        x = point[0]
+        y = point[1]
+        if self.bbox is None:
+            return PolygonIndex.OUTSIDE
+        xmin, ymin, xmax, ymax = self.bbox
+        if x < xmin or x > xmax or y < ymin or y > ymax:
+            return PolygonIndex.OUTSIDE
+        tol2 = self.tol ** 2
+        left = x - self.tol
+        edges = self.edges
+        inside = False
+        for index in self.slabs[self._slab(y)]:
+            x1, y1, x2, y2 = edges[index]
+            if x1 < left and x2 < left:
+                # the edge is not crossed by the ray, and not within the tolerance
+                continue
+            dx = x2 - x1
+            dy = y2 - y1
+            length2 = dx * dx + dy * dy
+            t = ((x - x1) * dx + (y - y1) * dy) / length2 if length2 else 0.0
+            t = min(1.0, max(0.0, t))
+            if (x1 + t * dx - x) ** 2 + (y1 + t * dy - y) ** 2 <= tol2:
+                return PolygonIndex.BOUNDARY
+            if (y1 > y) != (y2 > y):
+                o = orient_xy((x1, y1), (x2, y2), (x, y))
+                if o == 0:
+                    return PolygonIndex.BOUNDARY
+                if (o > 0) == (y2 > y1):
+                    inside = not inside
+            elif (x == x1 and y == y1) or (x == x2 and y == y2) or (y1 == y2 == y and min(x1, x2) <= x <= max(x1, x2)):
+                # points on the vertices and horizontal edges, which are not crossed by the ray
+                return PolygonIndex.BOUNDARY
+        return PolygonIndex.INSIDE if inside else PolygonIndex.OUTSIDE
+
+    # --------------------------------------------------------------------------
+    # batch queries
+    # --------------------------------------------------------------------------
+
+    def _use_numpy(self, points):
+        if compas.IPY or len(points) < self.numpy_threshold:
+            return False
+        try:
+            import numpy  # noqa: F401
+        except ImportError:
+            return False
+        return True
+
+    def classify(self, points):
+        """Determine for a number of points if they lie inside the polygon, on its boundary, or outside it.
+
+        Parameters
+        ----------
+        points : list
+            XY(Z) coordinates of 2D or 3D points (Z will be ignored).
+
+        Returns
+        -------
+        list
+            For every point :attr:`INSIDE` (``1``), :attr:`BOUNDARY` (``0``) or :attr:`OUTSIDE` (``-1``).
+
+        Examples
+        --------
+        >>> index = PolygonIndex([[0.0, 0.0], [1.0, 0.0], [0.0, 1.0]])
+        >>> index.classify([[0.2, 0.2], [0.5, 0.5], [1.0, 1.0]])
+        [1, 0, -1]
+
+        """
+        if self._use_numpy(points):
+            from compas.geometry._predicates.polygonindex_numpy import polygonindex_classify_numpy
+            return polygonindex_classify_numpy(self, points).tolist()
+        return [self.classify_point(point) for point in points]
+
+
+# ==============================================================================
+# Main
+# ==============================================================================
+
+if __name__ == '__main__':
+
+    import doctest
+    doctest.testmod(globs=globals())
@@ -0,0 +1,153 @@
+from __future__ import print_function
+from __future__ import absolute_import
+from __future__ import division
+
+from numpy import absolute
+from numpy import arange
+from numpy import array
+from numpy import asarray
+from numpy import bincount
+from numpy import clip
+from numpy import concatenate
+from numpy import cumsum
+from numpy import float64
+from numpy import flatnonzero
+from numpy import full
+from numpy import int8
+from numpy import int64
+from numpy import maximum
+from numpy import minimum
+from numpy import searchsorted
+from numpy import where
+from numpy import zeros
+
+from compas.geometry._predicates.predicates_2 import CCW_ERRBOUND
+from compas.geometry._predicates.predicates_2 import UNDERFLOW_ERRBOUND
+from compas.geometry._predicates.predicates_2 import orient_xy
+
+
+__all__ = [
+    'polygonindex_classify_numpy',
+]
+
+
+# the number of pairs of points and edges processed at once
+CHUNKSIZE = 2 ** 20
+
+
+def polygonindex_classify_numpy(index, points):
+    """Determine for a number of points if they lie inside a polygon, on its boundary, or outside it, using NumPy.
+
+    Parameters
+    ----------
+    index : :class:`compas.geometry.PolygonIndex`
+        The index of the edges of the polygon.
+    points : array-like
+        XY(Z) coordinates of 2D or 3D points (Z will be ignored).
+
+    Returns
+    -------
+    array
+        For every point ``1`` if it is inside, ``0`` if it is on the boundary and ``-1`` if it is outside.
+
+    Notes
+    -----
+    The points are paired with the edges of their slab, in chunks of at most :data:`CHUNKSIZE` pairs.
+    The orientations of the points and the crossed edges are computed in floating point arithmetic,
+    and recomputed exactly with :func:`compas.geometry.orient_xy` if their sign is uncertain.
+    The results are therefore the same as those of :meth:`compas.geometry.PolygonIndex.classify_point`.
+
+    Examples
+    --------
+    >>> from compas.geometry import PolygonIndex
+    >>> index = PolygonIndex([[0.0, 0.0], [1.0, 0.0], [0.0, 1.0]])
+    >>> codes = polygonindex_classify_numpy(index, [[0.2, 0.2], [0.5, 0.5], [1.0, 1.0]])
+    >>> codes.tolist()
+    [1, 0, -1]
+    >>> (codes == index.INSIDE).tolist()
+    [True, False, False]
+
+    """
+    points = asarray(points, dtype=float64).reshape((len(points), -1))
+    result = full(len(points), index.OUTSIDE, dtype=int8)
+    if index.bbox is None or not len(points):
+        return result
+    edges, offsets, members = _index_arrays(index)
+    right = maximum(edges[:, 0], edges[:, 2])
+    xmin, ymin, xmax, ymax = index.bbox
+    x = points[:, 0]
+    y = points[:, 1]
+    candidates = flatnonzero((x >= xmin) & (x <= xmax) & (y >= ymin) & (y <= ymax))
+    x = x[candidates]
+    y = y[candidates]
+    left = x - index.tol
+    slab = clip(((y - ymin) / index._height).astype(int64), 0, len(offsets) - 2)
+    lo = offsets[slab]
+    count = offsets[slab + 1] - lo
+    end = cumsum(count)
+    inside = zeros(len(candidates), dtype=bool)
+    boundary = zeros(len(candidates), dtype=bool)
+    tol2 = index.tol ** 2
+    start = 0
+    while start < len(candidates):
+        stop = max(start + 1, int(searchsorted(end, end[start] - count[start] + CHUNKSIZE, 'right')))
+        c = count[start:stop]
+        first = end[start:stop] - c
+        q = arange(stop - start).repeat(c)
+        e = members[(lo[start:stop] - first).repeat(c) + arange(first[0], end[stop - 1])]
+        # the edges left of the points are not crossed by the rays, and not within the tolerance
+        keep = flatnonzero(right[e] >= left[start:stop][q])
+        q = q[keep]
+        e = e[keep]
+        px = x[start:stop][q]
+        py = y[start:stop][q]
+        x1, y1, x2, y2 = edges[e].T
+        # the distances to the edges
+        dx = x2 - x1
+        dy = y2 - y1
+        length2 = dx * dx + dy * dy
+        t = clip(((px - x1) * dx + (py - y1) * dy) / where(length2 > 0, length2, 1.0), 0.0, 1.0)
+        on = (x1 + t * dx - px) ** 2 + (y1 + t * dy - py) ** 2 <= tol2
+        # the orientations of the points with respect to the crossed edges, exact if uncertain
+        up = y2 > py
+        crossed = (y1 > py) != up
+        detleft = (x1 - px) * (y2 - py)
+        detright = (y1 - py) * (x2 - px)
+        o = detleft - detright
+        uncertain = flatnonzero(crossed & (absolute(o) <= CCW_ERRBOUND * (absolute(detleft) + absolute(detright)) + UNDERFLOW_ERRBOUND))
+        for k in uncertain.tolist():
+            o[k] = orient_xy((x1[k], y1[k]), (x2[k], y2[k]), (px[k], py[k]))
+        on |= crossed & (o == 0)
+        on |= ~crossed & (((px == x1) & (py == y1)) | ((px == x2) & (py == y2)) |
+                          ((y1 == py) & (y2 == py) & (px >= minimum(x1, x2)) & (px <= maximum(x1, x2))))
+        crossed &= (o != 0) & ((o > 0) == up)
+        inside[start:stop] = bincount(q, weights=crossed, minlength=stop - start) % 2 == 1
+        boundary[start:stop] = bincount(q, weights=on, minlength=stop - start) > 0
+        start = stop
+    result[candidates] = where(boundary, index.BOUNDARY, where(inside, index.INSIDE, index.OUTSIDE))
+    return result
+
+
+# ==============================================================================
+# Helpers
+# ==============================================================================
+
+
+def _index_arrays(index):
+    """The edges, and the slabs in compressed sparse row format, cached on the index."""
+    if index._arrays is None:
+        edges = array(index.edges, dtype=float64).reshape((-1, 4))
+        offsets = concatenate(([0], cumsum([len(slab) for slab in index.slabs]))).astype(int64)
+        members = array([edge for slab in index.slabs for edge in slab], dtype=int64)
+        index._arrays = edges, offsets, members
+    return index._arrays
+
+
+# ==============================================================================
+# Main
+# ==============================================================================
+
+if __name__ == '__main__':
+
+    import doctest
+    doctest.testmod(globs=globals())
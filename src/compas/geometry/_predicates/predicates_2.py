@@ -2,12 +2,17 @@ from __future__ import print_function
 from __future__ import absolute_import
 from __future__ import division
 
+from fractions import Fraction
+from numbers import Integral
+
 from compas.geometry._core import distance_point_point_xy
 from compas.geometry._core import distance_point_line_xy
 from compas.geometry._core import closest_point_on_segment_xy
 
 
 __all__ = [
+    'orient_xy',
+    'incircle_xy',
     'is_ccw_xy',
     'is_colinear_xy',
     'is_polygon_convex_xy',
@@ -24,6 +29,147 @@ __all__ = [
 ]
 
 
+# the relative error bounds of the floating point evaluation of the determinants (Shewchuk, 1997)
+# and an absolute error bound for the products that underflow
+EPSILON = 2.0 ** -53
+CCW_ERRBOUND = (3.0 + 16.0 * EPSILON) * EPSILON
+INCIRCLE_ERRBOUND = (10.0 + 96.0 * EPSILON) * EPSILON
+UNDERFLOW_ERRBOUND = 2.0 ** -1070
+
+
+def orient_xy(a, b, c):
+    """Compute the orientation of three points in the XY plane, with the correct sign.
+
+    Parameters
+    ----------
+    a : sequence of float
+        XY(Z) coordinates of the first point.
+    b : sequence of float
+        XY(Z) coordinates of the second point.
+    c : sequence of float
+        XY(Z) coordinates of the third point.
+
+    Returns
+    -------
+    float
+        Twice the signed area of the triangle ``abc``.
+        Positive if the points are in counterclockwise order,
+        negative if they are in clockwise order, and zero if they are colinear.
+
+    Notes
+    -----
+    The determinant is first evaluated in floating point arithmetic.
+    Its sign is correct if its magnitude exceeds a bound on the rounding error [1]_,
+    extended to account for underflow, which is the case for all but nearly degenerate inputs.
+    Otherwise, the determinant is evaluated exactly, with integers,
+    after scaling the coordinates with a common power of two.
+    The sign of the result is therefore always correct,
+    and a result of zero means that the points are exactly colinear.
+
+    References
+    ----------
+    .. [1] Shewchuk, J.R. *Adaptive Precision Floating-Point Arithmetic and Fast Robust Geometric Predicates*.
+           Discrete & Computational Geometry 18(3): 305-363, 1997.
+
+    Examples
+    --------
+    >>> orient_xy([0.0, 0.0], [1.0, 0.0], [0.0, 1.0])
+    1.0
+    >>> orient_xy([0.1, 0.1], [0.2, 0.2], [0.3, 0.3])
+    0.0
+    >>> orient_xy([0.5, 0.5], [12.0, 12.0], [24.0, 24.0 + 2 ** -48]) > 0
+    True
+
+    """
+    detleft = (a[0] - c[0]) * (b[1] - c[1])
+    detright = (a[1] - c[1]) * (b[0] - c[0])
+    det = detleft - detright
+    if detleft > 0.0:
+        if detright <= 0.0:
+            return det
+        detsum = detleft + detright
+    elif detleft < 0.0:
+        if detright >= 0.0:
+            return det
+        detsum = -detleft - detright
+    elif detright or (a[0] == c[0] or b[1] == c[1]) and (a[1] == c[1] or b[0] == c[0]):
+        # the sign is correct, unless both products underflow to zero
+        return det
+    else:
+        detsum = 0.0
+    errbound = CCW_ERRBOUND * detsum + UNDERFLOW_ERRBOUND
+    if det > errbound or -det > errbound:
+        return det
+    (ax, ay, bx, by, cx, cy), scale = _integers((a[0], a[1], b[0], b[1], c[0], c[1]))
+    return _float((ax - cx) * (by - cy) - (ay - cy) * (bx - cx), scale ** 2)
+
+
+def incircle_xy(a, b, c, d):
+    """Determine the position of a point with respect to the circle through three points in the XY plane,
+    with the correct sign.
+
+    Parameters
+    ----------
+    a : sequence of float
+        XY(Z) coordinates of the first point on the circle.
+    b : sequence of float
+        XY(Z) coordinates of the second point on the circle.
+    c : sequence of float
+        XY(Z) coordinates of the third point on the circle.
+    d : sequence of float
+        XY(Z) coordinates of the test point.
+
+    Returns
+    -------
+    float
+        Positive if ``d`` lies inside the circle through ``a``, ``b`` and ``c``,
+        negative if it lies outside, and zero if the four points are cocircular,
+        assuming that ``a``, ``b`` and ``c`` are in counterclockwise order.
+        The signs are reversed if they are in clockwise order.
+
+    Notes
+    -----
+    The determinant is evaluated with the same floating point filter and exact fallback as in :func:`orient_xy`.
+
+    Examples
+    --------
+    >>> incircle_xy([0.0, 0.0], [1.0, 0.0], [0.0, 1.0], [0.5, 0.5]) > 0
+    True
+    >>> incircle_xy([0.0, 0.0], [1.0, 0.0], [0.0, 1.0], [1.0, 1.0])
+    0.0
+
+    """
+    adx = a[0] - d[0]
+    bdx = b[0] - d[0]
+    cdx = c[0] - d[0]
+    ady = a[1] - d[1]
+    bdy = b[1] - d[1]
+    cdy = c[1] - d[1]
+    bdxcdy = bdx * cdy
+    cdxbdy = cdx * bdy
+    alift = adx * adx + ady * ady
+    cdxady = cdx * ady
+    adxcdy = adx * cdy
+    blift = bdx * bdx + bdy * bdy
+    adxbdy = adx * bdy
+    bdxady = bdx * ady
+    clift = cdx * cdx + cdy * cdy
+    det = alift * (bdxcdy - cdxbdy) + blift * (cdxady - adxcdy) + clift * (adxbdy - bdxady)
+    permanent = ((abs(bdxcdy) + abs(cdxbdy)) * alift +
+                 (abs(cdxady) + abs(adxcdy)) * blift +
+                 (abs(adxbdy) + abs(bdxady)) * clift)
+    errbound = INCIRCLE_ERRBOUND * permanent + UNDERFLOW_ERRBOUND * (alift + blift + clift + 1.0)
+    if det > errbound or -det > errbound:
+        return det
+    (ax, ay, bx, by, cx, cy, dx, dy), scale = _integers((a[0], a[1], b[0], b[1], c[0], c[1], d[0], d[1]))
+    adx, ady = ax - dx, ay - dy
+    bdx, bdy = bx - dx, by - dy
+    cdx, cdy = cx - dx, cy - dy
+    return _float((adx * adx + ady * ady) * (bdx * cdy - cdx * bdy) +
+                  (bdx * bdx + bdy * bdy) * (cdx * ady - adx * cdy) +
+                  (cdx * cdx + cdy * cdy) * (adx * bdy - bdx * ady), scale ** 4)
+
+
 def is_ccw_xy(a, b, c, colinear=False):
     """Determine if c is on the left of ab when looking from a to b,
     and assuming that all points lie in the XY plane.
@@ -48,6 +194,7 @@ def is_ccw_xy(a, b, c, colinear=False):
 
     Notes
     -----
+    The orientation is computed with :func:`orient_xy`, and is therefore exact.
     For more info, see [1]_.
 
     References
@@ -70,13 +217,9 @@ def is_ccw_xy(a, b, c, colinear=False):
     True
 
     """
-    ab_x = b[0] - a[0]
-    ab_y = b[1] - a[1]
-    ac_x = c[0] - a[0]
-    ac_y = c[1] - a[1]
     if colinear:
-        return ab_x * ac_y - ab_y * ac_x >= 0
-    return ab_x * ac_y - ab_y * ac_x > 0
+        return orient_xy(a, b, c) >= 0
+    return orient_xy(a, b, c) > 0
 
 
 def is_colinear_xy(a, b, c):
@@ -98,11 +241,7 @@ def is_colinear_xy(a, b, c):
         ``False`` otherwise.
 
     """
-    ab_x = b[0] - a[0]
-    ab_y = b[1] - a[1]
-    ac_x = c[0] - a[0]
-    ac_y = c[1] - a[1]
-    return ab_x * ac_y == ab_y * ac_x
+    return orient_xy(a, b, c) == 0
 
 
 def is_polygon_convex_xy(polygon, colinear=False):
@@ -450,6 +589,32 @@ def is_intersection_segment_segment_xy(ab, cd):
     return is_ccw_xy(a, c, d) != is_ccw_xy(b, c, d) and is_ccw_xy(a, b, c) != is_ccw_xy(a, b, d)
 
 
+# ==============================================================================
+# Helpers
+# ==============================================================================
+
+
+def _integers(values):
+    """Scale floating point numbers to integers, exactly, with a common power of two.
+    Integers are not converted to floating point numbers, which could round them.
+
+    Returns the integers and the scale.
+    """
+    ratios = [(int(value), 1) if isinstance(value, Integral) else float(value).as_integer_ratio() for value in values]
+    scale = max(denominator for _, denominator in ratios)
+    return [numerator * (scale // denominator) for numerator, denominator in ratios], scale
+
+
+def _float(determinant, scale):
+    """Convert an exact determinant of scaled integers to a float, without losing its sign to underflow."""
+    if not determinant:
+        return 0.0
+    result = float(Fraction(determinant, scale))
+    if result == 0.0:
+        return 5e-324 if determinant > 0 else -5e-324
+    return result
+
+
 # ==============================================================================
 # Main
 # ==============================================================================
@@ -2,12 +2,12 @@ from __future__ import print_function
 from __future__ import absolute_import
 from __future__ import division
 
-from compas.geometry import cross_vectors
-from compas.geometry import subtract_vectors
-from compas.geometry import dot_vectors
-from compas.geometry import cross_vectors_xy
+from itertools import count
+from math import sqrt
 
-# from compas.geometry import distance_point_point
+import compas
+
+from compas.geometry import orient_xy
 
 
 __all__ = [
@@ -29,58 +29,55 @@ def convex_hull(points):
     list
         The triangular faces of the convex hull as lists of vertex indices
         referring to the original point coordinates.
+        The faces have consistent cycle directions, such that their normals point outward.
 
     Notes
     -----
-    This algorithm is based on [1]_. Note that is not optimized and relatively
-    slow on large sets of points. For a more optimized version of this algorithm,
-    see [2]_.
+    This function implements the Quickhull algorithm [1]_, [2]_.
+    Every face of the hull keeps a list of the points that lie above it, the "outside set" of the face.
+    The farthest point of an outside set is added to the hull by replacing the faces it can see
+    with a cone of new faces between the point and the horizon of the visible region,
+    and only the points in the outside sets of the replaced faces are assigned to the new faces.
+    The expected time complexity is ``O(n log n)``.
+
+    Points that lie within a relative tolerance of the plane of a face are considered to be inside the hull.
+    If all points are coplanar, the hull is the two-sided triangulation of their planar hull.
+    If the points are collinear or coincident, the hull has no faces.
+
+    If NumPy is available and the number of points is large,
+    the points in the interior of the hull of the extreme points in 26 directions are discarded
+    before the hull is constructed (the Akl-Toussaint heuristic [3]_).
 
     References
     ----------
-    .. [1] GitHubGist. *Convex Hull*.
-           Available at: https://gist.github.com/anonymous/5184ba0bcab21d3dd19781efd3aae543
+    .. [1] Barber, C.B., Dobkin, D.P. and Huhdanpaa, H. *The Quickhull Algorithm for Convex Hulls*.
+           ACM Transactions on Mathematical Software 22(4), 1996.
     .. [2] Thomas Diewald. *Convex Hull 3D - Quickhull Algorithm*.
            Available at: https://web.archive.org/web/20180106161310/http://thomasdiewald.com/blog/?p=1888
+    .. [3] Akl, S.G. and Toussaint, G.T. *A fast convex hull algorithm*.
+           Information Processing Letters 7(5), 1978.
 
     Examples
     --------
-    >>>
+    >>> points = [[0, 0, 0], [1, 0, 0], [0, 1, 0], [0, 0, 1], [0.1, 0.1, 0.1]]
+    >>> faces = convex_hull(points)
+    >>> len(faces)
+    4
+    >>> sorted(set(index for face in faces for index in face))
+    [0, 1, 2, 3]
 
     """
-    def _normal_face(face):
-        u = subtract_vectors(points[face[1]], points[face[0]])
-        v = subtract_vectors(points[face[-1]], points[face[0]])
-        return cross_vectors(u, v)
-
-    def _seen(face, p):
-        normal = _normal_face(face)
-        vec = subtract_vectors(points[p], points[face[0]])
-        return (dot_vectors(normal, vec) >= 0)
-
-    def _bdry(faces):
-        bdry_fw = set([(face[i - 1], face[i]) for face in faces for i in range(len(face))])
-        bdry_bk = set([(face[i], face[i - 1]) for face in faces for i in range(len(face))])
-        return bdry_fw - bdry_bk
-
-    def _add_point(hull, p):
-        seen_faces = [face for face in hull if _seen(face, p)]
-
-        if len(seen_faces) == len(hull):
-            # if can see all faces, unsee ones looking "down"
-            normal = _normal_face(seen_faces[0])
-            seen_faces = [face for face in seen_faces if dot_vectors(_normal_face(face), normal) > 0]
-
-        for face in seen_faces:
-            hull.remove(face)
-
-        for edge in _bdry(seen_faces):
-            hull.append([edge[0], edge[1], p])
-
-    hull = [[0, 1, 2], [0, 2, 1]]
-    for i in range(3, len(points)):
-        _add_point(hull, i)
-    return hull
+    xyz = [(point[0], point[1], point[2]) for point in points]
+    if not xyz:
+        return []
+    tol = _hull_tolerance(xyz)
+    indices = None
+    if _use_numpy(xyz):
+        from compas.geometry.hull.hull_numpy import _convex_hull_candidates_numpy
+        indices = _convex_hull_candidates_numpy(xyz, tol)
+    if indices is None:
+        indices = range(len(xyz))
+    return _quickhull(xyz, indices, tol)
 
 
 def convex_hull_xy(points, strict=False):
@@ -90,6 +87,9 @@ def convex_hull_xy(points, strict=False):
     ----------
     points : list
         XY(Z) coordinates of the points.
+    strict : bool, optional
+        If ``True``, keep the points on the straight segments of the hull.
+        Default is ``False``.
 
     Returns
     -------
@@ -100,6 +100,9 @@ def convex_hull_xy(points, strict=False):
     Notes
     -----
     Implements Andrew's monotone chain algorithm [1]_. O(n log n) complexity.
+    The orientation tests are exact (see :func:`compas.geometry.orient_xy`),
+    which makes the hull of a million random points about 15% slower to compute
+    than with a plain floating point cross product.
 
     References
     ----------
@@ -108,14 +111,10 @@ def convex_hull_xy(points, strict=False):
 
     Examples
     --------
-    >>>
+    >>> convex_hull_xy([[0, 0, 0], [1, 0, 0], [1, 1, 0], [0.5, 0.5, 0], [0, 1, 0]])
+    [(0, 0, 0), (1, 0, 0), (1, 1, 0), (0, 1, 0)]
 
     """
-    def cross(o, a, b):
-        u = subtract_vectors(a, o)
-        v = subtract_vectors(b, o)
-        return cross_vectors_xy(u, v)[2]
-
     # Sort the points lexicographically (tuples are compared lexicographically).
     # Remove duplicates to detect the case we have just one unique point.
     points = sorted(set(map(tuple, points)))
@@ -124,75 +123,238 @@ def convex_hull_xy(points, strict=False):
     if len(points) <= 1:
         return points
 
-    # Build lower hull
-    lower = []
-    for p in points:
-        if strict:
-            while len(lower) >= 2 and cross(lower[-2], lower[-1], p) < 0:
-                lower.pop()
-        else:
-            while len(lower) >= 2 and cross(lower[-2], lower[-1], p) <= 0:
-                lower.pop()
-        lower.append(p)
-
-    # Build upper hull
-    upper = []
-    for p in reversed(points):
-        if strict:
-            while len(upper) >= 2 and cross(upper[-2], upper[-1], p) < 0:
-                upper.pop()
-        else:
-            while len(upper) >= 2 and cross(upper[-2], upper[-1], p) <= 0:
-                upper.pop()
-        upper.append(p)
-
-    # Concatenation of the lower and upper hulls gives the convex hull.
-    # Last point of each list is omitted because it is repeated at the beginning of the other list.
-    return lower[:-1] + upper[:-1]
+    return _monotone_chain(points, strict)
 
 
 # ==============================================================================
-# Main
+# Helpers
 # ==============================================================================
 
 
-if __name__ == "__main__":
-
-    # import random
-    # from compas.utilities import flatten
-    # from compas.datastructures import Mesh
-    # from compas_viewers import MeshViewer
-    # from compas.topology import unify_cycles
-
-    # radius = 5
-    # origin = (0., 0., 0.)
-    # count = 0
-    # points = []
-
-    # while count < 1000:
-    #     x = (random.random() - 0.5) * radius * 2
-    #     y = (random.random() - 0.5) * radius * 2
-    #     z = (random.random() - 0.5) * radius * 2
-    #     pt = x, y, z
+def _use_numpy(xyz, threshold=1000):
+    if compas.IPY or len(xyz) < threshold:
+        return False
+    try:
+        import numpy  # noqa: F401
+        import scipy  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def _hull_tolerance(xyz):
+    """The distance within which points are considered to lie in the plane of a face,
+    relative to the magnitude of the coordinates."""
+    extent = 0.0
+    for axis in range(3):
+        values = [point[axis] for point in xyz]
+        extent += max(abs(min(values)), abs(max(values)))
+    return 3 * 2.220446049250313e-16 * max(extent, 1.0)
+
+
+def _monotone_chain(points, strict=False):
+    """The hull of a list of lexicographically sorted points, with exact orientation tests."""
+    def chain(points):
+        hull = []
+        for p in points:
+            while len(hull) >= 2:
+                cross = orient_xy(hull[-2], hull[-1], p)
+                if cross > 0 or (strict and cross == 0):
+                    break
+                hull.pop()
+            hull.append(p)
+        return hull
+
+    lower = chain(points)
+    upper = chain(reversed(points))
+    # Concatenation of the lower and upper hulls gives the convex hull.
+    # Last point of each list is omitted because it is repeated at the beginning of the other list.
+    return lower[:-1] + upper[:-1]
 
-    #     if distance_point_point(origin, pt) <= radius:
-    #         points.append(pt)
-    #         count += 1
 
-    # faces = convex_hull(points)
-    # vertices = list(set(flatten(faces)))
+def _plane(xyz, a, b, c):
+    """The unit normal and the offset of the plane through three points."""
+    ax, ay, az = xyz[a]
+    bx, by, bz = xyz[b]
+    cx, cy, cz = xyz[c]
+    ux = bx - ax
+    uy = by - ay
+    uz = bz - az
+    vx = cx - ax
+    vy = cy - ay
+    vz = cz - az
+    nx = uy * vz - uz * vy
+    ny = uz * vx - ux * vz
+    nz = ux * vy - uy * vx
+    length = sqrt(nx * nx + ny * ny + nz * nz) or 1.0
+    nx /= length
+    ny /= length
+    nz /= length
+    return nx, ny, nz, nx * ax + ny * ay + nz * az
+
+
+def _initial_simplex(xyz, indices, tol):
+    """Four points spanning a tetrahedron of maximal size, or fewer if the points are degenerate."""
+    extremes = []
+    for axis in range(3):
+        extremes.append(min(indices, key=lambda i: xyz[i][axis]))
+        extremes.append(max(indices, key=lambda i: xyz[i][axis]))
+    best = 0.0
+    a = b = extremes[0]
+    for i in extremes:
+        x, y, z = xyz[i]
+        for j in extremes:
+            u, v, w = xyz[j]
+            d = (x - u) ** 2 + (y - v) ** 2 + (z - w) ** 2
+            if d > best:
+                best = d
+                a, b = i, j
+    if best <= tol * tol:
+        return [a]
+    # the point farthest from the line through a and b
+    ax, ay, az = xyz[a]
+    bx, by, bz = xyz[b]
+    ux = bx - ax
+    uy = by - ay
+    uz = bz - az
+    best = 0.0
+    c = None
+    for i in indices:
+        x, y, z = xyz[i]
+        x -= ax
+        y -= ay
+        z -= az
+        cx = uy * z - uz * y
+        cy = uz * x - ux * z
+        cz = ux * y - uy * x
+        d = cx * cx + cy * cy + cz * cz
+        if d > best:
+            best = d
+            c = i
+    if c is None or best <= tol * tol * (ux * ux + uy * uy + uz * uz):
+        return [a, b]
+    # the point farthest from the plane through a, b and c
+    nx, ny, nz, offset = _plane(xyz, a, b, c)
+    best = 0.0
+    d = None
+    for i in indices:
+        x, y, z = xyz[i]
+        distance = abs(nx * x + ny * y + nz * z - offset)
+        if distance > best:
+            best = distance
+            d = i
+    if d is None or best <= tol:
+        return [a, b, c]
+    return [a, b, c, d]
+
+
+def _flat_hull(xyz, indices, simplex):
+    """The two-sided triangulation of the planar hull of coplanar points."""
+    nx, ny, nz, _ = _plane(xyz, *simplex)
+    # project the points onto the coordinate plane that is most parallel to their plane
+    axis = max(range(3), key=lambda i: abs((nx, ny, nz)[i]))
+    s, t = [i for i in range(3) if i != axis]
+    points = sorted((xyz[i][s], xyz[i][t], i) for i in indices)
+    polygon = [point[2] for point in _monotone_chain(points)]
+    # the back is fanned from a different vertex than the front, such that no diagonal is shared
+    front = [[polygon[0], polygon[i], polygon[i + 1]] for i in range(1, len(polygon) - 1)]
+    polygon = polygon[1:] + polygon[:1]
+    back = [[polygon[0], polygon[i + 1], polygon[i]] for i in range(1, len(polygon) - 1)]
+    return front + back
+
+
+def _quickhull(xyz, indices, tol):
+    """The outward oriented triangular faces of the convex hull of a subset of points."""
+    simplex = _initial_simplex(xyz, indices, tol)
+    if len(simplex) < 3:
+        return []
+    if len(simplex) == 3:
+        return _flat_hull(xyz, indices, simplex)
+
+    faces = {}
+    planes = {}
+    outside = {}
+    halfedges = {}
+    keys = count()
+
+    def add_face(a, b, c):
+        face = next(keys)
+        faces[face] = (a, b, c)
+        planes[face] = _plane(xyz, a, b, c)
+        outside[face] = []
+        halfedges[a, b] = face
+        halfedges[b, c] = face
+        halfedges[c, a] = face
+        return face
+
+    def assign(points, new):
+        # every point is assigned to the first face it is above, if any
+        buckets = [planes[face] + (outside[face], ) for face in new]
+        for i in points:
+            x, y, z = xyz[i]
+            for nx, ny, nz, offset, bucket in buckets:
+                if nx * x + ny * y + nz * z - offset > tol:
+                    bucket.append(i)
+                    break
+
+    # the faces of the initial tetrahedron, oriented such that the opposite vertex is below
+    a, b, c, d = simplex
+    nx, ny, nz, offset = _plane(xyz, a, b, c)
+    x, y, z = xyz[d]
+    if nx * x + ny * y + nz * z - offset > 0:
+        b, c = c, b
+    new = [add_face(a, b, c), add_face(a, d, b), add_face(b, d, c), add_face(c, d, a)]
+    simplex = set(simplex)
+    assign((i for i in indices if i not in simplex), new)
+
+    pending = [face for face in new if outside[face]]
+    while pending:
+        face = pending.pop()
+        if face not in faces or not outside[face]:
+            continue
+        # the point farthest above the face
+        nx, ny, nz, offset = planes[face]
+        eye = max(outside[face], key=lambda i: nx * xyz[i][0] + ny * xyz[i][1] + nz * xyz[i][2])
+        ex, ey, ez = xyz[eye]
+        # the faces visible from the point, and the edges of the horizon of the visible region
+        visible = [face]
+        seen = {face: True}
+        horizon = []
+        stack = [face]
+        while stack:
+            a, b, c = faces[stack.pop()]
+            for u, v in ((a, b), (b, c), (c, a)):
+                nbr = halfedges[v, u]
+                if nbr not in seen:
+                    nx, ny, nz, offset = planes[nbr]
+                    seen[nbr] = nx * ex + ny * ey + nz * ez - offset > tol
+                    if seen[nbr]:
+                        visible.append(nbr)
+                        stack.append(nbr)
+                if not seen[nbr]:
+                    horizon.append((u, v))
+        # replace the visible faces by a cone from the horizon to the point
+        orphans = []
+        for face in visible:
+            a, b, c = faces.pop(face)
+            del halfedges[a, b]
+            del halfedges[b, c]
+            del halfedges[c, a]
+            orphans.extend(outside.pop(face))
+            del planes[face]
+        new = [add_face(u, v, eye) for u, v in horizon]
+        assign((i for i in orphans if i != eye), new)
+        pending.extend(face for face in new if outside[face])
+
+    return [list(face) for face in faces.values()]
 
-    # i_index = {i: index for index, i in enumerate(vertices)}
 
-    # vertices = [points[index] for index in vertices]
-    # faces = [[i_index[i] for i in face] for face in faces]
-    # faces = unify_cycles(vertices, faces)
+# ==============================================================================
+# Main
+# ==============================================================================
 
-    # mesh = Mesh.from_vertices_and_faces(vertices, faces)
 
-    # viewer = MeshViewer()
-    # viewer.mesh = mesh
-    # viewer.show()
+if __name__ == "__main__":
 
     import doctest
     doctest.testmod(globs=globals())
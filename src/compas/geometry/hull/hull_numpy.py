@@ -2,9 +2,21 @@ from __future__ import print_function
 from __future__ import absolute_import
 from __future__ import division
 
+from itertools import product
+
+from numpy import argmax
+from numpy import array
 from numpy import asarray
+from numpy import cross
+from numpy import flatnonzero
+from numpy import float64
+from numpy import unique
+from numpy import zeros
+from numpy.linalg import norm
 from scipy.spatial import ConvexHull
 
+from compas.geometry.hull.hull import _quickhull
+
 
 __all__ = [
     'convex_hull_numpy',
@@ -132,6 +144,26 @@ def convex_hull_xy_numpy(points):
     return hull.vertices, hull.simplices
 
 
+def _convex_hull_candidates_numpy(xyz, tol):
+    """The indices of the points that are not strictly inside the hull of the extreme points in 26 directions."""
+    points = asarray(xyz, dtype=float64)
+    directions = array([d for d in product((-1, 0, 1), repeat=3) if any(d)], dtype=float64)
+    extremes = unique([argmax(points.dot(d)) for d in directions]).tolist()
+    faces = _quickhull(xyz, extremes, tol)
+    if not faces:
+        return None
+    a, b, c = points[array(faces)].transpose(1, 0, 2)
+    normals = cross(b - a, c - a)
+    lengths = norm(normals, axis=1)
+    normals = normals[lengths > 0] / lengths[lengths > 0, None]
+    offsets = (normals * a[lengths > 0]).sum(axis=1)
+    keep = zeros(len(points), dtype=bool)
+    for normal, offset in zip(normals, offsets):
+        keep |= points.dot(normal) - offset > -tol
+    keep[extremes] = True
+    return flatnonzero(keep).tolist()
+
+
 # ==============================================================================
 # Main
 # ==============================================================================
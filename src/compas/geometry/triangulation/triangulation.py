@@ -4,15 +4,10 @@ from __future__ import division
 
 import random
 
-from compas.geometry import centroid_points
-from compas.geometry import distance_point_point
-from compas.geometry import add_vectors
-from compas.geometry import bounding_box
-
+from compas.geometry import incircle_xy
 from compas.geometry import is_point_in_polygon_xy
-from compas.geometry import is_point_in_triangle_xy
-from compas.geometry import is_point_in_circle_xy
-from compas.geometry import circle_from_points_xy
+from compas.geometry import orient_xy
+from compas.utilities import geometric_key_xy
 
 
 __all__ = [
@@ -20,7 +15,7 @@ __all__ = [
 ]
 
 
-def delaunay_from_points(points, boundary=None, holes=None, tiny=1e-12):
+def delaunay_from_points(points, boundary=None, holes=None, tiny=0.0):
     """Computes the delaunay triangulation for a list of points.
 
     Parameters
@@ -31,6 +26,11 @@ def delaunay_from_points(points, boundary=None, holes=None, tiny=1e-12):
         list of ordered points describing the outer boundary (optional)
     holes : list of sequences of tuples
         list of polygons (ordered points describing internal holes (optional)
+    tiny : float, optional
+        The magnitude of an optional random perturbation of the points.
+        The perturbation is no longer needed to avoid numerical issues for perfectly structured point sets,
+        since the orientation and incircle tests are exact.
+        Default is ``0.0``.
 
     Returns
     -------
@@ -40,106 +40,381 @@ def delaunay_from_points(points, boundary=None, holes=None, tiny=1e-12):
 
     Notes
     -----
-    For more info, see [1]_.
+    The points are inserted one by one into a triangulation with a large enclosing triangle,
+    and the Delaunay property is restored after every insertion by flipping edges [1]_.
+    The triangle containing a new point is found by walking from the last inserted triangle.
+    The points are inserted in rounds of increasing size (biased randomized insertion order),
+    and sorted along a Hilbert curve within every round,
+    such that consecutive points are close to each other and the walks are short.
+    The orientation and incircle tests are exact (see :func:`compas.geometry.orient_xy`),
+    such that structured point sets, with many colinear and cocircular points, are triangulated correctly.
+
+    If all vertices of the boundary and of a hole are points of the list,
+    the edges of the polygon are enforced in the triangulation by flipping the edges that cross them [2]_.
+    The triangles outside the boundary and inside the holes are removed,
+    based on the position of their centroids.
 
     References
     ----------
     .. [1] Sloan, S. W., 1987 *A fast algorithm for constructing Delaunay triangulations in the plane*
            Advances in Engineering Software 9(1): 34-55, 1978.
+    .. [2] Sloan, S. W., 1993 *A fast algorithm for generating constrained Delaunay triangulations*
+           Computers & Structures 47(3): 441-450.
 
     Examples
     --------
-    >>>
+    >>> points = [[0.0, 0.0, 0.0], [1.0, 0.0, 0.0], [1.0, 1.0, 0.0], [0.0, 1.0, 0.0], [0.4, 0.6, 0.0]]
+    >>> faces = delaunay_from_points(points)
+    >>> len(faces)
+    4
 
     """
-    from compas.datastructures import Mesh
-    from compas.datastructures import trimesh_swap_edge
-
-    def super_triangle(coords, ccw=True):
-        centpt = centroid_points(coords)
-        bbpts = bounding_box(coords)
-        dis = distance_point_point(bbpts[0], bbpts[2])
-        dis = dis * 300
-        v1 = (0 * dis, 2 * dis, 0)
-        v2 = (1.73205 * dis, -1.0000000000001 * dis, 0)  # due to numerical issues
-        v3 = (-1.73205 * dis, -1 * dis, 0)
-        pt1 = add_vectors(centpt, v1)
-        pt2 = add_vectors(centpt, v2)
-        pt3 = add_vectors(centpt, v3)
-        if ccw:
-            return pt1, pt3, pt2
-        return pt1, pt2, pt3
-
-    mesh = Mesh()
-
-    # to avoid numerical issues for perfectly structured point sets
-    points = [(point[0] + random.uniform(-tiny, tiny), point[1] + random.uniform(-tiny, tiny), 0.0) for point in points]
-
-    # create super triangle
-    pt1, pt2, pt3 = super_triangle(points)
-
-    # add super triangle vertices to mesh
     n = len(points)
-    super_keys = n, n + 1, n + 2
-
-    mesh.add_vertex(super_keys[0], {'x': pt1[0], 'y': pt1[1], 'z': pt1[2]})
-    mesh.add_vertex(super_keys[1], {'x': pt2[0], 'y': pt2[1], 'z': pt2[2]})
-    mesh.add_vertex(super_keys[2], {'x': pt3[0], 'y': pt3[1], 'z': pt3[2]})
-
-    mesh.add_face(super_keys)
-
-    # iterate over points
-    for key, point in enumerate(points):
-        # newtris should be intialised here
-
-        # check in which triangle this point falls
-        for fkey in list(mesh.faces()):
-            abc = mesh.face_coordinates(fkey)
-
-            if is_point_in_triangle_xy(point, abc, True):
-                # generate 3 new triangles (faces) and delete surrounding triangle
-                key, newtris = mesh.insert_vertex(fkey, key=key, xyz=point, return_fkeys=True)
-                break
-
-        while newtris:
-            fkey = newtris.pop()
-
-            face = mesh.face_vertices(fkey)
-            i = face.index(key)
-            u = face[i - 2]
-            v = face[i - 1]
+    if tiny:
+        xy = [[point[0] + random.uniform(-tiny, tiny), point[1] + random.uniform(-tiny, tiny)] for point in points]
+    else:
+        xy = [[point[0], point[1]] for point in points]
 
-            nbr = mesh.halfedge[v][u]
+    triangulation = _Triangulation(xy, tolerance=4 * tiny)
+    for index in _insertion_order(xy):
+        triangulation.insert(index)
 
-            if nbr is not None:
-                a, b, c = mesh.face_coordinates(nbr)
-                circle = circle_from_points_xy(a, b, c)
+    polygons = []
+    if boundary:
+        polygons.append(boundary)
+    if holes:
+        polygons += holes
+    if polygons:
+        gkey_index = {}
+        for index, point in enumerate(points):
+            gkey_index.setdefault(geometric_key_xy(point), index)
+        for polygon in polygons:
+            indices = [gkey_index.get(geometric_key_xy(point)) for point in polygon]
+            if None in indices:
+                continue
+            for u, v in zip(indices, indices[1:] + indices[:1]):
+                if u != v:
+                    triangulation.constrain(u, v)
+
+    faces = []
+    for face in triangulation.faces():
+        if max(face) >= n:
+            continue
+        if boundary or holes:
+            centroid = [sum(xy[index][0] for index in face) / 3.0, sum(xy[index][1] for index in face) / 3.0, 0.0]
+            if boundary and not is_point_in_polygon_xy(centroid, boundary):
+                continue
+            if holes and any(is_point_in_polygon_xy(centroid, polygon) for polygon in holes):
+                continue
+        faces.append(face)
+    return faces
 
-                if is_point_in_circle_xy(point, circle):
-                    fkey, nbr = trimesh_swap_edge(mesh, u, v)
-                    newtris.append(fkey)
-                    newtris.append(nbr)
 
-    # Delete faces adjacent to supertriangle
-    for key in super_keys:
-        mesh.delete_vertex(key)
+# ==============================================================================
+# Helpers
+# ==============================================================================
 
-    # Delete faces outside of boundary
-    if boundary:
-        for fkey in list(mesh.faces()):
-            centroid = mesh.face_centroid(fkey)
-            if not is_point_in_polygon_xy(centroid, boundary):
-                mesh.delete_face(fkey)
 
-    # Delete faces inside of inside boundaries
-    if holes:
-        for polygon in holes:
-            for fkey in list(mesh.faces()):
-                centroid = mesh.face_centroid(fkey)
-                if is_point_in_polygon_xy(centroid, polygon):
-                    mesh.delete_face(fkey)
+def _dot(a, b, c):
+    """The dot product of the vectors from ``a`` to ``b`` and from ``a`` to ``c``."""
+    return (b[0] - a[0]) * (c[0] - a[0]) + (b[1] - a[1]) * (c[1] - a[1])
+
+
+def _opposite(x, y):
+    """True if two orientations have opposite, nonzero signs."""
+    return (x < 0 < y) or (y < 0 < x)
+
+
+def _hilbert_key(x, y, order=16):
+    """The distance of a point with integer coordinates along a Hilbert curve of a given order."""
+    d = 0
+    s = 1 << (order - 1)
+    while s:
+        rx = 1 if x & s else 0
+        ry = 1 if y & s else 0
+        d += s * s * ((3 * rx) ^ ry)
+        if not ry:
+            if rx:
+                x = s - 1 - x
+                y = s - 1 - y
+            x, y = y, x
+        s >>= 1
+    return d
+
+
+def _insertion_order(xy):
+    """Biased randomized insertion order of points, sorted along a Hilbert curve within every round."""
+    if not xy:
+        return []
+    xmin = min(x for x, _ in xy)
+    ymin = min(y for _, y in xy)
+    extent = max(max(x for x, _ in xy) - xmin, max(y for _, y in xy) - ymin) or 1.0
+    scale = ((1 << 16) - 1) / extent
+    keys = [_hilbert_key(int((x - xmin) * scale), int((y - ymin) * scale)) for x, y in xy]
+    indices = list(range(len(xy)))
+    random.shuffle(indices)
+    rounds = []
+    while len(indices) > 64:
+        half = len(indices) // 2
+        rounds.append(indices[half:])
+        indices = indices[:half]
+    rounds.append(indices)
+    order = []
+    for indices in reversed(rounds):
+        order += sorted(indices, key=keys.__getitem__)
+    return order
+
+
+class _Triangulation(object):
+    """Triangulation of points in the plane, inside a large enclosing triangle.
+
+    The triangles are stored in flat lists.
+    The vertices of triangle ``t`` are ``vertices[3 * t: 3 * t + 3]``, in counterclockwise order,
+    and the neighbor ``neighbors[3 * t + i]`` is the triangle across the edge opposite vertex ``i``,
+    or ``-1`` on the outside of the enclosing triangle.
+    The vertices of the enclosing triangle are appended to the points.
+    Vertices closer than the tolerance to a constrained edge are considered to lie on it.
+    Points within the tolerance of a vertex are not inserted, but recorded as duplicates of that vertex.
+    """
 
-    return [mesh.face_vertices(fkey) for fkey in mesh.faces()]
+    def __init__(self, xy, tolerance=0.0):
+        xmin = min(x for x, _ in xy) if xy else 0.0
+        xmax = max(x for x, _ in xy) if xy else 1.0
+        ymin = min(y for _, y in xy) if xy else 0.0
+        ymax = max(y for _, y in xy) if xy else 1.0
+        cx = 0.5 * (xmin + xmax)
+        cy = 0.5 * (ymin + ymax)
+        d = 300 * (((xmax - xmin) ** 2 + (ymax - ymin) ** 2) ** 0.5 or 1.0)
+        n = len(xy)
+        self.points = xy + [[cx, cy + 2 * d], [cx - 1.73205 * d, cy - d], [cx + 1.73205 * d, cy - d]]
+        self.vertices = [n, n + 1, n + 2]
+        self.neighbors = [-1, -1, -1]
+        self.vertex_triangle = [0] * (n + 3)
+        self.last = 0
+        self.fixed = set()
+        self.duplicates = {}
+        self.tolerance = tolerance
+
+    def faces(self):
+        vertices = self.vertices
+        return [vertices[i:i + 3] for i in range(0, len(vertices), 3)]
+
+    def locate(self, p):
+        """Find the triangle containing a point, by walking from the last visited triangle."""
+        points = self.points
+        vertices = self.vertices
+        neighbors = self.neighbors
+        t = self.last
+        start = 0
+        while True:
+            for k in range(3):
+                i = (start + k) % 3
+                a = points[vertices[3 * t + (i + 1) % 3]]
+                b = points[vertices[3 * t + (i + 2) % 3]]
+                if orient_xy(a, b, p) < 0:
+                    t = neighbors[3 * t + i]
+                    start = (start + 1) % 3
+                    break
+            else:
+                self.last = t
+                return t
+
+    def insert(self, index):
+        """Insert a point, and restore the Delaunay property around it."""
+        points = self.points
+        vertices = self.vertices
+        neighbors = self.neighbors
+        p = points[index]
+        t = self.locate(p)
+        a, b, c = vertices[3 * t: 3 * t + 3]
+        tol = self.tolerance ** 2
+        for v in (a, b, c):
+            q = points[v]
+            if (p[0] - q[0]) ** 2 + (p[1] - q[1]) ** 2 <= tol:
+                self.duplicates[index] = v
+                return
+        na, nb, nc = neighbors[3 * t: 3 * t + 3]
+        t1 = len(vertices) // 3
+        t2 = t1 + 1
+        vertices[3 * t: 3 * t + 3] = [a, b, index]
+        neighbors[3 * t: 3 * t + 3] = [t1, t2, nc]
+        vertices += [b, c, index, c, a, index]
+        neighbors += [t2, t, na, t, t1, nb]
+        self._relink(na, t, t1)
+        self._relink(nb, t, t2)
+        vertex_triangle = self.vertex_triangle
+        vertex_triangle[a] = vertex_triangle[index] = t
+        vertex_triangle[b] = t1
+        vertex_triangle[c] = t2
+        self._legalize([(t, 2), (t1, 2), (t2, 2)])
+
+    def _relink(self, t, old, new):
+        if t != -1:
+            neighbors = self.neighbors
+            i = 3 * t
+            if neighbors[i] == old:
+                neighbors[i] = new
+            elif neighbors[i + 1] == old:
+                neighbors[i + 1] = new
+            else:
+                neighbors[i + 2] = new
+
+    def _flip(self, t, i):
+        """Flip the edge opposite vertex ``i`` of triangle ``t``.
+
+        Returns the two new triangles, both with the vertex ``i`` of ``t`` as their first vertex.
+        """
+        vertices = self.vertices
+        neighbors = self.neighbors
+        u = neighbors[3 * t + i]
+        j = neighbors[3 * u: 3 * u + 3].index(t)
+        p = vertices[3 * t + i]
+        x = vertices[3 * t + (i + 1) % 3]
+        y = vertices[3 * t + (i + 2) % 3]
+        q = vertices[3 * u + j]
+        a = neighbors[3 * t + (i + 1) % 3]
+        b = neighbors[3 * t + (i + 2) % 3]
+        c = neighbors[3 * u + (j + 1) % 3]
+        d = neighbors[3 * u + (j + 2) % 3]
+        vertices[3 * t: 3 * t + 3] = [p, x, q]
+        neighbors[3 * t: 3 * t + 3] = [c, u, b]
+        vertices[3 * u: 3 * u + 3] = [p, q, y]
+        neighbors[3 * u: 3 * u + 3] = [d, a, t]
+        self._relink(c, u, t)
+        self._relink(a, t, u)
+        vertex_triangle = self.vertex_triangle
+        vertex_triangle[p] = vertex_triangle[x] = vertex_triangle[q] = t
+        vertex_triangle[y] = u
+        return t, u
+
+    def _legalize(self, stack, outer=False):
+        """Flip the non-Delaunay edges of a stack of edges, given as triangles and vertex indices.
+
+        After a flip, the two edges opposite the first vertex of the new triangles are checked,
+        or all four outer edges of the flipped pair if ``outer`` is true.
+        """
+        points = self.points
+        vertices = self.vertices
+        neighbors = self.neighbors
+        fixed = self.fixed
+        while stack:
+            t, i = stack.pop()
+            u = neighbors[3 * t + i]
+            if u == -1:
+                continue
+            x = vertices[3 * t + (i + 1) % 3]
+            y = vertices[3 * t + (i + 2) % 3]
+            if fixed and (x, y) in fixed:
+                continue
+            j = neighbors[3 * u: 3 * u + 3].index(t)
+            a, b, c = vertices[3 * t: 3 * t + 3]
+            if incircle_xy(points[a], points[b], points[c], points[vertices[3 * u + j]]) > 0:
+                t, u = self._flip(t, i)
+                stack += [(t, 0), (u, 0)]
+                if outer:
+                    stack += [(t, 2), (u, 1)]
+
+    def _find_edge(self, a, b):
+        """Find the triangle with the directed edge from ``a`` to ``b``, and the index of ``a`` in it."""
+        vertices = self.vertices
+        neighbors = self.neighbors
+        # rotate counterclockwise around a, and clockwise if the rotation leaves the triangulation
+        for step in (1, 2):
+            start = t = self.vertex_triangle[a]
+            while True:
+                i = vertices[3 * t: 3 * t + 3].index(a)
+                if vertices[3 * t + (i + 1) % 3] == b:
+                    return t, i
+                t = neighbors[3 * t + (i + step) % 3]
+                if t == start:
+                    return None, None
+                if t == -1:
+                    break
+        return None, None
+
+    def _crossed_edges(self, a, b):
+        """The edges crossed by the segment from ``a`` to ``b``, up to ``b`` or the first vertex on the segment.
+
+        Returns the crossed edges, as pairs of vertices right and left of the segment, and the last vertex.
+        Vertices within the tolerance of the segment are considered to be on it.
+        """
+        points = self.points
+        vertices = self.vertices
+        neighbors = self.neighbors
+        pa = points[a]
+        pb = points[b]
+        tol = self.tolerance * ((pb[0] - pa[0]) ** 2 + (pb[1] - pa[1]) ** 2) ** 0.5
+        start = t = self.vertex_triangle[a]
+        while True:
+            i = vertices[3 * t: 3 * t + 3].index(a)
+            right = vertices[3 * t + (i + 1) % 3]
+            left = vertices[3 * t + (i + 2) % 3]
+            if right == b or left == b:
+                return [], b
+            o_right = orient_xy(pa, pb, points[right])
+            o_left = orient_xy(pa, pb, points[left])
+            if abs(o_right) <= tol and _dot(pa, pb, points[right]) > 0:
+                return [], right
+            if abs(o_left) <= tol and _dot(pa, pb, points[left]) > 0:
+                return [], left
+            if o_right < 0 and o_left > 0:
+                break
+            t = neighbors[3 * t + (i + 1) % 3]
+            if t == start:
+                raise ValueError('The segment does not leave its start vertex.')
+        edges = [(right, left)]
+        while True:
+            u = neighbors[3 * t + (vertices[3 * t: 3 * t + 3].index(right) + 2) % 3]
+            j = neighbors[3 * u: 3 * u + 3].index(t)
+            w = vertices[3 * u + j]
+            if w == b:
+                return edges, b
+            o = orient_xy(pa, pb, points[w])
+            if abs(o) <= tol:
+                return edges, w
+            if o < 0:
+                right = w
+            else:
+                left = w
+            edges.append((right, left))
+            t = u
+
+    def constrain(self, a, b):
+        """Enforce the edge between two vertices, by flipping the edges that cross it."""
+        points = self.points
+        a = self.duplicates.get(a, a)
+        b = self.duplicates.get(b, b)
+        while a != b:
+            edges, c = self._crossed_edges(a, b)
+            pa = points[a]
+            pc = points[c]
+            created = []
+            while edges:
+                u, v = edges.pop(0)
+                t, i = self._find_edge(u, v)
+                k = (i + 2) % 3
+                p = self.vertices[3 * t + k]
+                n = self.neighbors[3 * t + k]
+                q = self.vertices[3 * n + self.neighbors[3 * n: 3 * n + 3].index(t)]
+                pp = points[p]
+                pq = points[q]
+                if not _opposite(orient_xy(pp, pq, points[u]), orient_xy(pp, pq, points[v])):
+                    edges.append((u, v))
+                    continue
+                self._flip(t, k)
+                if p not in (a, c) and q not in (a, c) and _opposite(orient_xy(pa, pc, pp), orient_xy(pa, pc, pq)):
+                    edges.append((p, q))
+                else:
+                    created.append((p, q))
+            self.fixed.add((a, c))
+            self.fixed.add((c, a))
+            stack = []
+            for p, q in created:
+                if (p, q) != (a, c) and (p, q) != (c, a):
+                    t, i = self._find_edge(p, q)
+                    stack.append((t, (i + 2) % 3))
+            self._legalize(stack, outer=True)
+            a = c
 
 
 # def voronoi_from_delaunay(delaunay):
@@ -223,23 +498,5 @@ def delaunay_from_points(points, boundary=None, holes=None, tiny=1e-12):
 
 if __name__ == "__main__":
 
-    # from compas.datastructures import Mesh
-    # from compas.geometry import pointcloud_xy
-    # from compas_plotters import MeshPlotter
-
-    # points = pointcloud_xy(200, (0, 50))
-    # faces = delaunay_from_points(points)
-
-    # delaunay = Mesh.from_vertices_and_faces(points, faces)
-
-    # plotter = MeshPlotter(delaunay, figsize=(8, 5))
-
-    # facecolor = {fkey: (255, 0, 0) if delaunay.face_normal(fkey)[2] > 0 else (0, 0, 255) for fkey in delaunay.faces()}
-
-    # plotter.draw_vertices(keys=list(delaunay.vertices_on_boundary()), radius=0.5)
-    # plotter.draw_faces(facecolor=facecolor)
-    # plotter.draw_edges(keys=list(delaunay.edges_on_boundary()))
-    # plotter.show()
-
     import doctest
     doctest.testmod(globs=globals())
@@ -13,6 +13,7 @@ connectivity
     :nosignatures:
 
     adjacency_from_edges
+    CSRAdjacency
 
 combinatorics
 -------------
@@ -23,6 +24,7 @@ combinatorics
 
     vertex_coloring
     connected_components
+    connected_components_from_edges
 
 orientation
 -----------
@@ -48,9 +50,14 @@ traversal
     breadth_first_traverse
     breadth_first_paths
     depth_first_ordering
+    dijkstra_distance_matrix
+    dijkstra_distance_matrix_numpy
     dijkstra_distances
+    dijkstra_nearest_path
     dijkstra_path
+    graph_adjacency_weight
     shortest_path
+    ShortestPathTree
 
 """
 from __future__ import absolute_import
@@ -67,6 +74,7 @@ if compas.IPY:
     from .orientation_rhino import *  # noqa: F401 F403
 else:
     from .orientation_numpy import *  # noqa: F401 F403
+    from .traversal_numpy import *  # noqa: F401 F403
 
 from .connectivity import *  # noqa: F401 F403
 
@@ -2,13 +2,14 @@ from __future__ import print_function
 from __future__ import absolute_import
 from __future__ import division
 
-from collections import deque
-from compas.topology import breadth_first_traverse
+from compas.topology.connectivity import CSRAdjacency
+from compas.topology.traversal import breadth_first_ordering
 
 
 __all__ = [
     'vertex_coloring',
     'connected_components',
+    'connected_components_from_edges',
 ]
 
 
@@ -17,11 +18,18 @@ def vertex_coloring(adjacency):
 
     Parameters
     ----------
-    network : compas.datastructures.Network
-        The network object.
+    adjacency : dict or :class:`compas.topology.CSRAdjacency`
+        An adjacency dictionary mapping vertex identifiers to neighbours.
+
+    Returns
+    -------
+    dict
+        A dictionary mapping vertex identifiers to colors, numbered from zero.
 
     Notes
     -----
+    The vertices are colored in order of decreasing degree,
+    with the smallest color that is not used by any of their neighbors.
     For more info, see [1]_.
 
     References
@@ -31,7 +39,7 @@ def vertex_coloring(adjacency):
 
     Warnings
     --------
-    This is a greedy algorithm, so it might be slow for large networks.
+    This is a greedy algorithm, so it does not necessarily use the smallest possible number of colors.
 
     Examples
     --------
@@ -39,28 +47,26 @@ def vertex_coloring(adjacency):
     >>> from compas.datastructures import Network
     >>> network = Network.from_obj(compas.get('lines.obj'))
     >>> key_color = vertex_coloring(network.adjacency)
-    >>> key = network.get_any_vertex()
+    >>> key = network.get_any_node()
     >>> color = key_color[key]
-    >>> any(key_color[nbr] == color for nbr in network.vertex_neighbors(key))
+    >>> any(key_color[nbr] == color for nbr in network.neighbors(key))
     False
     """
-    key_to_color = {}
-    key_to_degree = {key: len(adjacency[key]) for key in adjacency}
-    vertices = sorted(adjacency.keys(), key=lambda key: key_to_degree[key])
-    uncolored = deque(vertices[::-1])
-    current_color = 0
-    while uncolored:
-        a = uncolored.popleft()
-        key_to_color[a] = current_color
-        colored_with_current = [a]
-        for b in uncolored:
-            if not any(b in adjacency[key] for key in colored_with_current):
-                key_to_color[b] = current_color
-                colored_with_current.append(b)
-        for key in colored_with_current[1:]:
-            uncolored.remove(key)
-        current_color += 1
-    return key_to_color
+    if not isinstance(adjacency, CSRAdjacency):
+        csr = CSRAdjacency.from_adjacency(adjacency)
+        keys = csr.keys
+        return {keys[i]: color for i, color in vertex_coloring(csr).items()}
+    indptr = adjacency.indptr
+    indices = adjacency.indices
+    n = len(adjacency)
+    color = [-1] * n
+    for a in reversed(sorted(range(n), key=lambda i: indptr[i + 1] - indptr[i])):
+        used = set([color[b] for b in indices[indptr[a]:indptr[a + 1]]])
+        c = 0
+        while c in used:
+            c += 1
+        color[a] = c
+    return dict(enumerate(color))
 
 
 def connected_components(adjacency):
@@ -68,13 +74,23 @@ def connected_components(adjacency):
 
     Parameters
     ----------
-    adjacency : dict
+    adjacency : dict or :class:`compas.topology.CSRAdjacency`
         An adjacency dictionary mapping vertex identifiers to neighbours.
 
     Returns
     -------
     list of list of hashable
         A nested list of vertex identifiers.
+        The components are ordered by their first vertex in the adjacency.
+
+    Notes
+    -----
+    The components are found with a breadth-first search from every vertex that was not yet visited.
+    With a compact adjacency, the visited vertices are marked in a flat buffer.
+
+    See Also
+    --------
+    :func:`connected_components_from_edges`
 
     Examples
     --------
@@ -82,13 +98,90 @@ def connected_components(adjacency):
     >>> connected_components(adjacency)
     [[0, 1, 2], [3]]
     """
-    tovisit = set(adjacency)
+    if not isinstance(adjacency, CSRAdjacency):
+        visited = set()
+        components = []
+        for root in adjacency:
+            if root not in visited:
+                component = breadth_first_ordering(adjacency, root)
+                visited.update(component)
+                components.append(component)
+        return components
+    indptr = adjacency.indptr
+    indices = adjacency.indices
+    visited = bytearray(len(adjacency))
+    components = []
+    for root in range(len(adjacency)):
+        if visited[root]:
+            continue
+        visited[root] = 1
+        component = [root]
+        for node in component:
+            for nbr in indices[indptr[node]:indptr[node + 1]]:
+                if not visited[nbr]:
+                    visited[nbr] = 1
+                    component.append(nbr)
+        components.append(component)
+    return components
+
+
+def connected_components_from_edges(edges, n=None):
+    """Identify the vertices of connected components directly from a list of edges.
+
+    Parameters
+    ----------
+    edges : list
+        A list of pairs of vertex indices.
+    n : int, optional
+        The number of vertices.
+        Default is one more than the largest index.
+        Vertices that are not part of any edge form components of their own.
+
+    Returns
+    -------
+    list of list of int
+        A nested list of vertex indices.
+        The components are ordered by their smallest vertex,
+        and the vertices of every component are in increasing order.
+
+    Notes
+    -----
+    The vertices of every edge are merged in a disjoint-set forest, with path halving [1]_.
+    This takes almost linear time, and does not require an adjacency structure.
+
+    References
+    ----------
+    .. [1] Wikipedia. *Disjoint-set data structure*.
+           Available at: https://en.wikipedia.org/wiki/Disjoint-set_data_structure.
+
+    Examples
+    --------
+    >>> connected_components_from_edges([(0, 1), (3, 2), (1, 4)], 6)
+    [[0, 1, 4], [2, 3], [5]]
+    """
+    edges = list(edges)
+    if n is None:
+        n = max(max(u, v) for u, v in edges) + 1 if edges else 0
+    parent = list(range(n))
+    for u, v in edges:
+        while parent[u] != u:
+            parent[u] = u = parent[parent[u]]
+        while parent[v] != v:
+            parent[v] = v = parent[parent[v]]
+        # the root of every set is its smallest vertex
+        if u < v:
+            parent[v] = u
+        elif v < u:
+            parent[u] = v
+    # the parents of all smaller vertices are already roots
     components = []
-    while tovisit:
-        root = tovisit.pop()
-        visited = breadth_first_traverse(adjacency, root)
-        tovisit -= visited
-        components.append(list(visited))
+    component = {}
+    for i in range(n):
+        root = parent[i] = parent[parent[i]]
+        if root == i:
+            component[i] = len(components)
+            components.append([])
+        components[component[root]].append(i)
     return components
 
 
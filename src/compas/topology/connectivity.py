@@ -3,7 +3,8 @@ from __future__ import absolute_import
 from __future__ import division
 
 __all__ = [
-    'adjacency_from_edges'
+    'adjacency_from_edges',
+    'CSRAdjacency',
 ]
 
 
@@ -34,6 +35,152 @@ def adjacency_from_edges(edges):
     return adj
 
 
+class CSRAdjacency(object):
+    """Compact adjacency of a graph, in compressed sparse row format.
+
+    Parameters
+    ----------
+    indptr : list of int
+        The offsets of the neighbors of every vertex in ``indices``.
+        The neighbors of vertex ``i`` are ``indices[indptr[i]:indptr[i + 1]]``.
+    indices : list of int
+        The concatenated neighbors of all vertices.
+    keys : list, optional
+        The identifiers of the vertices in the original graph.
+        Default is ``None``, in which case the identifiers are the indices.
+
+    Attributes
+    ----------
+    key_index : dict
+        A mapping of the identifiers of the vertices to their indices.
+
+    Notes
+    -----
+    The vertices of a compact adjacency are identified by their index.
+    The object behaves like an adjacency dictionary mapping indices to lists of neighbors,
+    such that it can be used by all traversal algorithms of :mod:`compas.topology`.
+    Most of these algorithms use the flat lists directly,
+    which is considerably faster for large graphs than going through a dictionary of lists.
+    Use :attr:`keys` to map the results back to the identifiers of the original graph.
+
+    Examples
+    --------
+    >>> adjacency = CSRAdjacency.from_adjacency({'a': ['b'], 'b': ['a', 'c'], 'c': ['b']})
+    >>> adjacency.indptr
+    [0, 1, 3, 4]
+    >>> adjacency.indices
+    [1, 0, 2, 1]
+    >>> adjacency[1]
+    [0, 2]
+    >>> [adjacency.keys[i] for i in adjacency[1]]
+    ['a', 'c']
+    """
+
+    def __init__(self, indptr, indices, keys=None):
+        self.indptr = indptr
+        self.indices = indices
+        self.keys = keys if keys is not None else list(range(len(indptr) - 1))
+        self._key_index = None
+
+    @property
+    def key_index(self):
+        if self._key_index is None:
+            self._key_index = {key: index for index, key in enumerate(self.keys)}
+        return self._key_index
+
+    @classmethod
+    def from_adjacency(cls, adjacency):
+        """Construct a compact adjacency from an adjacency dictionary.
+
+        Parameters
+        ----------
+        adjacency : dict
+            An adjacency dictionary mapping vertex identifiers to neighbours,
+            for example the ``adjacency`` of a network or mesh.
+
+        Returns
+        -------
+        :class:`CSRAdjacency`
+        """
+        keys = list(adjacency)
+        key_index = {key: index for index, key in enumerate(keys)}
+        indptr = [0]
+        indices = []
+        for key in keys:
+            indices += [key_index[nbr] for nbr in adjacency[key]]
+            indptr.append(len(indices))
+        csr = cls(indptr, indices, keys)
+        csr._key_index = key_index
+        return csr
+
+    @classmethod
+    def from_edges(cls, edges, n=None):
+        """Construct a compact adjacency from a list of edges between vertex indices.
+
+        Parameters
+        ----------
+        edges : list
+            A list of index pairs.
+        n : int, optional
+            The number of vertices.
+            Default is one more than the largest index.
+
+        Returns
+        -------
+        :class:`CSRAdjacency`
+
+        Examples
+        --------
+        >>> CSRAdjacency.from_edges([(0, 1), (1, 2)], 4)[1]
+        [0, 2]
+        """
+        edges = list(edges)
+        if n is None:
+            n = max(max(u, v) for u, v in edges) + 1 if edges else 0
+        degree = [0] * (n + 1)
+        for u, v in edges:
+            degree[u + 1] += 1
+            degree[v + 1] += 1
+        for i in range(n):
+            degree[i + 1] += degree[i]
+        indptr = degree[:]
+        indices = [0] * indptr[-1]
+        for u, v in edges:
+            indices[degree[u]] = v
+            degree[u] += 1
+            indices[degree[v]] = u
+            degree[v] += 1
+        return cls(indptr, indices)
+
+    def __len__(self):
+        return len(self.indptr) - 1
+
+    def __iter__(self):
+        return iter(range(len(self.indptr) - 1))
+
+    def __contains__(self, index):
+        return 0 <= index < len(self.indptr) - 1
+
+    def __getitem__(self, index):
+        return self.indices[self.indptr[index]:self.indptr[index + 1]]
+
+    def degree(self, index):
+        """The number of neighbors of a vertex."""
+        return self.indptr[index + 1] - self.indptr[index]
+
+    def to_adjacency(self):
+        """Convert to an adjacency dictionary of the original vertex identifiers.
+
+        Returns
+        -------
+        dict
+        """
+        keys = self.keys
+        indptr = self.indptr
+        indices = self.indices
+        return {keys[i]: [keys[j] for j in indices[indptr[i]:indptr[i + 1]]] for i in range(len(indptr) - 1)}
+
+
 # ==============================================================================
 # Main
 # ==============================================================================
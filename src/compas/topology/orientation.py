@@ -2,12 +2,6 @@ from __future__ import print_function
 from __future__ import absolute_import
 from __future__ import division
 
-from compas.geometry import KDTree
-
-from compas.utilities import pairwise
-from compas.geometry import centroid_points
-from compas.topology import breadth_first_traverse
-
 
 __all__ = [
     'face_adjacency',
@@ -22,8 +16,10 @@ def unify_cycles(vertices, faces, root=0):
     ----------
     vertices : list
         A list of vertex coordinates.
+        The coordinates are not used, and may be ``None``.
     faces : list
         A list of lists of face vertex indices.
+        The faces are modified in place.
     root : int, optional
         The starting face.
 
@@ -37,6 +33,12 @@ def unify_cycles(vertices, faces, root=0):
     AssertionError
         If not all faces were visited.
 
+    Notes
+    -----
+    The faces are traversed breadth-first, starting from the root,
+    through the edges they share with other faces (see :func:`face_adjacency`).
+    A face is reversed if it traverses a shared edge in the same direction as the face from which it is reached.
+
     Examples
     --------
     >>> vertices = [[0.0, 0.0, 0.0], [1.0, 0.0, 0.0], [1.0, 1.0, 0.0], [0.0, 1.0, 1.0]]
@@ -44,22 +46,35 @@ def unify_cycles(vertices, faces, root=0):
     >>> unify_cycles(vertices, faces)
     [[0, 1, 2], [2, 3, 0]]
     """
-    def unify(node, nbr):
-        # find the common edge
-        for u, v in pairwise(faces[nbr] + faces[nbr][0:1]):
-            if u in faces[node] and v in faces[node]:
-                # node and nbr have edge u-v in common
-                i = faces[node].index(u)
-                j = faces[node].index(v)
-                if i == j - 1 or (j == 0 and u == faces[node][-1]):
-                    # if the traversal of a neighboring halfedge
-                    # is in the same direction
-                    # flip the neighbor
-                    faces[nbr][:] = faces[nbr][::-1]
-                    return
-    adj = face_adjacency(vertices, faces)
-    visited = breadth_first_traverse(adj, root, unify)
-    assert len(list(visited)) == len(faces), 'Not all faces were visited'
+    if not isinstance(faces, list):
+        faces = [list(face) for face in faces]
+    # the halfedges of the faces, by the sorted vertices of their edges
+    # a halfedge is forward if it runs from the smaller to the larger vertex
+    edges = {}
+    for face, cycle in enumerate(faces):
+        for u, v in zip(cycle, cycle[1:] + cycle[:1]):
+            if u < v:
+                edges.setdefault((u, v), []).append((face, True))
+            elif v < u:
+                edges.setdefault((v, u), []).append((face, False))
+    flipped = [None] * len(faces)
+    flipped[root] = False
+    tovisit = [root]
+    for face in tovisit:
+        cycle = faces[face]
+        for u, v in zip(cycle, cycle[1:] + cycle[:1]):
+            if u == v:
+                continue
+            key = (u, v) if u < v else (v, u)
+            forward = (u < v) != flipped[face]
+            for nbr, other in edges[key]:
+                if flipped[nbr] is None:
+                    flipped[nbr] = other == forward
+                    tovisit.append(nbr)
+    assert len(tovisit) == len(faces), 'Not all faces were visited'
+    for cycle, flip in zip(faces, flipped):
+        if flip:
+            cycle[:] = cycle[::-1]
     return faces
 
 
@@ -70,14 +85,23 @@ def face_adjacency(xyz, faces):
     ----------
     xyz : list
         The coordinates of the face vertices.
+        The coordinates are not used, and may be ``None``.
     faces : list
         The indices of the face vertices in the coordinates list.
+        Any iterable of faces is accepted, for example a generator reading the faces from a file.
 
     Returns
     -------
     dict
         For every face a list of neighbouring faces.
 
+    Notes
+    -----
+    Two faces are neighbours if they have an edge in common, regardless of the direction of their halfedges.
+    The edges are identified by their sorted vertex indices, in a dictionary.
+    The faces are therefore processed in a single pass, and are not stored.
+    Faces sharing a non-manifold edge are all neighbours of each other.
+
     Examples
     --------
     >>> vertices = [[0.0, 0.0, 0.0], [1.0, 0.0, 0.0], [1.0, 1.0, 0.0], [0.0, 1.0, 1.0]]
@@ -85,60 +109,24 @@ def face_adjacency(xyz, faces):
     >>> face_adjacency(vertices, faces)
     {0: [1], 1: [0]}
     """
-    f = len(faces)
-    if f > 100:
-        return _face_adjacency(xyz, faces)
-    adjacency = {}
-    for face, vertices in enumerate(faces):
-        nbrs = []
-        found = set()
-        for u, v in pairwise(vertices + vertices[0:1]):
-            for nbr, _ in enumerate(faces):
-                if nbr == face:
-                    continue
-                if nbr in found:
-                    continue
-                for a, b in pairwise(faces[nbr] + faces[nbr][0:1]):
-                    if v == a and u == b:
-                        nbrs.append(nbr)
-                        found.add(nbr)
-                        break
-                for a, b in pairwise(faces[nbr] + faces[nbr][0:1]):
-                    if u == a and v == b:
-                        nbrs.append(nbr)
-                        found.add(nbr)
-                        break
-        adjacency[face] = nbrs
-    return adjacency
-
-
-def _face_adjacency(xyz, faces, nmax=10, radius=2.0):
-    points = [centroid_points([xyz[index] for index in face]) for face in faces]
-    tree = KDTree(points)
-    closest = [tree.nearest_neighbors(point, nmax) for point in points]
-    closest = [[index for _, index, _ in nnbrs] for nnbrs in closest]
     adjacency = {}
-    for face, vertices in enumerate(faces):
-        nbrs = []
-        found = set()
-        nnbrs = set(closest[face])
-        for u, v in pairwise(vertices + vertices[0:1]):
-            for nbr in nnbrs:
-                if nbr == face:
-                    continue
-                if nbr in found:
-                    continue
-                for a, b in pairwise(faces[nbr] + faces[nbr][0:1]):
-                    if v == a and u == b:
-                        nbrs.append(nbr)
-                        found.add(nbr)
-                        break
-                for a, b in pairwise(faces[nbr] + faces[nbr][0:1]):
-                    if u == a and v == b:
-                        nbrs.append(nbr)
-                        found.add(nbr)
-                        break
-        adjacency[face] = nbrs
+    edges = {}
+    for face, cycle in enumerate(faces):
+        cycle = list(cycle)
+        nbrs = adjacency[face] = []
+        for u, v in zip(cycle, cycle[1:] + cycle[:1]):
+            if u == v:
+                continue
+            key = (u, v) if u < v else (v, u)
+            others = edges.get(key)
+            if others is None:
+                edges[key] = [face]
+                continue
+            for other in others:
+                if other != face and other not in nbrs:
+                    nbrs.append(other)
+                    adjacency[other].append(face)
+            others.append(face)
     return adjacency
 
 
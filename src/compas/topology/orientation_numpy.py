@@ -2,11 +2,17 @@ from __future__ import print_function
 from __future__ import absolute_import
 from __future__ import division
 
-from scipy.spatial import cKDTree
+from numpy import arange
+from numpy import array
+from numpy import concatenate
+from numpy import cumsum
+from numpy import flatnonzero
+from numpy import int64
+from numpy import lexsort
+from numpy import maximum
+from numpy import minimum
 
-from compas.utilities import pairwise
-from compas.geometry import centroid_points
-from compas.topology import breadth_first_traverse
+from compas.topology import unify_cycles
 
 
 __all__ = [
@@ -22,8 +28,10 @@ def unify_cycles_numpy(vertices, faces, root=0):
     ----------
     vertices : list
         A list of vertex coordinates.
+        The coordinates are not used, and may be ``None``.
     faces : list
         A list of lists of face vertex indices.
+        The faces are modified in place.
     root : int, optional
         The starting face.
 
@@ -37,30 +45,19 @@ def unify_cycles_numpy(vertices, faces, root=0):
     AssertionError
         If not all faces were visited.
 
+    Notes
+    -----
+    This is an alias of :func:`compas.topology.unify_cycles`,
+    which finds the neighbours of the faces by hashing their edges, in linear time.
+
     Examples
     --------
     >>> vertices = [[0.0, 0.0, 0.0], [1.0, 0.0, 0.0], [1.0, 1.0, 0.0], [0.0, 1.0, 1.0]]
     >>> faces = [[0, 1, 2], [0, 3, 2]]
-    >>> unify_cycles(vertices, faces)
+    >>> unify_cycles_numpy(vertices, faces)
     [[0, 1, 2], [2, 3, 0]]
     """
-    def unify(node, nbr):
-        # find the common edge
-        for u, v in pairwise(faces[nbr] + faces[nbr][0:1]):
-            if u in faces[node] and v in faces[node]:
-                # node and nbr have edge u-v in common
-                i = faces[node].index(u)
-                j = faces[node].index(v)
-                if i == j - 1 or (j == 0 and u == faces[node][-1]):
-                    # if the traversal of a neighboring halfedge
-                    # is in the same direction
-                    # flip the neighbor
-                    faces[nbr][:] = faces[nbr][::-1]
-                    return
-    adj = face_adjacency_numpy(vertices, faces)
-    visited = breadth_first_traverse(adj, root, unify)
-    assert len(list(visited)) == len(faces), 'Not all faces were visited'
-    return faces
+    return unify_cycles(vertices, faces, root=root)
 
 
 def face_adjacency_numpy(xyz, faces):
@@ -70,6 +67,7 @@ def face_adjacency_numpy(xyz, faces):
     ----------
     xyz : list
         The coordinates of the face vertices.
+        The coordinates are not used, and may be ``None``.
     faces : list
         The indices of the face vertices in the coordinates list.
 
@@ -78,67 +76,59 @@ def face_adjacency_numpy(xyz, faces):
     dict
         For every face a list of neighbouring faces.
 
+    Notes
+    -----
+    Two faces are neighbours if they have an edge in common, regardless of the direction of their halfedges.
+    The halfedges of all faces are sorted by the sorted indices of their vertices,
+    such that the faces sharing an edge are consecutive.
+    Faces sharing a non-manifold edge are all neighbours of each other.
+
     Examples
     --------
     >>> vertices = [[0.0, 0.0, 0.0], [1.0, 0.0, 0.0], [1.0, 1.0, 0.0], [0.0, 1.0, 1.0]]
     >>> faces = [[0, 1, 2], [0, 3, 2]]
-    >>> face_adjacency(vertices, faces)
+    >>> face_adjacency_numpy(vertices, faces)
     {0: [1], 1: [0]}
     """
-    f = len(faces)
-    if f > 100:
-        return _face_adjacency(xyz, faces)
-    adjacency = {}
-    for face, vertices in enumerate(faces):
-        nbrs = []
-        found = set()
-        for u, v in pairwise(vertices + vertices[0:1]):
-            for nbr, _ in enumerate(faces):
-                if nbr == face:
-                    continue
-                if nbr in found:
-                    continue
-                for a, b in pairwise(faces[nbr] + faces[nbr][0:1]):
-                    if v == a and u == b:
-                        nbrs.append(nbr)
-                        found.add(nbr)
-                        break
-                for a, b in pairwise(faces[nbr] + faces[nbr][0:1]):
-                    if u == a and v == b:
-                        nbrs.append(nbr)
-                        found.add(nbr)
-                        break
-        adjacency[face] = nbrs
-    return adjacency
-
-
-def _face_adjacency(xyz, faces, nmax=10, radius=2.0):
-    points = [centroid_points([xyz[index] for index in face]) for face in faces]
-    k = min(len(faces), nmax)
-    tree = cKDTree(points)
-    _, closest = tree.query(points, k=k, n_jobs=-1)
-    adjacency = {}
-    for face, vertices in enumerate(faces):
-        nbrs = []
-        found = set()
-        nnbrs = set(closest[face])
-        for u, v in pairwise(vertices + vertices[0:1]):
-            for nbr in nnbrs:
-                if nbr == face:
-                    continue
-                if nbr in found:
-                    continue
-                for a, b in pairwise(faces[nbr] + faces[nbr][0:1]):
-                    if v == a and u == b:
-                        nbrs.append(nbr)
-                        found.add(nbr)
-                        break
-                for a, b in pairwise(faces[nbr] + faces[nbr][0:1]):
-                    if u == a and v == b:
-                        nbrs.append(nbr)
-                        found.add(nbr)
-                        break
-        adjacency[face] = nbrs
+    faces = list(faces)
+    count = array([len(face) for face in faces], dtype=int64)
+    u = array([index for face in faces for index in face], dtype=int64)
+    f = arange(len(faces)).repeat(count)
+    # the next vertex of every halfedge, wrapping around at the end of every face
+    following = arange(1, len(u) + 1)
+    following[cumsum(count)[count > 0] - 1] = (cumsum(count) - count)[count > 0]
+    v = u[following]
+    valid = u != v
+    lo = minimum(u, v)[valid]
+    hi = maximum(u, v)[valid]
+    f = f[valid]
+    order = lexsort((f, hi, lo))
+    lo, hi, f = lo[order], hi[order], f[order]
+    # pairs of consecutive halfedges of the same edge in different faces
+    same = (lo[1:] == lo[:-1]) & (hi[1:] == hi[:-1])
+    first = [f[:-1][same]]
+    second = [f[1:][same]]
+    # halfedges that are separated by more than one position in the sorted list, for non-manifold edges
+    shift = 2
+    while same.any():
+        same = same[:-1] & (lo[shift:] == lo[:-shift]) & (hi[shift:] == hi[:-shift])
+        first.append(f[:-shift][same])
+        second.append(f[shift:][same])
+        shift += 1
+    a = concatenate(first)
+    b = concatenate(second)
+    different = a != b
+    a, b = a[different], b[different]
+    a, b = concatenate((a, b)), concatenate((b, a))
+    order = lexsort((b, a))
+    a, b = a[order], b[order]
+    unique = concatenate(([True], (a[1:] != a[:-1]) | (b[1:] != b[:-1])))
+    a, b = a[unique], b[unique]
+    adjacency = {face: [] for face in range(len(faces))}
+    start = concatenate(([0], flatnonzero(a[1:] != a[:-1]) + 1, [len(a)]))
+    b = b.tolist()
+    for i, j in zip(start[:-1].tolist(), start[1:].tolist()):
+        adjacency[int(a[i])] = b[i:j]
     return adjacency
 
 
@@ -148,4 +138,6 @@ def _face_adjacency(xyz, faces, nmax=10, radius=2.0):
 
 if __name__ == "__main__":
 
-    pass
+    import doctest
+
+    doctest.testmod(globs=globals())
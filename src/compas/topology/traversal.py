@@ -2,14 +2,13 @@ from __future__ import print_function
 from __future__ import absolute_import
 from __future__ import division
 
-try:
-    from queue import PriorityQueue
-except ImportError:
-    from Queue import PriorityQueue
-
 from collections import deque
+from heapq import heappop
+from heapq import heappush
+from itertools import count
 
 from compas.geometry import distance_point_point
+from compas.topology.connectivity import CSRAdjacency
 
 
 __all__ = [
@@ -20,7 +19,11 @@ __all__ = [
     'shortest_path',
     'astar_shortest_path',
     'dijkstra_distances',
-    'dijkstra_path'
+    'dijkstra_path',
+    'dijkstra_nearest_path',
+    'ShortestPathTree',
+    'dijkstra_distance_matrix',
+    'graph_adjacency_weight',
 ]
 
 
@@ -34,7 +37,7 @@ def depth_first_ordering(adjacency, root):
 
     Parameters
     ----------
-    adjacency : dict
+    adjacency : dict or :class:`compas.topology.CSRAdjacency`
         An adjacency dictionary. Each key represents a vertex
         and maps to a list of neighboring vertex keys.
     root : str
@@ -68,15 +71,29 @@ def depth_first_ordering(adjacency, root):
     Note that this returns a depth-first spanning tree of a connected component
     of the network.
 
+    With a compact adjacency, the vertices are identified by their index,
+    and the visited vertices are marked in a flat buffer.
+
     Examples
     --------
-    >>>
+    >>> adjacency = {0: [1, 2], 1: [0, 3], 2: [0], 3: [1]}
+    >>> depth_first_ordering(adjacency, 0)
+    [0, 2, 1, 3]
     """
-    adjacency = {key: set(nbrs) for key, nbrs in iter(adjacency.items())}
     tovisit = [root]
-    visited = set()
     ordering = []
-
+    if isinstance(adjacency, CSRAdjacency):
+        indptr = adjacency.indptr
+        indices = adjacency.indices
+        visited = bytearray(len(adjacency))
+        while tovisit:
+            node = tovisit.pop()
+            if not visited[node]:
+                visited[node] = 1
+                ordering.append(node)
+                tovisit += [nbr for nbr in indices[indptr[node]:indptr[node + 1]] if not visited[nbr]]
+        return ordering
+    visited = set()
     while tovisit:
         # pop the last added element from the stack
         node = tovisit.pop()
@@ -85,7 +102,7 @@ def depth_first_ordering(adjacency, root):
             visited.add(node)
             ordering.append(node)
             # add the unvisited nbrs to the stack
-            tovisit.extend(adjacency[node] - visited)
+            tovisit += [nbr for nbr in adjacency[node] if nbr not in visited]
     return ordering
 
 
@@ -151,7 +168,7 @@ def breadth_first_ordering(adjacency, root):
 
     Parameters
     ----------
-    adjacency : dict
+    adjacency : dict or :class:`compas.topology.CSRAdjacency`
         An adjacency dictionary. Each key represents a vertex
         and maps to a list of neighboring vertex keys.
     root : str
@@ -176,18 +193,32 @@ def breadth_first_ordering(adjacency, root):
     and by visiting the nodes at the start of the list first, the network is
     traversed in *breadth-first* order.
 
+    The ordering itself is the queue of nodes to visit.
+    With a compact adjacency, the vertices are identified by their index,
+    and the visited vertices are marked in a flat buffer.
+
     Examples
     --------
-    >>>
+    >>> adjacency = {0: [1, 2], 1: [0, 3], 2: [0], 3: [1]}
+    >>> breadth_first_ordering(adjacency, 0)
+    [0, 1, 2, 3]
     """
-    tovisit = deque([root])
-    visited = set([root])
     ordering = [root]
-    while tovisit:
-        node = tovisit.popleft()
+    if isinstance(adjacency, CSRAdjacency):
+        indptr = adjacency.indptr
+        indices = adjacency.indices
+        visited = bytearray(len(adjacency))
+        visited[root] = 1
+        for node in ordering:
+            for nbr in indices[indptr[node]:indptr[node + 1]]:
+                if not visited[nbr]:
+                    visited[nbr] = 1
+                    ordering.append(nbr)
+        return ordering
+    visited = set([root])
+    for node in ordering:
         for nbr in adjacency[node]:
             if nbr not in visited:
-                tovisit.append(nbr)
                 visited.add(nbr)
                 ordering.append(nbr)
     return ordering
@@ -198,7 +229,7 @@ def breadth_first_traverse(adjacency, root, callback=None):
 
     Parameters
     ----------
-    adjacency : dict
+    adjacency : dict or :class:`compas.topology.CSRAdjacency`
         Map of every node to a list of neighbouring nodes.
     root : int
         The identifier of the starting node.
@@ -212,8 +243,12 @@ def breadth_first_traverse(adjacency, root, callback=None):
 
     Examples
     --------
-    >>>
+    >>> adjacency = {0: [1, 2], 1: [0, 3], 2: [0], 3: [1], 4: []}
+    >>> sorted(breadth_first_traverse(adjacency, 0))
+    [0, 1, 2, 3]
     """
+    if callback is None:
+        return set(breadth_first_ordering(adjacency, root))
     tovisit = deque([root])
     visited = set([root])
     while tovisit:
@@ -222,8 +257,7 @@ def breadth_first_traverse(adjacency, root, callback=None):
             if nbr not in visited:
                 tovisit.append(nbr)
                 visited.add(nbr)
-                if callback:
-                    callback(node, nbr)
+                callback(node, nbr)
     return visited
 
 
@@ -250,13 +284,16 @@ def breadth_first_paths(adjacency, root, goal):
 
     Examples
     --------
-    >>>
+    >>> adjacency = {0: [1, 2], 1: [0, 3], 2: [0, 3], 3: [1, 2]}
+    >>> list(breadth_first_paths(adjacency, 0, 3))
+    [[0, 1, 3], [0, 2, 3]]
     """
-    adjacency = {key: set(nbrs) for key, nbrs in iter(adjacency.items())}
     tovisit = deque([(root, [root])])
     while tovisit:
         node, path = tovisit.popleft()
-        for nbr in adjacency[node] - set(path):
+        for nbr in adjacency[node]:
+            if nbr in path:
+                continue
             if nbr == goal:
                 yield path + [nbr]
             else:
@@ -331,7 +368,7 @@ def reconstruct_path(came_from, current):
     return total_path
 
 
-def astar_shortest_path(network, root, goal):
+def astar_shortest_path(network, root, goal, heuristic=None, weight=None):
     """Find the shortest path between two vertices of a network using the A* search algorithm.
 
     Parameters
@@ -341,82 +378,110 @@ def astar_shortest_path(network, root, goal):
         The identifier of the starting node.
     goal : hashable
         The identifier of the ending node.
+    heuristic : callable, optional
+        A function that returns a lower bound for the cost of the path from a node to the goal.
+        Default is the distance between the coordinates of the node and the goal.
+    weight : dict, optional
+        A dictionary of edge weights, for both directions of every edge.
+        Default is the distance between the coordinates of the nodes of the edges.
 
     Returns
     -------
     list, None
         The path from root to goal, or None, if no path exists between the vertices.
 
+    Notes
+    -----
+    The path is only guaranteed to be the shortest if the heuristic never overestimates the cost to the goal.
+
     Examples
     --------
-    >>>
+    >>> from compas.datastructures import Network
+    >>> network = Network.from_nodes_and_edges([[0, 0, 0], [1, 0, 0], [2, 0, 0], [1, 1, 0]], [(0, 1), (1, 2), (0, 3), (3, 2)])
+    >>> astar_shortest_path(network, 0, 2)
+    [0, 1, 2]
 
     References
     ----------
     https://en.wikipedia.org/wiki/A*_search_algorithm
     """
-    root_coords = network.vertex_coordinates(root)
-    goal_coords = network.vertex_coordinates(goal)
-
-    # The set of nodes already evaluated
-    visited_set = set()
-
-    # The set of currently discovered nodes that are not evaluated yet.
-    # Initially, only the start node is known.
-    candidates_set = {root}
-    best_candidate_heap = PriorityQueue()
-    best_candidate_heap.put((0, root))
-
-    # For each node, which node it can most efficiently be reached from.
-    # If a node can be reached from many nodes, came_from will eventually contain the
-    # most efficient previous step.
-    came_from = dict()
-
-    # g_score is a dict mapping node index to the cost of getting from the root node to that node.
-    # The default value is Infinity.
-    # The cost of going from start to start is zero.
-    g_score = dict()
+    if heuristic is None:
+        goal_coords = network.node_coordinates(goal)
+
+        def heuristic(node):
+            return distance_point_point(network.node_coordinates(node), goal_coords)
+
+    if weight is None:
+        def cost(u, v):
+            return distance_point_point(network.node_coordinates(u), network.node_coordinates(v))
+    else:
+        def cost(u, v):
+            return weight[(u, v)]
+
+    tiebreak = count()
+    g_score = {root: 0}
+    came_from = {}
+    visited = set()
+    heap = [(heuristic(root), next(tiebreak), root)]
+    while heap:
+        _, _, current = heappop(heap)
+        if current == goal:
+            return reconstruct_path(came_from, current)
+        if current in visited:
+            continue
+        visited.add(current)
+        for neighbor in network.neighbors(current):
+            if neighbor in visited:
+                continue
+            tentative = g_score[current] + cost(current, neighbor)
+            if tentative < g_score.get(neighbor, float('inf')):
+                came_from[neighbor] = current
+                g_score[neighbor] = tentative
+                heappush(heap, (tentative + heuristic(neighbor), next(tiebreak), neighbor))
+    return None
 
-    for v in network.vertices():
-        g_score[v] = float("inf")
 
-    g_score[root] = 0
+# ==============================================================================
+# Dijkstra
+# ==============================================================================
 
-    # For each node, the total cost of getting from the start node to the goal
-    # by passing by that node. That value is partly known, partly heuristic.
-    # The default value of f_score is Infinity
-    f_score = dict()
 
-    for v in network.vertices():
-        f_score[v] = float("inf")
+def _dijkstra(adjacency, weight, sources, targets=None, number=None, cutoff=None, reverse=False):
+    """Dijkstra search from a number of sources, with a binary heap.
 
-    # For the first node, that value is completely heuristic.
-    f_score[root] = distance_point_point(root_coords, goal_coords)
+    The search stops when all targets, or the given number of targets, are settled,
+    or when the distance exceeds the cutoff.
+    If ``reverse`` is true, the distances are computed along the reversed edges, i.e. towards the sources.
 
-    while not best_candidate_heap.empty():
-        _, current = best_candidate_heap.get()
-        if current == goal:
-            return reconstruct_path(came_from, current)
-        visited_set.add(current)
-        current_coords = network.vertex_coordinates(current)
-        for neighbor in network.vertex_neighbors(current):
-            if neighbor in visited_set:
-                continue  # Ignore the neighbor which is already evaluated.
-
-            # The distance from start to a neighbor
-            neighbor_coords = network.vertex_coordinates(neighbor)
-            tentative_gScore = g_score[current] + distance_point_point(current_coords, neighbor_coords)
-            if neighbor not in candidates_set:  # Discover a new node
-                candidates_set.add(neighbor)
-            elif tentative_gScore >= g_score[neighbor]:
+    Returns the distances and predecessors of the settled nodes, and the settled targets in order.
+    """
+    targets = set(targets) if targets is not None else None
+    if targets is not None and number is None:
+        number = len(targets)
+    tiebreak = count()
+    distance = {}
+    predecessor = {}
+    found = []
+    heap = []
+    for source in sources:
+        heappush(heap, (0, next(tiebreak), source, None))
+    while heap:
+        d, _, u, p = heappop(heap)
+        if u in distance:
+            continue
+        if cutoff is not None and d > cutoff:
+            break
+        distance[u] = d
+        predecessor[u] = p
+        if targets is not None and u in targets:
+            found.append(u)
+            if len(found) == number:
+                break
+        for v in adjacency[u]:
+            if v in distance:
                 continue
-
-            # This path is the best until now. Record it!
-            came_from[neighbor] = current
-            g_score[neighbor] = tentative_gScore
-            new_fscore = g_score[neighbor] + distance_point_point(neighbor_coords, goal_coords)
-            f_score[neighbor] = new_fscore
-            best_candidate_heap.put((new_fscore, neighbor))
+            heappush(heap, (d + (weight[(v, u)] if reverse else weight[(u, v)]), next(tiebreak), v, u))
+    return distance, predecessor, found
 
 
 def dijkstra_distances(adjacency, weight, target):
@@ -436,28 +501,22 @@ def dijkstra_distances(adjacency, weight, target):
     -------
     dict
         A dictionary of distances to the target.
+        Vertices that are not connected to the target have a distance of ``1e+17``.
 
-    Notes:
-        ...
+    Notes
+    -----
+    The next vertex is selected with a binary heap,
+    which makes the computation ``O(E log V)`` instead of ``O(V^2)``.
 
     Examples
     --------
-    >>>
+    >>> adjacency = {0: [1, 2], 1: [0, 2], 2: [0, 1]}
+    >>> weight = {(0, 1): 1.0, (1, 0): 1.0, (1, 2): 1.0, (2, 1): 1.0, (0, 2): 3.0, (2, 0): 3.0}
+    >>> dijkstra_distances(adjacency, weight, 0)
+    {0: 0, 1: 1.0, 2: 2.0}
     """
-    adjacency = {key: set(nbrs) for key, nbrs in adjacency.items()}
-    distance = {key: (0 if key == target else 1e+17) for key in adjacency}
-    tovisit = set(adjacency.keys())
-    visited = set()
-
-    while tovisit:
-        u = min(tovisit, key=lambda k: distance[k])
-        tovisit.remove(u)
-        visited.add(u)
-        for v in adjacency[u] - visited:
-            d = distance[u] + weight[(u, v)]
-            if d < distance[v]:
-                distance[v] = d
-    return distance
+    distance, _, _ = _dijkstra(adjacency, weight, [target])
+    return {key: distance.get(key, 1e+17) for key in adjacency}
 
 
 def dijkstra_path(adjacency, weight, source, target, dist=None):
@@ -475,11 +534,15 @@ def dijkstra_path(adjacency, weight, source, target, dist=None):
         The start vertex.
     target : str
         The end vertex.
+    dist : dict, optional
+        The distances of all vertices to the target (see :func:`dijkstra_distances`).
+        If provided, the path is found by descending the distances from the source.
 
     Returns
     -------
     list
         The shortest path.
+        ``None`` if the target cannot be reached from the source.
 
     Notes
     -----
@@ -487,22 +550,359 @@ def dijkstra_path(adjacency, weight, source, target, dist=None):
     For a directed graph, set the weights of the reversed edges to ``+inf``.
     For an undirected graph, add the same weight for an edge in both directions.
 
+    Without precomputed distances, the path is found with a bidirectional search,
+    which stops as soon as the searches from the source and from the target have met on a shortest path.
+    The adjacency should contain every edge in both directions.
+
     Examples
     --------
-    >>>
+    >>> adjacency = {0: [1, 2], 1: [0, 2], 2: [0, 1]}
+    >>> weight = {(0, 1): 1.0, (1, 0): 1.0, (1, 2): 1.0, (2, 1): 1.0, (0, 2): 3.0, (2, 0): 3.0}
+    >>> dijkstra_path(adjacency, weight, 0, 2)
+    [0, 1, 2]
     """
-    if not dist:
-        dist = dijkstra_distances(adjacency, weight, target)
-    path = [source]
-    node = source
-    node = min(adjacency[node], key=lambda nbr: dist[nbr] + weight[(node, nbr)])
-    path.append(node)
-    while node != target:
-        node = min(adjacency[node], key=lambda nbr: dist[nbr] + weight[(node, nbr)])
+    if dist:
+        path = [source]
+        node = source
+        while node != target:
+            node = min(adjacency[node], key=lambda nbr: dist[nbr] + weight[(node, nbr)])
+            path.append(node)
+        return path
+    if source == target:
+        return [source]
+    tiebreak = count()
+    # forward search from the source, and backward search from the target along the reversed edges
+    distance = [{}, {}]
+    predecessor = [{source: None}, {target: None}]
+    tentative = [{source: 0}, {target: 0}]
+    heaps = [[(0, next(tiebreak), source)], [(0, next(tiebreak), target)]]
+    best = float('inf')
+    meet = None
+    while heaps[0] and heaps[1]:
+        if heaps[0][0][0] + heaps[1][0][0] >= best:
+            break
+        side = 0 if heaps[0][0][0] <= heaps[1][0][0] else 1
+        d, _, u = heappop(heaps[side])
+        if u in distance[side]:
+            continue
+        distance[side][u] = d
+        for v in adjacency[u]:
+            if v in distance[side]:
+                continue
+            dv = d + (weight[(u, v)] if side == 0 else weight[(v, u)])
+            if dv < tentative[side].get(v, float('inf')):
+                tentative[side][v] = dv
+                predecessor[side][v] = u
+                heappush(heaps[side], (dv, next(tiebreak), v))
+                if v in tentative[1 - side] and dv + tentative[1 - side][v] < best:
+                    best = dv + tentative[1 - side][v]
+                    meet = v
+    if meet is None:
+        return None
+    path = []
+    node = meet
+    while node is not None:
+        path.append(node)
+        node = predecessor[0][node]
+    path.reverse()
+    node = predecessor[1][meet]
+    while node is not None:
         path.append(node)
+        node = predecessor[1][node]
     return path
 
 
+def dijkstra_nearest_path(adjacency, weight, sources, targets):
+    """Find the shortest path from any of a number of sources to the nearest of a number of targets.
+
+    Parameters
+    ----------
+    adjacency : dict
+        An adjacency dictionary. Each key represents a vertex
+        and maps to a list of neighboring vertex keys.
+    weight : dict
+        A dictionary of edge weights.
+    sources : list
+        The start vertices.
+    targets : list
+        The end vertices.
+
+    Returns
+    -------
+    list
+        The shortest path from a source to a target.
+        ``None`` if no target can be reached from the sources.
+
+    Notes
+    -----
+    The sources are searched simultaneously, and the search stops at the first target that is reached.
+
+    Examples
+    --------
+    >>> adjacency = {0: [1], 1: [0, 2], 2: [1, 3], 3: [2]}
+    >>> weight = {(u, v): 1.0 for u in adjacency for v in adjacency[u]}
+    >>> dijkstra_nearest_path(adjacency, weight, [0, 3], [1])
+    [0, 1]
+    """
+    tree = ShortestPathTree(adjacency, weight, sources, targets=targets, number=1)
+    if not tree.targets:
+        return None
+    return tree.path(tree.targets[0])
+
+
+class ShortestPathTree(object):
+    """The tree of shortest paths from one or more roots to the other vertices of a graph.
+
+    Parameters
+    ----------
+    adjacency : dict
+        An adjacency dictionary. Each key represents a vertex
+        and maps to a list of neighboring vertex keys.
+    weight : dict
+        A dictionary of edge weights.
+    roots : hashable or list
+        The root vertex, or a list or set of root vertices.
+    targets : list, optional
+        Vertices at which the search can stop.
+        Default is ``None``, in which case the tree spans all vertices that can be reached from the roots.
+    number : int, optional
+        The number of targets after which the search stops.
+        Default is all targets.
+    cutoff : float, optional
+        The distance at which the search stops.
+        Default is no cutoff.
+    reverse : bool, optional
+        If ``True``, the tree contains the shortest paths from the vertices to the roots instead.
+        Default is ``False``.
+
+    Attributes
+    ----------
+    distances : dict
+        The distance of every vertex in the tree to the nearest root.
+    predecessors : dict
+        The predecessor of every vertex in the tree, on the shortest path from the nearest root,
+        or ``None`` for the roots.
+        If ``reverse`` is true, the successor on the shortest path to the nearest root.
+    targets : list
+        The targets that are in the tree, in order of increasing distance.
+
+    Examples
+    --------
+    >>> adjacency = {0: [1, 2], 1: [0, 2], 2: [0, 1, 3], 3: [2]}
+    >>> weight = {(u, v): 1.0 for u in adjacency for v in adjacency[u]}
+    >>> tree = ShortestPathTree(adjacency, weight, 0)
+    >>> tree.distance(3)
+    2.0
+    >>> tree.path(3)
+    [0, 2, 3]
+    """
+
+    def __init__(self, adjacency, weight, roots, targets=None, number=None, cutoff=None, reverse=False):
+        if not isinstance(roots, (list, set)):
+            roots = [roots]
+        self.roots = list(roots)
+        self.reverse = reverse
+        self.distances, self.predecessors, self.targets = _dijkstra(adjacency, weight, self.roots,
+                                                                    targets=targets, number=number,
+                                                                    cutoff=cutoff, reverse=reverse)
+
+    def __contains__(self, key):
+        return key in self.distances
+
+    def distance(self, key):
+        """The distance of a vertex to the nearest root.
+
+        Parameters
+        ----------
+        key : hashable
+            The identifier of the vertex.
+
+        Returns
+        -------
+        float
+            The distance, or ``inf`` if the vertex is not in the tree.
+        """
+        return self.distances.get(key, float('inf'))
+
+    def root(self, key):
+        """The nearest root of a vertex.
+
+        Parameters
+        ----------
+        key : hashable
+            The identifier of the vertex.
+
+        Returns
+        -------
+        hashable
+            The root, or ``None`` if the vertex is not in the tree.
+        """
+        if key not in self.distances:
+            return None
+        while self.predecessors[key] is not None:
+            key = self.predecessors[key]
+        return key
+
+    def path(self, key):
+        """The shortest path between the nearest root and a vertex.
+
+        Parameters
+        ----------
+        key : hashable
+            The identifier of the vertex.
+
+        Returns
+        -------
+        list
+            The path from the root to the vertex, or from the vertex to the root if the tree is reversed.
+            ``None`` if the vertex is not in the tree.
+        """
+        if key not in self.distances:
+            return None
+        path = [key]
+        while self.predecessors[path[-1]] is not None:
+            path.append(self.predecessors[path[-1]])
+        if not self.reverse:
+            path.reverse()
+        return path
+
+
+# ==============================================================================
+# Distance matrices
+# ==============================================================================
+
+
+def graph_adjacency_weight(graph, name=None):
+    """Construct the adjacency dictionary and edge weights of a network or mesh.
+
+    Parameters
+    ----------
+    graph : :class:`compas.datastructures.Network` or :class:`compas.datastructures.Mesh`
+        The network or mesh.
+    name : str, optional
+        The name of the edge attribute containing the weights.
+        Default is ``None``, in which case the weights are the lengths of the edges.
+
+    Returns
+    -------
+    tuple
+        * The adjacency dictionary.
+        * The weights of the edges, in both directions.
+
+    Examples
+    --------
+    >>> from compas.datastructures import Network
+    >>> network = Network.from_nodes_and_edges([[0, 0, 0], [1, 0, 0], [1, 2, 0]], [(0, 1), (1, 2)])
+    >>> adjacency, weight = graph_adjacency_weight(network)
+    >>> weight[(2, 1)]
+    2.0
+    """
+    adjacency = {key: list(graph.adjacency[key]) for key in graph.adjacency}
+    weight = {}
+    for u, v in graph.edges():
+        if name is None:
+            w = graph.edge_length(u, v)
+        else:
+            w = graph.edge_attribute((u, v), name)
+        weight[(u, v)] = weight[(v, u)] = w
+    return adjacency, weight
+
+
+def dijkstra_distance_matrix(adjacency, weight, sources, targets=None, cutoff=None, sparse=False, processes=1):
+    """Compute the graph distances between a number of sources and a number of targets.
+
+    Parameters
+    ----------
+    adjacency : dict or :class:`compas.datastructures.Network` or :class:`compas.datastructures.Mesh`
+        An adjacency dictionary. Each key represents a vertex
+        and maps to a list of neighboring vertex keys.
+        Alternatively, a network or mesh.
+    weight : dict or str or None
+        A dictionary of edge weights.
+        If ``adjacency`` is a network or mesh, the name of the edge attribute containing the weights,
+        or ``None`` to use the lengths of the edges (see :func:`graph_adjacency_weight`).
+    sources : list
+        The source vertices.
+    targets : list, optional
+        The target vertices.
+        Default is ``None``, in which case the targets are all vertices, in the order of the adjacency dictionary.
+    cutoff : float, optional
+        The distance beyond which targets are considered unreachable.
+        Default is no cutoff.
+    sparse : bool, optional
+        If ``True``, return for every source a dictionary with only the distances of the reachable targets.
+        Default is ``False``.
+    processes : int, optional
+        The number of worker processes over which the sources are distributed.
+        Default is ``1``, in which case the distances are computed in the current process.
+        If ``None``, the number of CPUs is used.
+
+    Returns
+    -------
+    list
+        For every source, a list of the distances to the targets, with ``inf`` for unreachable targets,
+        or, if ``sparse`` is true, a dictionary mapping reachable targets to their distances.
+
+    Notes
+    -----
+    Every source is searched separately, and the search stops as soon as all targets are reached.
+    The edge weights should all be positive.
+
+    Worker processes are started with :mod:`multiprocessing`,
+    which on some platforms requires the calling script to be protected by ``if __name__ == '__main__'``.
+    Multiple processes only pay off if the graph is large and there are many sources.
+
+    See Also
+    --------
+    :func:`compas.topology.dijkstra_distance_matrix_numpy`
+
+    Examples
+    --------
+    >>> adjacency = {0: [1], 1: [0, 2], 2: [1], 3: []}
+    >>> weight = {(0, 1): 1.0, (1, 0): 1.0, (1, 2): 2.0, (2, 1): 2.0}
+    >>> dijkstra_distance_matrix(adjacency, weight, [0, 2])
+    [[0, 1.0, 3.0, inf], [3.0, 2.0, 0, inf]]
+    >>> dijkstra_distance_matrix(adjacency, weight, [0, 2], cutoff=2.0, sparse=True)
+    [{0: 0, 1: 1.0}, {1: 2.0, 2: 0}]
+    """
+    if not isinstance(adjacency, dict):
+        adjacency, weight = graph_adjacency_weight(adjacency, weight)
+    if targets is None:
+        targets = list(adjacency)
+    if processes == 1 or len(sources) < 2:
+        return [_distance_matrix_row(adjacency, weight, source, targets, cutoff, sparse) for source in sources]
+    from multiprocessing import Pool
+    from multiprocessing import cpu_count
+    processes = processes or cpu_count()
+    pool = Pool(processes, initializer=_distance_matrix_init, initargs=(adjacency, weight, targets, cutoff, sparse))
+    try:
+        return pool.map(_distance_matrix_task, sources, chunksize=max(1, len(sources) // (4 * processes)))
+    finally:
+        pool.close()
+        pool.join()
+
+
+def _distance_matrix_row(adjacency, weight, source, targets, cutoff, sparse):
+    distance, _, _ = _dijkstra(adjacency, weight, [source], targets=targets, cutoff=cutoff)
+    if sparse:
+        return {key: distance[key] for key in targets if key in distance}
+    return [distance.get(key, float('inf')) for key in targets]
+
+
+# the arguments shared by the tasks of a worker process, set by the initializer of the pool
+_distance_matrix_worker = {}
+
+
+def _distance_matrix_init(adjacency, weight, targets, cutoff, sparse):
+    _distance_matrix_worker.update(adjacency=adjacency, weight=weight, targets=targets, cutoff=cutoff, sparse=sparse)
+
+
+def _distance_matrix_task(source):
+    worker = _distance_matrix_worker
+    return _distance_matrix_row(worker['adjacency'], worker['weight'], source,
+                                worker['targets'], worker['cutoff'], worker['sparse'])
+
+
 # ==============================================================================
 # Main
 # ==============================================================================
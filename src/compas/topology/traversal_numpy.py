@@ -0,0 +1,107 @@
+from __future__ import print_function
+from __future__ import absolute_import
+from __future__ import division
+
+from numpy import array
+from numpy import float64
+from numpy import int64
+from numpy import isfinite
+from numpy import nonzero
+
+from scipy.sparse import coo_matrix
+from scipy.sparse import csr_matrix
+from scipy.sparse.csgraph import dijkstra
+
+from compas.topology import graph_adjacency_weight
+
+
+__all__ = [
+    'dijkstra_distance_matrix_numpy',
+]
+
+
+def dijkstra_distance_matrix_numpy(adjacency, weight, sources, targets=None, cutoff=None, sparse=False):
+    """Compute the graph distances between a number of sources and a number of targets, using SciPy.
+
+    Parameters
+    ----------
+    adjacency : dict or :class:`compas.datastructures.Network` or :class:`compas.datastructures.Mesh`
+        An adjacency dictionary. Each key represents a vertex
+        and maps to a list of neighboring vertex keys.
+        Alternatively, a network or mesh.
+    weight : dict or str or None
+        A dictionary of edge weights.
+        If ``adjacency`` is a network or mesh, the name of the edge attribute containing the weights,
+        or ``None`` to use the lengths of the edges (see :func:`compas.topology.graph_adjacency_weight`).
+    sources : list
+        The source vertices.
+    targets : list, optional
+        The target vertices.
+        Default is ``None``, in which case the targets are all vertices, in the order of the adjacency dictionary.
+    cutoff : float, optional
+        The distance beyond which targets are considered unreachable.
+        Default is no cutoff.
+    sparse : bool, optional
+        If ``True``, return a sparse matrix with only the distances of the reachable targets.
+        Default is ``False``.
+
+    Returns
+    -------
+    array or :class:`scipy.sparse.csr_matrix`
+        A matrix with a row per source and a column per target.
+        In the dense matrix, the distances of unreachable targets are ``inf``.
+        In the sparse matrix, only the distances of reachable targets are stored,
+        including explicit zeros for targets that are sources.
+
+    Notes
+    -----
+    The graph is converted to a sparse matrix once,
+    and the searches from all sources are run by :func:`scipy.sparse.csgraph.dijkstra`.
+
+    See Also
+    --------
+    :func:`compas.topology.dijkstra_distance_matrix`
+
+    Examples
+    --------
+    >>> adjacency = {0: [1], 1: [0, 2], 2: [1], 3: []}
+    >>> weight = {(0, 1): 1.0, (1, 0): 1.0, (1, 2): 2.0, (2, 1): 2.0}
+    >>> dijkstra_distance_matrix_numpy(adjacency, weight, [0, 2]).tolist()
+    [[0.0, 1.0, 3.0, inf], [3.0, 2.0, 0.0, inf]]
+    >>> dijkstra_distance_matrix_numpy(adjacency, weight, [0, 2], cutoff=2.0, sparse=True).toarray().tolist()
+    [[0.0, 1.0, 0.0, 0.0], [0.0, 2.0, 0.0, 0.0]]
+
+    """
+    if not isinstance(adjacency, dict):
+        adjacency, weight = graph_adjacency_weight(adjacency, weight)
+    key_index = {key: index for index, key in enumerate(adjacency)}
+    n = len(key_index)
+    rows = []
+    cols = []
+    data = []
+    for u in adjacency:
+        i = key_index[u]
+        for v in adjacency[u]:
+            rows.append(i)
+            cols.append(key_index[v])
+            data.append(weight[(u, v)])
+    graph = csr_matrix((array(data, dtype=float64), (array(rows, dtype=int64), array(cols, dtype=int64))), shape=(n, n))
+    indices = [key_index[key] for key in sources]
+    limit = float('inf') if cutoff is None else cutoff
+    distances = dijkstra(graph, directed=True, indices=indices, limit=limit)
+    if targets is not None:
+        distances = distances[:, [key_index[key] for key in targets]]
+    if not sparse:
+        return distances
+    i, j = nonzero(isfinite(distances))
+    return coo_matrix((distances[i, j], (i, j)), shape=distances.shape).tocsr()
+
+
+# ==============================================================================
+# Main
+# ==============================================================================
+
+if __name__ == '__main__':
+
+    import doctest
+    doctest.testmod(globs=globals())
@@ -1,5 +1,6 @@
-# import pytest
+import pytest
 import os
+import random
 import compas
 import json
 
@@ -77,9 +78,30 @@ def test_from_lines():
     assert mesh.number_of_edges() == 40
 
 
-def test_from_vertices_and_faces():
-    # tested through other functions
-    pass
+@pytest.mark.parametrize("storage", ['dict', 'compact'])
+def test_from_vertices_and_faces(storage):
+    vertices, faces = Mesh.from_obj(compas.get('faces.obj')).to_vertices_and_faces()
+    faces += [[0, 0, 1], [2, 3, 3, 2]]
+    mesh = Mesh(storage=storage)
+    for x, y, z in vertices:
+        mesh.add_vertex(x=x, y=y, z=z)
+    for face in faces:
+        mesh.add_face(face)
+    other = Mesh.from_vertices_and_faces(vertices, faces, storage=storage)
+    assert other.data == mesh.data
+    assert list(other.edges()) == list(mesh.edges())
+    assert all(list(other.halfedge[key].items()) == list(mesh.halfedge[key].items()) for key in mesh.halfedge)
+    assert other.is_valid()
+
+
+def test_from_vertices_and_faces_validate():
+    vertices = [[0, 0, 0], [1, 0, 0], [0, 1, 0], [0, 0, 1], [1, 1, 1]]
+    mesh = Mesh.from_vertices_and_faces(vertices[:4], [[0, 1, 2], [2, 1, 3]], validate=True)
+    assert mesh.is_manifold()
+    with pytest.raises(ValueError):
+        Mesh.from_vertices_and_faces(vertices, [[0, 1, 2], [0, 1, 3]], validate=True)
+    with pytest.raises(ValueError):
+        Mesh.from_vertices_and_faces(vertices, [[0, 1, 2], [0, 3, 4]], validate=True)
 
 
 def test_from_polyhedron():
@@ -139,6 +161,43 @@ def test_copy():
     assert mesh1.number_of_edges() == mesh2.number_of_edges()
 
 
+@pytest.mark.parametrize("storage", ['dict', 'compact'])
+def test_copy_independent(storage):
+    mesh1 = Mesh.from_obj(compas.get('faces.obj'))
+    mesh1 = Mesh.from_vertices_and_faces(*mesh1.to_vertices_and_faces(), storage=storage)
+    mesh1.vertex_attribute(0, 'load', [0.0, 0.0, -1.0])
+    mesh1.face_attribute(0, 'weight', 2.0)
+    mesh1.edge_attribute((0, 1), 'q', 3.0)
+    data = mesh1.data
+    mesh2 = mesh1.copy()
+    assert mesh2.data == data
+    assert list(mesh2.edges()) == list(mesh1.edges())
+    mesh2.vertex_attribute(0, 'x', 10.0)
+    mesh2.vertex_attribute(0, 'load')[2] = -2.0
+    mesh2.face_attribute(0, 'weight', 1.0)
+    mesh2.edge_attribute((0, 1), 'q', 1.0)
+    mesh2.delete_vertex(14)
+    mesh2.delete_face(1)
+    assert mesh1.data == data
+    assert mesh1.is_valid()
+    assert mesh2.number_of_vertices() == mesh1.number_of_vertices() - 1
+
+
+@pytest.mark.parametrize("storage", ['dict', 'compact'])
+def test_copy_mutable_attributes(storage):
+    mesh1 = Mesh.from_obj(compas.get('faces.obj'))
+    mesh1 = Mesh.from_vertices_and_faces(*mesh1.to_vertices_and_faces(), storage=storage)
+    mesh1.vertex_attribute(0, 'load', [1])
+    mesh2 = mesh1.copy()
+    mesh2.vertex_attribute(0, 'load').append(2)
+    assert mesh1.vertex_attribute(0, 'load') == [1]
+    assert mesh2.vertex_attribute(0, 'load') == [1, 2]
+    mesh3 = mesh1.copy()
+    mesh1.vertex_attribute(0, 'load').append(3)
+    assert mesh3.vertex_attribute(0, 'load') == [1]
+    assert mesh1.vertex_attribute(0, 'load') == [1, 3]
+
+
 def test_clear():
     mesh = Mesh.from_obj(compas.get('faces.obj'))
     mesh.clear()
@@ -147,6 +206,235 @@ def test_clear():
     assert mesh.number_of_edges() == 0
 
 
+# --------------------------------------------------------------------------
+# storage
+# --------------------------------------------------------------------------
+
+def test_compact_storage():
+    mesh1 = Mesh.from_obj(compas.get('faces.obj'))
+    mesh2 = Mesh(storage='compact')
+    mesh2.data = mesh1.data
+    assert mesh2.storage == 'compact'
+    assert mesh2.data == mesh1.data
+    assert list(mesh2.edges()) == list(mesh1.edges())
+    assert mesh2.vertex_neighbors(14, ordered=True) == mesh1.vertex_neighbors(14, ordered=True)
+    assert mesh2.face_vertices(0) == mesh1.face_vertices(0)
+    mesh1.delete_vertex(14)
+    mesh2.delete_vertex(14)
+    assert mesh2.data == mesh1.data
+    assert mesh2.is_valid()
+    assert mesh2.copy().storage == 'compact'
+
+
+def test_compact_storage_attributes():
+    mesh = Mesh.from_obj(compas.get('faces.obj'))
+    mesh = Mesh.from_vertices_and_faces(*mesh.to_vertices_and_faces(), storage='compact')
+    mesh.vertex_attribute(0, 'x', 3)
+    mesh.vertex_attribute(0, 'is_fixed', True)
+    assert mesh.vertex_attributes(0, 'xyz') == [3.0, 0.0, 0.0]
+    assert mesh.vertex_attribute(0, 'is_fixed')
+    assert mesh.vertex_attribute(1, 'is_fixed') is None
+    mesh.face[0][:] = mesh.face[0][::-1]
+    assert mesh.face_vertices(0) == [6, 7, 1, 0]
+
+
+def test_compact_storage_face_attributes():
+    mesh = Mesh.from_obj(compas.get('faces.obj'))
+    mesh = Mesh.from_vertices_and_faces(*mesh.to_vertices_and_faces(), storage='compact')
+    mesh.update_default_face_attributes(weight=1.0)
+    assert not mesh.facedata
+    assert dict(mesh.face_attributes(0)) == {'weight': 1.0}
+    assert all(attr['weight'] == 1.0 for _, attr in mesh.faces(data=True))
+    assert not mesh.facedata
+    mesh.face_attributes(0)['weight'] = 2.0
+    assert mesh.facedata == {0: {'weight': 2.0}}
+    assert mesh.data['facedata'][1] == {}
+
+
+def test_compact_storage_keys():
+    mesh = Mesh(storage='compact')
+    mesh.add_vertex(key=2 ** 31 - 1)
+    for key in (-1, 2 ** 31):
+        with pytest.raises(ValueError):
+            mesh.add_vertex(key=key)
+    vertices, faces = Mesh.from_obj(compas.get('faces.obj')).to_vertices_and_faces()
+    with pytest.raises(ValueError):
+        Mesh.from_vertices_and_faces(vertices, faces, storage='compact').add_face([0, 1, 2], fkey=-1)
+    mesh = Mesh(storage='compact')
+    with pytest.raises(ValueError):
+        mesh.data = {'attributes': {}, 'vertex': dict(enumerate({'x': x, 'y': y, 'z': z} for x, y, z in vertices)),
+                     'face': {str(-1 - i): face for i, face in enumerate(faces)}}
+    assert not mesh.halfedge or all(not mesh.halfedge[key] for key in mesh.halfedge)
+
+
+def test_compact_storage_copy_on_write():
+    mesh1 = Mesh.from_obj(compas.get('faces.obj'))
+    mesh1 = Mesh.from_vertices_and_faces(*mesh1.to_vertices_and_faces(), storage='compact')
+    mesh2 = mesh1.copy()
+    table1 = mesh1.vertex.table
+    table2 = mesh2.vertex.table
+    assert table2.xyz is table1.xyz
+    assert table2.target is table1.target
+    assert mesh2.face._vertices is mesh1.face._vertices
+    mesh2.vertex_attribute(0, 'x', 10.0)
+    assert table2.xyz is not table1.xyz
+    assert table2.target is table1.target
+    assert mesh1.vertex_attribute(0, 'x') == 0.0
+    mesh1.delete_face(0)
+    assert table2.target is not table1.target
+    assert mesh2.face._vertices is not mesh1.face._vertices
+    assert mesh2.has_face(0)
+    assert mesh2.halfedge[0][1] == 0
+
+
+def test_compact_storage_operations():
+    random.seed(1)
+    vertices, faces = Mesh.from_obj(compas.get('faces.obj')).to_vertices_and_faces()
+    meshes = [Mesh.from_vertices_and_faces(vertices, faces, storage=storage) for storage in ('dict', 'compact')]
+    deleted = []
+    for i in range(400):
+        keys = list(meshes[0].vertices())
+        fkeys = list(meshes[0].faces())
+        operation = random.randrange(8)
+        if operation == 0:
+            key = random.choice(deleted) if deleted and random.random() < 0.5 else None
+            for mesh in meshes:
+                mesh.add_vertex(key=key, x=i, y=0.0, z=0.0)
+        elif operation == 1:
+            key = random.choice(keys)
+            deleted.append(key)
+            for mesh in meshes:
+                mesh.delete_vertex(key)
+        elif operation == 2 and len(keys) > 3:
+            face = random.sample(keys, 3)
+            fkey = meshes[0]._max_int_fkey + random.choice([1, 1, 50, 10 ** 6])
+            if all(meshes[0].halfedge[u].get(v) is None for u, v in zip(face, face[1:] + face[:1])):
+                for mesh in meshes:
+                    mesh.add_face(face, fkey=fkey)
+        elif operation == 3 and fkeys:
+            fkey = random.choice(fkeys)
+            for mesh in meshes:
+                mesh.delete_face(fkey)
+        elif operation == 4:
+            key = random.choice(keys)
+            for mesh in meshes:
+                mesh.vertex_attribute(key, 'z', float(i))
+                mesh.vertex_attribute(key, 'is_fixed', True)
+        elif operation == 5 and fkeys:
+            fkey = random.choice(fkeys)
+            for mesh in meshes:
+                mesh.face_attribute(fkey, 'weight', i)
+        elif operation == 6:
+            key = meshes[0]._max_int_key + random.choice([1, 50, 10 ** 6])
+            for mesh in meshes:
+                mesh.add_vertex(key=key)
+        elif operation == 7 and random.random() < 0.2:
+            meshes = [mesh.copy() for mesh in meshes]
+        mesh1, mesh2 = meshes
+        assert list(mesh2.vertices()) == list(mesh1.vertices())
+        assert list(mesh2.faces()) == list(mesh1.faces())
+        assert mesh2.data == mesh1.data
+        assert [list(mesh2.halfedge[key].items()) for key in mesh2.vertices()] == [list(mesh1.halfedge[key].items()) for key in mesh1.vertices()]
+        assert [mesh2.face_attribute(fkey, 'weight') for fkey in mesh2.faces()] == [mesh1.face_attribute(fkey, 'weight') for fkey in mesh1.faces()]
+
+
+def test_storage_unknown():
+    with pytest.raises(ValueError):
+        Mesh(storage='numpy')
+
+
+class CustomMesh(Mesh):
+
+    def __init__(self):
+        super(CustomMesh, self).__init__()
+        self.attributes['name'] = 'Custom'
+
+
+@pytest.mark.parametrize("storage", ['dict', 'compact'])
+def test_storage_subclass(storage):
+    vertices, faces = Mesh.from_polyhedron(6).to_vertices_and_faces()
+    mesh = CustomMesh.from_vertices_and_faces(vertices, faces, storage=storage)
+    assert type(mesh) is CustomMesh
+    assert mesh.storage == storage
+    assert mesh.name == 'Custom'
+    assert mesh.is_valid()
+    other = mesh.copy()
+    assert type(other) is CustomMesh
+    assert other.storage == storage
+    assert other.data == mesh.data
+    assert type(CustomMesh.from_polyhedron(6)) is CustomMesh
+
+
+# --------------------------------------------------------------------------
+# arrays
+# --------------------------------------------------------------------------
+
+@pytest.mark.parametrize("storage", ['dict', 'compact'])
+def test_to_arrays(storage):
+    mesh = Mesh.from_obj(compas.get('faces.obj'))
+    mesh = Mesh.from_vertices_and_faces(*mesh.to_vertices_and_faces(), storage=storage)
+    arrays = mesh.to_arrays()
+    assert arrays is mesh.arrays
+    assert arrays.vertices.tolist() == mesh.vertices_attributes('xyz')
+    assert arrays.faces.tolist() == [mesh.face_vertices(fkey) for fkey in mesh.faces()]
+    assert [tuple(arrays.keys[edge]) for edge in arrays.edges] == list(mesh.edges())
+    assert not arrays.vertices.flags.writeable
+
+
+@pytest.mark.parametrize("storage", ['dict', 'compact'])
+def test_to_arrays_invalidation(storage):
+    mesh = Mesh.from_obj(compas.get('faces.obj'))
+    mesh = Mesh.from_vertices_and_faces(*mesh.to_vertices_and_faces(), storage=storage)
+    arrays = mesh.to_arrays()
+    for key, attr in mesh.vertices(True):
+        attr['z'] = 1.0
+        break
+    moved = mesh.to_arrays()
+    assert moved is not arrays
+    assert moved.faces is arrays.faces
+    assert moved.vertices[0, 2] == 1.0
+    mesh.delete_face(0)
+    assert mesh.to_arrays().faces.shape[0] == arrays.faces.shape[0] - 1
+    mesh.halfedge[0] = {}
+    mesh.invalidate()
+    assert mesh.to_arrays().halfedges.shape[0] < moved.halfedges.shape[0]
+
+
+# --------------------------------------------------------------------------
+# edge registry
+# --------------------------------------------------------------------------
+
+@pytest.mark.parametrize("storage", ['dict', 'compact'])
+def test_register_edges(storage):
+    mesh = Mesh.from_obj(compas.get('faces.obj'))
+    mesh = Mesh.from_vertices_and_faces(*mesh.to_vertices_and_faces(), storage=storage)
+    edges = list(mesh.edges())
+    registry = mesh.register_edges()
+    assert mesh.edge_registry is registry
+    assert list(mesh.edges()) == edges
+    assert mesh.number_of_edges() == len(edges)
+    assert sorted(registry.boundary) == [registry.edge_key(u, v) for u, v in edges if mesh.is_edge_on_boundary(u, v)]
+    mesh.unregister_edges()
+    assert mesh.edge_registry is None
+
+
+@pytest.mark.parametrize("storage", ['dict', 'compact'])
+def test_register_edges_update(storage):
+    mesh = Mesh.from_obj(compas.get('faces.obj'))
+    mesh = Mesh.from_vertices_and_faces(*mesh.to_vertices_and_faces(), storage=storage)
+    registry = mesh.register_edges()
+    key = registry.edge_key(7, 8)
+    mesh.delete_face(0)
+    mesh.split_edge(14, 15, allow_boundary=True)
+    mesh.collapse_edge(20, 21)
+    assert registry.edge_key(7, 8) == key
+    mesh.unregister_edges()
+    edges = set(frozenset(edge) for edge in mesh.edges())
+    assert set(frozenset(edge) for edge in registry) == edges
+    boundary = set(frozenset(edge) for edge in mesh.edges() if mesh.is_edge_on_boundary(*edge))
+    assert set(frozenset(edge) for edge in registry.edges_on_boundary()) == boundary
+
+
 # --------------------------------------------------------------------------
 # builders
 # --------------------------------------------------------------------------
@@ -497,6 +785,18 @@ def test_vertex_curvature():
     assert mesh.vertex_curvature(5) == 0.036193074384009094
 
 
+def test_vertices_geometry():
+    mesh = Mesh.from_obj(compas.get('quadmesh.obj'))
+    keys = list(mesh.vertices())
+    for a, b in zip(mesh.vertices_areas(), [mesh.vertex_area(key) for key in keys]):
+        assert a == pytest.approx(b)
+    for a, b in zip(mesh.vertices_normals(), [mesh.vertex_normal(key) for key in keys]):
+        assert a == pytest.approx(b)
+    for a, b in zip(mesh.vertices_curvatures(), [mesh.vertex_curvature(key) for key in keys]):
+        assert a == pytest.approx(b)
+    assert mesh.vertices_areas(keys=[5, 0]) == pytest.approx([mesh.vertex_area(5), mesh.vertex_area(0)])
+
+
 def test_face_coordinates():
     mesh = Mesh.from_obj(compas.get('quadmesh.obj'))
     assert mesh.face_coordinates(0, 'xyz') == [
@@ -559,6 +859,22 @@ def test_face_curvature():
     assert mesh.face_curvature(0) == 0
 
 
+def test_faces_geometry():
+    mesh = Mesh.from_obj(compas.get('quadmesh.obj'))
+    fkeys = list(mesh.faces())
+    for a, b in zip(mesh.faces_normals(), [mesh.face_normal(fkey) for fkey in fkeys]):
+        assert a == pytest.approx(b)
+    for a, b in zip(mesh.faces_centroids(), [mesh.face_centroid(fkey) for fkey in fkeys]):
+        assert a == pytest.approx(b)
+    assert mesh.faces_areas() == pytest.approx([mesh.face_area(fkey) for fkey in fkeys])
+    assert mesh.faces_areas(fkeys=[0]) == pytest.approx([0.3374168482414756])
+
+
+def test_edges_lengths():
+    mesh = Mesh.from_obj(compas.get('quadmesh.obj'))
+    assert mesh.edges_lengths() == pytest.approx([mesh.edge_length(u, v) for u, v in mesh.edges()])
+
+
 # --------------------------------------------------------------------------
 # boundary
 # --------------------------------------------------------------------------
@@ -0,0 +1,73 @@
+import pytest
+
+import compas
+from compas.datastructures import Mesh
+from compas.geometry import closest_point_on_plane
+from compas.geometry import closest_point_on_segment
+from compas.geometry import distance_point_point
+from compas.geometry import is_point_in_triangle
+from compas.geometry import normal_polygon
+from compas.utilities import pairwise
+
+
+@pytest.fixture
+def mesh():
+    mesh = Mesh.from_obj(compas.get('faces.obj'))
+    for key in mesh.vertices():
+        x, y, z = mesh.vertex_coordinates(key)
+        mesh.vertex_attribute(key, 'z', 0.1 * x * y)
+    return mesh
+
+
+def closest_point_on_triangle(point, triangle):
+    plane = triangle[0], normal_polygon(triangle)
+    projection = closest_point_on_plane(point, plane)
+    if is_point_in_triangle(projection, triangle):
+        return projection
+    points = [closest_point_on_segment(point, segment) for segment in pairwise(triangle + triangle[:1])]
+    return min(points, key=lambda x: distance_point_point(point, x))
+
+
+def test_closest_points(mesh):
+    points = [[x, y, z] for x in range(-1, 12, 2) for y in range(-1, 12, 3) for z in (-2.0, 0.5, 3.0)]
+    closest, faces, distances = mesh.bvh(leafsize=2).closest_points(points)
+    triangles = []
+    for fkey in mesh.faces():
+        a, b, c, d = mesh.face_coordinates(fkey)
+        triangles += [[a, b, c], [a, c, d]]
+    for point, x, distance in zip(points, closest.tolist(), distances.tolist()):
+        expected = min(distance_point_point(point, closest_point_on_triangle(point, triangle)) for triangle in triangles)
+        assert distance == pytest.approx(expected)
+        assert distance == pytest.approx(distance_point_point(point, x))
+
+
+def test_intersect_rays(mesh):
+    bvh = mesh.bvh()
+    points, faces, t = bvh.intersect_rays([[5.5, 5.5, 10.0], [5.5, 5.5, -10.0], [20.0, 0.0, 10.0]], [[0, 0, -1], [0, 0, -1], [0, 0, -1]])
+    assert points[0].tolist()[:2] == pytest.approx([5.5, 5.5])
+    assert bvh.closest_points(points[:1])[2][0] == pytest.approx(0.0)
+    assert faces.tolist()[1:] == [-1, -1]
+    _, faces, t = bvh.intersect_segments([[5.5, 5.5, 10.0], [5.5, 5.5, 10.0]], [[5.5, 5.5, 0.0], [5.5, 5.5, 5.0]])
+    assert t[0] == pytest.approx((10.0 - points[0][2]) / 10.0)
+    assert faces[1] == -1
+
+
+def test_intersect_plane_and_boxes(mesh):
+    bvh = mesh.bvh()
+    faces = bvh.intersect_plane(([5.5, 0.0, 0.0], [1.0, 0.0, 0.0]))
+    assert sorted(faces) == sorted(fkey for fkey in mesh.faces() if min(mesh.face_coordinates(fkey))[0] < 5.5 < max(mesh.face_coordinates(fkey))[0])
+    boxes = bvh.overlap_boxes([[[1.5, 1.5, -1.0], [2.5, 2.5, 1.0]], [[20.0, 20.0, 20.0], [21.0, 21.0, 21.0]]])
+    assert len(boxes[0]) == 4
+    assert boxes[1] == []
+
+
+def test_update(mesh):
+    bvh = mesh.bvh()
+    mesh.vertex_attribute(0, 'z', 5.0)
+    assert mesh.bvh() is bvh
+    _, _, distances = bvh.closest_points([[0.0, 0.0, 5.0]])
+    assert distances[0] == pytest.approx(0.0)
+    mesh.delete_face(mesh.vertex_faces(0)[0])
+    _, _, distances = bvh.closest_points([[0.0, 0.0, 5.0]])
+    assert distances[0] > 1.0
+    assert bvh.topology_version == mesh.topology_version
@@ -0,0 +1,89 @@
+import random
+
+import pytest
+
+from compas.datastructures import Mesh
+from compas.datastructures import mesh_decimate
+from compas.datastructures import mesh_quads_to_triangles
+from compas.datastructures import trimesh_subdivide_loop
+
+
+@pytest.fixture
+def sphere():
+    random.seed(0)
+    mesh = trimesh_subdivide_loop(Mesh.from_polyhedron(20), k=3)
+    for key, attr in mesh.vertices(True):
+        scale = 1.0 + 0.01 * random.random()
+        attr['x'] *= scale
+        attr['y'] *= scale
+        attr['z'] *= scale
+    return mesh
+
+
+@pytest.fixture
+def grid():
+    random.seed(0)
+    m = 20
+    vertices = [[i + 0.2 * random.random(), j + 0.2 * random.random(), 0.1 * random.random()] for i in range(m) for j in range(m)]
+    faces = [[i * m + j, (i + 1) * m + j, (i + 1) * m + j + 1, i * m + j + 1] for i in range(m - 1) for j in range(m - 1)]
+    mesh = Mesh.from_vertices_and_faces(vertices, faces)
+    mesh_quads_to_triangles(mesh)
+    return mesh
+
+
+def euler(mesh):
+    return mesh.number_of_vertices() - mesh.number_of_edges() + mesh.number_of_faces()
+
+
+def radii(mesh):
+    return [sum(x ** 2 for x in mesh.vertex_coordinates(key)) ** 0.5 for key in mesh.vertices()]
+
+
+def test_decimate(sphere):
+    rmin = min(radii(sphere))
+    rmax = max(radii(sphere))
+    stats = mesh_decimate(sphere, 200)
+    assert stats['faces'] == sphere.number_of_faces() == 200
+    assert stats['collapses'] == (1280 - 200) // 2
+    assert stats['rate'] > 0
+    assert sorted(stats['timing']) == ['collapse', 'setup']
+    assert sphere.is_valid()
+    assert euler(sphere) == 2
+    assert all(len(sphere.face_vertices(fkey)) == 3 for fkey in sphere.faces())
+    assert all(0.95 * rmin < radius < 1.05 * rmax for radius in radii(sphere))
+
+
+def test_decimate_max_error(sphere):
+    stats = mesh_decimate(sphere, 0, max_error=0.0)
+    assert stats['error'] == 0.0
+    assert sphere.number_of_faces() > 200
+
+
+def test_decimate_boundary(grid):
+    xyz = {key: grid.vertex_coordinates(key) for key in grid.vertices()}
+    boundary = set(grid.vertices_on_boundary())
+    corners = set([0, 19, 380, 399])
+    fixed = [210]
+    mesh_decimate(grid, 100, fixed=fixed)
+    assert grid.number_of_faces() <= 100
+    assert grid.is_valid()
+    assert euler(grid) == 1
+    assert corners <= set(grid.vertices_on_boundary()) <= boundary
+    for key in grid.vertices_on_boundary():
+        assert grid.vertex_coordinates(key) == xyz[key]
+    assert grid.vertex_coordinates(210) == xyz[210]
+
+
+def test_decimate_seams(grid):
+    seam = [i * 20 + 10 for i in range(20)]
+    mesh_decimate(grid, 100, seams=list(zip(seam[:-1], seam[1:])))
+    assert grid.is_valid()
+    remaining = [key for key in seam if grid.has_vertex(key)]
+    assert remaining[0] == seam[0] and remaining[-1] == seam[-1]
+    assert all(grid.has_edge((u, v)) or grid.has_edge((v, u)) for u, v in zip(remaining[:-1], remaining[1:]))
+
+
+def test_decimate_triangles():
+    mesh = Mesh.from_polyhedron(6)
+    with pytest.raises(ValueError):
+        mesh_decimate(mesh, 4)
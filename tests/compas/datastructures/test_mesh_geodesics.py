@@ -0,0 +1,55 @@
+import numpy
+import pytest
+
+from compas.datastructures import GeodesicSolver
+from compas.datastructures import Mesh
+from compas.datastructures import mesh_geodesic_distances_numpy
+from compas.datastructures import mesh_quads_to_triangles
+from compas.datastructures.mesh import geodesics_numpy
+
+
+@pytest.fixture
+def grid():
+    n = 21
+    vertices = [[0.1 * i, 0.1 * j, 0.0] for i in range(n) for j in range(n)]
+    faces = [[i * n + j, (i + 1) * n + j, (i + 1) * n + j + 1, i * n + j + 1] for i in range(n - 1) for j in range(n - 1)]
+    mesh = Mesh.from_vertices_and_faces(vertices, faces)
+    mesh_quads_to_triangles(mesh)
+    return mesh
+
+
+def euclidean(mesh, sources):
+    xyz = numpy.array(mesh.vertices_attributes('xyz'))
+    return numpy.linalg.norm(xyz[:, None, :] - xyz[sources][None, :, :], axis=2).min(axis=1)
+
+
+def test_geodesic_distances(grid):
+    d = mesh_geodesic_distances_numpy(grid, [220])
+    assert d.shape == (441,)
+    assert d[220] == 0.0
+    assert numpy.abs(d - euclidean(grid, [220])).max() < 0.1
+    assert mesh_geodesic_distances_numpy(grid, [0]).argmax() == 440
+
+
+def test_geodesic_solver(grid):
+    solver = GeodesicSolver(grid)
+    sources = [[0], [220], [0, 440], list(range(21))]
+    D = solver.distance_matrix(sources)
+    assert D.shape == (4, 441)
+    for row, keys in zip(D, sources):
+        assert numpy.allclose(row, solver.distances(keys))
+        assert numpy.allclose(row, mesh_geodesic_distances_numpy(grid, keys))
+        assert numpy.abs(row - euclidean(grid, keys)).max() < 0.1
+
+
+def test_geodesic_solver_chunks(grid, monkeypatch):
+    solver = GeodesicSolver(grid)
+    sources = [[key] for key in range(0, 441, 20)]
+    D = solver.distance_matrix(sources)
+    monkeypatch.setattr(geodesics_numpy, 'CHUNKSIZE', 3 * grid.number_of_faces())
+    assert numpy.allclose(solver.distance_matrix(sources), D)
+
+
+def test_geodesic_solver_triangles():
+    with pytest.raises(ValueError):
+        GeodesicSolver(Mesh.from_polyhedron(6))
@@ -0,0 +1,68 @@
+import random
+
+import pytest
+
+import compas
+from compas.datastructures import Mesh
+from compas.datastructures import mesh_quads_to_triangles
+from compas.datastructures import trimesh_remesh_queue
+
+
+@pytest.fixture
+def grid():
+    random.seed(0)
+    m = 12
+    vertices = [[i + 0.2 * random.random(), j + 0.2 * random.random(), 0.0] for i in range(m) for j in range(m)]
+    faces = [[i * m + j, (i + 1) * m + j, (i + 1) * m + j + 1, i * m + j + 1] for i in range(m - 1) for j in range(m - 1)]
+    mesh = Mesh.from_vertices_and_faces(vertices, faces)
+    mesh_quads_to_triangles(mesh)
+    return mesh
+
+
+def within(mesh, target, tol=0.1):
+    edges = [(u, v) for u, v in mesh.edges() if not mesh.is_edge_on_boundary(u, v)]
+    lengths = mesh.edges_lengths(edges)
+    lmin = (1 - tol) * (4.0 / 5.0) * target
+    lmax = (1 + tol) * (4.0 / 3.0) * target
+    return sum(1 for length in lengths if lmin <= length <= lmax) / float(len(lengths))
+
+
+@pytest.mark.parametrize('target', [0.5, 2.0])
+def test_remesh_queue(grid, target):
+    boundary = {key: grid.vertex_coordinates(key) for key in grid.vertices_on_boundary()}
+    fixed = [50, 51]
+    xyz = {key: grid.vertex_coordinates(key) for key in fixed}
+    calls = []
+    stats = trimesh_remesh_queue(grid, target, fixed=fixed, callback=lambda mesh, k, args: calls.append(k))
+    assert calls == list(range(stats['iterations']))
+    assert stats['split'] + stats['collapse'] > 0
+    assert sorted(stats['timing']) == ['collapse', 'smooth', 'split', 'swap']
+    assert grid.is_valid()
+    assert grid.is_trimesh()
+    assert within(grid, target) > 0.9
+    assert all(grid.vertex_coordinates(key) == xyz[key] for key in fixed)
+    assert all(grid.vertex_coordinates(key) == boundary[key] for key in grid.vertices_on_boundary() if key in boundary)
+
+
+def test_remesh_queue_boundary(grid):
+    boundary = set(grid.vertices_on_boundary())
+    trimesh_remesh_queue(grid, 0.5, allow_boundary_split=True)
+    assert set(grid.vertices_on_boundary()) > boundary
+    assert grid.is_valid()
+
+
+def test_remesh_queue_python(grid, monkeypatch):
+    monkeypatch.setattr(compas, 'IPY', True)
+    trimesh_remesh_queue(grid, 0.5)
+    assert grid.is_valid()
+    assert within(grid, 0.5) > 0.9
+
+
+def test_remesh_queue_stalled(grid):
+    # the boundary edges cannot be split, and the triangles along the boundary cannot reach the target length
+    stats = trimesh_remesh_queue(grid, 0.3, kmax=50)
+    assert stats['iterations'] < 20
+    assert stats['short'] > 0
+    assert stats['long'] > 0
+    assert grid.is_valid()
+    assert within(grid, 0.3) > 0.9
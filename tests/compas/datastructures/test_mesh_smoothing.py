@@ -0,0 +1,86 @@
+import random
+
+import pytest
+
+from compas.datastructures import Mesh
+from compas.datastructures import mesh_smooth_area
+from compas.datastructures import mesh_smooth_area_numpy
+from compas.datastructures import mesh_smooth_centerofmass
+from compas.datastructures import mesh_smooth_centerofmass_numpy
+from compas.datastructures import mesh_smooth_centroid
+from compas.datastructures import mesh_smooth_centroid_numpy
+from compas.datastructures.mesh import smoothing
+from compas.geometry import centroid_points
+
+
+def grid(m):
+    random.seed(0)
+    vertices = [[i + 0.3 * random.random(), j + 0.3 * random.random(), random.random()] for i in range(m) for j in range(m)]
+    faces = [[i * m + j, (i + 1) * m + j, (i + 1) * m + j + 1, i * m + j + 1] for i in range(m - 1) for j in range(m - 1)]
+    return Mesh.from_vertices_and_faces(vertices, faces)
+
+
+@pytest.mark.parametrize('smooth, smooth_numpy', [
+    (mesh_smooth_centroid, mesh_smooth_centroid_numpy),
+    (mesh_smooth_centerofmass, mesh_smooth_centerofmass_numpy),
+    (mesh_smooth_area, mesh_smooth_area_numpy),
+])
+def test_smooth(smooth, smooth_numpy, monkeypatch):
+    monkeypatch.setattr(smoothing, '_use_numpy', lambda mesh: False)
+    mesh = grid(8)
+    fixed = list(mesh.vertices_where({'vertex_degree': 2}))
+    xyz = {key: mesh.vertex_coordinates(key) for key in fixed}
+    calls = []
+
+    def callback(k, args):
+        calls.append((k, args, mesh.vertex_coordinates(10)))
+
+    smooth(mesh, fixed=fixed, kmax=5, callback=callback, callback_args='a')
+    assert [k for k, _, _ in calls] == list(range(5))
+    assert all(args == 'a' for _, args, _ in calls)
+    assert calls[0][2] != calls[1][2]
+    assert all(mesh.vertex_coordinates(key) == xyz[key] for key in fixed)
+    other = grid(8)
+    smooth_numpy(other, fixed=fixed, kmax=5)
+    for key in mesh.vertices():
+        assert other.vertex_coordinates(key) == pytest.approx(mesh.vertex_coordinates(key))
+    with pytest.raises(Exception):
+        smooth(mesh, callback=1)
+
+
+@pytest.mark.parametrize('smooth', [
+    mesh_smooth_centroid,
+    mesh_smooth_centroid_numpy,
+    mesh_smooth_area,
+    mesh_smooth_area_numpy,
+])
+def test_smooth_callback_modifies_vertices(smooth):
+    mesh = grid(4)
+    fixed = [0, 3, 12, 15]
+    for key in mesh.vertices():
+        mesh.vertex_attribute(key, 'z', 0.0 if key in fixed else 1.0)
+    z = []
+
+    def callback(k, args):
+        z.append(mesh.vertex_attribute(5, 'z'))
+        for key in mesh.vertices():
+            if key not in fixed:
+                mesh.vertex_attribute(key, 'z', 1.0)
+
+    smooth(mesh, fixed=fixed, kmax=4, callback=callback)
+    assert all(value > z[0] - 1e-9 for value in z[1:])
+
+
+def test_smooth_centroid():
+    mesh = grid(4)
+    expected = grid(4)
+    fixed = [0, 3, 12, 15]
+    mesh_smooth_centroid(mesh, fixed=fixed, kmax=2, damping=0.3)
+    for _ in range(2):
+        xyz = {key: expected.vertex_coordinates(key) for key in expected.vertices()}
+        for key in expected.vertices():
+            if key not in fixed:
+                c = centroid_points([xyz[nbr] for nbr in expected.vertex_neighbors(key)])
+                expected.vertex_attributes(key, 'xyz', [a + 0.3 * (b - a) for a, b in zip(xyz[key], c)])
+    for key in mesh.vertices():
+        assert mesh.vertex_coordinates(key) == pytest.approx(expected.vertex_coordinates(key))
@@ -0,0 +1,106 @@
+import pytest
+
+from compas.datastructures import Mesh
+from compas.datastructures import SubdivisionMatrix
+from compas.datastructures import mesh_subdivide_catmullclark
+from compas.datastructures import mesh_subdivide_doosabin
+from compas.datastructures import mesh_subdivision_matrix
+from compas.datastructures import subdivision_matrix_numpy
+from compas.datastructures import trimesh_subdivide_loop
+
+
+@pytest.fixture
+def grid():
+    vertices = [[i, j, (i * j) % 3] for i in range(4) for j in range(4)]
+    faces = [[i * 4 + j, (i + 1) * 4 + j, (i + 1) * 4 + j + 1, i * 4 + j + 1] for i in range(3) for j in range(3)]
+    return Mesh.from_vertices_and_faces(vertices, faces)
+
+
+class CustomMesh(Mesh):
+
+    def __init__(self):
+        super(CustomMesh, self).__init__()
+        self.attributes['name'] = 'Custom'
+
+
+def test_catmullclark_quad():
+    mesh = Mesh.from_vertices_and_faces([[0, 0, 0], [2, 0, 0], [2, 2, 0], [0, 2, 0]], [[0, 1, 2, 3]])
+    subd = mesh_subdivide_catmullclark(mesh, fixed=[0])
+    assert subd.number_of_vertices() == 9
+    assert subd.number_of_faces() == 4
+    assert subd.vertex_coordinates(0) == [0.0, 0.0, 0.0]
+    assert subd.vertex_coordinates(2) == pytest.approx([1.75, 1.75, 0.0])
+    assert sorted(subd.vertex_degree(key) for key in subd.vertices()) == [2, 2, 2, 2, 3, 3, 3, 3, 4]
+
+
+def test_catmullclark_cube():
+    mesh = Mesh.from_polyhedron(6)
+    subd = mesh_subdivide_catmullclark(mesh, k=2)
+    assert subd.number_of_faces() == 96
+    assert not subd.vertices_on_boundary()
+    radii = [sum(x ** 2 for x in subd.vertex_coordinates(key)) ** 0.5 for key in mesh.vertices()]
+    assert max(radii) - min(radii) == pytest.approx(0.0)
+
+
+def test_doosabin_cube():
+    mesh = Mesh.from_polyhedron(6)
+    subd = mesh_subdivide_doosabin(mesh)
+    assert subd.number_of_vertices() == 24
+    assert subd.number_of_faces() == 6 + 8 + 12
+    assert not subd.vertices_on_boundary()
+
+
+def test_loop(grid):
+    with pytest.raises(ValueError):
+        trimesh_subdivide_loop(grid)
+    mesh = Mesh.from_polyhedron(20)
+    subd = trimesh_subdivide_loop(mesh, k=2, fixed=[0])
+    assert subd.number_of_faces() == 20 * 16
+    assert subd.vertex_coordinates(0) == mesh.vertex_coordinates(0)
+
+
+def test_subdivide_attributes(grid):
+    grid.attributes['name'] = 'grid'
+    grid.update_default_vertex_attributes(is_anchor=False)
+    grid.vertex_attribute(5, 'is_anchor', True)
+    subd = mesh_subdivide_catmullclark(grid)
+    assert subd.name == 'grid'
+    assert subd.vertex_attribute(5, 'is_anchor')
+    assert not subd.vertex_attribute(6, 'is_anchor')
+    assert min(key for key in subd.vertices() if key not in grid.vertex) == 16
+
+
+@pytest.mark.parametrize('storage', ['dict', 'compact'])
+def test_subdivide_subclass(storage):
+    mesh = CustomMesh.from_vertices_and_faces([[0, 0, 0], [2, 0, 0], [2, 2, 0], [0, 2, 0]], [[0, 1, 2, 3]], storage=storage)
+    mesh.delete_vertex(mesh.add_vertex())
+    subd = mesh_subdivide_catmullclark(mesh)
+    assert type(subd) is CustomMesh
+    assert subd.storage == storage
+    assert min(key for key in subd.vertices() if key not in mesh.vertex) == 5
+
+
+def test_subdivision_matrix_cache(grid):
+    matrix = mesh_subdivision_matrix(grid, 'catmullclark', k=2)
+    subd = matrix.subdivide(grid)
+    grid.vertex_attribute(5, 'z', 10.0)
+    assert mesh_subdivision_matrix(grid, 'catmullclark', k=2) is matrix
+    assert mesh_subdivision_matrix(grid, 'catmullclark', k=2, fixed=[0]) is not matrix
+    moved = mesh_subdivide_catmullclark(grid, k=2)
+    assert moved.vertex_coordinates(5) != subd.vertex_coordinates(5)
+    assert moved.vertex_coordinates(5) == pytest.approx(matrix.apply(grid.vertices_attributes('xyz'))[5])
+    grid.delete_face(0)
+    assert mesh_subdivision_matrix(grid, 'catmullclark', k=2) is not matrix
+
+
+@pytest.mark.parametrize('scheme', ['catmullclark', 'doosabin'])
+def test_subdivision_matrix_numpy(grid, scheme, monkeypatch):
+    matrix = SubdivisionMatrix(grid, scheme, k=3)
+    points = grid.vertices_attributes('xyz')
+    expected = matrix.apply(points)
+    S = subdivision_matrix_numpy(matrix)
+    assert S.shape == (len(expected), grid.number_of_vertices())
+    assert S.sum(axis=1) == pytest.approx(1.0)
+    assert S.dot(points).ravel().tolist() == pytest.approx([x for point in expected for x in point])
+    monkeypatch.setattr(SubdivisionMatrix, 'numpy_threshold', 0)
+    assert [x for point in matrix.apply(points) for x in point] == pytest.approx([x for point in expected for x in point])
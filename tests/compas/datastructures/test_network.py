@@ -1,7 +1,14 @@
+import random
+from itertools import combinations
+
 import pytest
 
 import compas
 from compas.datastructures import Network
+from compas.datastructures import network_count_crossings
+from compas.datastructures import network_find_crossings
+from compas.datastructures import network_is_crossed
+from compas.geometry import is_intersection_segment_segment_xy
 
 
 @pytest.fixture
@@ -48,3 +55,34 @@ def test_planar(k5_network):
 
     k5_network.delete_edge('a', 'b')  # Delete (a, b) edge to make K5 planar
     assert network_is_planar(k5_network) is True
+
+
+def test_find_crossings():
+    random.seed(0)
+    network = Network()
+    for key in range(40):
+        network.add_node(key, x=random.randint(0, 10), y=random.randint(0, 10), z=0)
+    for _ in range(80):
+        u, v = random.sample(range(40), 2)
+        if not network.has_edge(u, v) and not network.has_edge(v, u):
+            network.add_edge(u, v)
+    # a long edge, tested against all other edges
+    network.add_node('a', x=-5, y=-5, z=0)
+    network.add_node('b', x=15, y=15, z=0)
+    network.add_edge('a', 'b')
+
+    expected = []
+    for (u1, v1), (u2, v2) in combinations(network.edges(), 2):
+        if len(set((u1, v1, u2, v2))) < 4:
+            continue
+        segment1 = network.node_attributes(u1, 'xy'), network.node_attributes(v1, 'xy')
+        segment2 = network.node_attributes(u2, 'xy'), network.node_attributes(v2, 'xy')
+        if is_intersection_segment_segment_xy(segment1, segment2):
+            expected.append(((u1, v1), (u2, v2)))
+    assert network_find_crossings(network) == expected
+    assert network_count_crossings(network) == len(expected)
+    assert network_is_crossed(network)
+
+    network = Network.from_lines([([0, 0, 0], [1, 0, 0]), ([1, 0, 0], [1, 1, 0]), ([2, 0, 0], [3, 0, 0])])
+    assert network_find_crossings(network) == []
+    assert not network_is_crossed(network)
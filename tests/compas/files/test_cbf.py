@@ -0,0 +1,99 @@
+import pytest
+
+import compas
+from compas.datastructures import Mesh
+from compas.datastructures import Network
+from compas.datastructures import VolMesh
+from compas.files import CBF
+from compas.files import CBFReader
+
+
+@pytest.fixture
+def mesh():
+    mesh = Mesh.from_obj(compas.get('faces.obj'))
+    mesh.update_default_vertex_attributes(is_fixed=False, label=None)
+    mesh.update_default_face_attributes(weight=1.0)
+    mesh.vertex_attribute(0, 'is_fixed', True)
+    mesh.vertex_attribute(1, 'label', 'corner')
+    mesh.vertex_attribute(2, 'load', [0.0, 0.0, -1.0])
+    mesh.vertex_attribute(3, 'id', 2 ** 40)
+    mesh.face_attribute(0, 'weight', 2.5)
+    mesh.edge_attribute((0, 1), 'q', 3)
+    mesh.delete_vertex(35)
+    mesh.delete_face(mesh.get_any_face())
+    return mesh
+
+
+@pytest.mark.parametrize("storage", ['dict', 'compact'])
+def test_mesh_binary(mesh, storage, tmp_path):
+    data = mesh.data
+    mesh = Mesh(storage=storage)
+    mesh.data = data
+    filepath = str(tmp_path / 'mesh.cbf')
+    mesh.to_binary(filepath)
+    assert CBF(filepath).reader.data == mesh.data
+    other = Mesh.from_binary(filepath)
+    assert other.data == mesh.data
+    assert other._max_int_key == mesh._max_int_key
+    assert other._max_int_fkey == mesh._max_int_fkey
+
+
+def test_mesh_binary_mmap(mesh, tmp_path):
+    filepath = str(tmp_path / 'mesh.cbf')
+    mesh.to_binary(filepath)
+    assert Mesh.from_binary(filepath, mmap=True).data == mesh.data
+    reader = CBFReader(filepath, mmap=True)
+    reader.open()
+    reader.pre()
+    assert list(reader.column('vertex', 'x')) == [mesh.vertex[key]['x'] for key in mesh.vertex]
+    assert list(reader.column('face')) == [key for fkey in mesh.face for key in mesh.face[fkey]]
+    reader.close()
+    assert reader.buffer is None
+
+
+def test_mmap_closed(mesh, tmp_path):
+    filepath = str(tmp_path / 'mesh.cbf')
+    mesh.to_binary(filepath)
+    cbf = CBF(filepath, mmap=True)
+    assert cbf.reader.data == mesh.data
+    assert cbf.reader.buffer is None
+
+
+def test_large_integer_strings(tmp_path):
+    values = [str(2 ** 70), '-1', '0']
+    filepath = str(tmp_path / 'data.cbf')
+    CBF(filepath).write({'values': {index: value for index, value in enumerate(values)}}, layout={'values': ('values', 1)})
+    assert [value for _, value in sorted(CBF(filepath).reader.data['values'].items())] == values
+
+
+def test_network_binary(tmp_path):
+    network = Network.from_obj(compas.get('lines.obj'))
+    network.edge_attribute(network.get_any_edge(), 'q', 2.0)
+    filepath = str(tmp_path / 'network.cbf')
+    network.to_binary(filepath)
+    assert CBF(filepath).reader.data == network.data
+    assert Network.from_binary(filepath).data == network.data
+
+
+def test_volmesh_binary(tmp_path):
+    volmesh = VolMesh.from_obj(compas.get('boxes.obj'))
+    filepath = str(tmp_path / 'volmesh.cbf')
+    volmesh.to_binary(filepath)
+    assert CBF(filepath).reader.data == volmesh.data
+    assert VolMesh.from_binary(filepath).data == volmesh.data
+
+
+def test_not_binary(tmp_path):
+    filepath = str(tmp_path / 'mesh.json')
+    Mesh.from_polyhedron(6).to_json(filepath)
+    with pytest.raises(ValueError):
+        Mesh.from_binary(filepath)
+
+
+def test_mixed_bool_int(tmp_path):
+    values = [True, 2, False]
+    filepath = str(tmp_path / 'data.cbf')
+    CBF(filepath).write({'values': dict(enumerate(values))}, layout={'values': ('values', 1)})
+    data = CBF(filepath).reader.data['values']
+    assert [data[index] for index in range(3)] == values
+    assert [type(data[index]) for index in range(3)] == [bool, int, bool]
@@ -0,0 +1,75 @@
+import random
+
+import pytest
+
+from compas.geometry import closest_line_to_point
+from compas.geometry import closest_line_to_point_numpy
+from compas.geometry import closest_point_on_plane
+from compas.geometry import closest_point_on_plane_numpy
+from compas.geometry import closest_point_on_polyline
+from compas.geometry import closest_point_on_polyline_numpy
+from compas.geometry import closest_point_on_segment
+from compas.geometry import closest_point_on_segment_numpy
+from compas.geometry import distance_point_line
+from compas.geometry import distance_point_line_numpy
+from compas.geometry import distance_point_plane
+from compas.geometry import distance_point_plane_numpy
+from compas.geometry import normalize_vector
+from compas.geometry._core import distance_numpy
+
+
+def random_points(n):
+    return [[random.random(), random.random(), random.random()] for _ in range(n)]
+
+
+def flatten(values):
+    return [x for value in values for x in value]
+
+
+def test_distance_point_line_numpy():
+    random.seed(0)
+    points = random_points(20)
+    lines = [random_points(2) for _ in range(10)]
+    matrix = distance_point_line_numpy([[point] for point in points], lines)
+    assert matrix.shape == (20, 10)
+    assert matrix.ravel().tolist() == pytest.approx([distance_point_line(point, line) for point in points for line in lines])
+    pairwise = distance_point_line_numpy(points[:10], lines)
+    assert pairwise.tolist() == pytest.approx([distance_point_line(point, line) for point, line in zip(points, lines)])
+    # degenerate lines
+    assert distance_point_line_numpy([1.0, 1.0, 0.0], [[0.0, 0.0, 0.0], [0.0, 0.0, 0.0]]) == pytest.approx(2 ** 0.5)
+
+
+def test_distance_point_plane_numpy():
+    random.seed(1)
+    points = random_points(20)
+    planes = [(base, normalize_vector(normal)) for base, normal in (random_points(2) for _ in range(20))]
+    assert distance_point_plane_numpy(points, planes).tolist() == pytest.approx([distance_point_plane(point, plane) for point, plane in zip(points, planes)])
+    closest = closest_point_on_plane_numpy(points, planes)
+    assert flatten(closest.tolist()) == pytest.approx(flatten(closest_point_on_plane(point, plane) for point, plane in zip(points, planes)))
+
+
+def test_closest_point_on_segment_numpy():
+    random.seed(2)
+    points = random_points(50)
+    segments = [random_points(2) for _ in range(50)]
+    closest = closest_point_on_segment_numpy(points, segments)
+    assert flatten(closest.tolist()) == pytest.approx(flatten(closest_point_on_segment(point, segment) for point, segment in zip(points, segments)))
+
+
+def test_closest_point_on_polyline_numpy(monkeypatch):
+    random.seed(3)
+    points = random_points(100)
+    polyline = random_points(30)
+    expected = flatten(closest_point_on_polyline(point, polyline) for point in points)
+    assert flatten(closest_point_on_polyline_numpy(points, polyline).tolist()) == pytest.approx(expected)
+    # a chunk of fewer points than the number of segments
+    monkeypatch.setattr(distance_numpy, 'CHUNKSIZE', 10)
+    assert flatten(closest_point_on_polyline_numpy(points, polyline).tolist()) == pytest.approx(expected)
+
+
+def test_closest_line_to_point_numpy():
+    random.seed(4)
+    points = random_points(100)
+    lines = [random_points(2) for _ in range(30)]
+    expected = [lines.index(closest_line_to_point(point, lines)) for point in points]
+    assert closest_line_to_point_numpy(points, lines).tolist() == expected
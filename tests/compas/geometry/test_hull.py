@@ -0,0 +1,70 @@
+import math
+import random
+
+from compas.geometry import convex_hull
+from compas.geometry import convex_hull_numpy
+from compas.geometry import convex_hull_xy
+from compas.geometry import cross_vectors
+from compas.geometry import dot_vectors
+from compas.geometry import subtract_vectors
+from compas.geometry.hull.hull import _quickhull
+from compas.geometry.hull.hull import _hull_tolerance
+
+
+def assert_hull(points, faces):
+    # every halfedge has an opposite halfedge, and all points are below all faces
+    halfedges = set()
+    for face in faces:
+        for u, v in zip(face, face[1:] + face[:1]):
+            assert (u, v) not in halfedges
+            halfedges.add((u, v))
+    assert all((v, u) in halfedges for u, v in halfedges)
+    for a, b, c in faces:
+        normal = cross_vectors(subtract_vectors(points[b], points[a]), subtract_vectors(points[c], points[a]))
+        for point in points:
+            assert dot_vectors(normal, subtract_vectors(point, points[a])) < 1e-9
+
+
+def test_convex_hull():
+    random.seed(0)
+    points = [[random.random(), random.random(), random.random()] for _ in range(2000)]
+    faces = convex_hull(points)
+    assert_hull(points, faces)
+    vertices, simplices = convex_hull_numpy(points)
+    assert set(index for face in faces for index in face) == set(vertices.tolist())
+    assert len(faces) == len(simplices)
+    # the pure python path, without discarding interior points with numpy
+    assert sorted(map(sorted, _quickhull(points, range(len(points)), _hull_tolerance(points)))) == sorted(map(sorted, faces))
+
+
+def test_convex_hull_sphere():
+    random.seed(1)
+    points = []
+    for _ in range(500):
+        vector = [random.gauss(0, 1) for _ in range(3)]
+        length = math.sqrt(sum(x ** 2 for x in vector))
+        points.append([x / length for x in vector])
+    faces = convex_hull(points)
+    assert_hull(points, faces)
+    assert len(faces) == 2 * len(points) - 4
+
+
+def test_convex_hull_degenerate():
+    grid = [[x, y, z] for x in range(4) for y in range(4) for z in range(4)]
+    faces = convex_hull(grid * 2)
+    assert_hull(grid * 2, faces)
+    assert set(tuple(grid[index % len(grid)]) for face in faces for index in face) >= set((x, y, z) for x in (0, 3) for y in (0, 3) for z in (0, 3))
+    flat = [[x, y, 0] for x in range(4) for y in range(4)]
+    faces = convex_hull(flat)
+    assert_hull(flat, faces)
+    assert len(faces) == 4
+    assert convex_hull([[0, 0, 0], [1, 0, 0], [0, 1, 0]]) == [[0, 1, 2], [1, 0, 2]]
+    assert convex_hull([[0, 0, 0], [1, 1, 1], [2, 2, 2]]) == []
+    assert convex_hull([]) == []
+
+
+def test_convex_hull_xy():
+    points = [[0, 0, 0], [1, 0, 0], [2, 0, 0], [2, 2, 0], [1, 1, 0], [0, 2, 0], [0, 0, 0]]
+    assert convex_hull_xy(points) == [(0, 0, 0), (2, 0, 0), (2, 2, 0), (0, 2, 0)]
+    assert convex_hull_xy(points, strict=True) == [(0, 0, 0), (1, 0, 0), (2, 0, 0), (2, 2, 0), (0, 2, 0)]
+    assert convex_hull_xy([[1, 1, 0], [1, 1, 0]]) == [(1, 1, 0)]
@@ -0,0 +1,98 @@
+import random
+
+import pytest
+
+from compas.geometry import intersection_line_triangle
+from compas.geometry import intersection_line_triangle_numpy
+from compas.geometry import intersection_segment_plane
+from compas.geometry import intersection_segment_plane_numpy
+from compas.geometry import intersection_segment_segment_xy
+from compas.geometry import intersection_segment_segment_xy_numpy
+from compas.geometry import intersection_segment_triangle_numpy
+from compas.geometry import intersection_segments_triangles_numpy
+from compas.geometry import overlapping_boxes_numpy
+from compas.geometry._intersections import intersections_numpy
+
+
+def random_points(n, scale=1.0):
+    return [[scale * random.random(), scale * random.random(), scale * random.random()] for _ in range(n)]
+
+
+def test_intersection_line_triangle_numpy():
+    random.seed(0)
+    lines = [random_points(2) for _ in range(200)]
+    triangles = [random_points(3) for _ in range(200)]
+    hits, t = intersection_line_triangle_numpy(lines, triangles)
+    for line, triangle, hit, param in zip(lines, triangles, hits, t):
+        x = intersection_line_triangle(line, triangle)
+        assert hit == (x is not None)
+        if hit:
+            a, b = line
+            assert [a[i] + param * (b[i] - a[i]) for i in range(3)] == pytest.approx(x)
+    assert hits.sum() > 10
+
+
+def test_intersection_segment_plane_numpy():
+    random.seed(1)
+    segments = [random_points(2) for _ in range(200)]
+    planes = [random_points(2) for _ in range(200)]
+    hits, t = intersection_segment_plane_numpy(segments, planes)
+    for segment, plane, hit, param in zip(segments, planes, hits, t):
+        x = intersection_segment_plane(segment, plane)
+        assert hit == (x is not None)
+        if hit:
+            a, b = segment
+            assert [a[i] + param * (b[i] - a[i]) for i in range(3)] == pytest.approx(x)
+
+
+def test_intersection_segment_segment_xy_numpy():
+    random.seed(2)
+    segments1 = [random_points(2) for _ in range(200)]
+    segments2 = [random_points(2) for _ in range(200)]
+    hits, t, s = intersection_segment_segment_xy_numpy(segments1, segments2)
+    for ab, cd, hit, param in zip(segments1, segments2, hits, t):
+        x = intersection_segment_segment_xy(ab, cd)
+        assert hit == (x is not None)
+        if hit:
+            a, b = ab
+            assert [a[i] + param * (b[i] - a[i]) for i in range(2)] == pytest.approx(x[:2])
+    # all pairs, by broadcasting
+    hits, t, s = intersection_segment_segment_xy_numpy([[segment] for segment in segments1[:10]], segments2)
+    assert hits.shape == (10, 200)
+
+
+def test_overlapping_boxes_numpy(monkeypatch):
+    random.seed(3)
+    boxes1 = []
+    boxes2 = []
+    for boxes, count in ((boxes1, 300), (boxes2, 200)):
+        for _ in range(count):
+            lo = random_points(1, 10.0)[0]
+            boxes.append([lo, [x + random.random() * 2.0 for x in lo]])
+    # a large box, and a box touching another box
+    boxes1.append([[0.0, 0.0, 0.0], [10.0, 10.0, 0.5]])
+    boxes2.append([boxes1[0][1], [20.0, 20.0, 20.0]])
+    expected = [(i, j) for i, (lo1, hi1) in enumerate(boxes1) for j, (lo2, hi2) in enumerate(boxes2)
+                if all(lo1[k] <= hi2[k] and lo2[k] <= hi1[k] for k in range(3))]
+    i, j = overlapping_boxes_numpy(boxes1, boxes2)
+    assert list(zip(i.tolist(), j.tolist())) == expected
+    monkeypatch.setattr(intersections_numpy, 'CHUNKSIZE', 7)
+    i, j = overlapping_boxes_numpy(boxes1, boxes2)
+    assert list(zip(i.tolist(), j.tolist())) == expected
+    i, j = overlapping_boxes_numpy([], boxes2)
+    assert len(i) == len(j) == 0
+
+
+def test_intersection_segments_triangles_numpy():
+    random.seed(4)
+    segments = []
+    for a in random_points(300, 10.0):
+        segments.append([a, [x + random.random() - 0.5 for x in a]])
+    triangles = []
+    for a in random_points(300, 10.0):
+        triangles.append([a, [x + random.random() for x in a], [x + random.random() for x in a]])
+    hits, t = intersection_segment_triangle_numpy([[segment] for segment in segments], triangles)
+    i, j, params = intersection_segments_triangles_numpy(segments, triangles)
+    assert list(zip(i.tolist(), j.tolist())) == [tuple(pair) for pair in zip(*hits.nonzero())]
+    assert params.tolist() == t[hits].tolist()
+    assert len(i) > 0
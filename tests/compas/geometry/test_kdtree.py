@@ -0,0 +1,69 @@
+import pickle
+import random
+
+import pytest
+
+from compas.geometry import KDTree
+from compas.geometry import distance_point_point
+
+
+@pytest.fixture
+def cloud():
+    random.seed(0)
+    points = [[random.random(), random.random(), 0.0] for _ in range(500)]
+    return points + points[:20]
+
+
+@pytest.mark.parametrize('threshold', [1, 10 ** 9])
+def test_query(cloud, threshold, monkeypatch):
+    monkeypatch.setattr(KDTree, 'numpy_threshold', threshold)
+    tree = KDTree(cloud)
+    points = [[random.random(), random.random(), random.random()] for _ in range(200)]
+    distances, labels = tree.query(points, k=4)
+    for point, d, nbrs in zip(points, distances, labels):
+        expected = sorted(distance_point_point(point, xyz) for xyz in cloud)[:4]
+        assert d == pytest.approx(expected)
+        assert [distance_point_point(point, cloud[i]) for i in nbrs] == pytest.approx(expected)
+
+
+@pytest.mark.parametrize('threshold', [1, 10 ** 9])
+def test_query_radius(cloud, threshold, monkeypatch):
+    monkeypatch.setattr(KDTree, 'numpy_threshold', threshold)
+    tree = KDTree(cloud)
+    points = cloud[:100]
+    distances, labels = tree.query_radius(points, 0.1)
+    for point, d, nbrs in zip(points, distances, labels):
+        expected = [i for i, xyz in enumerate(cloud) if distance_point_point(point, xyz) <= 0.1]
+        assert sorted(nbrs) == expected
+        assert d == sorted(d)
+
+
+def test_nearest_neighbors(cloud):
+    tree = KDTree(cloud)
+    point = [0.5, 0.5, 0.0]
+    xyz, label, distance = tree.nearest_neighbor(point, exclude={tree.nearest_neighbor(point)[1]})
+    nnbrs = tree.nearest_neighbors(point, 2, distance_sort=True)
+    assert label == nnbrs[1][1]
+    assert distance == pytest.approx(nnbrs[1][2])
+
+
+def test_nearest_neighbors_order(cloud):
+    tree = KDTree(cloud)
+    point = [0.3, 0.7, 0.0]
+    nnbrs = tree.nearest_neighbors(point, 10)
+    expected = sorted(distance_point_point(point, xyz) for xyz in cloud)[:10]
+    assert [distance for _, _, distance in nnbrs] == pytest.approx(expected)
+    assert nnbrs == tree.nearest_neighbors(point, 10, distance_sort=True)
+
+
+def test_nearest_neighbors_padding():
+    tree = KDTree([[0.0, 0.0, 0.0], [1.0, 0.0, 0.0]])
+    nnbrs = tree.nearest_neighbors([0.9, 0.0, 0.0], 4)
+    assert [label for _, label, _ in nnbrs] == [1, 0, None, None]
+    assert nnbrs[2:] == [[None, None, float('inf')]] * 2
+
+
+def test_pickle(cloud):
+    tree = KDTree(cloud)
+    other = pickle.loads(pickle.dumps(tree))
+    assert other.query(cloud[:10], k=3) == tree.query(cloud[:10], k=3)
@@ -0,0 +1,52 @@
+import math
+import random
+
+import pytest
+
+from compas.geometry import PolygonIndex
+from compas.geometry import is_point_in_polygon_xy
+
+
+@pytest.fixture
+def polygon():
+    random.seed(0)
+    points = []
+    for i in range(200):
+        a = 2 * math.pi * i / 200
+        r = 1.0 + 0.5 * math.sin(5 * a) + 0.1 * random.random()
+        points.append([r * math.cos(a), r * math.sin(a), 0.0])
+    return points
+
+
+@pytest.mark.parametrize('threshold', [1, 10 ** 9])
+def test_classify(polygon, threshold, monkeypatch):
+    monkeypatch.setattr(PolygonIndex, 'numpy_threshold', threshold)
+    hole = [[0.1 * math.cos(a), 0.1 * math.sin(a), 0.0] for a in (0, 2, 4)]
+    index = PolygonIndex(polygon, holes=[hole])
+    points = [[random.uniform(-2, 2), random.uniform(-2, 2), 0.0] for _ in range(2000)]
+    codes = index.classify(points)
+    for point, code in zip(points, codes):
+        expected = is_point_in_polygon_xy(point, polygon) and not is_point_in_polygon_xy(point, hole)
+        assert code == (index.INSIDE if expected else index.OUTSIDE)
+    # the vertices and the midpoints of the edges are on the boundary
+    points = polygon + [[0.5 * (a[0] + b[0]), 0.5 * (a[1] + b[1]), 0.0] for a, b in zip(polygon, polygon[1:])]
+    assert index.classify(points) == [index.BOUNDARY] * len(points)
+
+
+@pytest.mark.parametrize('threshold', [1, 10 ** 9])
+def test_classify_exact(threshold, monkeypatch):
+    monkeypatch.setattr(PolygonIndex, 'numpy_threshold', threshold)
+    index = PolygonIndex([[0, 0], [4, 0], [4, 4], [2, 2], [0, 4]], tol=0.0)
+    points = [[0.5 * x, 0.5 * y] for x in range(-1, 10) for y in range(-1, 10)]
+    expected = []
+    for x, y in points:
+        if x < 0 or x > 4 or y < 0 or y > 4 or (y > 2 and abs(x - 2) < y - 2):
+            expected.append(index.OUTSIDE)
+        elif x in (0, 4) or y == 0 or (y >= 2 and abs(x - 2) == y - 2):
+            expected.append(index.BOUNDARY)
+        else:
+            expected.append(index.INSIDE)
+    assert index.classify(points) == expected
+    assert index.classify_point([2.0, 2.0 + 1e-15]) == index.OUTSIDE
+    assert index.classify_point([2.0, 2.0 - 1e-15]) == index.INSIDE
+    assert PolygonIndex([]).classify([[0, 0]] * 200) == [index.OUTSIDE] * 200
@@ -1,8 +1,50 @@
 from compas.geometry import Line
 from compas.geometry import Point
+from compas.geometry import incircle_xy
+from compas.geometry import is_ccw_xy
+from compas.geometry import is_colinear_xy
 from compas.geometry import is_line_line_colinear
+from compas.geometry import orient_xy
 
 
 def test_is_line_line_colinear():
     assert is_line_line_colinear(Line(Point(0, 0, 0), Point(1, 1, 1)), Line(Point(3, 3, 3), Point(2, 2, 2))) is True
     assert is_line_line_colinear(Line(Point(0, 0, 0), Point(1, 1, 1)), Line(Point(4, 1, 0), Point(5, 2, 1))) is False
+
+
+def test_orient_xy():
+    assert orient_xy([0.0, 0.0], [1.0, 0.0], [0.0, 1.0]) == 1.0
+    assert orient_xy([0.0, 0.0], [0.0, 1.0], [1.0, 0.0]) == -1.0
+    # colinear points with inexact coordinates
+    assert orient_xy([0.1, 0.1], [0.2, 0.2], [0.3, 0.3]) == 0.0
+    # points that are nearly colinear, for which the floating point determinant has the wrong sign
+    a = [0.5, 0.5]
+    c = [24.0, 24.0]
+    signs = set()
+    for i in range(64):
+        for j in range(64):
+            b = [0.5 + i * 2 ** -53, 0.5 + j * 2 ** -53]
+            o = orient_xy(a, b, c)
+            assert (o > 0) - (o < 0) == (i > j) - (i < j)
+            signs.add((o > 0) - (o < 0))
+    assert signs == {-1, 0, 1}
+    assert is_ccw_xy([0.0, 0.0], [1e-300, 0.0], [0.0, 1e-300])
+    assert is_colinear_xy([0.1, 0.1], [0.2, 0.2], [0.3, 0.3])
+
+
+def test_orient_xy_large_integers():
+    # the coordinates of b cannot be represented as floating point numbers
+    assert orient_xy([0, 0], [2 ** 53 + 1, 2 ** 53], [1, 1]) > 0
+    assert orient_xy([0, 0], [2 ** 53, 2 ** 53 + 1], [1, 1]) < 0
+    assert orient_xy([0, 0], [2 ** 53 + 1, 2 ** 53 + 1], [1, 1]) == 0
+
+
+def test_incircle_xy():
+    a, b, c = [1.0, 0.0], [0.0, 1.0], [-1.0, 0.0]
+    assert incircle_xy(a, b, c, [0.0, 0.0]) > 0
+    assert incircle_xy(a, b, c, [0.0, 2.0]) < 0
+    assert incircle_xy(a, b, c, [0.0, -1.0]) == 0.0
+    assert incircle_xy(a, b, c, [0.0, -1.0 + 2 ** -53]) > 0
+    assert incircle_xy(a, b, c, [0.0, -1.0 - 2 ** -52]) < 0
+    # clockwise
+    assert incircle_xy(c, b, a, [0.0, 0.0]) < 0
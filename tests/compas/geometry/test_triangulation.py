@@ -0,0 +1,54 @@
+import random
+
+from compas.geometry import delaunay_from_points
+from compas.geometry import delaunay_from_points_numpy
+
+
+def area(points, faces):
+    total = 0
+    for a, b, c in faces:
+        (ax, ay, _), (bx, by, _), (cx, cy, _) = points[a], points[b], points[c]
+        total += 0.5 * ((bx - ax) * (cy - ay) - (by - ay) * (cx - ax))
+    return total
+
+
+def test_delaunay_from_points():
+    random.seed(0)
+    points = [[random.random(), random.random(), 0.0] for _ in range(1000)]
+    faces = delaunay_from_points(points)
+    expected = delaunay_from_points_numpy(points).tolist()
+    # slivers along the convex hull may be missing, due to the finite enclosing triangle
+    assert set(tuple(sorted(face)) for face in faces) <= set(tuple(sorted(face)) for face in expected)
+    assert len(expected) - len(faces) < 5
+    assert all(area(points, [face]) > 0 for face in faces)
+
+
+def test_delaunay_from_points_grid():
+    points = [[x, y, 0.0] for x in range(10) for y in range(10)]
+    assert len(delaunay_from_points(points)) == 2 * 9 * 9
+    # a perturbation of the points still gives a triangulation of the grid
+    faces = delaunay_from_points(points, tiny=1e-12)
+    assert len(faces) == 2 * 9 * 9
+    assert abs(area(points, faces) - 81) < 1e-6
+    assert all(area(points, [face]) > 0 for face in faces)
+    # inexact coordinates, and points on a line through the grid
+    points = [[0.1 * x, 0.1 * y, 0.0] for x in range(10) for y in range(10)]
+    faces = delaunay_from_points(points)
+    assert len(faces) == 2 * 9 * 9
+    assert abs(area(points, faces) - 0.81) < 1e-9
+    points += [[0.1 * x + 0.05, 0.1 * x + 0.05, 0.0] for x in range(9)]
+    faces = delaunay_from_points(points)
+    assert len(faces) == 2 * 9 * 9 + 2 * 9
+    assert all(area(points, [face]) > 0 for face in faces)
+
+
+def test_delaunay_from_points_boundary_holes():
+    points = [[x, y, 0.0] for x in range(11) for y in range(11)]
+    boundary = [[0, 0, 0], [10, 0, 0], [10, 4, 0], [3, 4, 0], [3, 10, 0], [0, 10, 0]]
+    hole = [[5, 1, 0], [8, 1, 0], [8, 3, 0], [5, 3, 0]]
+    faces = delaunay_from_points(points, boundary=boundary, holes=[hole])
+    assert abs(area(points, faces) - (58 - 6)) < 1e-6
+    # a boundary edge that is not an edge of the unconstrained triangulation
+    boundary = [[0, 0, 0], [10, 0, 0], [10, 10, 0], [0, 1, 0]]
+    faces = delaunay_from_points(points, boundary=boundary)
+    assert abs(area(points, faces) - 55) < 1e-6
@@ -0,0 +1,48 @@
+import random
+
+import pytest
+
+from compas.datastructures import Mesh
+from compas.datastructures import mesh_connected_components
+from compas.datastructures import mesh_is_connected
+from compas.topology import CSRAdjacency
+from compas.topology import adjacency_from_edges
+from compas.topology import connected_components
+from compas.topology import connected_components_from_edges
+from compas.topology import vertex_coloring
+
+
+@pytest.fixture
+def edges():
+    random.seed(0)
+    return [(random.randint(0, 199), random.randint(0, 199)) for _ in range(150)]
+
+
+def test_connected_components(edges):
+    adjacency = adjacency_from_edges(edges)
+    expected = sorted(sorted(component) for component in connected_components(adjacency))
+    csr = CSRAdjacency.from_adjacency(adjacency)
+    components = [sorted(csr.keys[i] for i in component) for component in connected_components(csr)]
+    assert sorted(components) == expected
+    components = connected_components_from_edges(edges)
+    assert sorted(component for component in components if len(component) > 1 or component[0] in adjacency) == expected
+    assert sum(len(component) for component in components) == max(max(edge) for edge in edges) + 1
+
+
+def test_vertex_coloring(edges):
+    adjacency = adjacency_from_edges(edges)
+    for graph in (adjacency, CSRAdjacency.from_adjacency(adjacency)):
+        color = vertex_coloring(graph)
+        assert len(color) == len(adjacency)
+        assert all(color[u] != color[v] for u in graph for v in graph[u] if u != v)
+
+
+def test_mesh_connected_components():
+    vertices = [[0, 0, 0], [1, 0, 0], [1, 1, 0], [0, 1, 0], [5, 0, 0], [6, 0, 0], [6, 1, 0]]
+    mesh = Mesh.from_vertices_and_faces(vertices, [[0, 1, 2, 3], [4, 5, 6]])
+    assert not mesh_is_connected(mesh)
+    assert sorted(sorted(component) for component in mesh_connected_components(mesh)) == [[0, 1, 2, 3], [4, 5, 6]]
+    mesh.delete_face(1)
+    for key in (4, 5, 6):
+        mesh.delete_vertex(key)
+    assert mesh_is_connected(mesh)
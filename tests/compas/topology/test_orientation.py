@@ -0,0 +1,48 @@
+import random
+
+import pytest
+
+from compas.datastructures import Mesh
+from compas.datastructures import mesh_unify_cycles
+from compas.topology import face_adjacency
+from compas.topology import face_adjacency_numpy
+from compas.topology import unify_cycles
+
+
+@pytest.fixture
+def faces():
+    # a strip of long, thin triangles, of which the nearest centroids are not the neighbours
+    n = 100
+    faces = []
+    for i in range(n - 1):
+        faces += [[i, i + 1, n + i + 1], [i, n + i + 1, n + i]]
+    return faces
+
+
+def test_face_adjacency(faces):
+    expected = {}
+    for face, cycle in enumerate(faces):
+        expected[face] = sorted(nbr for nbr, other in enumerate(faces) if nbr != face and len(set(cycle) & set(other)) == 2)
+    adjacency = face_adjacency(None, iter(faces))
+    assert {face: sorted(nbrs) for face, nbrs in adjacency.items()} == expected
+    adjacency = face_adjacency_numpy(None, faces)
+    assert {face: sorted(nbrs) for face, nbrs in adjacency.items()} == expected
+
+
+def test_unify_cycles(faces):
+    random.seed(0)
+    flipped = [face[::-1] if random.random() < 0.5 and i else face[:] for i, face in enumerate(faces)]
+    assert unify_cycles(None, flipped) == faces
+    with pytest.raises(AssertionError):
+        unify_cycles(None, faces + [[1000, 1001, 1002]])
+
+
+@pytest.mark.parametrize('storage', ['dict', 'compact'])
+def test_mesh_unify_cycles(faces, storage):
+    vertices = [[i, 0, 0] for i in range(100)] + [[i, 1, 0] for i in range(100)]
+    random.seed(1)
+    flipped = [face[::-1] if random.random() < 0.5 and i else face[:] for i, face in enumerate(faces)]
+    mesh = Mesh.from_vertices_and_faces(vertices, flipped, storage=storage)
+    mesh_unify_cycles(mesh, root=0)
+    assert [mesh.face_vertices(fkey) for fkey in mesh.faces()] == faces
+    assert all(mesh.halfedge[u][v] == fkey for fkey in mesh.faces() for u, v in mesh.face_halfedges(fkey))
@@ -0,0 +1,144 @@
+import random
+
+import pytest
+
+from compas.datastructures import Mesh
+from compas.datastructures import Network
+from compas.geometry import distance_point_point
+from compas.topology import CSRAdjacency
+from compas.topology import ShortestPathTree
+from compas.topology import breadth_first_ordering
+from compas.topology import breadth_first_traverse
+from compas.topology import astar_shortest_path
+from compas.topology import dijkstra_distance_matrix
+from compas.topology import dijkstra_distance_matrix_numpy
+from compas.topology import dijkstra_distances
+from compas.topology import dijkstra_nearest_path
+from compas.topology import depth_first_ordering
+from compas.topology import dijkstra_path
+
+
+@pytest.fixture
+def grid():
+    random.seed(0)
+    n = 20
+    adjacency = {(i, j): [] for i in range(n) for j in range(n)}
+    weight = {}
+    for i, j in adjacency:
+        for u in ((i + 1, j), (i, j + 1)):
+            if u in adjacency:
+                w = random.random()
+                adjacency[(i, j)].append(u)
+                adjacency[u].append((i, j))
+                weight[((i, j), u)] = weight[(u, (i, j))] = w
+    return adjacency, weight
+
+
+def path_length(path, weight):
+    return sum(weight[(u, v)] for u, v in zip(path[:-1], path[1:]))
+
+
+def test_traversal_csr(grid):
+    adjacency, _ = grid
+    csr = CSRAdjacency.from_adjacency(adjacency)
+    root = csr.key_index[(4, 7)]
+    for ordering in (depth_first_ordering, breadth_first_ordering):
+        order = ordering(adjacency, (4, 7))
+        assert len(order) == len(set(order)) == len(adjacency)
+        assert [csr.keys[i] for i in ordering(csr, root)] == order
+    order = breadth_first_ordering(adjacency, (4, 7))
+    depth = {(4, 7): 0}
+    for node in order:
+        for nbr in adjacency[node]:
+            depth.setdefault(nbr, depth[node] + 1)
+    assert [depth[node] for node in order] == sorted(depth[node] for node in order)
+    assert breadth_first_traverse(csr, root) == set(range(len(csr)))
+    assert csr.to_adjacency() == adjacency
+
+
+def test_dijkstra_path(grid):
+    adjacency, weight = grid
+    source, target = (0, 0), (19, 13)
+    dist = dijkstra_distances(adjacency, weight, target)
+    path = dijkstra_path(adjacency, weight, source, target)
+    assert path[0] == source and path[-1] == target
+    assert path_length(path, weight) == pytest.approx(dist[source])
+    assert path_length(dijkstra_path(adjacency, weight, source, target, dist), weight) == pytest.approx(dist[source])
+
+
+def test_dijkstra_unreachable(grid):
+    adjacency, weight = grid
+    adjacency['a'] = []
+    assert dijkstra_distances(adjacency, weight, (0, 0))['a'] == 1e+17
+    assert dijkstra_path(adjacency, weight, (0, 0), 'a') is None
+
+
+def test_dijkstra_nearest_path(grid):
+    adjacency, weight = grid
+    sources = [(0, 0), (19, 19)]
+    targets = [(10, 10), (5, 15), (15, 5)]
+    path = dijkstra_nearest_path(adjacency, weight, sources, targets)
+    expected = min(dijkstra_distances(adjacency, weight, t)[s] for s in sources for t in targets)
+    assert path[0] in sources and path[-1] in targets
+    assert path_length(path, weight) == pytest.approx(expected)
+
+
+def test_shortest_path_tree(grid):
+    adjacency, weight = grid
+    tree = ShortestPathTree(adjacency, weight, (3, 4))
+    dist = dijkstra_distances(adjacency, weight, (3, 4))
+    for key in adjacency:
+        assert tree.distance(key) == pytest.approx(dist[key])
+        assert path_length(tree.path(key), weight) == pytest.approx(dist[key])
+    tree = ShortestPathTree(adjacency, weight, (3, 4), cutoff=1.0)
+    assert all(d <= 1.0 for d in tree.distances.values())
+    assert (19, 19) not in tree and tree.path((19, 19)) is None
+
+
+def test_astar_shortest_path():
+    nodes = [[x, y, 0] for x in range(10) for y in range(10)]
+    edges = [(i, i + 1) for i in range(100) if (i + 1) % 10] + [(i, i + 10) for i in range(90)]
+    network = Network.from_nodes_and_edges(nodes, edges)
+    path = astar_shortest_path(network, 0, 99)
+    assert path[0] == 0 and path[-1] == 99
+    assert len(path) == 19
+    weight = {}
+    for u, v in network.edges():
+        weight[(u, v)] = weight[(v, u)] = distance_point_point(nodes[u], nodes[v])
+    assert path_length(path, weight) == pytest.approx(18)
+    assert astar_shortest_path(network, 0, 99, heuristic=lambda key: 0, weight=weight)[-1] == 99
+
+
+@pytest.mark.parametrize('processes', [1, 2])
+def test_dijkstra_distance_matrix(grid, processes):
+    adjacency, weight = grid
+    adjacency['a'] = []
+    sources = [(0, 0), (7, 3), (19, 19)]
+    matrix = dijkstra_distance_matrix(adjacency, weight, sources, processes=processes)
+    for source, row in zip(sources, matrix):
+        dist = dijkstra_distances(adjacency, weight, source)
+        assert row[:-1] == pytest.approx([dist[key] for key in adjacency][:-1])
+        assert row[-1] == float('inf')
+    expected = dijkstra_distance_matrix_numpy(adjacency, weight, sources)
+    assert sum(matrix, []) == pytest.approx(expected.ravel().tolist())
+
+
+def test_dijkstra_distance_matrix_sparse(grid):
+    adjacency, weight = grid
+    sources = [(0, 0), (7, 3)]
+    targets = [(5, 5), (7, 4), (0, 1)]
+    rows = dijkstra_distance_matrix(adjacency, weight, sources, targets, cutoff=1.0, sparse=True)
+    matrix = dijkstra_distance_matrix(adjacency, weight, sources, targets)
+    expected = dijkstra_distance_matrix_numpy(adjacency, weight, sources, targets, cutoff=1.0, sparse=True)
+    for i, row in enumerate(rows):
+        assert row == {key: d for key, d in zip(targets, matrix[i]) if d <= 1.0}
+        assert row == pytest.approx({targets[j]: expected[i, j] for j in expected[i].indices})
+
+
+def test_dijkstra_distance_matrix_mesh():
+    mesh = Mesh.from_vertices_and_faces([[x, y, 0] for x in range(5) for y in range(5)],
+                                        [[5 * i + j, 5 * i + j + 5, 5 * i + j + 6, 5 * i + j + 1]
+                                         for i in range(4) for j in range(4)])
+    matrix = dijkstra_distance_matrix(mesh, None, [0, 24], [24, 0, 12])
+    assert matrix == [[8, 0, 4], [0, 8, 4]]
+    assert dijkstra_distance_matrix_numpy(mesh, None, [0, 24], [24, 0, 12]).tolist() == matrix